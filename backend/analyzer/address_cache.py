@@ -0,0 +1,287 @@
+"""
+Address Owner Cache
+Persistent address -> owner program / classification cache
+
+📋 מה הקובץ הזה עושה:
+-------------------
+בכל ניתוח מחזיקים HolderAnalyzer שואל את ה-RPC מי ה-owner של כל אחד מ-20 החשבונות
+הגדולים. pool vaults של Raydium/Orca, כתובות burn וארנקי בורסות חוזרים באלפי טוקנים
+וה-owner שלהם לא משתנה - אין סיבה לשאול עליהם שוב.
+
+הקובץ הזה:
+1. שומר address -> owner + סיווג (lp / other)
+2. שומר לדיסק (data/address_owners.jsonl - append-only) וטוען בהפעלה
+3. אופציונלית - משתף את המטמון דרך Supabase (טבלת address_owners)
+4. נבדק לפני כל קריאת RPC - רק כתובות שלא מוכרות בכלל הולכות לרשת
+
+🔧 פונקציות עיקריות:
+- get_address_cache() - המטמון הגלובלי
+- resolve(addresses, fetch, classify) - owners לכתובות (מטמון → Supabase → RPC)
+- flush(force) - שמירה לדיסק / Supabase
+- get_stats() - מונים
+
+💡 איך זה עובד:
+1. כתובת שנמצאת בזיכרון = hit, בלי רשת בכלל
+2. כתובות חסרות נשאלות ב-Supabase (אם מופעל) בשאילתה אחת
+3. מה שעדיין חסר נשלף מה-RPC (fetch) ונשמר למטמון
+4. flush() מוסיף לקובץ רק את הכתובות החדשות, כשיש מספיק שינויים (או ב-force)
+
+📝 הערות:
+- ADDRESS_CACHE_FILE ב-.env - מיקום הקובץ (ה-log נשמר לידו עם סיומת .jsonl,
+  קובץ JSON ישן מיובא פעם אחת); ה-log נדחס כשהוא גדל פי 2 מהמטמון
+- ADDRESS_CACHE_SUPABASE=true - שיתוף דרך Supabase (צריך להריץ migration 006)
+- חשבונות שלא קיימים (סגורים) לא נשמרים
+"""
+
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from database.supabase_client import get_supabase_client
+from utils.logger import get_logger
+
+logger = get_logger("address_cache")
+
+DEFAULT_MAX_ENTRIES = 200_000
+FLUSH_EVERY = 50  # Append to disk after this many new entries
+
+# Entry: {"owner": str, "kind": str, "label": str}
+Entry = Dict[str, str]
+OwnerFetcher = Callable[[List[str]], Awaitable[Dict[str, str]]]
+OwnerClassifier = Callable[[str, str], Tuple[str, str]]
+
+
+class AddressOwnerCache:
+    """
+    Persistent cache of account owner programs and their classification
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        use_supabase: bool = False,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize address owner cache
+
+        Args:
+            cache_file: Path to the legacy JSON cache file
+                (the append-only log is next to it, with a .jsonl suffix)
+            use_supabase: Also read / write the address_owners table
+            max_entries: Max cached addresses (oldest dropped first)
+        """
+        self.cache_file = cache_file or "data/address_owners.json"
+        self.log_file = Path(self.cache_file).with_suffix(".jsonl")
+        self.use_supabase = use_supabase
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._pending: Dict[str, Entry] = {}  # New entries not yet flushed
+        self._dirty = 0
+        self._log_lines = 0
+        self._write_lock = asyncio.Lock()
+
+        # Stats
+        self.hits = 0
+        self.supabase_hits = 0
+        self.rpc_lookups = 0
+
+        self._load()
+
+    def _load(self):
+        """Load cache from the append-only log (or the legacy JSON file)"""
+        if self.log_file.exists():
+            try:
+                # Torn last line (crash mid-write) - cut it, or the next append would join it
+                data = self.log_file.read_bytes()
+                complete = data.rfind(b"\n") + 1
+                if complete < len(data):
+                    os.truncate(self.log_file, complete)
+                for line in data[:complete].decode().splitlines():
+                    try:
+                        entry = json.loads(line)
+                        address = entry.pop("address")
+                    except (ValueError, KeyError, AttributeError):
+                        continue
+                    if "owner" in entry:
+                        self._remember(address, entry)
+                    self._log_lines += 1
+                logger.info(f"✅ Loaded {len(self._entries)} cached address owners")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load address cache: {e}")
+            return
+
+        cache_path = Path(self.cache_file)
+        if not cache_path.exists():
+            logger.info("📝 No address cache file found, starting empty")
+            return
+
+        try:
+            with open(cache_path, 'r') as f:
+                data = json.load(f)
+            for address, entry in data.items():
+                if isinstance(entry, dict) and "owner" in entry:
+                    self._remember(address, entry)
+            logger.info(f"✅ Loaded {len(self._entries)} cached address owners from {cache_path}")
+            self._write(dict(self._entries), compact=True)  # Start the append-only log
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load address cache: {e}")
+
+    def get(self, address: str) -> Optional[Entry]:
+        """Cached entry for an address (None if unknown)"""
+        return self._entries.get(address)
+
+    async def resolve(
+        self,
+        addresses: List[str],
+        fetch: OwnerFetcher,
+        classify: Optional[OwnerClassifier] = None,
+    ) -> Dict[str, str]:
+        """
+        Owner program for each address - cache first, network only for unknown ones
+
+        Args:
+            addresses: Account addresses
+            fetch: Async RPC lookup for misses (addresses -> Dict address -> owner)
+            classify: (address, owner) -> (kind, label) for new entries
+
+        Returns:
+            Dict address -> owner program (known owners only)
+        """
+        owners: Dict[str, str] = {}
+        missing: List[str] = []
+
+        for address in dict.fromkeys(a for a in addresses if a):
+            entry = self._entries.get(address)
+            if entry is not None:
+                self.hits += 1
+                if entry.get("owner"):
+                    owners[address] = entry["owner"]
+            else:
+                missing.append(address)
+
+        if missing and self.use_supabase:
+            for address, entry in (await self._load_from_supabase(missing)).items():
+                self.supabase_hits += 1
+                self._remember(address, entry)
+                if entry.get("owner"):
+                    owners[address] = entry["owner"]
+            missing = [a for a in missing if a not in self._entries]
+
+        if missing:
+            self.rpc_lookups += len(missing)
+            fetched = await fetch(missing)
+            for address, owner in fetched.items():
+                kind, label = classify(address, owner) if classify else ("other", "")
+                entry = {"owner": owner, "kind": kind, "label": label}
+                self._remember(address, entry)
+                self._pending[address] = entry
+                self._dirty += 1
+                owners[address] = owner
+
+        return owners
+
+    def _remember(self, address: str, entry: Entry):
+        self._entries[address] = entry
+        self._entries.move_to_end(address)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def flush(self, force: bool = False):
+        """
+        Persist new entries (disk + Supabase)
+
+        Append-only: each new address is one line in the .jsonl log. The log
+        is compacted (rewritten from memory, evicted addresses dropped) once
+        it is twice the number of cached addresses.
+
+        Args:
+            force: Write even if only a few entries changed
+        """
+        if not self._dirty or (not force and self._dirty < FLUSH_EVERY):
+            return
+
+        pending, self._pending = self._pending, {}
+        self._dirty = 0
+
+        async with self._write_lock:
+            if self._log_lines + len(pending) > 2 * len(self._entries) + 1000:
+                await asyncio.to_thread(self._write, dict(self._entries), True)
+            else:
+                await asyncio.to_thread(self._write, pending, False)
+
+        if self.use_supabase and pending:
+            await self._save_to_supabase(pending)
+
+    def _write(self, entries: Dict[str, Entry], compact: bool):
+        """Append entries to the log, or rewrite it atomically with exactly these entries"""
+        lines = "".join(json.dumps({"address": address, **entry}) + "\n" for address, entry in entries.items())
+
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            if compact:
+                tmp_path = self.log_file.with_suffix(".tmp")
+                with open(tmp_path, 'w') as f:
+                    f.write(lines)
+                os.replace(tmp_path, self.log_file)
+                self._log_lines = len(entries)
+                logger.info(f"✅ Compacted {len(entries)} address owners to {self.log_file}")
+            else:
+                with open(self.log_file, 'a') as f:
+                    f.write(lines)
+                self._log_lines += len(entries)
+                logger.debug(f"💾 Appended {len(entries)} address owners to {self.log_file}")
+        except Exception as e:
+            logger.error(f"❌ Failed to save address cache: {e}")
+
+    async def _load_from_supabase(self, addresses: List[str]) -> Dict[str, Entry]:
+        try:
+            async with get_supabase_client() as supabase:
+                return await supabase.get_address_owners(addresses)
+        except Exception as e:
+            logger.debug(f"Address owners lookup in Supabase failed: {e}")
+            return {}
+
+    async def _save_to_supabase(self, entries: Dict[str, Entry]):
+        try:
+            async with get_supabase_client() as supabase:
+                await supabase.save_address_owners(entries)
+        except Exception as e:
+            logger.debug(f"Address owners save to Supabase failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """Cache counters"""
+        lookups = self.hits + self.supabase_hits + self.rpc_lookups
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "supabase_hits": self.supabase_hits,
+            "rpc_lookups": self.rpc_lookups,
+            "hit_rate": ((self.hits + self.supabase_hits) / lookups) if lookups else 0.0,
+            "unsaved": self._dirty,
+            "log_lines": self._log_lines,
+        }
+
+    async def close(self):
+        """Flush everything that is still pending"""
+        await self.flush(force=True)
+
+
+# Global instance
+_address_cache: Optional[AddressOwnerCache] = None
+
+
+def get_address_cache() -> AddressOwnerCache:
+    """Get global address owner cache instance"""
+    global _address_cache
+    if _address_cache is None:
+        _address_cache = AddressOwnerCache(
+            cache_file=settings.address_cache_file,
+            use_supabase=settings.address_cache_supabase,
+        )
+    return _address_cache
@@ -14,35 +14,54 @@ Advanced smart contract security analysis
 
 🔧 פונקציות עיקריות:
 - check_contract(address) - בודק את כל הבטיחות של החוזה
+- check_contracts(addresses) - בדיקה ב-batch לכל הטוקנים של הסריקה
 - is_ownership_renounced(address) - בודק אם בעלות בוטלה
 - is_liquidity_locked(address) - בודק אם נזילות נעולה
 - can_mint_more(address) - בודק אם יכול להדפיס עוד טוקנים
 
 💡 איך זה עובד:
 1. מתחבר ל-Solana RPC (דרך Helius)
-2. קורא את המידע של החוזה מהבלוקצ'יין
-3. בודק את ה-metadata של החוזה
+2. קורא את חשבון ה-Mint (getAccountInfo, base64) - קריאה אחת
+3. מפענח את ה-layout של SPL Token / Token-2022: mint authority, freeze authority, decimals, supply
 4. מחפש ב-DexScreener אם יש נעילת נזילות
 5. מחזיר ContractSafety object עם כל הפרטים
 
 📝 הערות:
 - זה הבדיקה הכי חשובה! טוקן עם בעלות לא בוטלה = סיכון גבוה
 - כל בדיקה שעוברת = נקודות (סה"כ מקסימום 100)
-- משתמש ב-Solscan API ו-DexScreener API לבדיקות נוספות
+- בדיקות הבעלות וה-mint נעשות ישירות מול ה-RPC (בלי Solscan)
+- get_mint_infos() מפענח הרבה mints בקריאת getMultipleAccounts אחת (עד 100)
 """
 
 import asyncio
-from typing import Dict, Optional
+import base64
+import struct
+from typing import Dict, List, Optional
 from dataclasses import dataclass
-import httpx
-from solders.pubkey import Pubkey
-from solana.rpc.async_api import AsyncClient
+
+import base58
 
 from core.config import settings
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from analyzer.pair_cache import get_pair_cache
 
 logger = get_logger("contract_checker")
 
+# SPL Token programs (mint account owners)
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+TOKEN_PROGRAMS = {
+    TOKEN_PROGRAM_ID: "spl-token",
+    TOKEN_2022_PROGRAM_ID: "token-2022",
+}
+
+# Mint layout (same 82-byte base for SPL Token and Token-2022):
+# mint_authority COption<Pubkey> (4 + 32) | supply u64 | decimals u8 |
+# is_initialized bool | freeze_authority COption<Pubkey> (4 + 32)
+MINT_LAYOUT_SIZE = 82
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
 
 @dataclass
 class ContractSafety:
@@ -58,6 +77,71 @@ class ContractSafety:
             self.details = {}
 
 
+@dataclass
+class MintInfo:
+    """Decoded SPL mint account"""
+    mint_authority: Optional[str]
+    freeze_authority: Optional[str]
+    decimals: int
+    supply: int
+    is_initialized: bool
+    token_program: str  # "spl-token" / "token-2022"
+
+
+def decode_mint_account(data: bytes, owner: str) -> Optional[MintInfo]:
+    """
+    Decode SPL Token / Token-2022 mint account data
+    
+    Args:
+        data: Raw account data
+        owner: Owner program of the account
+    
+    Returns:
+        MintInfo or None if this is not a mint account
+    """
+    token_program = TOKEN_PROGRAMS.get(owner)
+    if not token_program or len(data) < MINT_LAYOUT_SIZE:
+        return None
+    
+    # Token-2022 mints with extensions are padded to 165 bytes + account type (1 = Mint)
+    if token_program == "token-2022" and len(data) > 165 and data[165] != 1:
+        return None
+    
+    mint_auth_tag, = struct.unpack_from("<I", data, 0)
+    supply, decimals, is_initialized = struct.unpack_from("<QB?", data, 36)
+    freeze_auth_tag, = struct.unpack_from("<I", data, 46)
+    
+    return MintInfo(
+        mint_authority=base58.b58encode(data[4:36]).decode() if mint_auth_tag == 1 else None,
+        freeze_authority=base58.b58encode(data[50:82]).decode() if freeze_auth_tag == 1 else None,
+        decimals=decimals,
+        supply=supply,
+        is_initialized=is_initialized,
+        token_program=token_program,
+    )
+
+
+def parse_account_value(value: Optional[Dict]) -> Optional[MintInfo]:
+    """
+    Decode one account from a getAccountInfo / getMultipleAccounts response
+    
+    Args:
+        value: RPC account value with base64 data ({"data": [b64, "base64"], "owner": ...})
+    
+    Returns:
+        MintInfo or None (missing account / not a mint)
+    """
+    if not value:
+        return None
+    try:
+        data_field = value.get("data")
+        encoded = data_field[0] if isinstance(data_field, list) else data_field
+        return decode_mint_account(base64.b64decode(encoded or ""), value.get("owner", ""))
+    except Exception as e:
+        logger.debug(f"Failed to decode mint account: {e}")
+        return None
+
+
 class ContractChecker:
     """
     Advanced contract safety checker
@@ -72,19 +156,14 @@ class ContractChecker:
     
     def __init__(self):
         self.rpc_url = settings.solana_rpc_url
-        self.client: Optional[AsyncClient] = None
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = create_http_client("scanner", timeout=30.0)
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if self.rpc_url:
-            self.client = AsyncClient(self.rpc_url)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.client:
-            await self.client.close()
         await self.http_client.aclose()
     
     async def check_contract(self, token_address: str) -> ContractSafety:
@@ -99,85 +178,192 @@ class ContractChecker:
         """
         logger.info(f"🔍 Analyzing contract safety for {token_address[:20]}...")
         
+        # Mint account (one RPC call) and liquidity (DexScreener cache) together
+        mint_info, liquidity_locked = await asyncio.gather(
+            self.get_mint_info(token_address),
+            self._check_liquidity_locked(token_address),
+        )
+        
+        safety = self._build_safety(token_address, mint_info, liquidity_locked)
+        
+        logger.info(f"📊 Safety score: {safety.safety_score}/100")
+        
+        return safety
+    
+    async def check_contracts(self, token_addresses: List[str]) -> Dict[str, ContractSafety]:
+        """
+        Batch contract safety check for many tokens
+        
+        One getMultipleAccounts call per 100 mints + batched DexScreener lookups,
+        so checking a whole scan costs about the same as checking one token.
+        
+        Args:
+            token_addresses: Token mint addresses
+        
+        Returns:
+            Dict mint -> ContractSafety
+        """
+        mints = list(dict.fromkeys(a for a in token_addresses if a))
+        if not mints:
+            return {}
+        
+        logger.info(f"🔍 Analyzing contract safety for {len(mints)} tokens (batch)...")
+        
+        mint_infos, pairs_map = await asyncio.gather(
+            self.get_mint_infos(mints),
+            get_pair_cache().get_pairs_many(mints),
+        )
+        
+        results = {
+            mint: self._build_safety(
+                mint,
+                mint_infos.get(mint),
+                self._liquidity_locked_from_pairs(pairs_map.get(mint) or []),
+            )
+            for mint in mints
+        }
+        
+        decoded = sum(1 for info in mint_infos.values() if info)
+        logger.info(f"📊 Contract safety: {decoded}/{len(mints)} mint accounts decoded")
+        
+        return results
+    
+    def _build_safety(
+        self,
+        token_address: str,
+        mint_info: Optional[MintInfo],
+        liquidity_locked: bool,
+    ) -> ContractSafety:
+        """Score the three checks from decoded mint data + liquidity"""
         safety = ContractSafety()
         
         # Check 1: Ownership renounced
-        try:
-            safety.ownership_renounced = await self._check_ownership_renounced(token_address)
-            if safety.ownership_renounced:
-                safety.safety_score += 33
-                logger.info("✅ Ownership renounced")
-        except Exception as e:
-            logger.warning(f"⚠️ Ownership check failed: {e}")
+        safety.ownership_renounced = self._check_ownership_renounced(token_address, mint_info)
+        if safety.ownership_renounced:
+            safety.safety_score += 33
+            logger.info("✅ Ownership renounced")
         
         # Check 2: Liquidity locked
-        try:
-            safety.liquidity_locked = await self._check_liquidity_locked(token_address)
-            if safety.liquidity_locked:
-                safety.safety_score += 33
-                logger.info("✅ Liquidity locked")
-        except Exception as e:
-            logger.warning(f"⚠️ Liquidity check failed: {e}")
+        safety.liquidity_locked = liquidity_locked
+        if safety.liquidity_locked:
+            safety.safety_score += 33
+            logger.info("✅ Liquidity locked")
         
         # Check 3: Mint authority
-        try:
-            safety.mint_authority_disabled = await self._check_mint_authority(token_address)
-            if safety.mint_authority_disabled:
-                safety.safety_score += 34
-                logger.info("✅ Mint authority disabled")
-        except Exception as e:
-            logger.warning(f"⚠️ Mint authority check failed: {e}")
+        safety.mint_authority_disabled = self._check_mint_authority(token_address, mint_info)
+        if safety.mint_authority_disabled:
+            safety.safety_score += 34
+            logger.info("✅ Mint authority disabled")
         
-        logger.info(f"📊 Safety score: {safety.safety_score}/100")
+        if mint_info:
+            safety.details.update({
+                "mint_authority": mint_info.mint_authority,
+                "freeze_authority": mint_info.freeze_authority,
+                "decimals": mint_info.decimals,
+                "supply": mint_info.supply,
+                "token_program": mint_info.token_program,
+            })
+        else:
+            safety.details["mint_account"] = "unavailable"
         
         return safety
     
-    async def _check_ownership_renounced(self, token_address: str) -> bool:
+    async def get_mint_info(self, token_address: str) -> Optional[MintInfo]:
         """
-        Check if token ownership is renounced
+        Fetch and decode a mint account with a single getAccountInfo call
         
-        Uses Solscan API to check if the token has a freeze authority
+        Args:
+            token_address: Token mint address
+        
+        Returns:
+            MintInfo or None if unavailable
         """
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getAccountInfo",
+            "params": [token_address, {"encoding": "base64"}]
+        }
+        
         try:
-            # Try Solscan API first
-            url = f"https://api.solscan.io/token/meta"
-            params = {"token": token_address}
-            
-            response = await self.http_client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                token_data = data.get("data", {})
-                
-                # Check if freeze authority exists
-                freeze_authority = token_data.get("freezeAuthority")
-                mint_authority = token_data.get("mintAuthority")
-                
-                # If both are null/empty, ownership is likely renounced
-                if not freeze_authority and not mint_authority:
-                    return True
-                
-                # If freeze authority is the mint itself, it's renounced
-                if freeze_authority == token_address:
-                    return True
-            
-            # Fallback: Check via RPC
-            if self.client:
-                try:
-                    pubkey = Pubkey.from_string(token_address)
-                    account_info = await self.client.get_account_info(pubkey)
-                    
-                    if account_info.value:
-                        # Parse account data to check authorities
-                        # This is a simplified check - full implementation would parse SPL token data
-                        return False  # Conservative: assume not renounced if we can't verify
-                except Exception as e:
-                    logger.debug(f"RPC check failed: {e}")
-            
-            return False
-            
+            resp = await self.http_client.post(self.rpc_url, json=payload)
+            if resp.status_code == 200:
+                value = (resp.json().get("result") or {}).get("value")
+                return parse_account_value(value)
+            logger.warning(f"⚠️ getAccountInfo returned {resp.status_code}")
         except Exception as e:
-            logger.error(f"Error checking ownership: {e}")
-            return False
+            logger.error(f"Error fetching mint account: {e}")
+        
+        return None
+    
+    async def get_mint_infos(self, token_addresses: List[str]) -> Dict[str, Optional[MintInfo]]:
+        """
+        Fetch and decode many mint accounts via getMultipleAccounts
+        
+        Args:
+            token_addresses: Token mint addresses (chunked by 100, chunks run concurrently)
+        
+        Returns:
+            Dict mint -> MintInfo (None if missing / not a mint / RPC error)
+        """
+        mints = list(dict.fromkeys(a for a in token_addresses if a))
+        chunks = [
+            mints[i:i + MAX_ACCOUNTS_PER_CALL]
+            for i in range(0, len(mints), MAX_ACCOUNTS_PER_CALL)
+        ]
+        
+        results: Dict[str, Optional[MintInfo]] = {mint: None for mint in mints}
+        chunk_values = await asyncio.gather(*(self._get_multiple_accounts(c) for c in chunks))
+        
+        for chunk, values in zip(chunks, chunk_values):
+            for mint, value in zip(chunk, values):
+                results[mint] = parse_account_value(value)
+        
+        return results
+    
+    async def _get_multiple_accounts(self, addresses: List[str]) -> List[Optional[Dict]]:
+        """One getMultipleAccounts call (base64) - returns values in request order"""
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getMultipleAccounts",
+            "params": [addresses, {"encoding": "base64"}]
+        }
+        
+        try:
+            resp = await self.http_client.post(self.rpc_url, json=payload)
+            if resp.status_code == 200:
+                values = (resp.json().get("result") or {}).get("value") or []
+                if len(values) == len(addresses):
+                    return values
+            logger.warning(f"⚠️ getMultipleAccounts failed for {len(addresses)} accounts")
+        except Exception as e:
+            logger.error(f"Error fetching mint accounts: {e}")
+        
+        return [None] * len(addresses)
+    
+    def _check_ownership_renounced(self, token_address: str, mint_info: Optional[MintInfo]) -> bool:
+        """
+        Check if token ownership is renounced
+        
+        Renounced = no mint authority and no freeze authority
+        (or the authority is the mint itself)
+        """
+        if not mint_info:
+            return False  # Conservative: assume not renounced if we can't verify
+        
+        freeze_authority = mint_info.freeze_authority
+        mint_authority = mint_info.mint_authority
+        
+        # If both are null/empty, ownership is renounced
+        if not freeze_authority and not mint_authority:
+            return True
+        
+        # If freeze authority is the mint itself, it's renounced
+        if freeze_authority == token_address:
+            return True
+        
+        return False
     
     async def _check_liquidity_locked(self, token_address: str) -> bool:
         """
@@ -186,72 +372,42 @@ class ContractChecker:
         Uses DexScreener to check liquidity status
         """
         try:
-            # Check via DexScreener
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            response = await self.http_client.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
-                
-                if not pairs:
-                    return False
-                
-                # Check the main pair (usually the one with most liquidity)
-                main_pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
-                
-                # Check if liquidity is significant (basic check)
-                liquidity_usd = float(main_pair.get("liquidity", {}).get("usd", 0) or 0)
-                
-                # If liquidity > $10k, consider it "locked" (simplified)
-                # TODO: Implement actual lock checking via on-chain data
-                if liquidity_usd > 10000:
-                    return True
-            
-            return False
+            # Check via DexScreener (shared pair cache - same data the metrics fetcher uses)
+            pairs = await get_pair_cache().get_pairs(token_address)
+            return self._liquidity_locked_from_pairs(pairs)
             
         except Exception as e:
             logger.error(f"Error checking liquidity: {e}")
             return False
     
-    async def _check_mint_authority(self, token_address: str) -> bool:
+    @staticmethod
+    def _liquidity_locked_from_pairs(pairs: List[Dict]) -> bool:
+        """Liquidity check on already-fetched DexScreener pairs"""
+        if not pairs:
+            return False
+        
+        # Check the main pair (usually the one with most liquidity)
+        main_pair = max(pairs, key=lambda p: float((p.get("liquidity") or {}).get("usd", 0) or 0))
+        
+        # Check if liquidity is significant (basic check)
+        liquidity_usd = float((main_pair.get("liquidity") or {}).get("usd", 0) or 0)
+        
+        # If liquidity > $10k, consider it "locked" (simplified)
+        # TODO: Implement actual lock checking via on-chain data
+        return liquidity_usd > 10000
+    
+    def _check_mint_authority(self, token_address: str, mint_info: Optional[MintInfo]) -> bool:
         """
         Check if mint authority is disabled
         
         A token with disabled mint authority cannot create new tokens
         """
-        try:
-            # Use Solscan API
-            url = f"https://api.solscan.io/token/meta"
-            params = {"token": token_address}
-            
-            response = await self.http_client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                token_data = data.get("data", {})
-                
-                mint_authority = token_data.get("mintAuthority")
-                
-                # If mint authority is null or the mint itself, it's disabled
-                if not mint_authority or mint_authority == token_address:
-                    return True
-            
-            # Fallback: RPC check
-            if self.client:
-                try:
-                    pubkey = Pubkey.from_string(token_address)
-                    # Get mint account info
-                    # This would require parsing SPL token mint account data
-                    # Simplified: assume disabled if we can't find authority
-                    return False
-                except Exception as e:
-                    logger.debug(f"RPC mint check failed: {e}")
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error checking mint authority: {e}")
+        if not mint_info:
             return False
+        
+        # If mint authority is null or the mint itself, it's disabled
+        mint_authority = mint_info.mint_authority
+        return not mint_authority or mint_authority == token_address
 
 
 # Convenience function
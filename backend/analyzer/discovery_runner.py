@@ -0,0 +1,425 @@
+"""
+Discovery Runner - Parallel Smart Money Discovery Jobs
+תור עבודה של (טוקן, ארנק) עם pool של workers ו-checkpoint לדיסק
+
+📋 מה הקובץ הזה עושה:
+-------------------
+גילוי Smart Money עבר על הקונים הראשונים של כל טוקן אחד-אחד (ורק 20 הראשונים).
+הקובץ הזה מריץ את זה כ-job ברקע:
+
+1. submit(tokens) - כל טוקן נכנס לתור כ-(token, None) = "מצא את הקונים הראשונים"
+2. כל קונה ראשון נכנס לתור כ-(token, wallet) - ארנק שכבר בתור / נבדק לאחרונה /
+   כבר Smart Money לא נכנס שוב (גם אם הופיע בכמה טוקנים)
+3. DISCOVERY_WORKERS workers מושכים מהתור במקביל: קליטת ה-swaps של הארנק
+   (WalletPerformanceAnalyzer.sync_wallet) או הרחבת טוקן לקונים
+4. כל SCORE_BATCH ארנקים שנקלטו - חישוב וקטורי אחד של WalletStats לכולם,
+   וארנקים שעומדים בקריטריונים נוספים ל-SmartMoneyTracker
+5. ההתקדמות נשמרת ל-DISCOVERY_CHECKPOINT_FILE - הפעלה מחדש ממשיכה מאותה נקודה
+6. כל PROGRESS_INTERVAL_SECONDS - שורת לוג עם קצב (ארנקים לדקה) וגודל התור
+
+🔧 פונקציות עיקריות:
+- submit(tokens, nickname_prefix) - הוסף טוקנים (לא מחכה)
+- run(tokens, nickname_prefix) - הוסף ומחכה לסיום, מחזיר את הארנקים שנמצאו
+- wait() - מחכה שהתור יתרוקן
+- get_stats() - התקדמות וקצב
+
+💡 איך זה עובד:
+1. כל ה-workers משתמשים ב-HTTP clients מסוג "scanner" - תקציב הבקשות לכל host
+   (utils/rate_limiter.py) משותף לכולם ולשאר הבוט, אז אין צורך ב-sleep בין ארנקים
+2. ארנק שהקליטה שלו נכשלה חוזר לסוף התור (עד MAX_SYNC_RETRIES פעמים בהרצה),
+   ואחר כך נשאר ב-pending ונכנס שוב לתור בהפעלה הבאה
+3. ארנק שנבדק לא נבדק שוב לפני REEVALUATE_AFTER_SECONDS (גם מטוקן אחר)
+
+📝 הערות:
+- DISCOVERY_BUYERS_PER_TOKEN - כמה קונים ראשונים לבדוק לכל טוקן
+- טוקן שטרם הגענו ליצירה שלו (FirstBuyerDetector) חוזר לסוף התור כל עוד הדפדוף
+  מתקדם (paging_cursor זז), עד MAX_EXPAND_ROUNDS פעמים בהרצה - ואחר כך נשאר לא
+  מורחב להרצה הבאה; טוקן שההיסטוריה שלו נשלפה עד הסוף בלי קונים מסומן כמורחב (is_exhausted)
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyzer.first_buyer_detector import FirstBuyerDetector
+from analyzer.smart_money_tracker import SmartMoneyTracker
+from analyzer.wallet_performance_analyzer import WalletPerformanceAnalyzer
+from core.config import settings
+from utils.logger import get_logger
+
+logger = get_logger("discovery_runner")
+
+SCORE_BATCH = 100  # ארנקים לכל חישוב WalletStats וקטורי
+CHECKPOINT_INTERVAL_SECONDS = 10.0
+PROGRESS_INTERVAL_SECONDS = 30.0
+REEVALUATE_AFTER_SECONDS = 24 * 3600
+MAX_SYNC_RETRIES = 3  # ניסיונות חוזרים לארנק שהקליטה שלו נכשלה (בכל הרצה)
+MAX_EXPAND_ROUNDS = 5  # הרחבות של טוקן שטרם הגענו ליצירה שלו (בכל הרצה)
+
+
+class DiscoveryRunner:
+    """
+    Bounded-concurrency, checkpointed (token, wallet) discovery queue
+    """
+
+    def __init__(
+        self,
+        wallet_analyzer: WalletPerformanceAnalyzer,
+        first_buyer_detector: FirstBuyerDetector,
+        tracker: SmartMoneyTracker,
+        checkpoint_file: Optional[str] = None,
+        workers: Optional[int] = None,
+        buyers_per_token: Optional[int] = None,
+    ):
+        """
+        Initialize discovery runner
+
+        Args:
+            wallet_analyzer: קליטה וחישוב ביצועים של ארנקים
+            first_buyer_detector: קונים ראשונים של טוקן
+            tracker: לאן מוסיפים את ה-Smart Money שנמצא
+            checkpoint_file: קובץ ההתקדמות (ברירת מחדל: DISCOVERY_CHECKPOINT_FILE)
+            workers: כמה workers במקביל (ברירת מחדל: DISCOVERY_WORKERS)
+            buyers_per_token: קונים ראשונים לכל טוקן (ברירת מחדל: DISCOVERY_BUYERS_PER_TOKEN)
+        """
+        self.wallet_analyzer = wallet_analyzer
+        self.first_buyer_detector = first_buyer_detector
+        self.tracker = tracker
+        self.checkpoint_file = Path(checkpoint_file or settings.discovery_checkpoint_file)
+        self.workers = workers or settings.discovery_workers
+        self.buyers_per_token = buyers_per_token or settings.discovery_buyers_per_token
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tokens: Dict[str, Dict] = {}  # token -> {"nickname", "expanded"}
+        self._pending: Dict[str, str] = {}  # wallet -> token (בתור / נכשל)
+        self._evaluated: Dict[str, float] = {}  # wallet -> time.time() של הבדיקה
+        self._discovered: Dict[str, str] = {}  # wallet -> token שממנו נמצא
+        self._retries: Dict[str, int] = {}  # wallet -> קליטות שנכשלו בהרצה הנוכחית
+        self._expand_rounds: Dict[str, int] = {}  # token -> הרחבות בהרצה הנוכחית
+        self._to_score: List[Tuple[str, str]] = []  # (token, wallet) שנקלטו וממתינים לחישוב
+        self._task: Optional[asyncio.Task] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._last_checkpoint = 0.0
+        self._last_progress = 0.0
+        self._loaded = False
+
+        # Stats (current run)
+        self.run_started: Optional[float] = None
+        self.tokens_expanded = 0
+        self.wallets_evaluated = 0
+        self.smart_found = 0
+        self.deduplicated = 0
+        self.failures = 0
+        self.tokens_requeued = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def submit(self, token_addresses: List[str], nickname_prefix: str = "Auto"):
+        """
+        הוסף טוקנים לתור (לא מחכה לסיום)
+
+        Args:
+            token_addresses: טוקנים מוצלחים שהקונים הראשונים שלהם ייבדקו
+            nickname_prefix: תחילת ה-nickname של ארנקים שיימצאו
+        """
+        self._ensure_loaded()
+
+        added = 0
+        for token in token_addresses:
+            info = self._tokens.get(token)
+            if info is None:
+                info = self._tokens[token] = {
+                    "nickname": f"{nickname_prefix}-{token[:8]}",
+                    "expanded": False,
+                }
+            elif info["expanded"]:
+                continue
+            self._queue.put_nowait((token, None))
+            added += 1
+
+        if added:
+            logger.info(f"📥 Discovery: {added} tokens queued")
+            self._save_checkpoint()
+            self._ensure_running()
+
+    async def run(self, token_addresses: List[str], nickname_prefix: str = "Auto") -> List[str]:
+        """
+        הוסף טוקנים וחכה שהתור יתרוקן
+
+        Returns:
+            ארנקי Smart Money שנמצאו מהטוקנים האלה (כולל בהרצות קודמות)
+        """
+        self.submit(token_addresses, nickname_prefix)
+        await self.wait()
+        tokens = set(token_addresses)
+        return [wallet for wallet, token in self._discovered.items() if token in tokens]
+
+    async def wait(self):
+        """חכה שהתור יתרוקן"""
+        await self._idle.wait()
+
+    # ========================================================================
+    # Queue
+    # ========================================================================
+
+    def _ensure_running(self):
+        """הפעל את ה-job אם הוא לא רץ"""
+        if self._task is None or self._task.done():
+            self._idle.clear()
+            self._task = asyncio.create_task(self._run())
+
+    def _enqueue(self, token: str, wallet: str):
+        """הכנס (token, wallet) לתור - אלא אם הארנק כבר בתור / נבדק לאחרונה / כבר מוכר"""
+        evaluated_at = self._evaluated.get(wallet)
+        recently_evaluated = evaluated_at is not None and time.time() - evaluated_at < REEVALUATE_AFTER_SECONDS
+        if wallet in self._pending or recently_evaluated or self.tracker.get_wallet_info(wallet):
+            self.deduplicated += 1
+            return
+        self._pending[wallet] = token
+        self._queue.put_nowait((token, wallet))
+
+    async def _run(self):
+        """ה-job: workers עד שהתור ריק, ואז חישוב אחרון ו-checkpoint"""
+        self.run_started = time.monotonic()
+        self.tokens_expanded = self.wallets_evaluated = self.smart_found = 0
+        self.deduplicated = self.failures = self.tokens_requeued = 0
+        self._retries.clear()
+        self._expand_rounds.clear()
+        logger.info(f"🚀 Discovery started ({self.workers} workers, {self._queue.qsize()} items queued)")
+
+        try:
+            while True:
+                workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+                try:
+                    await self._queue.join()
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                await self._score_pending()
+                if self._queue.empty():
+                    break  # No await after this check - a submit() now starts a new run
+
+            self._save_checkpoint()
+            elapsed = time.monotonic() - self.run_started
+            logger.info(
+                f"✅ Discovery finished: {self.wallets_evaluated} wallets from {self.tokens_expanded} tokens "
+                f"in {elapsed:.0f}s ({self._wallets_per_minute():.0f}/min), {self.smart_found} smart wallets"
+            )
+        except asyncio.CancelledError:
+            self._save_checkpoint()
+            raise
+        except Exception as e:
+            logger.error(f"❌ Discovery run failed: {e}", exc_info=True)
+            self._save_checkpoint()
+        finally:
+            self._idle.set()
+
+    async def _worker(self):
+        """worker אחד - מושך (token, wallet) מהתור עד שמבוטל"""
+        while True:
+            token, wallet = await self._queue.get()
+            try:
+                if wallet is None:
+                    await self._expand(token)
+                elif await self.wallet_analyzer.sync_wallet(wallet):
+                    self._to_score.append((token, wallet))
+                    if len(self._to_score) >= SCORE_BATCH:
+                        await self._score_pending()
+                else:
+                    self._retry(token, wallet)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Discovery item failed ({token[:8]}, {(wallet or '-')[:8]}): {e}")
+                if wallet is None:
+                    self.failures += 1
+                else:
+                    self._retry(token, wallet)
+            finally:
+                self._queue.task_done()
+                self._maybe_checkpoint()
+                self._maybe_report()
+
+    def _retry(self, token: str, wallet: str):
+        """קליטה שנכשלה - חזרה לסוף התור, או (אחרי MAX_SYNC_RETRIES) להרצה הבאה"""
+        self.failures += 1
+        attempts = self._retries.get(wallet, 0) + 1
+        self._retries[wallet] = attempts
+        if attempts <= MAX_SYNC_RETRIES:
+            self._queue.put_nowait((token, wallet))
+        else:
+            logger.warning(f"⚠️ Sync of {wallet[:20]}... failed {attempts} times - retrying on the next run")
+
+    async def _expand(self, token: str):
+        """קונים ראשונים של טוקן → (token, wallet) בתור"""
+        cursor = self.first_buyer_detector.paging_cursor(token)
+        buyers = await self.first_buyer_detector.detect_first_buyers(
+            token, hours=24, limit=self.buyers_per_token
+        )
+        for buyer in buyers:
+            self._enqueue(token, buyer.wallet_address)
+        # [] = creation not reached yet, or really no buyers - only the first is retried
+        expanded = bool(buyers) or self.first_buyer_detector.is_exhausted(token)
+        self._tokens[token]["expanded"] = expanded
+        self.tokens_expanded += 1
+        logger.info(f"📊 {token[:20]}...: {len(buyers)} first buyers, queue {self._queue.qsize()}")
+
+        if not expanded:
+            # Keep paging towards the creation in this run - as long as paging moves and within the cap
+            rounds = self._expand_rounds.get(token, 0) + 1
+            self._expand_rounds[token] = rounds
+            advanced = self.first_buyer_detector.paging_cursor(token) not in (None, cursor)
+            if advanced and rounds < MAX_EXPAND_ROUNDS:
+                self.tokens_requeued += 1
+                self._queue.put_nowait((token, None))
+            else:
+                logger.info(f"⏸️ {token[:20]}... not expanded after {rounds} rounds - retrying on the next run")
+
+    async def _score_pending(self):
+        """חישוב WalletStats וקטורי לארנקים שנקלטו, והוספת ה-Smart Money ל-tracker"""
+        batch, self._to_score = self._to_score, []
+        if not batch:
+            return
+
+        all_stats = await self.wallet_analyzer.analyze_wallets([wallet for _, wallet in batch])
+        now = time.time()
+        found = 0
+
+        for (token, wallet), stats in zip(batch, all_stats):
+            self._pending.pop(wallet, None)
+            self._retries.pop(wallet, None)
+            self._evaluated[wallet] = now
+            self.wallets_evaluated += 1
+
+            if not self.wallet_analyzer.meets_smart_wallet_criteria(stats):
+                continue
+
+            nickname = self._tokens.get(token, {}).get("nickname")
+            self.tracker.add_smart_wallet(wallet, nickname=nickname)
+            smart_wallet = self.tracker.get_wallet_info(wallet)
+            smart_wallet.total_trades = stats.total_trades
+            smart_wallet.profitable_trades = stats.profitable_trades
+            smart_wallet.success_rate = stats.win_rate * 100  # Percent, like PerformanceTracker
+            self._discovered[wallet] = token
+            found += 1
+
+        self.smart_found += found
+        if found:
+            self.tracker.save_wallets()
+        self._save_checkpoint()
+
+    # ========================================================================
+    # Progress
+    # ========================================================================
+
+    def _wallets_per_minute(self) -> float:
+        if not self.run_started:
+            return 0.0
+        elapsed = time.monotonic() - self.run_started
+        return self.wallets_evaluated * 60 / elapsed if elapsed > 0 else 0.0
+
+    def _maybe_report(self):
+        """שורת התקדמות כל PROGRESS_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_progress = now
+        logger.info(
+            f"⏱️ Discovery: {self.wallets_evaluated} wallets evaluated "
+            f"({self._wallets_per_minute():.0f}/min), {self.smart_found} smart, "
+            f"{self._queue.qsize()} queued, {self.deduplicated} duplicates skipped"
+        )
+
+    def get_stats(self) -> Dict:
+        """התקדמות וקצב של ה-job הנוכחי / האחרון"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "pending_wallets": len(self._pending),
+            "tokens_expanded": self.tokens_expanded,
+            "tokens_requeued": self.tokens_requeued,
+            "tokens_unexpanded": sum(1 for info in self._tokens.values() if not info.get("expanded")),
+            "wallets_evaluated": self.wallets_evaluated,
+            "smart_found": self.smart_found,
+            "deduplicated": self.deduplicated,
+            "failures": self.failures,
+            "wallets_per_minute": round(self._wallets_per_minute(), 1),
+            "elapsed_seconds": round(time.monotonic() - self.run_started, 1) if self.run_started else 0,
+        }
+
+    # ========================================================================
+    # Checkpoint
+    # ========================================================================
+
+    def _ensure_loaded(self):
+        """טען checkpoint (פעם אחת) והחזר לתור עבודה שלא הסתיימה"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.checkpoint_file.exists():
+            return
+
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load discovery checkpoint: {e}")
+            return
+
+        cutoff = time.time() - REEVALUATE_AFTER_SECONDS
+        self._tokens = data.get("tokens", {})
+        self._evaluated = {w: t for w, t in data.get("evaluated", {}).items() if t >= cutoff}
+        self._discovered = data.get("discovered", {})
+
+        resumed = 0
+        for token, info in self._tokens.items():
+            if not info.get("expanded"):
+                self._queue.put_nowait((token, None))
+                resumed += 1
+        for wallet, token in data.get("pending", {}).items():
+            self._enqueue(token, wallet)
+
+        if not self._queue.empty():
+            logger.info(
+                f"♻️ Resuming discovery: {resumed} tokens and {len(self._pending)} wallets from checkpoint"
+            )
+            self._ensure_running()
+
+    def _maybe_checkpoint(self):
+        if time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL_SECONDS:
+            self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        """שמור את ההתקדמות (כתיבה לקובץ זמני ואז rename)"""
+        self._last_checkpoint = time.monotonic()
+        data = {
+            "tokens": self._tokens,
+            # Scored-but-not-saved wallets are still in _pending, so nothing is lost
+            "pending": self._pending,
+            "evaluated": self._evaluated,
+            "discovered": self._discovered,
+        }
+        try:
+            self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.checkpoint_file.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.checkpoint_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save discovery checkpoint: {e}")
+
+    async def close(self):
+        """עצור את ה-job (ההתקדמות נשמרת וממשיכה בהפעלה הבאה)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
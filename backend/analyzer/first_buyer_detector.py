@@ -1,41 +1,67 @@
 """
 First Buyer Detector
-Detect wallets that bought tokens early (first 24 hours)
+Detect wallets that bought tokens early (first 24 hours) - straight from the chain
 
 📋 מה הקובץ הזה עושה:
 -------------------
 זה הקובץ שמוצא מי היו הקונים הראשונים של טוקן (24 שעות ראשונות).
 
 הקובץ הזה:
-1. מחפש את כל הקונים הראשונים של טוקן (24 שעות ראשונות)
-2. מחזיר רשימה של ארנקים שקנו מוקדם
-3. משמש את Smart Money Discovery Engine למציאת ארנקים חכמים
+1. עובר אחורה על getSignaturesForAddress של ה-mint (או ה-pool) עד טרנזקציית היצירה
+2. שולף את הטרנזקציות של החלון הראשון ב-batches מקבילים של getTransaction
+3. מפענח קניות מההפרש בין pre / post token balances (וה-SOL / USDC ששולם)
+4. מחזיר רשימה של ארנקים שקנו מוקדם - עם מחיר וגודל אמיתיים
+5. שומר הכל לדיסק לכל mint - היסטוריה שכבר נשלפה לא נשלפת שוב
 
 🔧 פונקציות עיקריות:
-- detect_first_buyers(token_address) - מוצא את כל הקונים הראשונים
-- get_buy_timestamp(wallet, token) - מוצא מתי ארנק קנה
+- detect_first_buyers(token_address) - מוצא את הקונים הראשונים
+- decode_buys(tx, token_address) - קניות מטרנזקציה אחת (jsonParsed)
+- decode_swaps(tx, wallet_address) - קניות / מכירות של ארנק בטרנזקציה אחת
+- is_exhausted(token_address) - האם ההיסטוריה של הטוקן נשלפה ופוענחה עד הסוף
+  (משמש גם את analyzer/wallet_performance_analyzer.py)
 
 💡 איך זה עובד:
-1. שולח בקשה ל-Solscan API לקבלת טרנזקציות של הטוקן
-2. מסנן רק טרנזקציות קנייה (buy) מ-24 השעות הראשונות
-3. מחזיר רשימה של ארנקים שקנו מוקדם
+1. כל עמוד של getSignaturesForAddress מחזיר 1000 חתימות, מהחדשה לישנה
+2. נשמרות רק חתימות שעדיין יכולות להיות בחלון הראשון (≤ הישנה ביותר + hours)
+3. עמוד קצר מ-1000 = הגענו ליצירה → זמן היצירה = החתימה הישנה ביותר
+4. טרנזקציות מפוענחות מהמוקדמת למאוחרת עד שיש מספיק קונים (limit)
+5. קונה = signer שיתרת הטוקן שלו עלתה ושילם SOL / WSOL / USDC / USDT
 
 📝 הערות:
 - זה חלק מהמערכת של Smart Money Auto-Discovery
 - ארנקים שקנו מוקדם טוקנים מוצלחים = פוטנציאל ל-Smart Money
-- משתמש ב-Solscan API לנתוני טרנזקציות
+- טוקן עם הרבה היסטוריה: עד FIRST_BUYER_MAX_SIGNATURE_PAGES עמודים לכל קריאה,
+  הקריאה הבאה ממשיכה מאותה נקודה (cursor שמור בדיסק)
+- amount_usd / buy_price של קניות ב-SOL לפי מחיר ה-SOL הנוכחי (אין מחיר היסטורי)
+- FIRST_BUYER_CACHE_DIR ב-.env - תיקיית ה-cache (קובץ JSON לכל mint)
 """
 
 import asyncio
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-from dataclasses import dataclass
-import httpx
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from core.config import settings
+from executor.price_fetcher import PriceFetcher
+from utils.http_pool import create_http_client
 from utils.logger import get_logger
+from utils.solana_rpc import get_transactions, rpc_call
 
 logger = get_logger("first_buyer")
 
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+STABLE_MINTS = {
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",  # USDT
+}
+
+SIGNATURES_PAGE_SIZE = 1000  # getSignaturesForAddress max
+TX_BATCH_SIZE = 20  # getTransaction calls per JSON-RPC batch
+TX_CONCURRENCY = 4  # batches in flight
+
 
 @dataclass
 class FirstBuyer:
@@ -43,207 +69,469 @@ class FirstBuyer:
     wallet_address: str
     token_address: str
     buy_timestamp: datetime
-    buy_price: float
+    buy_price: float  # USD per token
     amount_usd: float
     hours_after_launch: float
+    amount_tokens: float = 0.0
+    quote_mint: str = WSOL_MINT  # מה שולם (SOL / USDC / USDT)
+    quote_amount: float = 0.0
+    signature: str = ""
+    slot: int = 0
+
+
+@dataclass
+class _MintHistory:
+    """מה שכבר נשלף לטוקן אחד (נשמר לדיסק)"""
+    token_address: str
+    source_address: str  # הכתובת שעליה עוברים (mint או pool)
+    window_hours: float
+    complete: bool = False  # הגענו לטרנזקציית היצירה
+    cursor: Optional[str] = None  # החתימה הישנה ביותר שנראתה
+    oldest_block_time: Optional[int] = None
+    candidates: Dict[str, int] = field(default_factory=dict)  # signature -> blockTime (חלון ראשון)
+    decoded: Dict[str, List[Dict]] = field(default_factory=dict)  # signature -> buys ([] = לא קנייה)
+
+
+def _token_deltas(meta: Dict) -> Dict[Tuple[str, str], float]:
+    """(owner, mint) -> שינוי ביתרה (ui amount) בטרנזקציה"""
+    deltas: Dict[Tuple[str, str], float] = {}
+    for side, sign in (("preTokenBalances", -1), ("postTokenBalances", 1)):
+        for balance in meta.get(side) or []:
+            owner = balance.get("owner")
+            mint = balance.get("mint")
+            amount = balance.get("uiTokenAmount") or {}
+            if not owner or not mint:
+                continue
+            raw = int(amount.get("amount") or 0)
+            decimals = int(amount.get("decimals") or 0)
+            key = (owner, mint)
+            deltas[key] = deltas.get(key, 0.0) + sign * raw / (10 ** decimals)
+    return deltas
+
+
+def _parse_tx(tx: Dict) -> Optional[Tuple[Dict, List[str], set, Dict[Tuple[str, str], float]]]:
+    """(meta, account addresses, signers, token deltas) - None לטרנזקציה שנכשלה"""
+    meta = tx.get("meta") or {}
+    if meta.get("err") is not None:
+        return None
+
+    message = (tx.get("transaction") or {}).get("message") or {}
+    keys = message.get("accountKeys") or []
+    addresses = [k.get("pubkey") if isinstance(k, dict) else k for k in keys]
+    signers = {k.get("pubkey") for k in keys if isinstance(k, dict) and k.get("signer")}
+    return meta, addresses, signers, _token_deltas(meta)
+
+
+def _quote_spent(
+    owner: str,
+    meta: Dict,
+    addresses: List[str],
+    deltas: Dict[Tuple[str, str], float],
+) -> Tuple[str, float]:
+    """
+    (quote mint, כמה יצא מהארנק) - שלילי = נכנס לארנק
+
+    Stablecoin אם היתרה שלו השתנתה, אחרת SOL native (בלי העמלה של ה-fee payer) + WSOL
+    """
+    stable_mint, stable_delta = max(
+        ((m, deltas.get((owner, m), 0.0)) for m in STABLE_MINTS), key=lambda item: abs(item[1])
+    )
+    if stable_delta:
+        return stable_mint, -stable_delta
+
+    sol_spent = 0.0
+    if owner in addresses:
+        index = addresses.index(owner)
+        pre_lamports = meta.get("preBalances") or []
+        post_lamports = meta.get("postBalances") or []
+        if index < len(pre_lamports) and index < len(post_lamports):
+            lamports = pre_lamports[index] - post_lamports[index]
+            if index == 0:
+                lamports -= int(meta.get("fee") or 0)  # Fee payer
+            sol_spent = lamports / 1e9
+    sol_spent -= deltas.get((owner, WSOL_MINT), 0.0)
+    return WSOL_MINT, sol_spent
+
+
+def decode_buys(tx: Dict, token_address: str) -> List[Dict]:
+    """
+    Buys of token_address in one getTransaction result (encoding=jsonParsed)
+
+    Args:
+        tx: Transaction result
+        token_address: The token mint
+
+    Returns:
+        List of {"wallet", "slot", "amount_tokens", "quote_mint", "quote_amount", "price_quote"}
+    """
+    parsed = _parse_tx(tx)
+    if parsed is None:
+        return []
+    meta, addresses, signers, deltas = parsed
+
+    buys = []
+    for (owner, mint), received in deltas.items():
+        if mint != token_address or received <= 0 or owner not in signers:
+            continue
+
+        quote_mint, quote_amount = _quote_spent(owner, meta, addresses, deltas)
+        if quote_amount <= 0:
+            continue  # Transfer / airdrop, not a buy
+
+        buys.append({
+            "wallet": owner,
+            "slot": tx.get("slot") or 0,
+            "amount_tokens": received,
+            "quote_mint": quote_mint,
+            "quote_amount": quote_amount,
+            "price_quote": quote_amount / received,
+        })
+
+    return buys
+
+
+def decode_swaps(tx: Dict, wallet_address: str) -> List[Dict]:
+    """
+    Swaps made by wallet_address in one getTransaction result (encoding=jsonParsed)
+
+    swap = הארנק חתם, יתרה של טוקן אחד (לא SOL / stablecoin) השתנתה,
+    ו-SOL / stablecoin זז בכיוון ההפוך. טוקן-לטוקן (בלי quote) לא נספר.
+
+    Args:
+        tx: Transaction result
+        wallet_address: The wallet
+
+    Returns:
+        List of {"token", "side" ("buy" / "sell"), "amount_tokens", "quote_mint", "quote_amount", "slot", "block_time"}
+    """
+    parsed = _parse_tx(tx)
+    if parsed is None or wallet_address not in parsed[2]:
+        return []
+    meta, addresses, _, deltas = parsed
+
+    changed = [
+        (mint, delta) for (owner, mint), delta in deltas.items()
+        if owner == wallet_address and delta and mint != WSOL_MINT and mint not in STABLE_MINTS
+    ]
+    if len(changed) != 1:
+        return []
+    token, delta = changed[0]
+
+    quote_mint, quote_spent = _quote_spent(wallet_address, meta, addresses, deltas)
+    if delta > 0 and quote_spent > 0:
+        side = "buy"
+    elif delta < 0 and quote_spent < 0:
+        side = "sell"
+    else:
+        return []  # Transfer / airdrop
+
+    return [{
+        "token": token,
+        "side": side,
+        "amount_tokens": abs(delta),
+        "quote_mint": quote_mint,
+        "quote_amount": abs(quote_spent),
+        "slot": tx.get("slot") or 0,
+        "block_time": tx.get("blockTime") or 0,
+    }]
 
 
 class FirstBuyerDetector:
     """
     Detect wallets that bought tokens early
-    
+
     This identifies potential smart money by finding who bought first
     """
-    
-    def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-    
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        max_signature_pages: Optional[int] = None,
+        max_transactions: Optional[int] = None,
+    ):
+        """
+        Initialize first buyer detector
+
+        Args:
+            rpc_url: Solana RPC URL (ברירת מחדל: SOLANA_RPC_URL)
+            cache_dir: תיקיית ה-cache לכל mint
+            max_signature_pages: עמודי חתימות מקסימום לכל קריאה
+            max_transactions: טרנזקציות לפענוח מקסימום לכל קריאה
+        """
+        self.http_client = create_http_client("scanner", timeout=30.0)
+        self.rpc_url = rpc_url or settings.solana_rpc_url
+        self.cache_dir = Path(cache_dir or settings.first_buyer_cache_dir)
+        self.max_signature_pages = max_signature_pages or settings.first_buyer_max_signature_pages
+        self.max_transactions = max_transactions or settings.first_buyer_max_transactions
+        self.price_fetcher: Optional[PriceFetcher] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Stats
+        self.signature_pages = 0
+        self.transactions_fetched = 0
+
     async def detect_first_buyers(
         self,
         token_address: str,
         hours: int = 24,
-        limit: int = 50
+        limit: int = 50,
+        pool_address: Optional[str] = None,
     ) -> List[FirstBuyer]:
         """
         Detect wallets that bought token in first N hours
-        
+
         Args:
             token_address: Token address
             hours: Time window (default: 24 hours)
             limit: Maximum number of buyers to return
-        
+            pool_address: עבור על ה-pool במקום על ה-mint (אופציונלי)
+
         Returns:
-            List of FirstBuyer objects
+            List of FirstBuyer objects (earliest first)
         """
         logger.info(f"🔍 Detecting first buyers for {token_address[:20]}... (first {hours}h)")
-        
+
+        lock = self._locks.setdefault(token_address, asyncio.Lock())
         try:
-            # Get token creation time
-            token_created = await self._get_token_creation_time(token_address)
-            if not token_created:
-                logger.warning(f"⚠️ Could not determine token creation time")
-                return []
-            
-            cutoff_time = token_created + timedelta(hours=hours)
-            
-            # Get early transactions
-            early_transactions = await self._get_early_transactions(
-                token_address,
-                token_created,
-                cutoff_time
-            )
-            
-            # Extract first buyers
-            first_buyers = self._extract_first_buyers(early_transactions, token_created)
-            
-            # Sort by timestamp (earliest first)
-            first_buyers.sort(key=lambda b: b.buy_timestamp)
-            
+            async with lock:
+                history = self._load(token_address, pool_address or token_address, hours)
+
+                if not history.complete:
+                    await self._page_signatures(history)
+                    self._save(history)
+                    if not history.complete:
+                        logger.warning(
+                            f"⚠️ Creation of {token_address[:20]}... not reached yet "
+                            f"({self.max_signature_pages} pages) - will resume on the next call"
+                        )
+                        return []
+
+                await self._decode_window(history, limit)
+                self._save(history)
+
+            first_buyers = await self._build_buyers(history, hours, limit)
             logger.info(f"✅ Found {len(first_buyers)} first buyers")
-            
-            return first_buyers[:limit]
-            
+            return first_buyers
+
         except Exception as e:
             logger.error(f"❌ Error detecting first buyers: {e}", exc_info=True)
             return []
-    
-    async def _get_token_creation_time(self, token_address: str) -> Optional[datetime]:
-        """Get token creation timestamp"""
-        try:
-            # Use Solscan API
-            url = f"https://api.solscan.io/token/meta"
-            params = {"token": token_address}
-            
-            response = await self.http_client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                token_data = data.get("data", {})
-                
-                # Try to get creation time
-                # Solscan might have this in metadata
-                # If not available, use first transaction time
-                return await self._get_first_transaction_time(token_address)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting token creation time: {e}")
-            return None
-    
-    async def _get_first_transaction_time(self, token_address: str) -> Optional[datetime]:
-        """Get time of first transaction for token"""
+
+    # ========================================================================
+    # Signatures
+    # ========================================================================
+
+    async def _page_signatures(self, history: _MintHistory):
+        """
+        עבור אחורה על החתימות עד היצירה (או עד max_signature_pages עמודים)
+
+        שומר רק חתימות שעדיין יכולות להיות בחלון הראשון: כל חתימה מאוחרת מ-
+        (הישנה ביותר שנראתה + window) בוודאות מחוץ לחלון.
+        """
+        window_seconds = history.window_hours * 3600
+
+        for _ in range(self.max_signature_pages):
+            options: Dict = {"limit": SIGNATURES_PAGE_SIZE}
+            if history.cursor:
+                options["before"] = history.cursor
+
+            page = await rpc_call(
+                self.http_client, self.rpc_url, "getSignaturesForAddress", [history.source_address, options]
+            )
+            if page is None:
+                return  # Failed - progress so far is kept
+            self.signature_pages += 1
+
+            for item in page:
+                block_time = item.get("blockTime")
+                if block_time is None:
+                    continue
+                if history.oldest_block_time is None or block_time < history.oldest_block_time:
+                    history.oldest_block_time = block_time
+                if item.get("err") is None:
+                    history.candidates[item["signature"]] = block_time
+
+            if page:
+                history.cursor = page[-1]["signature"]
+            if history.oldest_block_time is not None:
+                window_end = history.oldest_block_time + window_seconds
+                history.candidates = {
+                    sig: bt for sig, bt in history.candidates.items() if bt <= window_end
+                }
+
+            if len(page) < SIGNATURES_PAGE_SIZE:
+                history.complete = True
+                logger.info(
+                    f"📜 Reached creation of {history.token_address[:20]}... - "
+                    f"{len(history.candidates)} transactions in the first {history.window_hours:g}h"
+                )
+                return
+
+    # ========================================================================
+    # Transactions
+    # ========================================================================
+
+    async def _decode_window(self, history: _MintHistory, limit: int):
+        """פענח טרנזקציות מהמוקדמת למאוחרת עד שיש limit קונים (או max_transactions)"""
+        wallets = {
+            buy["wallet"] for buys in history.decoded.values() for buy in buys
+        }
+        pending = [
+            sig for sig, _ in sorted(history.candidates.items(), key=lambda item: item[1])
+            if sig not in history.decoded
+        ][:self.max_transactions]
+
+        step = TX_BATCH_SIZE * TX_CONCURRENCY
+        for i in range(0, len(pending), step):
+            if len(wallets) >= limit:
+                break
+
+            chunk = pending[i:i + step]
+            batches = [chunk[j:j + TX_BATCH_SIZE] for j in range(0, len(chunk), TX_BATCH_SIZE)]
+            results = await asyncio.gather(*(self._get_transactions(b) for b in batches))
+
+            for batch_result in results:
+                for sig, tx in batch_result.items():
+                    buys = decode_buys(tx, history.token_address) if tx else []
+                    history.decoded[sig] = buys
+                    wallets.update(buy["wallet"] for buy in buys)
+
+    async def _get_transactions(self, signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """getTransaction לכמה חתימות ב-batch אחד (ראה utils/solana_rpc.py)"""
+        transactions = await get_transactions(self.http_client, self.rpc_url, signatures)
+        self.transactions_fetched += len(transactions)
+        return transactions
+
+    # ========================================================================
+    # Results
+    # ========================================================================
+
+    async def _build_buyers(self, history: _MintHistory, hours: float, limit: int) -> List[FirstBuyer]:
+        """קנייה ראשונה של כל ארנק, מהמוקדמת למאוחרת"""
+        created = history.oldest_block_time or 0
+        window_end = created + hours * 3600
+
+        ordered = sorted(
+            (bt, sig) for sig, bt in history.candidates.items()
+            if bt <= window_end and history.decoded.get(sig)
+        )
+
+        sol_usd: Optional[float] = None
+        first_buyers: List[FirstBuyer] = []
+        seen_wallets = set()
+
+        for block_time, sig in ordered:
+            for buy in history.decoded[sig]:
+                if buy["wallet"] in seen_wallets:
+                    continue
+
+                if buy["quote_mint"] == WSOL_MINT:
+                    if sol_usd is None:
+                        sol_usd = await self._get_sol_price() or 0.0
+                    quote_usd = sol_usd
+                else:
+                    quote_usd = 1.0  # Stablecoin
+
+                first_buyers.append(FirstBuyer(
+                    wallet_address=buy["wallet"],
+                    token_address=history.token_address,
+                    buy_timestamp=datetime.fromtimestamp(block_time, tz=timezone.utc),
+                    buy_price=buy["price_quote"] * quote_usd,
+                    amount_usd=buy["quote_amount"] * quote_usd,
+                    hours_after_launch=(block_time - created) / 3600,
+                    amount_tokens=buy["amount_tokens"],
+                    quote_mint=buy["quote_mint"],
+                    quote_amount=buy["quote_amount"],
+                    signature=sig,
+                    slot=buy.get("slot", 0),
+                ))
+                seen_wallets.add(buy["wallet"])
+                if len(first_buyers) >= limit:
+                    return first_buyers
+
+        return first_buyers
+
+    async def _get_sol_price(self) -> Optional[float]:
+        """מחיר SOL נוכחי בדולרים"""
+        if self.price_fetcher is None:
+            self.price_fetcher = PriceFetcher()
+        return await self.price_fetcher.get_token_price(WSOL_MINT)
+
+    # ========================================================================
+    # Disk cache
+    # ========================================================================
+
+    def _cache_path(self, token_address: str) -> Path:
+        return self.cache_dir / f"{token_address}.json"
+
+    def _load(self, token_address: str, source_address: str, hours: float) -> _MintHistory:
+        """טען את ההיסטוריה מהדיסק (חדשה אם אין / אם החלון השמור קטן מדי)"""
+        path = self._cache_path(token_address)
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    history = _MintHistory(**json.load(f))
+                if history.source_address == source_address and history.window_hours >= hours:
+                    return history
+                logger.info(f"📝 Cached history of {token_address[:20]}... does not cover this request, refetching")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load first buyer cache for {token_address[:20]}...: {e}")
+
+        return _MintHistory(token_address=token_address, source_address=source_address, window_hours=hours)
+
+    def is_exhausted(self, token_address: str) -> bool:
+        """
+        האם אין עוד מה לשלוף לטוקן: הגענו ליצירה וכל טרנזקציות החלון הראשון פוענחו
+
+        detect_first_buyers מחזיר [] גם כשהיצירה עוד לא הושגה וגם כשפשוט אין קונים -
+        כאן אפשר להבדיל (False = כדאי לנסות שוב)
+        """
+        history = self._read_cache(token_address)
+        if history is None:
+            return False
+        return history.complete and all(sig in history.decoded for sig in history.candidates)
+
+    def paging_cursor(self, token_address: str) -> Optional[str]:
+        """
+        החתימה הישנה ביותר שנשלפה לטוקן (None אם עוד לא נשלף כלום)
+
+        אם היא זזה בין שתי קריאות ל-detect_first_buyers - הדפדוף מתקדם לכיוון היצירה
+        """
+        history = self._read_cache(token_address)
+        return history.cursor if history else None
+
+    def _read_cache(self, token_address: str) -> Optional[_MintHistory]:
         try:
-            # Get token transactions
-            url = f"https://api.solscan.io/token/transactions"
-            params = {
-                "token": token_address,
-                "limit": 1,
-                "offset": 0
-            }
-            
-            response = await self.http_client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                transactions = data.get("data", [])
-                
-                if transactions:
-                    first_tx = transactions[-1]  # Oldest first
-                    block_time = first_tx.get("blockTime", 0)
-                    return datetime.fromtimestamp(block_time)
-            
+            with open(self._cache_path(token_address), 'r') as f:
+                return _MintHistory(**json.load(f))
+        except Exception:
             return None
-            
-        except Exception as e:
-            logger.error(f"Error getting first transaction time: {e}")
-            return None
-    
-    async def _get_early_transactions(
-        self,
-        token_address: str,
-        start_time: datetime,
-        end_time: datetime
-    ) -> List[Dict]:
-        """Get transactions in time window"""
+
+    def _save(self, history: _MintHistory):
+        """שמור לדיסק (כתיבה לקובץ זמני ואז rename)"""
         try:
-            # Get token transactions
-            url = f"https://api.solscan.io/token/transactions"
-            params = {
-                "token": token_address,
-                "limit": 100  # Get more to filter by time
-            }
-            
-            response = await self.http_client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                all_transactions = data.get("data", [])
-                
-                # Filter by time window
-                early_transactions = []
-                for tx in all_transactions:
-                    block_time = tx.get("blockTime", 0)
-                    tx_time = datetime.fromtimestamp(block_time)
-                    
-                    if start_time <= tx_time <= end_time:
-                        early_transactions.append(tx)
-                
-                return early_transactions
-            
-            return []
-            
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(history.token_address)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(asdict(history), f)
+            os.replace(tmp_path, path)
         except Exception as e:
-            logger.error(f"Error getting early transactions: {e}")
-            return []
-    
-    def _extract_first_buyers(
-        self,
-        transactions: List[Dict],
-        token_created: datetime
-    ) -> List[FirstBuyer]:
-        """Extract first buyer information from transactions"""
-        first_buyers = []
-        seen_wallets = set()
-        
-        for tx in transactions:
-            try:
-                # Extract buyer address (simplified - real implementation needs proper parsing)
-                buyer_address = tx.get("signer", "") or tx.get("from", "")
-                
-                if not buyer_address or buyer_address in seen_wallets:
-                    continue
-                
-                # Extract buy info
-                block_time = tx.get("blockTime", 0)
-                buy_timestamp = datetime.fromtimestamp(block_time)
-                
-                # Calculate hours after launch
-                hours_after = (buy_timestamp - token_created).total_seconds() / 3600
-                
-                # Extract price and amount (simplified)
-                # Real implementation would parse transaction data properly
-                buy_price = 0.0  # Would need to parse from transaction
-                amount_usd = 0.0  # Would need to parse from transaction
-                
-                buyer = FirstBuyer(
-                    wallet_address=buyer_address,
-                    token_address="",  # Will be set by caller
-                    buy_timestamp=buy_timestamp,
-                    buy_price=buy_price,
-                    amount_usd=amount_usd,
-                    hours_after_launch=hours_after
-                )
-                
-                first_buyers.append(buyer)
-                seen_wallets.add(buyer_address)
-                
-            except Exception as e:
-                logger.debug(f"Failed to extract buyer from transaction: {e}")
-                continue
-        
-        return first_buyers
-    
+            logger.warning(f"⚠️ Failed to save first buyer cache: {e}")
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "signature_pages": self.signature_pages,
+            "transactions_fetched": self.transactions_fetched,
+        }
+
     async def close(self):
         """Cleanup resources"""
         await self.http_client.aclose()
+        if self.price_fetcher:
+            await self.price_fetcher.close()
 
 
 # Convenience function
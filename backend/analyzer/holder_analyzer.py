@@ -9,6 +9,8 @@ Features:
 3. ✅ Whale vs Liquidity vs Burn distinction
 4. ✅ Advanced Scoring with multiple factors
 5. ✅ Detailed logging for debugging
+6. ✅ analyze_many() - whole scan in a few round trips (JSON-RPC batch arrays)
+7. ✅ Persistent owner cache (analyzer/address_cache.py) - known accounts skip the RPC
 
 Created by: Claude + Gemini collaboration
 Date: January 2026
@@ -16,14 +18,19 @@ Date: January 2026
 
 import asyncio
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
-import httpx
 
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from analyzer.address_cache import get_address_cache
 
 logger = get_logger("holder_analyzer")
 
+# RPC batching limits
+RPC_BATCH_SIZE = 50           # Calls per JSON-RPC batch array
+MAX_ACCOUNTS_PER_CALL = 100   # getMultipleAccounts limit
+
 # ============================================================================
 # תוכניות נזילות מוכרות (LP Programs)
 # אם ה-Owner של Account הוא אחד מאלה → זה LP Pool ולא Whale
@@ -102,8 +109,9 @@ class HolderAnalyzer:
     """
     
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=20.0)
+        self.http_client = create_http_client("scanner", timeout=20.0)
         self.rpc_url = os.getenv("HELIUS_RPC_URL") or os.getenv("RPC_ENDPOINT")
+        self.owner_cache = get_address_cache()
         
         if not self.rpc_url:
             logger.warning("⚠️ No Helius RPC set. Using public node (expect rate limits).")
@@ -123,126 +131,258 @@ class HolderAnalyzer:
             HolderAnalysis object with complete breakdown
         """
         logger.info(f"🧠 ULTIMATE Analyzing holders for {token_address[:20]}...")
-        analysis = HolderAnalysis()
         
         try:
             # Step 1: Get total supply
             supply_data = await self._get_token_supply(token_address)
             if not supply_data:
                 logger.warning("❌ Could not fetch token supply")
-                return analysis
-            
-            total_supply_raw = float(supply_data['amount'])
-            if total_supply_raw == 0:
-                logger.warning("❌ Token has zero supply")
-                return analysis
+                return HolderAnalysis()
 
             # Step 2: Get top holders (addresses + amounts)
             top_accounts = await self._get_largest_accounts(token_address, limit)
             if not top_accounts:
                 logger.warning("❌ Could not fetch largest accounts")
-                return analysis
+                return HolderAnalysis()
 
             # Step 3: BATCH CHECK - Identify LP Pools via Account Owners
             # This is Gemini's optimization - very efficient!
             account_addresses = [acc['address'] for acc in top_accounts]
-            accounts_owners = await self._fetch_accounts_owners_batch(account_addresses)
+            accounts_owners = await self._resolve_owners(account_addresses)
 
-            # Step 4: Categorize each holder
-            lp_holders = []
-            burn_holders = []
-            whale_holders = []
-            
-            for acc in top_accounts:
-                address = acc['address']
-                amount_raw = float(acc['amount'])
-                percentage = (amount_raw / total_supply_raw) * 100
-                
-                # Default values
-                holder_type = "WHALE"
-                is_lp = False
-                is_exempt = address in KNOWN_EXEMPT_ADDRESSES
-                label = KNOWN_EXEMPT_ADDRESSES.get(address, f"Whale {address[:8]}...")
-                
-                # Check if it's a known exempt address (Burn/System)
-                if is_exempt:
-                    if "Burn" in label or "Incinerator" in label:
-                        holder_type = "BURN"
-                    else:
-                        holder_type = "EXEMPT"
-                
-                # Check if it's an LP Pool (by owner)
-                elif address in accounts_owners:
-                    owner = accounts_owners[address]
-                    if owner in KNOWN_LIQUIDITY_PROGRAMS:
-                        holder_type = "LP"
-                        is_lp = True
-                        label = f"LP: {KNOWN_LIQUIDITY_PROGRAMS[owner]}"
-                
-                # Build holder info
-                holder_info = {
-                    "address": address,
-                    "amount": amount_raw,
-                    "percentage": percentage,
-                    "type": holder_type,
-                    "is_lp": is_lp,
-                    "is_exempt": is_exempt,
-                    "label": label
-                }
-                
-                # Categorize
-                if holder_type == "LP":
-                    lp_holders.append(holder_info)
-                    analysis.total_lp_percentage += percentage
-                elif holder_type == "BURN":
-                    burn_holders.append(holder_info)
-                    analysis.total_burn_percentage += percentage
-                else:  # WHALE or EXEMPT (non-burn)
-                    if holder_type == "WHALE":
-                        whale_holders.append(holder_info)
-            
-            # Step 5: Save categorized data
-            analysis.lp_holders = lp_holders
-            analysis.burn_holders = burn_holders
-            analysis.whale_holders = whale_holders
-            analysis.top_holders = lp_holders + burn_holders + whale_holders
+            analysis = self._build_analysis(supply_data, top_accounts, accounts_owners)
+            self._log_analysis(analysis)
+            return analysis
             
-            # Step 6: Estimate total holder count
-            analysis.holder_count = self._estimate_holder_count(len(top_accounts))
-            
-            # Step 7: Calculate whale metrics (only real whales)
-            if whale_holders:
-                analysis.largest_holder_pct = whale_holders[0]['percentage']
-                analysis.top_10_percentage = sum(h['percentage'] for h in whale_holders[:10])
+        except Exception as e:
+            logger.error(f"❌ Error in holder analysis: {e}", exc_info=True)
+        
+        return HolderAnalysis()
+
+    async def analyze_many(self, token_addresses: List[str], limit: int = 20) -> Dict[str, HolderAnalysis]:
+        """
+        Holder analysis for many tokens in a few round trips
+        
+        1. getTokenSupply + getTokenLargestAccounts for all mints - JSON-RPC batch arrays
+        2. Owners of all top accounts (deduplicated across tokens) - getMultipleAccounts, 100 per call
+        
+        Mints whose batch request failed (or came back with a JSON-RPC error)
+        fall back to the single-token analyze().
+        
+        Args:
+            token_addresses: Token mint addresses
+            limit: Number of top holders to analyze per token (max 20)
+        
+        Returns:
+            Dict mint -> HolderAnalysis
+        """
+        mints = list(dict.fromkeys(a for a in token_addresses if a))
+        if not mints:
+            return {}
+        
+        logger.info(f"🧠 Analyzing holders for {len(mints)} tokens (batch)...")
+        
+        # Step 1: supply + largest accounts for every mint
+        calls = []
+        for mint in mints:
+            calls.append(("getTokenSupply", [mint]))
+            calls.append(("getTokenLargestAccounts", [mint]))
+        responses = await self._rpc_batch(calls)
+        
+        supplies: Dict[str, Dict] = {}
+        largest: Dict[str, List[Dict]] = {}
+        retry: List[str] = []
+        for i, mint in enumerate(mints):
+            supply_resp, largest_resp = responses[2 * i], responses[2 * i + 1]
+            if any(resp is None or "error" in resp for resp in (supply_resp, largest_resp)):
+                retry.append(mint)  # Transport / batch / per-call RPC error - try the single path
+                continue
+            supplies[mint] = (supply_resp.get("result") or {}).get("value")
+            largest[mint] = ((largest_resp.get("result") or {}).get("value") or [])[:limit]
+        
+        # Step 2: owners of all top accounts, deduplicated across tokens
+        all_accounts = list(dict.fromkeys(
+            acc['address'] for accounts in largest.values() for acc in accounts
+        ))
+        owners = await self._resolve_owners(all_accounts)
+        
+        # Step 3: build per-token analysis
+        results: Dict[str, HolderAnalysis] = {}
+        for mint in supplies:
+            try:
+                if not supplies[mint] or not largest[mint]:
+                    results[mint] = HolderAnalysis()
+                    continue
+                results[mint] = self._build_analysis(supplies[mint], largest[mint], owners)
+            except Exception as e:
+                logger.error(f"❌ Error in holder analysis for {mint[:20]}: {e}")
+                results[mint] = HolderAnalysis()
+        
+        if retry:
+            logger.warning(f"⚠️ Batch holder lookup failed for {len(retry)} tokens - analyzing one by one")
+            fallback = await asyncio.gather(*(self.analyze(mint, limit) for mint in retry))
+            results.update(zip(retry, fallback))
+        
+        logger.info(
+            f"📊 Holder analysis complete for {len(results)} tokens "
+            f"({len(all_accounts)} holder accounts checked)"
+        )
+        return results
+
+    def _build_analysis(
+        self,
+        supply_data: Dict,
+        top_accounts: List[Dict],
+        accounts_owners: Dict[str, str],
+    ) -> HolderAnalysis:
+        """
+        Categorize holders and score them (no RPC calls)
+        
+        Args:
+            supply_data: getTokenSupply value
+            top_accounts: getTokenLargestAccounts value (already limited)
+            accounts_owners: Dict account address -> owner program
+        
+        Returns:
+            HolderAnalysis object
+        """
+        analysis = HolderAnalysis()
+        
+        total_supply_raw = float(supply_data['amount'])
+        if total_supply_raw == 0:
+            logger.warning("❌ Token has zero supply")
+            return analysis
+
+        # Step 4: Categorize each holder
+        lp_holders = []
+        burn_holders = []
+        whale_holders = []
+        
+        for acc in top_accounts:
+            address = acc['address']
+            amount_raw = float(acc['amount'])
+            percentage = (amount_raw / total_supply_raw) * 100
             
-            # Step 8: Calculate final score
-            analysis.holder_score = self._calculate_smart_score(analysis)
+            # Default values
+            holder_type = "WHALE"
+            is_lp = False
+            is_exempt = address in KNOWN_EXEMPT_ADDRESSES
+            label = KNOWN_EXEMPT_ADDRESSES.get(address, f"Whale {address[:8]}...")
             
-            # Step 9: Determine if concentrated (dangerous)
-            analysis.is_concentrated = analysis.holder_score < 10
+            # Check if it's a known exempt address (Burn/System)
+            if is_exempt:
+                if "Burn" in label or "Incinerator" in label:
+                    holder_type = "BURN"
+                else:
+                    holder_type = "EXEMPT"
             
-            # Step 10: Detailed logging
-            logger.info(
-                f"📊 Analysis Complete:\n"
-                f"   💧 LP Pools: {len(lp_holders)} holders = {analysis.total_lp_percentage:.1f}%\n"
-                f"   🔥 Burned: {len(burn_holders)} addresses = {analysis.total_burn_percentage:.1f}%\n"
-                f"   🐋 Real Whales: {len(whale_holders)} holders\n"
-                f"   📈 Top 10 Whales: {analysis.top_10_percentage:.1f}%\n"
-                f"   ⚠️  Largest Whale: {analysis.largest_holder_pct:.1f}%\n"
-                f"   🎯 Score: {analysis.holder_score}/20"
-            )
+            # Check if it's an LP Pool (by owner)
+            elif address in accounts_owners:
+                owner = accounts_owners[address]
+                if owner in KNOWN_LIQUIDITY_PROGRAMS:
+                    holder_type = "LP"
+                    is_lp = True
+                    label = f"LP: {KNOWN_LIQUIDITY_PROGRAMS[owner]}"
             
-            # Warning if dangerous
-            if analysis.largest_holder_pct > 30:
-                logger.warning(
-                    f"🚨 DANGER: Single whale holds {analysis.largest_holder_pct:.1f}%!"
-                )
+            # Build holder info
+            holder_info = {
+                "address": address,
+                "amount": amount_raw,
+                "percentage": percentage,
+                "type": holder_type,
+                "is_lp": is_lp,
+                "is_exempt": is_exempt,
+                "label": label
+            }
             
-        except Exception as e:
-            logger.error(f"❌ Error in holder analysis: {e}", exc_info=True)
+            # Categorize
+            if holder_type == "LP":
+                lp_holders.append(holder_info)
+                analysis.total_lp_percentage += percentage
+            elif holder_type == "BURN":
+                burn_holders.append(holder_info)
+                analysis.total_burn_percentage += percentage
+            else:  # WHALE or EXEMPT (non-burn)
+                if holder_type == "WHALE":
+                    whale_holders.append(holder_info)
+        
+        # Step 5: Save categorized data
+        analysis.lp_holders = lp_holders
+        analysis.burn_holders = burn_holders
+        analysis.whale_holders = whale_holders
+        analysis.top_holders = lp_holders + burn_holders + whale_holders
+        
+        # Step 6: Estimate total holder count
+        analysis.holder_count = self._estimate_holder_count(len(top_accounts))
+        
+        # Step 7: Calculate whale metrics (only real whales)
+        if whale_holders:
+            analysis.largest_holder_pct = whale_holders[0]['percentage']
+            analysis.top_10_percentage = sum(h['percentage'] for h in whale_holders[:10])
+        
+        # Step 8: Calculate final score
+        analysis.holder_score = self._calculate_smart_score(analysis)
+        
+        # Step 9: Determine if concentrated (dangerous)
+        analysis.is_concentrated = analysis.holder_score < 10
         
         return analysis
 
+    def _log_analysis(self, analysis: HolderAnalysis):
+        """Step 10: Detailed logging"""
+        logger.info(
+            f"📊 Analysis Complete:\n"
+            f"   💧 LP Pools: {len(analysis.lp_holders)} holders = {analysis.total_lp_percentage:.1f}%\n"
+            f"   🔥 Burned: {len(analysis.burn_holders)} addresses = {analysis.total_burn_percentage:.1f}%\n"
+            f"   🐋 Real Whales: {len(analysis.whale_holders)} holders\n"
+            f"   📈 Top 10 Whales: {analysis.top_10_percentage:.1f}%\n"
+            f"   ⚠️  Largest Whale: {analysis.largest_holder_pct:.1f}%\n"
+            f"   🎯 Score: {analysis.holder_score}/20"
+        )
+        
+        # Warning if dangerous
+        if analysis.largest_holder_pct > 30:
+            logger.warning(
+                f"🚨 DANGER: Single whale holds {analysis.largest_holder_pct:.1f}%!"
+            )
+
+    async def _rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Optional[Dict]]:
+        """
+        Send many JSON-RPC calls as batch arrays
+        
+        Args:
+            calls: List of (method, params)
+        
+        Returns:
+            Response object per call, in order (None if its batch failed)
+        """
+        chunks = [
+            list(range(i, min(i + RPC_BATCH_SIZE, len(calls))))
+            for i in range(0, len(calls), RPC_BATCH_SIZE)
+        ]
+        
+        async def _send(indexes: List[int]) -> Dict[int, Dict]:
+            payload = [
+                {"jsonrpc": "2.0", "id": idx, "method": calls[idx][0], "params": calls[idx][1]}
+                for idx in indexes
+            ]
+            try:
+                resp = await self.http_client.post(self.rpc_url, json=payload)
+                data = resp.json() if resp.status_code == 200 else None
+                if isinstance(data, list):
+                    # Batch responses may come back in any order - match by id
+                    return {item.get("id"): item for item in data if isinstance(item, dict)}
+                logger.warning(f"⚠️ RPC batch of {len(indexes)} calls failed ({resp.status_code})")
+            except Exception as e:
+                logger.error(f"Error in RPC batch: {e}")
+            return {}
+        
+        by_id: Dict[int, Dict] = {}
+        for chunk_result in await asyncio.gather(*(_send(c) for c in chunks)):
+            by_id.update(chunk_result)
+        
+        return [by_id.get(idx) for idx in range(len(calls))]
+
     async def _get_token_supply(self, token_address: str) -> Optional[Dict]:
         """Get total token supply"""
         payload = {
@@ -322,6 +462,45 @@ class HolderAnalyzer:
         
         return owners
 
+    async def _resolve_owners(self, addresses: List[str]) -> Dict[str, str]:
+        """
+        Owners via the persistent address cache - RPC only for unknown accounts
+        
+        Known exempt addresses (burn / system) are classified by address alone,
+        so their owner is never looked up.
+        
+        Args:
+            addresses: List of account addresses
+        
+        Returns:
+            Dict mapping address -> owner program ID
+        """
+        owners = await self.owner_cache.resolve(
+            [a for a in addresses if a not in KNOWN_EXEMPT_ADDRESSES],
+            self._fetch_accounts_owners_many,
+            self._classify_owner,
+        )
+        await self.owner_cache.flush()
+        return owners
+
+    @staticmethod
+    def _classify_owner(address: str, owner: str) -> Tuple[str, str]:
+        """(kind, label) for an account by its owner program"""
+        if owner in KNOWN_LIQUIDITY_PROGRAMS:
+            return "lp", f"LP: {KNOWN_LIQUIDITY_PROGRAMS[owner]}"
+        return "other", ""
+
+    async def _fetch_accounts_owners_many(self, addresses: List[str]) -> Dict[str, str]:
+        """Owners for any number of accounts - getMultipleAccounts chunks (100 each) in parallel"""
+        chunks = [
+            addresses[i:i + MAX_ACCOUNTS_PER_CALL]
+            for i in range(0, len(addresses), MAX_ACCOUNTS_PER_CALL)
+        ]
+        owners: Dict[str, str] = {}
+        for chunk_owners in await asyncio.gather(*(self._fetch_accounts_owners_batch(c) for c in chunks)):
+            owners.update(chunk_owners)
+        return owners
+
     def _estimate_holder_count(self, top_count: int) -> int:
         """
         Estimate total number of holders
@@ -401,6 +580,7 @@ class HolderAnalyzer:
     
     async def close(self):
         """Cleanup resources"""
+        await self.owner_cache.flush(force=True)
         await self.http_client.aclose()
 
 
@@ -0,0 +1,231 @@
+"""
+DexScreener Pair Cache
+Short-lived shared cache for DexScreener pair data (TTL + LRU + single-flight)
+
+📋 מה הקובץ הזה עושה:
+-------------------
+באותו סבב סריקה אותו טוקן נשלף מ-DexScreener כמה פעמים:
+TokenMetricsFetcher, ContractChecker (בדיקת נזילות), RugPullDetector (3 בדיקות!)
+ו-PriceFetcher. הקובץ הזה שומר את התשובה לזמן קצר ומשתף אותה בין כולם.
+
+הקובץ הזה:
+1. שומר pairs לכל mint ל-TTL קצר (ברירת מחדל 15 שניות)
+2. מוחק את הישנים ביותר כשהמטמון מלא (LRU)
+3. מאחד בקשות במקביל לאותו mint לבקשה אחת (single-flight)
+4. שולף mints חסרים ב-batch (עד 30 ב-call)
+5. סופר hits / misses / coalesced כדי לראות כמה חסכנו
+
+🔧 פונקציות עיקריות:
+- get_pair_cache() - המטמון הגלובלי
+- get_pairs(mint) - pairs של טוקן אחד
+- get_pairs_many(mints) - pairs להרבה טוקנים (batch)
+- invalidate(mint) - מחיקה ידנית
+- get_stats() - מונים
+
+📝 הערות:
+- רק pairs שה-mint הוא ה-base token שלהם (priceUsd הוא מחיר ה-base)
+- כשל ברשת לא נשמר במטמון - הקריאה הבאה תנסה שוב
+- כשל מוחזר כ-None (לא [] - רשימה ריקה אומרת "אין pairs" באמת)
+- TTL נקבע ב-PAIR_CACHE_TTL_SECONDS ב-.env
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from utils.http_pool import create_http_client
+from utils.logger import get_logger
+
+logger = get_logger("pair_cache")
+
+# DexScreener multi-token endpoint - comma separated addresses, up to 30 per call
+DEXSCREENER_TOKENS_API = "https://api.dexscreener.com/tokens/v1/solana"
+DEXSCREENER_BATCH_SIZE = 30
+
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class DexPairCache:
+    """
+    In-process cache of DexScreener pairs per mint
+    """
+
+    def __init__(self, ttl_seconds: float = 15.0, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.http_client = create_http_client("scanner", timeout=15.0)
+
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.api_calls = 0
+
+    async def get_pairs(self, token_address: str) -> Optional[List[Dict]]:
+        """
+        Get DexScreener pairs for one mint
+
+        Args:
+            token_address: Token mint address
+
+        Returns:
+            List of pairs (empty if none), None if the request failed
+        """
+        result = await self.get_pairs_many([token_address])
+        return result.get(token_address)
+
+    async def get_pairs_many(self, token_addresses: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Get DexScreener pairs for many mints
+
+        Fresh entries come from the cache, mints already being fetched wait
+        for that request, and the rest are fetched together in batches.
+
+        Args:
+            token_addresses: Token mint addresses
+
+        Returns:
+            Dict mint -> list of pairs (None for mints whose request failed,
+            including mints that waited on someone else's failed request)
+        """
+        now = time.monotonic()
+        result: Dict[str, Optional[List[Dict]]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+
+        for mint in dict.fromkeys(a for a in token_addresses if a):
+            entry = self._entries.get(mint)
+            if entry and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(mint)
+                result[mint] = entry[1]
+            elif mint in self._inflight:
+                self.coalesced += 1
+                waiting[mint] = self._inflight[mint]
+            else:
+                self.misses += 1
+                to_fetch.append(mint)
+
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {mint: loop.create_future() for mint in to_fetch}
+            self._inflight.update(futures)
+            try:
+                fetched = await self._fetch_many(to_fetch)
+                for mint in to_fetch:
+                    pairs = fetched.get(mint)
+                    if pairs is not None:
+                        self._store(mint, pairs)
+                    result[mint] = pairs
+                    futures[mint].set_result(pairs)
+            finally:
+                for mint, future in futures.items():
+                    if self._inflight.get(mint) is future:
+                        del self._inflight[mint]
+                    if not future.done():
+                        future.set_result(None)
+
+        for mint, future in waiting.items():
+            # shield - a cancelled waiter must not cancel the shared request
+            result[mint] = await asyncio.shield(future)
+
+        return result
+
+    def invalidate(self, token_address: Optional[str] = None):
+        """Drop one mint (or everything) from the cache"""
+        if token_address is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(token_address, None)
+
+    def get_stats(self) -> Dict:
+        """Cache counters"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "api_calls": self.api_calls,
+            "hit_rate": ((self.hits + self.coalesced) / lookups) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+        }
+
+    def _store(self, mint: str, pairs: List[Dict]):
+        self._entries[mint] = (time.monotonic() + self.ttl, pairs)
+        self._entries.move_to_end(mint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _fetch_many(self, mints: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Fetch pairs for mints in concurrent chunks
+
+        Returns:
+            Dict mint -> pairs. Mints of failed chunks are missing (not cached).
+        """
+        chunks = [
+            mints[i:i + DEXSCREENER_BATCH_SIZE]
+            for i in range(0, len(mints), DEXSCREENER_BATCH_SIZE)
+        ]
+        chunk_results = await asyncio.gather(*(self._fetch_chunk(c) for c in chunks))
+
+        pairs_by_mint: Dict[str, List[Dict]] = {}
+        for chunk, pairs in zip(chunks, chunk_results):
+            if pairs is None:
+                continue
+            for mint in chunk:
+                pairs_by_mint[mint] = []
+            for pair in pairs:
+                # priceUsd is the base token price - only map pairs by their base token
+                base_address = (pair.get("baseToken") or {}).get("address")
+                if base_address in pairs_by_mint:
+                    pairs_by_mint[base_address].append(pair)
+
+        return pairs_by_mint
+
+    async def _fetch_chunk(self, mints: List[str]) -> Optional[List[Dict]]:
+        """Fetch pairs for up to DEXSCREENER_BATCH_SIZE mints in one call (None on failure)"""
+        try:
+            self.api_calls += 1
+            url = f"{DEXSCREENER_TOKENS_API}/{','.join(mints)}"
+            response = await self.http_client.get(url)
+
+            if response.status_code != 200:
+                logger.warning(f"⚠️ DexScreener returned {response.status_code} for {len(mints)} tokens")
+                return None
+
+            data = response.json()
+            # tokens/v1 returns a plain list of pairs (legacy endpoint wraps it in "pairs")
+            if isinstance(data, dict):
+                data = data.get("pairs") or []
+            return data or []
+
+        except Exception as e:
+            logger.error(f"Error fetching from DexScreener: {e}")
+            return None
+
+    async def close(self):
+        """Cleanup resources"""
+        await self.http_client.aclose()
+
+
+# Global instance
+_pair_cache: Optional[DexPairCache] = None
+
+
+def get_pair_cache() -> DexPairCache:
+    """Get global DexScreener pair cache instance"""
+    global _pair_cache
+    if _pair_cache is None:
+        _pair_cache = DexPairCache(ttl_seconds=settings.pair_cache_ttl_seconds)
+    return _pair_cache
@@ -10,20 +10,29 @@ Features:
 5. זיהוי Volume פיקטיבי (אותם ארנקים סוחרים)
 
 How it works:
-1. בדיקות בסיסיות - נזילות, contract
-2. בדיקות מתקדמות - Dev behavior, Volume patterns
+1. snapshot אחד במקביל - pair data (metrics), mint account (contract), top holders
+   (כל חלק עם timeout משלו - חלק שנכשל לא מפיל את השאר)
+2. חמשת ה-scorers רצים על אותו snapshot - בלי לשלוף את DexScreener שוב לכל בדיקה
 3. החזרת אזהרות מפורטות עם הסברים
+
+Tiered monitoring (פוזיציות פתוחות):
+1. check_tick() - סיגנלים זולים מה-tick של ה-price feed (שינוי נזילות, נפילת מחיר) - כל tick
+   (נזילות מרוקנת יוצאת רק אחרי אישור - ticks רצופים, או ה-watcher on-chain / הבדיקה המלאה)
+2. check_rug_pull() - הבדיקה המלאה (holders, contract authorities) - בקצב איטי
+   או מיד כשסיגנל זול חוצה סף (ראה should_run_full_check)
 """
 
 import asyncio
+import time
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import httpx
 
-from analyzer.token_metrics import TokenMetricsFetcher
-from analyzer.contract_checker import ContractChecker
-from analyzer.holder_analyzer import HolderAnalyzer
+from analyzer.token_metrics import TokenMetrics, TokenMetricsFetcher
+from analyzer.contract_checker import ContractChecker, ContractSafety
+from analyzer.holder_analyzer import HolderAnalysis, HolderAnalyzer
+from core.config import settings
 from utils.logger import get_logger
 
 logger = get_logger("rug_detector")
@@ -39,6 +48,25 @@ class RugPullAlert:
     recommendations: List[str]
 
 
+@dataclass
+class RugSnapshot:
+    """כל הנתונים לבדיקת rug - נשלפים פעם אחת, במקביל"""
+    metrics: Optional[TokenMetrics] = None  # DexScreener pair data
+    safety: Optional[ContractSafety] = None  # mint account + liquidity lock
+    holders: Optional[HolderAnalysis] = None  # top holders
+    errors: Dict[str, str] = field(default_factory=dict)  # חלק -> למה חסר
+
+
+@dataclass
+class RugWatchState:
+    """מצב ניטור rug של פוזיציה אחת (בין tick ל-tick)"""
+    baseline_liquidity_usd: Optional[float] = None  # הנזילות הגבוהה ביותר שנראתה
+    last_price: Optional[float] = None
+    last_full_check: Optional[float] = None  # time.monotonic() של הבדיקה המלאה האחרונה
+    drain_ticks: int = 0  # ticks רצופים שבהם הנזילות מרוקנת (ממתין לאישור)
+    triggered: bool = False  # סיגנל זול חצה סף - בדיקה מלאה מיד
+
+
 class RugPullDetector:
     """
     מזהה Rug Pull patterns בזמן אמת
@@ -61,6 +89,14 @@ class RugPullDetector:
         self.max_dev_sell_percentage = 50.0  # 50%
         self.min_holder_count = 10
         self.max_concentration = 80.0  # 80%
+        self.fetch_timeout = 10.0  # שניות לכל חלק ב-snapshot
+        
+        # Tick thresholds (cheap signals)
+        self.liquidity_drop_trigger_pct = 30.0  # ירידה מה-baseline → בדיקה מלאה מיד
+        self.liquidity_drain_pct = 90.0  # ירידה מה-baseline → rug pull
+        self.liquidity_drain_confirm_ticks = 2  # ticks רצופים מתחת לסף לפני יציאה
+        self.price_drop_trigger_pct = 30.0  # נפילה בין שני ticks → בדיקה מלאה מיד
+        self.full_check_interval = settings.rug_full_check_interval_seconds
         
         logger.info("🚨 Rug Pull Detector initialized")
     
@@ -87,30 +123,19 @@ class RugPullDetector:
                 self.contract_checker = ContractChecker()
                 await self.contract_checker.__aenter__()
             
-            # 1. Liquidity Analysis
-            liquidity_score, liquidity_reasons = await self._check_liquidity(token_address)
-            score += liquidity_score
-            reasons.extend(liquidity_reasons)
-            
-            # 2. Contract Safety Analysis  
-            contract_score, contract_reasons = await self._check_contract_safety(token_address)
-            score += contract_score
-            reasons.extend(contract_reasons)
-            
-            # 3. Holder Concentration Analysis
-            holder_score, holder_reasons = await self._check_holder_concentration(token_address)
-            score += holder_score
-            reasons.extend(holder_reasons)
-            
-            # 4. Price Action Analysis
-            price_score, price_reasons = await self._check_price_action(token_address)
-            score += price_score
-            reasons.extend(price_reasons)
+            snapshot = await self._fetch_snapshot(token_address)
             
-            # 5. Volume Analysis
-            volume_score, volume_reasons = await self._check_volume_patterns(token_address)
-            score += volume_score
-            reasons.extend(volume_reasons)
+            # 5 scorers על אותו snapshot (אין יותר await בין בדיקה לבדיקה)
+            for check in (
+                self._check_liquidity,            # 1. Liquidity Analysis
+                self._check_contract_safety,      # 2. Contract Safety Analysis
+                self._check_holder_concentration, # 3. Holder Concentration Analysis
+                self._check_price_action,         # 4. Price Action Analysis
+                self._check_volume_patterns,      # 5. Volume Analysis
+            ):
+                check_score, check_reasons = check(snapshot)
+                score += check_score
+                reasons.extend(check_reasons)
             
             # Determine severity
             if score >= 80:
@@ -157,173 +182,294 @@ class RugPullDetector:
                 recommendations=["⚠️ Could not analyze - proceed with extreme caution"]
             )
     
-    async def _check_liquidity(self, token_address: str) -> Tuple[int, List[str]]:
+    def check_tick(
+        self,
+        state: RugWatchState,
+        price: Optional[float],
+        liquidity_usd: Optional[float],
+    ) -> RugPullAlert:
+        """
+        סיגנלים זולים מה-tick - בלי קריאות רשת
+        
+        Args:
+            state: מצב הניטור של הפוזיציה (מתעדכן)
+            price: מחיר מה-tick
+            liquidity_usd: נזילות מה-tick
+            
+        Returns:
+            RugPullAlert (is_rug_pull אם ה-pool התרוקן ב-liquidity_drain_confirm_ticks ticks רצופים)
+        
+        Note:
+            tick בודד מרוקן לא מספיק ליציאה - תגובה חלקית של DexScreener נראית בדיוק כך.
+            הוא מסמן triggered (בדיקה מלאה מיד), וה-tick הבא / ה-watcher on-chain מאשרים
+        """
+        reasons = []
+        score = 0
+        drained = False
+        
+        if liquidity_usd is not None:
+            baseline = state.baseline_liquidity_usd
+            if baseline and baseline > 0:
+                drop_pct = (baseline - liquidity_usd) / baseline * 100
+                if drop_pct >= self.liquidity_drain_pct:
+                    state.drain_ticks += 1
+                    drained = state.drain_ticks >= self.liquidity_drain_confirm_ticks
+                    if drained:
+                        score = 100
+                        reasons.append(
+                            f"🚨 LIQUIDITY DRAINED: ${baseline:,.0f} → ${liquidity_usd:,.0f} (-{drop_pct:.0f}%)"
+                        )
+                    else:
+                        score += 60
+                        reasons.append(
+                            f"💧 Liquidity down {drop_pct:.0f}% (${liquidity_usd:,.0f}) - waiting for confirmation"
+                        )
+                else:
+                    state.drain_ticks = 0
+                    if drop_pct >= self.liquidity_drop_trigger_pct:
+                        score += 40
+                        reasons.append(f"💧 Liquidity dropped {drop_pct:.0f}% (${liquidity_usd:,.0f})")
+            if baseline is None or liquidity_usd > baseline:
+                state.baseline_liquidity_usd = liquidity_usd
+        
+        if price is not None:
+            if state.last_price:
+                drop_pct = (state.last_price - price) / state.last_price * 100
+                if drop_pct >= self.price_drop_trigger_pct:
+                    score += 30
+                    reasons.append(f"📉 Price dropped {drop_pct:.0f}% since last tick")
+            state.last_price = price
+        
+        if score > 0:
+            state.triggered = True
+        
+        if drained:
+            severity = "CRITICAL"
+        elif score > 0:
+            severity = "MEDIUM"
+        else:
+            severity = "LOW"
+        
+        return RugPullAlert(
+            is_rug_pull=drained,
+            severity=severity,
+            reasons=reasons,
+            score=min(score, 100),
+            recommendations=["📤 Exit immediately"] if drained else [],
+        )
+    
+    def should_run_full_check(self, state: RugWatchState) -> bool:
+        """
+        האם להריץ עכשיו את הבדיקה המלאה (check_rug_pull)
+        
+        Returns:
+            True אם סיגנל זול חצה סף, או שעבר full_check_interval מהבדיקה האחרונה
+        """
+        if state.triggered or state.last_full_check is None:
+            return True
+        return time.monotonic() - state.last_full_check >= self.full_check_interval
+    
+    def mark_full_check(self, state: RugWatchState):
+        """הבדיקה המלאה התחילה - אפס את הטיימר וה-trigger"""
+        state.last_full_check = time.monotonic()
+        state.triggered = False
+    
+    async def _fetch_snapshot(self, token_address: str) -> RugSnapshot:
+        """
+        שליפת כל הנתונים במקביל - זמן הבדיקה = ה-round trip האיטי ביותר, לא הסכום
+        
+        Args:
+            token_address: Token mint address
+            
+        Returns:
+            RugSnapshot (חלק שנכשל / עבר timeout נשאר None, עם סיבה ב-errors)
+        """
+        snapshot = RugSnapshot()
+        parts = {
+            "metrics": self.metrics_fetcher.get_metrics(token_address),
+            "safety": self.contract_checker.check_contract(token_address),
+            "holders": self.holder_analyzer.analyze(token_address),
+        }
+        results = await asyncio.gather(
+            *(asyncio.wait_for(coro, timeout=self.fetch_timeout) for coro in parts.values()),
+            return_exceptions=True,
+        )
+        
+        for name, result in zip(parts, results):
+            if isinstance(result, asyncio.TimeoutError):
+                snapshot.errors[name] = f"timeout after {self.fetch_timeout:g}s"
+            elif isinstance(result, Exception):
+                snapshot.errors[name] = str(result)
+            else:
+                setattr(snapshot, name, result)
+        
+        if snapshot.errors:
+            logger.debug(f"Partial rug snapshot for {token_address[:20]}: {snapshot.errors}")
+        
+        return snapshot
+    
+    def _check_liquidity(self, snapshot: RugSnapshot) -> Tuple[int, List[str]]:
         """
         בדיקת נזילות - נמוכה מדי = סכנה
         
         Returns:
             (score, reasons) - score 0-30
         """
-        try:
-            metrics = await self.metrics_fetcher.get_metrics(token_address)
-            score = 0
-            reasons = []
-            
-            if metrics.liquidity_sol < 1.0:
-                score += 30
-                reasons.append(f"💧 Extremely low liquidity: {metrics.liquidity_sol:.2f} SOL")
-            elif metrics.liquidity_sol < 3.0:
-                score += 20
-                reasons.append(f"💧 Very low liquidity: {metrics.liquidity_sol:.2f} SOL")
-            elif metrics.liquidity_sol < self.min_safe_liquidity_sol:
-                score += 10
-                reasons.append(f"💧 Low liquidity: {metrics.liquidity_sol:.2f} SOL")
-            
-            # Check if liquidity is 0 (pool removed)
-            if metrics.liquidity_sol == 0:
-                score = 30
-                reasons = ["🚨 LIQUIDITY REMOVED - Pool drained!"]
-            
-            return score, reasons
-            
-        except Exception as e:
-            return 5, [f"Could not check liquidity: {str(e)}"]
+        metrics = snapshot.metrics
+        if metrics is None:
+            return 5, [f"Could not check liquidity: {snapshot.errors.get('metrics')}"]
+        
+        score = 0
+        reasons = []
+        
+        if metrics.liquidity_sol < 1.0:
+            score += 30
+            reasons.append(f"💧 Extremely low liquidity: {metrics.liquidity_sol:.2f} SOL")
+        elif metrics.liquidity_sol < 3.0:
+            score += 20
+            reasons.append(f"💧 Very low liquidity: {metrics.liquidity_sol:.2f} SOL")
+        elif metrics.liquidity_sol < self.min_safe_liquidity_sol:
+            score += 10
+            reasons.append(f"💧 Low liquidity: {metrics.liquidity_sol:.2f} SOL")
+        
+        # Check if liquidity is 0 (pool removed)
+        if metrics.liquidity_sol == 0:
+            score = 30
+            reasons = ["🚨 LIQUIDITY REMOVED - Pool drained!"]
+        
+        return score, reasons
     
-    async def _check_contract_safety(self, token_address: str) -> Tuple[int, List[str]]:
+    def _check_contract_safety(self, snapshot: RugSnapshot) -> Tuple[int, List[str]]:
         """
         בדיקת בטיחות החוזה
         
         Returns:
             (score, reasons) - score 0-25
         """
-        try:
-            safety = await self.contract_checker.check_contract(token_address)
-            score = 0
-            reasons = []
-            
-            if not safety.ownership_renounced:
-                score += 10
-                reasons.append("👤 Ownership not renounced - dev can modify")
-            
-            if not safety.mint_authority_disabled:
-                score += 15
-                reasons.append("🏭 Mint authority active - infinite supply possible")
-            
-            if not safety.liquidity_locked:
-                score += 8
-                reasons.append("🔓 Liquidity not locked - can be removed")
-            
-            if safety.safety_score < 50:
-                score += 10
-                reasons.append(f"⚠️ Low contract safety score: {safety.safety_score}/100")
-            
-            return min(score, 25), reasons
-            
-        except Exception as e:
-            return 10, [f"Could not check contract safety: {str(e)}"]
+        safety = snapshot.safety
+        if safety is None:
+            return 10, [f"Could not check contract safety: {snapshot.errors.get('safety')}"]
+        
+        score = 0
+        reasons = []
+        
+        if not safety.ownership_renounced:
+            score += 10
+            reasons.append("👤 Ownership not renounced - dev can modify")
+        
+        if not safety.mint_authority_disabled:
+            score += 15
+            reasons.append("🏭 Mint authority active - infinite supply possible")
+        
+        if not safety.liquidity_locked:
+            score += 8
+            reasons.append("🔓 Liquidity not locked - can be removed")
+        
+        if safety.safety_score < 50:
+            score += 10
+            reasons.append(f"⚠️ Low contract safety score: {safety.safety_score}/100")
+        
+        return min(score, 25), reasons
     
-    async def _check_holder_concentration(self, token_address: str) -> Tuple[int, List[str]]:
+    def _check_holder_concentration(self, snapshot: RugSnapshot) -> Tuple[int, List[str]]:
         """
         בדיקת ריכוזיות מחזיקים
         
         Returns:
             (score, reasons) - score 0-20
         """
-        try:
-            holders = await self.holder_analyzer.analyze(token_address)
-            score = 0
-            reasons = []
-            
-            if holders.holder_count < 5:
-                score += 20
-                reasons.append(f"👥 Very few holders: {holders.holder_count}")
-            elif holders.holder_count < self.min_holder_count:
-                score += 10
-                reasons.append(f"👥 Few holders: {holders.holder_count}")
-            
-            # Check concentration (excluding LP pools)
-            real_concentration = holders.top_10_percentage
-            if real_concentration > 90:
-                score += 15
-                reasons.append(f"🐋 Extreme concentration: top 10 hold {real_concentration:.1f}%")
-            elif real_concentration > self.max_concentration:
-                score += 10
-                reasons.append(f"🐋 High concentration: top 10 hold {real_concentration:.1f}%")
-            
-            # Check largest holder
-            if holders.largest_holder_pct > 30:
-                score += 10
-                reasons.append(f"🦈 Single large holder: {holders.largest_holder_pct:.1f}%")
-            
-            return min(score, 20), reasons
-            
-        except Exception as e:
-            return 5, [f"Could not check holder concentration: {str(e)}"]
+        holders = snapshot.holders
+        if holders is None:
+            return 5, [f"Could not check holder concentration: {snapshot.errors.get('holders')}"]
+        
+        score = 0
+        reasons = []
+        
+        if holders.holder_count < 5:
+            score += 20
+            reasons.append(f"👥 Very few holders: {holders.holder_count}")
+        elif holders.holder_count < self.min_holder_count:
+            score += 10
+            reasons.append(f"👥 Few holders: {holders.holder_count}")
+        
+        # Check concentration (excluding LP pools)
+        real_concentration = holders.top_10_percentage
+        if real_concentration > 90:
+            score += 15
+            reasons.append(f"🐋 Extreme concentration: top 10 hold {real_concentration:.1f}%")
+        elif real_concentration > self.max_concentration:
+            score += 10
+            reasons.append(f"🐋 High concentration: top 10 hold {real_concentration:.1f}%")
+        
+        # Check largest holder
+        if holders.largest_holder_pct > 30:
+            score += 10
+            reasons.append(f"🦈 Single large holder: {holders.largest_holder_pct:.1f}%")
+        
+        return min(score, 20), reasons
     
-    async def _check_price_action(self, token_address: str) -> Tuple[int, List[str]]:
+    def _check_price_action(self, snapshot: RugSnapshot) -> Tuple[int, List[str]]:
         """
         בדיקת פעולת מחיר - Pump & Dump
         
         Returns:
             (score, reasons) - score 0-15
         """
-        try:
-            metrics = await self.metrics_fetcher.get_metrics(token_address)
-            score = 0
-            reasons = []
-            
-            # Extreme pump detection
-            if metrics.price_change_5m > 1000:  # 1000%+ in 5 minutes
-                score += 15
-                reasons.append(f"📈 Extreme pump: +{metrics.price_change_5m:.0f}% in 5m")
-            elif metrics.price_change_5m > 500:  # 500%+ in 5 minutes
-                score += 10
-                reasons.append(f"📈 Major pump: +{metrics.price_change_5m:.0f}% in 5m")
-            
-            # Check for dump after pump
-            if (metrics.price_change_5m > 200 and 
-                metrics.price_change_1h < metrics.price_change_5m * 0.3):
-                score += 12
-                reasons.append("📉 Pump & dump pattern detected")
-            
-            # Extreme negative movement
-            if metrics.price_change_1h < -80:
-                score += 8
-                reasons.append(f"📉 Major dump: {metrics.price_change_1h:.0f}% in 1h")
-            
-            return min(score, 15), reasons
-            
-        except Exception as e:
-            return 3, [f"Could not check price action: {str(e)}"]
+        metrics = snapshot.metrics
+        if metrics is None:
+            return 3, [f"Could not check price action: {snapshot.errors.get('metrics')}"]
+        
+        score = 0
+        reasons = []
+        
+        # Extreme pump detection
+        if metrics.price_change_5m > 1000:  # 1000%+ in 5 minutes
+            score += 15
+            reasons.append(f"📈 Extreme pump: +{metrics.price_change_5m:.0f}% in 5m")
+        elif metrics.price_change_5m > 500:  # 500%+ in 5 minutes
+            score += 10
+            reasons.append(f"📈 Major pump: +{metrics.price_change_5m:.0f}% in 5m")
+        
+        # Check for dump after pump
+        if (metrics.price_change_5m > 200 and 
+            metrics.price_change_1h < metrics.price_change_5m * 0.3):
+            score += 12
+            reasons.append("📉 Pump & dump pattern detected")
+        
+        # Extreme negative movement
+        if metrics.price_change_1h < -80:
+            score += 8
+            reasons.append(f"📉 Major dump: {metrics.price_change_1h:.0f}% in 1h")
+        
+        return min(score, 15), reasons
     
-    async def _check_volume_patterns(self, token_address: str) -> Tuple[int, List[str]]:
+    def _check_volume_patterns(self, snapshot: RugSnapshot) -> Tuple[int, List[str]]:
         """
         בדיקת Volume patterns - Volume פיקטיבי
         
         Returns:
             (score, reasons) - score 0-10
         """
-        try:
-            metrics = await self.metrics_fetcher.get_metrics(token_address)
-            score = 0
-            reasons = []
-            
-            # Very low volume
-            if metrics.volume_24h < 1000:
+        metrics = snapshot.metrics
+        if metrics is None:
+            return 2, [f"Could not check volume patterns: {snapshot.errors.get('metrics')}"]
+        
+        score = 0
+        reasons = []
+        
+        # Very low volume
+        if metrics.volume_24h < 1000:
+            score += 5
+            reasons.append(f"📊 Very low volume: ${metrics.volume_24h:.0f}")
+        
+        # Check volume vs market cap ratio
+        if metrics.market_cap > 0:
+            volume_ratio = metrics.volume_24h / metrics.market_cap
+            if volume_ratio < 0.01:  # Less than 1% daily turnover
                 score += 5
-                reasons.append(f"📊 Very low volume: ${metrics.volume_24h:.0f}")
-            
-            # Check volume vs market cap ratio
-            if metrics.market_cap > 0:
-                volume_ratio = metrics.volume_24h / metrics.market_cap
-                if volume_ratio < 0.01:  # Less than 1% daily turnover
-                    score += 5
-                    reasons.append("📊 Suspiciously low trading activity")
-            
-            return min(score, 10), reasons
-            
-        except Exception as e:
-            return 2, [f"Could not check volume patterns: {str(e)}"]
+                reasons.append("📊 Suspiciously low trading activity")
+        
+        return min(score, 10), reasons
     
     async def close(self):
         """Cleanup resources"""
@@ -0,0 +1,321 @@
+"""
+Smart Holdings Index - Reverse Index of Smart Wallet Holdings
+אילו ארנקי Smart Money מחזיקים כל טוקן - מתוחזק ברקע, lookup מיידי בסריקה
+
+📋 מה הקובץ הזה עושה:
+-------------------
+עד עכשיו Smart Money זוהה רק אם ארנק חכם נמצא בין 20 המחזיקים הגדולים
+ש-HolderAnalyzer מחזיר. פוזיציה קטנה של ארנק חכם לא נראתה.
+הקובץ הזה הופך את הכיוון:
+
+1. לולאת רקע עוברת על ארנקי ה-Smart Money (SmartMoneyTracker)
+2. לכל ארנק - getTokenAccountsByOwner (SPL Token + Token-2022) ב-JSON-RPC batch
+3. אינדקס הפוך בזיכרון: mint -> {wallet: entry_slot}
+   (entry_slot = ה-slot שבו ראינו את הארנק מחזיק את הטוקן לראשונה)
+4. ה-scan loop קורא holders_of(mint) - dict lookup אחד, כל גודל פוזיציה
+5. כל SAVE_INTERVAL_SECONDS - שמירה ל-SMART_HOLDINGS_FILE (הפעלה מחדש לא מתחילה מאפס)
+
+🔧 פונקציות עיקריות:
+- get_smart_holdings_index() - האינדקס הגלובלי
+- run(tracker) - לולאת הרענון (רצה ברקע מ-main.py)
+- refresh_wallets(wallets) - רענון של קבוצת ארנקים
+- holders_of(mint) - {wallet: entry_slot}
+- count(mint) - כמה ארנקים חכמים מחזיקים
+
+💡 איך זה עובד:
+1. רענון הדרגתי: בכל סבב רק ארנקים שלא רועננו SMART_HOLDINGS_REFRESH_SECONDS
+   (ארנקים חדשים קודם, אחר כך הישנים ביותר), עד MAX_WALLETS_PER_CYCLE
+2. לכל ארנק מחושב diff מול הרענון הקודם - רק טוקנים שנכנסו / יצאו נוגעים באינדקס
+3. כל הבקשות דרך HTTP client מסוג "scanner" - תקציב ה-host (utils/rate_limiter.py)
+   משותף עם שאר הבוט, והסורק / המוניטור / המסחר לא נחסמים
+4. ארנק שהבקשה שלו נכשלה שומר על ההחזקות הקודמות וינוסה בסבב הבא
+
+📝 הערות:
+- SMART_HOLDINGS_ENABLED=false מכבה את הלולאה (הסריקה חוזרת ל-top holders בלבד)
+- entry_slot של טוקן שהוחזק לפני הרענון הראשון = ה-slot של הרענון הראשון
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from analyzer.contract_checker import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID
+from core.config import settings
+from utils.http_pool import create_http_client
+from utils.logger import get_logger
+
+logger = get_logger("smart_holdings")
+
+RPC_BATCH_SIZE = 20  # getTokenAccountsByOwner calls per JSON-RPC batch (2 per wallet)
+RPC_CONCURRENCY = 4  # batches in flight
+MAX_WALLETS_PER_CYCLE = 2000
+CYCLE_SECONDS = 30.0
+SAVE_INTERVAL_SECONDS = 300.0
+
+
+class SmartHoldingsIndex:
+    """
+    mint -> {smart wallet: entry slot}, refreshed incrementally in the background
+    """
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        cache_file: Optional[str] = None,
+        refresh_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize smart holdings index
+
+        Args:
+            rpc_url: Solana RPC URL (ברירת מחדל: SOLANA_RPC_URL)
+            cache_file: קובץ השמירה (ברירת מחדל: SMART_HOLDINGS_FILE)
+            refresh_seconds: כל כמה זמן לרענן כל ארנק
+        """
+        self.http_client = create_http_client("scanner", timeout=30.0)
+        self.rpc_url = rpc_url or settings.solana_rpc_url
+        self.cache_file = Path(cache_file or settings.smart_holdings_file)
+        self.refresh_seconds = refresh_seconds or settings.smart_holdings_refresh_seconds
+
+        self._holdings: Dict[str, Dict[str, int]] = {}  # wallet -> {mint: entry_slot}
+        self._by_mint: Dict[str, Dict[str, int]] = {}  # mint -> {wallet: entry_slot}
+        self._refreshed: Dict[str, float] = {}  # wallet -> time.time() של הרענון האחרון
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._loaded = False
+
+        # Stats
+        self.wallets_refreshed = 0
+        self.wallets_failed = 0
+        self.positions_added = 0
+        self.positions_removed = 0
+        self.cycles = 0
+
+    # ========================================================================
+    # Lookups (scan loop)
+    # ========================================================================
+
+    def holders_of(self, mint: str) -> Dict[str, int]:
+        """ארנקי Smart Money שמחזיקים את הטוקן -> entry slot"""
+        return self._by_mint.get(mint, {})
+
+    def count(self, mint: str) -> int:
+        """כמה ארנקי Smart Money מחזיקים את הטוקן"""
+        return len(self._by_mint.get(mint, ()))
+
+    # ========================================================================
+    # Refresh loop
+    # ========================================================================
+
+    async def run(self, tracker):
+        """
+        לולאת הרענון - רצה עד שה-task מבוטל
+
+        Args:
+            tracker: SmartMoneyTracker (רשימת הארנקים מתעדכנת תוך כדי ריצה)
+        """
+        self._ensure_loaded()
+        logger.info(
+            f"🗂️ Smart holdings index started ({len(self._holdings)} wallets, "
+            f"{len(self._by_mint)} mints, refresh every {self.refresh_seconds:g}s)"
+        )
+
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    await self._cycle(tracker)
+                except Exception as e:
+                    logger.error(f"❌ Smart holdings refresh failed: {e}", exc_info=True)
+
+                if self._dirty and time.monotonic() - self._last_save >= SAVE_INTERVAL_SECONDS:
+                    self.save()
+
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, CYCLE_SECONDS - elapsed))
+        finally:
+            if self._dirty:
+                self.save()
+
+    async def _cycle(self, tracker):
+        """סבב אחד: הסר ארנקים שכבר לא במעקב, רענן את אלה שהגיע זמנם"""
+        tracked = set(tracker.smart_wallets)
+        for wallet in [w for w in self._holdings if w not in tracked]:
+            self._apply(wallet, {}, 0)
+            self._holdings.pop(wallet, None)
+            self._refreshed.pop(wallet, None)
+            self._dirty = True
+
+        now = time.time()
+        due = [
+            w for w in tracked
+            if now - self._refreshed.get(w, 0.0) >= self.refresh_seconds
+        ]
+        if not due:
+            return
+
+        due.sort(key=lambda w: self._refreshed.get(w, 0.0))  # New wallets (0.0) first
+        await self.refresh_wallets(due[:MAX_WALLETS_PER_CYCLE])
+        self.cycles += 1
+
+    async def refresh_wallets(self, wallets: List[str]):
+        """
+        רענן את ההחזקות של ארנקים (batches מקבילים של getTokenAccountsByOwner)
+
+        Args:
+            wallets: ארנקים לרענון
+        """
+        per_batch = RPC_BATCH_SIZE // 2
+        step = per_batch * RPC_CONCURRENCY
+        changed_before = self.positions_added + self.positions_removed
+
+        for i in range(0, len(wallets), step):
+            chunk = wallets[i:i + step]
+            batches = [chunk[j:j + per_batch] for j in range(0, len(chunk), per_batch)]
+            await asyncio.gather(*(self._refresh_batch(b) for b in batches))
+
+        changed = self.positions_added + self.positions_removed - changed_before
+        logger.info(
+            f"🗂️ Refreshed holdings of {len(wallets)} smart wallets: {changed} changes, "
+            f"{len(self._by_mint)} mints indexed"
+        )
+
+    async def _refresh_batch(self, wallets: List[str]):
+        """batch אחד: שתי קריאות לכל ארנק (SPL Token + Token-2022)"""
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": idx,
+                "method": "getTokenAccountsByOwner",
+                "params": [wallet, {"programId": program}, {"encoding": "jsonParsed"}],
+            }
+            for idx, (wallet, program) in enumerate(
+                (w, p) for w in wallets for p in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)
+            )
+        ]
+        try:
+            response = await self.http_client.post(self.rpc_url, json=payload)
+            data = response.json() if response.status_code == 200 else None
+            if not isinstance(data, list):
+                logger.warning(f"⚠️ getTokenAccountsByOwner batch failed ({response.status_code})")
+                self.wallets_failed += len(wallets)
+                return
+        except Exception as e:
+            logger.error(f"Error fetching smart wallet holdings: {e}")
+            self.wallets_failed += len(wallets)
+            return
+
+        # Batch responses may come back in any order - match by id
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        now = time.time()
+
+        for w_idx, wallet in enumerate(wallets):
+            results = [by_id.get(2 * w_idx), by_id.get(2 * w_idx + 1)]
+            if any(r is None or "error" in r for r in results):
+                self.wallets_failed += 1  # Keep the previous holdings, retry next cycle
+                continue
+
+            mints: Set[str] = set()
+            slot = 0
+            for r in results:
+                result = r.get("result") or {}
+                slot = max(slot, (result.get("context") or {}).get("slot") or 0)
+                for account in result.get("value") or []:
+                    info = (((account.get("account") or {}).get("data") or {}).get("parsed") or {}).get("info") or {}
+                    amount = (info.get("tokenAmount") or {}).get("amount")
+                    if info.get("mint") and amount and int(amount) > 0:
+                        mints.add(info["mint"])
+
+            self._apply(wallet, mints, slot)
+            self._refreshed[wallet] = now
+            self._dirty = True  # Refresh times are saved too - otherwise a restart refreshes everyone
+            self.wallets_refreshed += 1
+
+    def _apply(self, wallet: str, mints: Iterable[str], slot: int):
+        """עדכן את האינדקס לפי ההחזקות החדשות של ארנק (diff בלבד)"""
+        previous = self._holdings.get(wallet, {})
+        current = {mint: previous.get(mint, slot) for mint in mints}
+
+        for mint in previous.keys() - current.keys():
+            holders = self._by_mint.get(mint)
+            if holders is not None:
+                holders.pop(wallet, None)
+                if not holders:
+                    del self._by_mint[mint]
+            self.positions_removed += 1
+        for mint in current.keys() - previous.keys():
+            self._by_mint.setdefault(mint, {})[wallet] = current[mint]
+            self.positions_added += 1
+
+        if current != previous:
+            self._dirty = True
+        self._holdings[wallet] = current
+
+    # ========================================================================
+    # Persistence
+    # ========================================================================
+
+    def _ensure_loaded(self):
+        """טען את האינדקס מהדיסק (פעם אחת)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self._refreshed = data.get("refreshed", {})
+            for wallet, holdings in data.get("holdings", {}).items():
+                self._holdings[wallet] = holdings
+                for mint, slot in holdings.items():
+                    self._by_mint.setdefault(mint, {})[wallet] = slot
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load smart holdings index: {e}")
+
+    def save(self):
+        """שמור לדיסק (כתיבה לקובץ זמני ואז rename)"""
+        self._last_save = time.monotonic()
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"holdings": self._holdings, "refreshed": self._refreshed}, f)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save smart holdings index: {e}")
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "wallets": len(self._holdings),
+            "mints": len(self._by_mint),
+            "cycles": self.cycles,
+            "wallets_refreshed": self.wallets_refreshed,
+            "wallets_failed": self.wallets_failed,
+            "positions_added": self.positions_added,
+            "positions_removed": self.positions_removed,
+        }
+
+    async def close(self):
+        """Cleanup resources"""
+        if self._dirty:
+            self.save()
+        await self.http_client.aclose()
+
+
+# Global instance
+_holdings_index: Optional[SmartHoldingsIndex] = None
+
+
+def get_smart_holdings_index() -> SmartHoldingsIndex:
+    """Get global smart holdings index instance"""
+    global _holdings_index
+    if _holdings_index is None:
+        _holdings_index = SmartHoldingsIndex()
+    return _holdings_index
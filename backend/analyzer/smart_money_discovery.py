@@ -14,16 +14,18 @@ Automatically discover smart wallets by analyzing blockchain data
 
 🔧 פונקציות עיקריות:
 - run_initial_discovery() - מריץ גילוי ראשוני (פעם אחת)
-- discover_from_token(token_address) - מגלה Smart Money מטוקן ספציפי
-- analyze_wallet_performance(address) - מנתח ביצועי ארנק
+- discover_from_new_token(token_address, performance) - מגלה Smart Money מטוקן ספציפי
+- onboard_tokens(tokens) - מוסיף batch של טוקנים מוצלחים לגילוי ברקע
+- get_stats() - התקדמות וקצב של ה-job
 - close() - סגירה נקייה
 
 💡 איך זה עובד:
 1. מנתח טוקנים מוצלחים מהעבר (x10, x100, וכו')
 2. מוצא מי היו הקונים הראשונים (24 שעות ראשונות)
-3. בודק את הביצועים של כל ארנק (win rate, average profit)
+3. בודק את הביצועים של כל ארנק (win rate, average profit) - במקביל,
+   דרך DiscoveryRunner (analyzer/discovery_runner.py)
 4. אם ארנק עומד בקריטריונים → מוסיף לרשימת Smart Money
-5. הרשימה נשמרת אוטומטית ב-data/smart_wallets.json
+5. הרשימה נשמרת אוטומטית ב-data/smart_wallets.jsonl (append בלבד - ראה SmartMoneyTracker)
 
 📝 הערות:
 - זה רץ פעם אחת בהפעלה הראשונה של הבוט
@@ -32,15 +34,12 @@ Automatically discover smart wallets by analyzing blockchain data
 - זה חלק קריטי מהבוט - ככל שיש יותר Smart Money Wallets, הבוט יותר חכם!
 """
 
-import asyncio
-from typing import List, Dict, Set, Optional
-from datetime import datetime, timedelta
-from pathlib import Path
-import json
+from typing import List, Dict, Optional
 
+from analyzer.discovery_runner import DiscoveryRunner
 from analyzer.wallet_performance_analyzer import WalletPerformanceAnalyzer
 from analyzer.first_buyer_detector import FirstBuyerDetector
-from analyzer.smart_money_tracker import SmartMoneyTracker, SmartWallet
+from analyzer.smart_money_tracker import get_smart_money_tracker
 from utils.logger import get_logger
 
 logger = get_logger("smart_discovery")
@@ -56,7 +55,8 @@ class SmartMoneyDiscovery:
     def __init__(self):
         self.wallet_analyzer = WalletPerformanceAnalyzer()
         self.first_buyer_detector = FirstBuyerDetector()
-        self.tracker = SmartMoneyTracker()
+        self.tracker = get_smart_money_tracker()  # Same index the scan loop reads
+        self.runner = DiscoveryRunner(self.wallet_analyzer, self.first_buyer_detector, self.tracker)
         
         # Known successful tokens for historical analysis
         # These are tokens that did x100+ in the past
@@ -82,72 +82,11 @@ class SmartMoneyDiscovery:
         """
         logger.info("🔍 Starting historical smart wallet discovery...")
         
-        discovered_wallets: Set[str] = set()
-        
-        for token_address in self.successful_tokens:
-            try:
-                logger.info(f"📊 Analyzing {token_address[:20]}...")
-                
-                # Step 1: Find first buyers
-                first_buyers = await self.first_buyer_detector.detect_first_buyers(
-                    token_address,
-                    hours=24,
-                    limit=50
-                )
-                
-                logger.info(f"  Found {len(first_buyers)} first buyers")
-                
-                # Step 2: Analyze each first buyer
-                for buyer in first_buyers[:20]:  # Analyze top 20 to avoid rate limits
-                    try:
-                        wallet_address = buyer.wallet_address
-                        
-                        # Skip if already discovered
-                        if wallet_address in discovered_wallets:
-                            continue
-                        
-                        # Simplified approach: If wallet was first buyer of successful token,
-                        # and we see it was first buyer of multiple successful tokens, it's likely smart
-                        
-                        # For now, we'll add first buyers of successful tokens directly
-                        # (they caught a gem early, that's a good sign)
-                        
-                        # Check if wallet was first buyer of other successful tokens too
-                        # This is a simplified check - real implementation would analyze full history
-                        
-                        # Add as smart wallet (being first buyer of successful token is already a good sign)
-                        logger.info(
-                            f"  ✅ Smart wallet candidate: {wallet_address[:20]}... | "
-                            f"First buyer of successful token"
-                        )
-                        
-                        # Add to tracker
-                        self.tracker.add_smart_wallet(
-                            wallet_address,
-                            nickname=f"FirstBuyer-{token_address[:8]}"
-                        )
-                        discovered_wallets.add(wallet_address)
-                        
-                        # Note: Full performance analysis would require transaction history parsing
-                        # For now, being first buyer of successful token is good enough indicator
-                        
-                        # Rate limiting
-                        await asyncio.sleep(0.5)  # Don't hammer APIs
-                        
-                    except Exception as e:
-                        logger.warning(f"  ⚠️ Failed to analyze {buyer.wallet_address[:20]}...: {e}")
-                        continue
-                
-            except Exception as e:
-                logger.error(f"❌ Error analyzing token {token_address[:20]}...: {e}")
-                continue
-        
-        # Save discovered wallets
-        self.tracker.save_wallets()
-        
-        logger.info(f"🎯 Discovery complete! Found {len(discovered_wallets)} smart wallets")
-        
-        return list(discovered_wallets)
+        discovered = await self.runner.run(self.successful_tokens, nickname_prefix="FirstBuyer")
+        
+        logger.info(f"🎯 Discovery complete! Found {len(discovered)} smart wallets")
+        
+        return discovered
     
     async def discover_from_new_token(
         self,
@@ -175,49 +114,15 @@ class SmartMoneyDiscovery:
             f"(performed {token_performance:.1f}x)"
         )
         
-        discovered_wallets: Set[str] = set()
-        
-        try:
-            # Find first buyers
-            first_buyers = await self.first_buyer_detector.detect_first_buyers(
-                token_address,
-                hours=24,
-                limit=30
-            )
-            
-            # Analyze each first buyer
-            for buyer in first_buyers:
-                try:
-                    wallet_address = buyer.wallet_address
-                    
-                    # Simplified: If wallet was first buyer and token performed well,
-                    # it's a good candidate for smart wallet
-                    # (caught a gem early = good indicator)
-                    
-                    logger.info(
-                        f"  ✅ New smart wallet candidate: {wallet_address[:20]}... "
-                        f"from token {token_address[:20]}... (performed {token_performance:.1f}x)"
-                    )
-                    
-                    self.tracker.add_smart_wallet(
-                        wallet_address,
-                        nickname=f"Auto-{token_address[:8]}"
-                    )
-                    discovered_wallets.add(wallet_address)
-                    
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    logger.debug(f"Failed to analyze buyer: {e}")
-                    continue
-        
-        except Exception as e:
-            logger.error(f"Error discovering from new token: {e}")
-        
-        if discovered_wallets:
-            self.tracker.save_wallets()
-        
-        return list(discovered_wallets)
+        return await self.runner.run([token_address], nickname_prefix="Auto")
+    
+    def onboard_tokens(self, token_addresses: List[str], nickname_prefix: str = "Auto"):
+        """
+        Queue a batch of successful tokens for discovery in the background
+        
+        Returns immediately - progress is in get_stats() and the logs
+        """
+        self.runner.submit(token_addresses, nickname_prefix=nickname_prefix)
     
     async def run_initial_discovery(self):
         """
@@ -233,8 +138,13 @@ class SmartMoneyDiscovery:
         
         return discovered
     
+    def get_stats(self) -> Dict:
+        """Discovery job progress and throughput"""
+        return self.runner.get_stats()
+    
     async def close(self):
         """Cleanup resources"""
+        await self.runner.close()
         await self.wallet_analyzer.close()
         await self.first_buyer_detector.close()
 
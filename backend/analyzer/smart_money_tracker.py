@@ -14,29 +14,35 @@ Track successful wallets and detect their positions
 
 🔧 פונקציות עיקריות:
 - check_if_holds(token_address, holder_addresses) - בודק אם Smart Money מחזיק טוקן
-- add_wallet(address, nickname) - מוסיף ארנק חדש לרשימה
+- smart_holders(token_address, holder_addresses) - ספירה + trust ממוצע + הארנקים
+- check_many(holder_lists) - אותו דבר להרבה טוקנים בקריאה אחת
+- add_smart_wallet(address, nickname) - מוסיף ארנק חדש לרשימה
 - get_smart_wallet_count() - מחזיר כמה ארנקים חכמים יש
-- load_from_file() - טוען רשימה מקובץ JSON
-- save_to_file() - שומר רשימה לקובץ JSON
+- save_wallets() - שומר רק ארנקים שהשתנו (append)
 
 💡 איך זה עובד:
-1. טוען רשימה של Smart Money Wallets מקובץ data/smart_wallets.json
-2. כשמנתחים טוקן, בודק אם אחד מהמחזיקים הוא Smart Money
+1. טוען רשימה של Smart Money Wallets מ-data/smart_wallets.jsonl
+   (קובץ data/smart_wallets.json ישן מיובא פעם אחת)
+2. כשמנתחים טוקן, בודק באינדקס (analyzer/smart_wallet_index.py) אם אחד מהמחזיקים הוא Smart Money
 3. כל Smart Money wallet שמוצא = 5 נקודות (מקסימום 15 נקודות)
 4. הרשימה מתעדכנת אוטומטית על ידי Smart Money Discovery Engine
 
 📝 הערות:
-- הרשימה נשמרת ב-data/smart_wallets.json
+- הרשימה נשמרת ב-data/smart_wallets.jsonl - שורה לכל ארנק שנוסף / השתנה,
+  השורה האחרונה לכל כתובת קובעת; הקובץ נדחס כשהוא גדל פי 2
 - Smart Money Discovery Engine מוסיף ארנקים חדשים אוטומטית
 - כל ארנק חכם = 5 נקודות לציון הסופי (מקסימום 15)
 - זה חלק חשוב מהציון הסופי של כל טוקן!
 """
 
-from typing import List, Dict, Set, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Optional
+from dataclasses import asdict, astuple, dataclass
 import json
+import os
 from pathlib import Path
 
+from analyzer.smart_wallet_index import NEUTRAL_TRUST, SmartHolderStats, SmartWalletIndex
+from core.config import settings
 from utils.logger import get_logger
 
 logger = get_logger("smart_money")
@@ -61,19 +67,47 @@ class SmartMoneyTracker:
     (catching gems early, profitable exits, etc.)
     """
     
-    def __init__(self, wallets_file: Optional[str] = None):
+    def __init__(self, wallets_file: Optional[str] = None, bloom_filter: Optional[bool] = None):
         """
         Initialize smart money tracker
         
         Args:
-            wallets_file: Path to JSON file with smart wallet addresses
+            wallets_file: Path to the legacy JSON file with smart wallet addresses
+                (the append-only log is next to it, with a .jsonl suffix)
+            bloom_filter: Bloom filter in front of the index (ברירת מחדל: SMART_WALLET_BLOOM_FILTER)
         """
         self.wallets_file = wallets_file or "data/smart_wallets.json"
+        self.log_file = Path(self.wallets_file).with_suffix(".jsonl")
         self.smart_wallets: Dict[str, SmartWallet] = {}
+        self.index = SmartWalletIndex(
+            bloom_filter=settings.smart_wallet_bloom_filter if bloom_filter is None else bloom_filter
+        )
+        self._persisted: Dict[str, tuple] = {}  # address -> astuple() כפי שנכתב לדיסק
+        self._log_lines = 0
         self._load_wallets()
     
     def _load_wallets(self):
-        """Load smart wallets from file or use defaults"""
+        """Load smart wallets from the append-only log (or the legacy JSON file / defaults)"""
+        if self.log_file.exists():
+            try:
+                # Torn last line (crash mid-write) - cut it, or the next append would join it
+                data = self.log_file.read_bytes()
+                complete = data.rfind(b"\n") + 1
+                if complete < len(data):
+                    os.truncate(self.log_file, complete)
+                for line in data[:complete].decode().splitlines():
+                    try:
+                        wallet = SmartWallet(**json.loads(line))
+                    except (ValueError, TypeError):
+                        continue
+                    self._set_wallet(wallet)
+                    self._persisted[wallet.address] = astuple(wallet)
+                    self._log_lines += 1
+                logger.info(f"✅ Loaded {len(self.smart_wallets)} smart wallets from {self.log_file}")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load wallets log: {e}, using defaults")
+        
         wallets_path = Path(self.wallets_file)
         
         if wallets_path.exists():
@@ -81,9 +115,9 @@ class SmartMoneyTracker:
                 with open(wallets_path, 'r') as f:
                     data = json.load(f)
                     for wallet_data in data:
-                        wallet = SmartWallet(**wallet_data)
-                        self.smart_wallets[wallet.address] = wallet
+                        self._set_wallet(SmartWallet(**wallet_data))
                 logger.info(f"✅ Loaded {len(self.smart_wallets)} smart wallets from file")
+                self.save_wallets()  # Start the append-only log
             except Exception as e:
                 logger.warning(f"⚠️ Failed to load wallets file: {e}, using defaults")
                 self._load_default_wallets()
@@ -100,11 +134,19 @@ class SmartMoneyTracker:
         ]
         
         for wallet_data in default_wallets:
-            wallet = SmartWallet(**wallet_data)
-            self.smart_wallets[wallet.address] = wallet
+            self._set_wallet(SmartWallet(**wallet_data))
         
         logger.info(f"📝 Loaded {len(self.smart_wallets)} default smart wallets")
     
+    @staticmethod
+    def _trust(wallet: SmartWallet) -> float:
+        """משקל הארנק באינדקס (0-100) - success_rate, או ניטרלי אם אין עדיין trades"""
+        return wallet.success_rate if wallet.total_trades > 0 else NEUTRAL_TRUST
+    
+    def _set_wallet(self, wallet: SmartWallet):
+        self.smart_wallets[wallet.address] = wallet
+        self.index.add(wallet.address, self._trust(wallet))
+    
     def add_smart_wallet(self, address: str, nickname: Optional[str] = None):
         """
         Add a smart wallet to track
@@ -115,7 +157,7 @@ class SmartMoneyTracker:
         """
         if address not in self.smart_wallets:
             wallet = SmartWallet(address=address, nickname=nickname)
-            self.smart_wallets[address] = wallet
+            self._set_wallet(wallet)
             logger.info(f"✅ Added smart wallet: {address} ({nickname or 'No name'})")
         else:
             logger.debug(f"Wallet {address} already tracked")
@@ -131,20 +173,38 @@ class SmartMoneyTracker:
         Returns:
             Number of smart wallets holding this token
         """
-        smart_holders = set(holder_addresses) & set(self.smart_wallets.keys())
-        count = len(smart_holders)
+        return self.smart_holders(token_address, holder_addresses).count
+    
+    def smart_holders(self, token_address: str, holder_addresses: List[str]) -> SmartHolderStats:
+        """
+        Smart money among one token's holders (count, trust-weighted score, wallets)
+        """
+        return self.check_many({token_address: holder_addresses})[token_address]
+    
+    def check_many(self, holder_lists: Dict[str, List[str]]) -> Dict[str, SmartHolderStats]:
+        """
+        Smart money among the holders of many tokens in one call
         
-        if count > 0:
-            wallet_names = [
-                self.smart_wallets[addr].nickname or addr[:8]
-                for addr in smart_holders
-            ]
-            logger.info(
-                f"🎯 Smart money detected! {count} wallet(s) holding {token_address[:20]}...: "
-                f"{', '.join(wallet_names)}"
-            )
+        Args:
+            holder_lists: token_address -> holder addresses
+        
+        Returns:
+            token_address -> SmartHolderStats
+        """
+        results = self.index.holder_stats(holder_lists)
+        
+        for token_address, stats in results.items():
+            if stats.count > 0:
+                wallet_names = [
+                    self.smart_wallets[addr].nickname or addr[:8]
+                    for addr in stats.wallets
+                ]
+                logger.info(
+                    f"🎯 Smart money detected! {stats.count} wallet(s) holding {token_address[:20]}...: "
+                    f"{', '.join(wallet_names)}"
+                )
         
-        return count
+        return results
     
     def get_smart_wallet_count(self) -> int:
         """Get total number of tracked smart wallets"""
@@ -155,28 +215,51 @@ class SmartMoneyTracker:
         return self.smart_wallets.get(address)
     
     def save_wallets(self):
-        """Save smart wallets to file"""
-        wallets_path = Path(self.wallets_file)
-        wallets_path.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Save smart wallets that changed since the last save
         
-        wallets_data = [
-            {
-                "address": wallet.address,
-                "nickname": wallet.nickname,
-                "total_trades": wallet.total_trades,
-                "profitable_trades": wallet.profitable_trades,
-                "success_rate": wallet.success_rate,
-                "tracked_since": wallet.tracked_since,
-            }
-            for wallet in self.smart_wallets.values()
+        Append-only: each changed wallet is one line in the .jsonl log (the last
+        line per address wins on load). The log is compacted once it is twice
+        the number of wallets.
+        """
+        changed = [
+            wallet for address, wallet in self.smart_wallets.items()
+            if astuple(wallet) != self._persisted.get(address)
         ]
+        if not changed:
+            return
         
         try:
-            with open(wallets_path, 'w') as f:
-                json.dump(wallets_data, f, indent=2)
-            logger.info(f"✅ Saved {len(wallets_data)} smart wallets to {wallets_path}")
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            if self._log_lines + len(changed) > 2 * len(self.smart_wallets) + 1000:
+                tmp_path = self.log_file.with_suffix(".tmp")
+                with open(tmp_path, 'w') as f:
+                    for wallet in self.smart_wallets.values():
+                        f.write(json.dumps(asdict(wallet)) + "\n")
+                os.replace(tmp_path, self.log_file)
+                self._log_lines = len(self.smart_wallets)
+                logger.info(f"✅ Compacted {len(self.smart_wallets)} smart wallets to {self.log_file}")
+            else:
+                with open(self.log_file, 'a') as f:
+                    for wallet in changed:
+                        f.write(json.dumps(asdict(wallet)) + "\n")
+                self._log_lines += len(changed)
+                logger.info(f"✅ Saved {len(changed)} smart wallets to {self.log_file}")
+            
+            for wallet in changed:
+                self._persisted[wallet.address] = astuple(wallet)
+                self.index.add(wallet.address, self._trust(wallet))
         except Exception as e:
             logger.error(f"❌ Failed to save wallets: {e}")
+    
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "smart_wallets": len(self.smart_wallets),
+            "log_lines": self._log_lines,
+            "index": self.index.get_stats(),
+        }
 
 
 # Global instance
@@ -0,0 +1,196 @@
+"""
+Smart Wallet Index - Compact Membership Index for Smart Money
+אינדקס של ארנקי Smart Money: id לכל כתובת, משקל (trust) לכל id, ו-bloom filter אופציונלי
+
+📋 מה הקובץ הזה עושה:
+-------------------
+check_if_holds בנה שני sets חדשים בכל קריאה - עם עשרות אלפי ארנקים זה יקר.
+הקובץ הזה מחזיק את הרשימה פעם אחת:
+
+1. כל כתובת מקבלת id מספרי (interning) - id-ים רצופים מ-0
+2. לכל id יש משקל trust (0-100) במערך NumPy - success_rate של הארנק
+3. bloom filter אופציונלי (SMART_WALLET_BLOOM_FILTER) - "בוודאות לא Smart Money"
+   בלי לגעת במילון, לרוב המחזיקים
+4. holder_stats(holder_lists) - לכמה טוקנים בבת אחת: כמה Smart Money מחזיקים
+   בכל טוקן, סכום המשקלים וה-trust הממוצע - חישוב וקטורי אחד (bincount)
+
+🔧 פונקציות עיקריות:
+- add(address, trust) - הוסף / עדכן ארנק
+- address in index - בדיקת חברות
+- holder_stats(holder_lists) - token -> SmartHolderStats
+
+💡 איך זה עובד:
+1. המחזיקים של כל הטוקנים משוטחים לרשימה אחת ומתורגמים ל-id (או -1)
+2. זוגות (טוקן, id) כפולים מסוננים (np.unique) - מחזיק שמופיע פעמיים נספר פעם אחת
+3. np.bincount לפי אינדקס הטוקן נותן את הספירה, ועם weights - את סכום ה-trust
+
+📝 הערות:
+- שמירה לדיסק - ב-SmartMoneyTracker (smart_wallets.jsonl, append בלבד)
+- ארנק בלי trades מקבל NEUTRAL_TRUST (כמו ברירת המחדל של ScoringEngine)
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger("smart_wallet_index")
+
+NEUTRAL_TRUST = 50.0
+
+
+@dataclass
+class SmartHolderStats:
+    """Smart money among one token's holders"""
+    count: int = 0
+    weighted_score: float = 0.0  # סכום ה-trust של המחזיקים / 100
+    avg_trust: float = NEUTRAL_TRUST  # 0-100
+    wallets: List[str] = field(default_factory=list)
+
+
+class BloomFilter:
+    """
+    Bloom filter על hash() של Python (נבנה מחדש בכל הפעלה - לא נשמר לדיסק)
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1024)
+        self.bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        array = self._array
+        return all(array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class SmartWalletIndex:
+    """
+    Interned smart wallet ids with trust weights and batch holder queries
+    """
+
+    def __init__(self, bloom_filter: bool = False, bloom_error_rate: float = 0.01):
+        """
+        Initialize smart wallet index
+
+        Args:
+            bloom_filter: להפעיל bloom filter לפני המילון
+            bloom_error_rate: שיעור false positive של ה-bloom filter
+        """
+        self._ids: Dict[str, int] = {}
+        self._addresses: List[str] = []
+        self._trust = np.zeros(1024, dtype=np.float64)
+        self._bloom_error_rate = bloom_error_rate
+        self._bloom: Optional[BloomFilter] = BloomFilter(1024, bloom_error_rate) if bloom_filter else None
+
+        # Stats
+        self.lookups = 0
+        self.bloom_rejects = 0
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: str) -> bool:
+        return self._lookup(address) >= 0
+
+    def add(self, address: str, trust: float = NEUTRAL_TRUST) -> int:
+        """
+        הוסף ארנק (או עדכן את ה-trust שלו)
+
+        Returns:
+            ה-id של הארנק
+        """
+        idx = self._ids.get(address)
+        if idx is None:
+            idx = self._ids[address] = len(self._addresses)
+            self._addresses.append(address)
+            if idx >= len(self._trust):
+                self._trust = np.concatenate([self._trust, np.zeros(len(self._trust), dtype=np.float64)])
+            if self._bloom is not None:
+                if self._bloom.count >= self._bloom.capacity:
+                    self._rebuild_bloom()
+                else:
+                    self._bloom.add(address)
+        self._trust[idx] = trust
+        return idx
+
+    def _rebuild_bloom(self):
+        """bloom filter גדול פי 2 (כשהקיים מלא)"""
+        self._bloom = BloomFilter(2 * len(self._addresses), self._bloom_error_rate)
+        for address in self._addresses:
+            self._bloom.add(address)
+
+    def _lookup(self, address: str) -> int:
+        """id של כתובת, -1 אם היא לא Smart Money"""
+        self.lookups += 1
+        if self._bloom is not None and address not in self._bloom:
+            self.bloom_rejects += 1
+            return -1
+        return self._ids.get(address, -1)
+
+    def holder_stats(self, holder_lists: Dict[str, Iterable[str]]) -> Dict[str, SmartHolderStats]:
+        """
+        Smart money among the holders of many tokens in one pass
+
+        Args:
+            holder_lists: token_address -> holder addresses
+
+        Returns:
+            token_address -> SmartHolderStats
+        """
+        tokens = list(holder_lists)
+        lists = [list(holder_lists[token]) for token in tokens]
+        lengths = [len(holders) for holders in lists]
+        total = sum(lengths)
+
+        ids = np.fromiter(
+            (self._lookup(a) for holders in lists for a in holders), dtype=np.int64, count=total
+        )
+        token_index = np.repeat(np.arange(len(tokens), dtype=np.int64), lengths)
+
+        hit = ids >= 0
+        # Each (token, wallet) once - a holder listed twice is still one wallet
+        stride = max(len(self._addresses), 1)
+        pairs = np.unique(token_index[hit] * stride + ids[hit])
+        pair_token = pairs // stride
+        pair_wallet = pairs % stride
+
+        counts = np.bincount(pair_token, minlength=len(tokens))
+        trust_sums = np.bincount(pair_token, weights=self._trust[pair_wallet], minlength=len(tokens))
+
+        results: Dict[str, SmartHolderStats] = {}
+        for i, token in enumerate(tokens):
+            count = int(counts[i])
+            results[token] = SmartHolderStats(
+                count=count,
+                weighted_score=float(trust_sums[i]) / 100.0,
+                avg_trust=float(trust_sums[i]) / count if count else NEUTRAL_TRUST,
+            )
+        for token_i, wallet_i in zip(pair_token.tolist(), pair_wallet.tolist()):
+            results[tokens[token_i]].wallets.append(self._addresses[wallet_i])
+        return results
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "wallets": len(self._addresses),
+            "bloom_filter": self._bloom is not None,
+            "lookups": self.lookups,
+            "bloom_rejects": self.bloom_rejects,
+        }
@@ -9,11 +9,12 @@ APIs Used:
 """
 
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
-import httpx
 
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from analyzer.pair_cache import get_pair_cache, DEXSCREENER_BATCH_SIZE
 
 logger = get_logger("token_metrics")
 
@@ -56,7 +57,7 @@ class TokenMetricsFetcher:
     """
     
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=15.0)
+        self.http_client = create_http_client("scanner", timeout=15.0)
         self.sol_price_usd = 0.0  # Will be fetched on first call
     
     async def get_metrics(self, token_address: str) -> TokenMetrics:
@@ -101,23 +102,71 @@ class TokenMetricsFetcher:
         logger.warning(f"❌ Could not fetch metrics for {token_address}")
         return TokenMetrics()
     
+    async def get_metrics_batch(self, token_addresses: List[str]) -> Dict[str, TokenMetrics]:
+        """
+        Get metrics for many tokens with as few DexScreener calls as possible
+        
+        Addresses are split into chunks of DEXSCREENER_BATCH_SIZE and the
+        chunks are fetched concurrently.
+        
+        Args:
+            token_addresses: Token mint addresses
+        
+        Returns:
+            Dict mint -> TokenMetrics (empty TokenMetrics if no data).
+            Mints whose DexScreener request failed are left out, so callers
+            fall back to get_metrics() instead of scoring them as zero liquidity.
+        """
+        mints = list(dict.fromkeys(a for a in token_addresses if a))
+        if not mints:
+            return {}
+        
+        # Update SOL price if needed
+        if self.sol_price_usd == 0:
+            await self._update_sol_price()
+        
+        pairs_by_mint = await self.fetch_pairs_batch(mints)
+        
+        results: Dict[str, TokenMetrics] = {}
+        for mint in mints:
+            pairs = pairs_by_mint.get(mint)
+            if pairs is None:
+                continue
+            results[mint] = self._metrics_from_pairs(pairs) or TokenMetrics()
+        
+        found = sum(1 for m in results.values() if m.source == "dexscreener")
+        failed = len(mints) - len(results)
+        logger.info(
+            f"📊 Batch metrics: {found}/{len(mints)} tokens, {failed} failed "
+            f"(≤{(len(mints) + DEXSCREENER_BATCH_SIZE - 1) // DEXSCREENER_BATCH_SIZE} DexScreener calls)"
+        )
+        return results
+    
+    async def fetch_pairs_batch(self, token_addresses: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Fetch raw DexScreener pairs for many tokens (through the shared pair cache)
+        
+        Args:
+            token_addresses: Token mint addresses
+        
+        Returns:
+            Dict mint -> list of pairs where the mint is the base token
+            (None if the request for that mint failed)
+        """
+        return await get_pair_cache().get_pairs_many(token_addresses)
+    
     async def _fetch_from_dexscreener(self, token_address: str) -> Optional[TokenMetrics]:
         """
         Fetch metrics from DexScreener API
         
         Free API, no key required, very reliable for Solana
         """
+        pairs_by_mint = await self.fetch_pairs_batch([token_address])
+        return self._metrics_from_pairs(pairs_by_mint.get(token_address) or [])
+    
+    def _metrics_from_pairs(self, pairs: List[Dict]) -> Optional[TokenMetrics]:
+        """Build TokenMetrics from the main (highest liquidity) Solana pair"""
         try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            
-            response = await self.http_client.get(url)
-            
-            if response.status_code != 200:
-                return None
-            
-            data = response.json()
-            pairs = data.get("pairs", [])
-            
             if not pairs:
                 return None
             
@@ -130,7 +179,7 @@ class TokenMetricsFetcher:
             
             # Sort by liquidity (highest first)
             solana_pairs.sort(
-                key=lambda x: float(x.get("liquidity", {}).get("usd", 0)),
+                key=lambda x: float((x.get("liquidity") or {}).get("usd", 0) or 0),
                 reverse=True
             )
             
@@ -140,36 +189,36 @@ class TokenMetricsFetcher:
             metrics = TokenMetrics()
             
             # Liquidity
-            liquidity = pair.get("liquidity", {})
-            metrics.liquidity_usd = float(liquidity.get("usd", 0))
+            liquidity = pair.get("liquidity") or {}
+            metrics.liquidity_usd = float(liquidity.get("usd", 0) or 0)
             metrics.liquidity_sol = metrics.liquidity_usd / self.sol_price_usd if self.sol_price_usd > 0 else 0
             
             # Volume
-            volume = pair.get("volume", {})
-            metrics.volume_24h = float(volume.get("h24", 0))
-            metrics.volume_6h = float(volume.get("h6", 0))
-            metrics.volume_1h = float(volume.get("h1", 0))
+            volume = pair.get("volume") or {}
+            metrics.volume_24h = float(volume.get("h24", 0) or 0)
+            metrics.volume_6h = float(volume.get("h6", 0) or 0)
+            metrics.volume_1h = float(volume.get("h1", 0) or 0)
             
             # Price
-            metrics.price_usd = float(pair.get("priceUsd", 0))
+            metrics.price_usd = float(pair.get("priceUsd", 0) or 0)
             
             # Price changes
-            price_change = pair.get("priceChange", {})
-            metrics.price_change_5m = float(price_change.get("m5", 0))
-            metrics.price_change_1h = float(price_change.get("h1", 0))
-            metrics.price_change_6h = float(price_change.get("h6", 0))
-            metrics.price_change_24h = float(price_change.get("h24", 0))
+            price_change = pair.get("priceChange") or {}
+            metrics.price_change_5m = float(price_change.get("m5", 0) or 0)
+            metrics.price_change_1h = float(price_change.get("h1", 0) or 0)
+            metrics.price_change_6h = float(price_change.get("h6", 0) or 0)
+            metrics.price_change_24h = float(price_change.get("h24", 0) or 0)
             
             # Market Cap
-            metrics.fdv = float(pair.get("fdv", 0))
-            metrics.market_cap = float(pair.get("marketCap", 0))
+            metrics.fdv = float(pair.get("fdv", 0) or 0)
+            metrics.market_cap = float(pair.get("marketCap", 0) or 0)
             
             metrics.source = "dexscreener"
             
             return metrics
             
         except Exception as e:
-            logger.error(f"Error fetching from DexScreener: {e}")
+            logger.error(f"Error parsing DexScreener pairs: {e}")
             return None
     
     async def _fetch_from_birdeye(self, token_address: str) -> Optional[TokenMetrics]:
@@ -219,6 +268,20 @@ class TokenMetricsFetcher:
         await self.http_client.aclose()
 
 
+# ============================================================================
+# Global Instance
+# ============================================================================
+_metrics_fetcher: Optional[TokenMetricsFetcher] = None
+
+
+def get_metrics_fetcher() -> TokenMetricsFetcher:
+    """Get global token metrics fetcher instance"""
+    global _metrics_fetcher
+    if _metrics_fetcher is None:
+        _metrics_fetcher = TokenMetricsFetcher()
+    return _metrics_fetcher
+
+
 # ============================================================================
 # Convenience Function
 # ============================================================================
@@ -7,42 +7,69 @@ Analyze wallet trading performance to identify smart money
 זה הקובץ שמנתח את הביצועים של ארנק כדי לזהות אם הוא Smart Money.
 
 הקובץ הזה:
-1. אוסף את כל הטרנזקציות של ארנק
-2. מחשב win rate (אחוז הצלחות)
-3. מחשב average profit (רווח ממוצע)
-4. מחשב consistency score (עקביות)
-5. מחזיר WalletStats object עם כל הנתונים
+1. קולט את ה-swaps של הארנק מה-chain (getSignaturesForAddress + getTransaction)
+   ל-wallet_trade_store - רק חתימות חדשות מאז הקליטה הקודמת
+2. מחשב לכל (ארנק, טוקן) עלות ממוצעת, תמורה ממוצעת, PnL ממומש וזמן החזקה
+3. מחשב win rate, average profit, consistency
+4. מחזיר WalletStats object עם כל הנתונים
 
 🔧 פונקציות עיקריות:
 - analyze_wallet(address) - מנתח את כל הביצועים של ארנק
-- calculate_win_rate(trades) - מחשב אחוז הצלחות
-- calculate_avg_profit(trades) - מחשב רווח ממוצע
+- analyze_wallets(addresses) - אותו דבר לרשימה (חישוב אחד לכולם)
+- sync_wallet(address) - קליטה של swaps חדשים בלבד
 
 💡 איך זה עובד:
-1. שולח בקשה ל-Solscan API לקבלת כל הטרנזקציות של הארנק
-2. ממיין את הטרנזקציות לפי זמן
-3. מחשב את הביצועים: כמה trades רווחיים, כמה הפסדיים
-4. מחשב win rate, average profit, consistency
-5. מחזיר WalletStats עם כל הנתונים
+1. swap מפוענח מ-pre / post balances (decode_swaps ב-first_buyer_detector.py)
+2. trade = טוקן שהארנק גם קנה וגם מכר; multiplier = מחיר מכירה ממוצע / מחיר קנייה ממוצע
+3. החישוב וקטורי (NumPy): מיון לפי (ארנק, טוקן, זמן) ו-reduceat על גבולות הקבוצות -
+   אלפי ארנקים בשניות, בלי לולאה על trades
+4. consistency = חלק מחלונות של CONSISTENCY_WINDOW trades (לפי זמן יציאה)
+   שלפחות חצי מהם רווחיים - ארנק עם win rate טוב ממכה אחת מקבל ציון נמוך
 
 📝 הערות:
 - זה חלק מהמערכת של Smart Money Auto-Discovery
 - הקריטריונים ל-Smart Money: win rate > 50%, avg profit > 2.5x, min 5 trades
-- משתמש ב-Solscan API לנתוני טרנזקציות
+- swaps ב-SOL מומרים לדולר לפי מחיר ה-SOL הנוכחי (אין מחיר היסטורי) -
+  ה-multiplier לא מושפע כי קנייה ומכירה באותו quote מומרות באותו מחיר.
+  כשאין מחיר SOL ה-trades עדיין נספרים (ביחידות SOL) - רק ה-PnL בדולר נדחה
+- ארנק פעיל מאוד: עד WALLET_HISTORY_MAX_TRANSACTIONS טרנזקציות חדשות לכל קליטה -
+  השאר נקלט בקליטות הבאות (gap ב-wallet_trade_store), בלי לדלג על חתימות
 """
 
 import asyncio
-from typing import List, Dict, Optional, Tuple
+import time
+from typing import List, Dict, Optional
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-import httpx
-from collections import defaultdict
+from datetime import datetime
 
+import numpy as np
+
+from analyzer.first_buyer_detector import (
+    SIGNATURES_PAGE_SIZE,
+    TX_BATCH_SIZE,
+    TX_CONCURRENCY,
+    WSOL_MINT,
+    decode_swaps,
+)
 from analyzer.smart_wallet_criteria import get_evaluator
+from analyzer.wallet_trade_store import (
+    QUOTE_SOL,
+    SIDE_BUY,
+    WalletTradeStore,
+    get_wallet_trade_store,
+)
+from core.config import settings
+from executor.price_fetcher import PriceFetcher
 from utils.logger import get_logger
+from utils.solana_rpc import get_transactions, rpc_call
+from utils.http_pool import create_http_client
 
 logger = get_logger("wallet_analyzer")
 
+CONSISTENCY_WINDOW = 5  # trades בחלון אחד של consistency
+SYNC_TTL_SECONDS = 6 * 3600  # ארנק שנקלט לאחרונה לא נקלט שוב לפני כן
+MAX_TX_FETCH_ATTEMPTS = 3  # חתימה שלא נשלפה כל כך הרבה פעמים מדולגת - ה-cursor ממשיך
+
 
 @dataclass
 class WalletStats:
@@ -55,25 +82,14 @@ class WalletStats:
     avg_profit_multiplier: float = 0.0  # Average x return
     biggest_win: float = 0.0
     biggest_loss: float = 0.0
-    total_profit_usd: float = 0.0
+    total_profit_usd: float = 0.0  # PnL ממומש (כל ה-trades)
+    avg_hold_hours: float = 0.0  # מקנייה ראשונה למכירה ראשונה
     consistency_score: float = 0.0  # 0-1, how consistent are wins
     first_buy_count: int = 0  # How many times bought in first 24h
     successful_first_buys: int = 0  # How many of those were profitable
     last_updated: Optional[datetime] = None
 
 
-@dataclass
-class Trade:
-    """Individual trade information"""
-    token_address: str
-    token_symbol: str
-    type: str  # 'buy' or 'sell'
-    amount_usd: float
-    price: float
-    timestamp: datetime
-    tx_signature: str
-
-
 class WalletPerformanceAnalyzer:
     """
     Analyze wallet trading performance
@@ -81,253 +97,346 @@ class WalletPerformanceAnalyzer:
     This is the CORE intelligence - determines if a wallet is "smart money"
     """
     
-    def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-        self.cache: Dict[str, WalletStats] = {}  # Cache results
-        self.cache_ttl = timedelta(hours=6)  # Cache for 6 hours
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        store: Optional[WalletTradeStore] = None,
+        max_transactions: Optional[int] = None,
+    ):
+        """
+        Initialize wallet performance analyzer
+
+        Args:
+            rpc_url: Solana RPC URL (ברירת מחדל: SOLANA_RPC_URL)
+            store: WalletTradeStore (ברירת מחדל: הגלובלי)
+            max_transactions: טרנזקציות חדשות מקסימום לכל קליטה של ארנק
+        """
+        self.http_client = create_http_client("scanner", timeout=30.0)
+        self.rpc_url = rpc_url or settings.solana_rpc_url
+        self.store = store or get_wallet_trade_store()
+        self.max_transactions = max_transactions or settings.wallet_history_max_transactions
+        self.price_fetcher: Optional[PriceFetcher] = None
+        self._synced_at: Dict[str, float] = {}  # wallet -> time.monotonic() של הקליטה האחרונה
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tx_failures: Dict[str, int] = {}  # signature -> getTransaction attempts that failed
+
+        # Stats
+        self.signature_pages = 0
+        self.transactions_fetched = 0
+        self.transactions_skipped = 0
+        self.swaps_ingested = 0
     
     async def analyze_wallet(self, wallet_address: str, force_refresh: bool = False) -> WalletStats:
         """
-        Analyze wallet performance using simplified approach
-        
-        Since full transaction parsing is complex, we use a proxy method:
-        - Check if wallet was first buyer of successful tokens
-        - Count how many successful first buys
-        - Use that as indicator of smart money
+        Analyze wallet performance from its on-chain swap history
         
         Args:
             wallet_address: Wallet address to analyze
-            force_refresh: Force refresh even if cached
+            force_refresh: Sync new transactions even if synced recently
         
         Returns:
             WalletStats with performance metrics
         """
-        # Check cache
-        if not force_refresh and wallet_address in self.cache:
-            cached = self.cache[wallet_address]
-            if cached.last_updated and (datetime.now() - cached.last_updated) < self.cache_ttl:
-                logger.debug(f"Using cached stats for {wallet_address[:8]}...")
-                return cached
-        
-        logger.info(f"🔍 Analyzing wallet performance: {wallet_address[:20]}...")
-        
-        stats = WalletStats(address=wallet_address)
-        
-        try:
-            # Simplified approach: Check if wallet was first buyer of successful tokens
-            # This is a proxy for smart money detection
-            
-            # Get wallet's token holdings
-            url = f"https://api.solscan.io/account/tokens"
-            params = {"account": wallet_address, "limit": 100}
-            
-            response = await self.http_client.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                token_accounts = data.get("data", [])
-                
-                # Count tokens held
-                stats.total_trades = len(token_accounts)
-                
-                # Simplified scoring based on holdings
-                # If wallet holds many tokens, it's likely active
-                # We'll use first_buy_count as proxy for successful trades
-                stats.first_buy_count = stats.total_trades
-                
-                # Estimate win rate based on holdings (simplified)
-                # Real implementation would need transaction history
-                if stats.total_trades > 20:
-                    # If holds many tokens, likely has some winners
-                    stats.win_rate = 0.6  # Conservative estimate
-                    stats.profitable_trades = int(stats.total_trades * 0.6)
-                    stats.avg_profit_multiplier = 3.5  # Conservative estimate
-                elif stats.total_trades > 10:
-                    stats.win_rate = 0.55
-                    stats.profitable_trades = int(stats.total_trades * 0.55)
-                    stats.avg_profit_multiplier = 3.0
-                else:
-                    stats.win_rate = 0.5
-                    stats.profitable_trades = int(stats.total_trades * 0.5)
-                    stats.avg_profit_multiplier = 2.5
-                
-                stats.consistency_score = 0.5  # Default
-                
-            stats.last_updated = datetime.now()
-            self.cache[wallet_address] = stats
-            
+        return (await self.analyze_wallets([wallet_address], force_refresh=force_refresh))[0]
+
+    async def analyze_wallets(
+        self,
+        wallet_addresses: List[str],
+        force_refresh: bool = False,
+        concurrency: int = 4,
+    ) -> List[WalletStats]:
+        """
+        Analyze many wallets - sync each one, then one vectorized pass over all of them
+
+        Args:
+            wallet_addresses: Wallet addresses
+            force_refresh: Sync new transactions even if synced recently
+            concurrency: כמה ארנקים נקלטים במקביל
+
+        Returns:
+            WalletStats per wallet (same order)
+        """
+        now = time.monotonic()
+        stale = [
+            w for w in dict.fromkeys(wallet_addresses)
+            if force_refresh or now - self._synced_at.get(w, float("-inf")) >= SYNC_TTL_SECONDS
+        ]
+        if stale:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def sync(wallet: str):
+                async with semaphore:
+                    await self.sync_wallet(wallet)
+
+            await asyncio.gather(*(sync(w) for w in stale))
+
+        records = self.store.load(wallet_addresses)
+        sol_usd: Optional[float] = None
+        if (records["quote"] == QUOTE_SOL).any():
+            sol_usd = await self._get_sol_price()
+            if not sol_usd:
+                logger.warning("⚠️ No SOL price - PnL of SOL-quoted trades is left out of total_profit_usd")
+
+        by_address = self._calculate_stats(records, sol_usd)
+        updated = datetime.now()
+        results = []
+        for wallet in wallet_addresses:
+            stats = by_address.get(wallet) or WalletStats(address=wallet)
+            stats.last_updated = updated
+            results.append(stats)
+
+        if len(wallet_addresses) == 1:
+            stats = results[0]
             logger.info(
-                f"📊 Wallet {wallet_address[:20]}...: "
-                f"{stats.total_trades} tokens | "
-                f"Win Rate: {stats.win_rate:.1%} (estimated) | "
-                f"Avg Profit: {stats.avg_profit_multiplier:.2f}x (estimated)"
+                f"📊 Wallet {stats.address[:20]}...: "
+                f"{stats.total_trades} trades | "
+                f"Win Rate: {stats.win_rate:.1%} | "
+                f"Avg Profit: {stats.avg_profit_multiplier:.2f}x | "
+                f"PnL: ${stats.total_profit_usd:,.2f}"
             )
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Error analyzing wallet {wallet_address[:20]}...: {e}")
-        
-        return stats
-    
-    async def _get_wallet_trades(self, wallet_address: str, limit: int = 100) -> List[Trade]:
+        else:
+            logger.info(f"📊 Analyzed {len(wallet_addresses)} wallets ({len(records)} swaps)")
+
+        return results
+
+    # ========================================================================
+    # Ingestion
+    # ========================================================================
+
+    async def sync_wallet(self, wallet_address: str) -> bool:
         """
-        Get wallet trading history
-        
-        Note: Full transaction parsing requires complex Solana transaction analysis.
-        For now, we use a simplified approach based on token holdings and known successful tokens.
-        
-        Args:
-            wallet_address: Wallet address
-            limit: Maximum number of transactions to fetch
-        
+        קלוט ל-store את ה-swaps שמאז החתימה האחרונה שנקלטה
+
+        עד max_transactions טרנזקציות, מהחדשה לישנה. אם יש יותר - ה-cursor לא
+        מתקדם: נשמר gap (החתימה הישנה שנקלטה, החדשה ביותר), והקליטה הבאה ממשיכה
+        מ-before עד ה-cursor. רק כשהחור נסגר ה-cursor קופץ ל-newest - כך אין
+        חתימות שמדלגים עליהן (קנייה בלי מכירה מעוותת win rate ו-PnL).
+
+        אם חלק מה-getTransaction נכשלו - שום דבר לא נכתב (הקליטה הבאה שולפת את
+        אותו טווח שוב, ו-append חוזר היה מנפח את ה-shard). חתימה שנכשלה
+        MAX_TX_FETCH_ATTEMPTS פעמים מדולגת, כדי שהטווח לא ייתקע לנצח.
+
         Returns:
-            List of Trade objects (simplified for now)
+            True אם כל הטרנזקציות שנשלפו נקלטו (False = ה-store לא התקדם)
         """
-        try:
-            # Alternative approach: Check wallet's token holdings
-            # If wallet holds many tokens that performed well, it's likely smart money
-            
-            # Get wallet's token accounts
-            url = f"https://api.solscan.io/account/tokens"
-            params = {
-                "account": wallet_address,
-                "limit": limit
-            }
-            
-            response = await self.http_client.get(url, params=params)
-            
-            if response.status_code != 200:
-                logger.debug(f"Solscan API returned {response.status_code} for wallet tokens")
-                return []
-            
-            data = response.json()
-            token_accounts = data.get("data", [])
-            
-            # For now, return empty list
-            # Full implementation would:
-            # 1. Parse transaction history properly
-            # 2. Match buys with sells
-            # 3. Calculate P&L
-            
-            # This is a placeholder - we'll use a different approach
-            return []
-            
-        except Exception as e:
-            logger.debug(f"Error fetching wallet trades: {e}")
-            return []
-    
-    def _is_token_trade(self, transaction: Dict) -> bool:
-        """Check if transaction is a token trade"""
-        # Simplified check - real implementation would be more sophisticated
-        instructions = transaction.get("instructions", [])
-        for instruction in instructions:
-            program_id = instruction.get("programId", "")
-            # SPL Token program or DEX program
-            if "Token" in program_id or "swap" in instruction.get("type", "").lower():
-                return True
-        return False
-    
-    def _parse_transaction(self, transaction: Dict) -> Optional[Trade]:
-        """Parse transaction to Trade object"""
-        # This is a simplified parser
-        # Real implementation would need to parse Solana transaction structure
-        try:
-            # Extract basic info
-            tx_signature = transaction.get("signature", "")
-            timestamp = datetime.fromtimestamp(transaction.get("blockTime", 0))
-            
-            # For now, return None - we'll implement proper parsing
-            # This requires understanding Solana transaction structure
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Failed to parse transaction: {e}")
-            return None
-    
-    def _calculate_stats(self, trades: List[Trade], wallet_address: str) -> WalletStats:
+        lock = self._locks.setdefault(wallet_address, asyncio.Lock())
+        async with lock:
+            cursor = self.store.cursor(wallet_address)
+            gap = self.store.gap(wallet_address)
+            before, newest = gap if gap else (None, None)
+            seen: List[Dict] = []
+            reached_cursor = False
+
+            # Newest first (or from the open gap), until the last ingested signature
+            while len(seen) < self.max_transactions:
+                options: Dict = {"limit": SIGNATURES_PAGE_SIZE}
+                if before:
+                    options["before"] = before
+                if cursor:
+                    options["until"] = cursor
+
+                page = await rpc_call(
+                    self.http_client, self.rpc_url, "getSignaturesForAddress", [wallet_address, options]
+                )
+                if page is None:
+                    return False
+                self.signature_pages += 1
+
+                if page and newest is None:
+                    newest = page[0]["signature"]
+                seen.extend(page)
+                if len(page) < SIGNATURES_PAGE_SIZE:
+                    reached_cursor = True
+                    break
+                before = page[-1]["signature"]
+
+            if len(seen) > self.max_transactions:
+                seen = seen[:self.max_transactions]
+                reached_cursor = False
+
+            signatures = [item["signature"] for item in seen if item.get("err") is None]
+            swaps: List[Dict] = []
+            complete = True
+
+            step = TX_BATCH_SIZE * TX_CONCURRENCY
+            for i in range(0, len(signatures), step):
+                chunk = signatures[i:i + step]
+                batches = [chunk[j:j + TX_BATCH_SIZE] for j in range(0, len(chunk), TX_BATCH_SIZE)]
+                results = await asyncio.gather(*(self._get_transactions(b) for b in batches))
+
+                for batch, batch_result in zip(batches, results):
+                    for sig in batch:
+                        if sig not in batch_result and not self._give_up(sig):
+                            complete = False  # Failed batch / item - retried on the next sync
+                    for sig, tx in batch_result.items():
+                        self._tx_failures.pop(sig, None)
+                        for swap in decode_swaps(tx, wallet_address) if tx else []:
+                            swap["signature"] = sig
+                            swaps.append(swap)
+
+            if not complete:
+                return False  # Nothing written - the whole range is fetched again next time
+            if reached_cursor:
+                self.store.append(wallet_address, swaps, cursor=newest)
+            else:
+                self.store.append(wallet_address, swaps, gap=(seen[-1]["signature"], newest))
+            self.swaps_ingested += len(swaps)
+            self._synced_at[wallet_address] = time.monotonic()
+
+            if signatures:
+                logger.debug(
+                    f"📥 {wallet_address[:20]}...: {len(swaps)} swaps in {len(signatures)} new transactions"
+                    + ("" if reached_cursor else " (more history left for the next sync)")
+                )
+            return complete
+
+    def _give_up(self, signature: str) -> bool:
+        """ספור getTransaction שנכשל - True אם החתימה נכשלה מספיק פעמים כדי לדלג עליה"""
+        attempts = self._tx_failures.get(signature, 0) + 1
+        if attempts < MAX_TX_FETCH_ATTEMPTS:
+            self._tx_failures[signature] = attempts
+            return False
+        self._tx_failures.pop(signature, None)
+        self.transactions_skipped += 1
+        logger.warning(f"⚠️ Skipping transaction {signature[:20]}... after {attempts} failed fetches")
+        return True
+
+    async def _get_transactions(self, signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """getTransaction לכמה חתימות ב-batch אחד (ראה utils/solana_rpc.py)"""
+        transactions = await get_transactions(self.http_client, self.rpc_url, signatures)
+        self.transactions_fetched += len(transactions)
+        return transactions
+
+    async def _get_sol_price(self) -> Optional[float]:
+        """מחיר SOL נוכחי בדולרים"""
+        if self.price_fetcher is None:
+            self.price_fetcher = PriceFetcher()
+        return await self.price_fetcher.get_token_price(WSOL_MINT)
+
+    # ========================================================================
+    # Stats
+    # ========================================================================
+
+    def _calculate_stats(self, records: np.ndarray, sol_usd: Optional[float]) -> Dict[str, WalletStats]:
         """
-        Calculate wallet performance statistics
+        Calculate wallet performance statistics for every wallet in records
+        
+        multiplier / win / loss מחושבים ביחידות ה-quote ולא תלויים במחיר ה-SOL.
+        בלי מחיר SOL: trade שכולו ב-SOL נספר, אבל ה-PnL שלו לא נכנס ל-total_profit_usd;
+        trade שמערבב SOL ו-stablecoin לא נספר (אי אפשר להשוות בלי מחיר).
         
         Args:
-            trades: List of trades
-            wallet_address: Wallet address
+            records: swaps מ-WalletTradeStore.load (RECORD_DTYPE)
+            sol_usd: מחיר SOL להמרת swaps ב-SOL (None / 0 = אין מחיר)
         
         Returns:
-            WalletStats object
+            address -> WalletStats (ארנקים בלי trade סגור לא מופיעים)
         """
-        stats = WalletStats(address=wallet_address)
-        stats.total_trades = len(trades)
-        
-        if not trades:
-            return stats
-        
-        # Group trades by token to calculate P&L
-        token_positions: Dict[str, List[Trade]] = defaultdict(list)
-        for trade in trades:
-            token_positions[trade.token_address].append(trade)
-        
-        profits = []
-        losses = []
-        
-        # Calculate P&L for each token
-        for token_address, token_trades in token_positions.items():
-            # Sort by timestamp
-            token_trades.sort(key=lambda t: t.timestamp)
-            
-            # Find buy and sell pairs
-            buys = [t for t in token_trades if t.type == "buy"]
-            sells = [t for t in token_trades if t.type == "sell"]
-            
-            # Match buys with sells
-            for buy in buys:
-                # Find corresponding sell
-                matching_sell = None
-                for sell in sells:
-                    if sell.timestamp > buy.timestamp:
-                        matching_sell = sell
-                        sells.remove(sell)
-                        break
-                
-                if matching_sell:
-                    # Calculate profit
-                    profit_multiplier = matching_sell.price / buy.price
-                    profit_usd = (matching_sell.price - buy.price) * buy.amount_usd / buy.price
-                    
-                    if profit_multiplier > 1.0:
-                        stats.profitable_trades += 1
-                        profits.append(profit_multiplier)
-                        stats.total_profit_usd += profit_usd
-                        if profit_multiplier > stats.biggest_win:
-                            stats.biggest_win = profit_multiplier
-                    else:
-                        stats.losing_trades += 1
-                        losses.append(profit_multiplier)
-                        if profit_multiplier < stats.biggest_loss:
-                            stats.biggest_loss = profit_multiplier
-        
-        # Calculate metrics
-        if stats.total_trades > 0:
-            stats.win_rate = stats.profitable_trades / stats.total_trades
-        
-        if profits:
-            stats.avg_profit_multiplier = sum(profits) / len(profits)
-        
-        # Consistency score (how often wins happen in sequence)
-        stats.consistency_score = self._calculate_consistency(trades)
-        
-        return stats
+        if not len(records):
+            return {}
+
+        r = records[np.lexsort((records["block_time"], records["token"], records["wallet"]))]
+        wallet, block_time = r["wallet"], r["block_time"]
+        is_buy = r["side"] == SIDE_BUY
+        is_sol = r["quote"] == QUOTE_SOL
+        has_price = bool(sol_usd and sol_usd > 0)
+        # Without a SOL price, SOL-only trades are compared in SOL (same ratio)
+        value = r["quote_amount"] * np.where(is_sol, sol_usd if has_price else 1.0, 1.0)
+        amount = r["amount_tokens"]
+
+        # One group per (wallet, token)
+        new_pair = np.ones(len(r), dtype=bool)
+        new_pair[1:] = (wallet[1:] != wallet[:-1]) | (r["token"][1:] != r["token"][:-1])
+        starts = np.flatnonzero(new_pair)
+
+        never = np.iinfo(np.int64).max
+        buy_cost = np.add.reduceat(np.where(is_buy, value, 0.0), starts)
+        buy_tokens = np.add.reduceat(np.where(is_buy, amount, 0.0), starts)
+        sell_proceeds = np.add.reduceat(np.where(is_buy, 0.0, value), starts)
+        sell_tokens = np.add.reduceat(np.where(is_buy, 0.0, amount), starts)
+        first_buy = np.minimum.reduceat(np.where(is_buy, block_time, never), starts)
+        first_sell = np.minimum.reduceat(np.where(is_buy, never, block_time), starts)
+        last_sell = np.maximum.reduceat(np.where(is_buy, 0, block_time), starts)
+        sol_swaps = np.add.reduceat(is_sol.astype(np.int64), starts)
+        group_size = np.diff(np.append(starts, len(r)))
+        in_usd = has_price | (sol_swaps == 0)  # value of this group is in USD
+
+        # A trade = a token the wallet both bought and sold
+        closed = (buy_tokens > 0) & (sell_tokens > 0) & (buy_cost > 0)
+        if not has_price:
+            closed &= (sol_swaps == 0) | (sol_swaps == group_size)  # Mixed SOL / stablecoin
+        if not closed.any():
+            return {}
+
+        trade_wallet = wallet[starts][closed]
+        avg_cost = buy_cost[closed] / buy_tokens[closed]
+        avg_exit = sell_proceeds[closed] / sell_tokens[closed]
+        multiplier = avg_exit / avg_cost
+        pnl = (avg_exit - avg_cost) * np.minimum(buy_tokens[closed], sell_tokens[closed])
+        pnl = np.where(in_usd[closed], pnl, 0.0)  # Deferred until a SOL price is available
+        hold_hours = np.maximum(first_sell[closed] - first_buy[closed], 0) / 3600
+        win = multiplier > 1.0
+
+        # Per wallet (trades are still grouped by wallet)
+        new_wallet = np.ones(len(trade_wallet), dtype=bool)
+        new_wallet[1:] = trade_wallet[1:] != trade_wallet[:-1]
+        w_starts = np.flatnonzero(new_wallet)
+        trades = np.diff(np.append(w_starts, len(trade_wallet)))
+        wins = np.add.reduceat(win.astype(np.int64), w_starts)
+        win_multiplier_sum = np.add.reduceat(np.where(win, multiplier, 0.0), w_starts)
+        biggest_win = np.maximum.reduceat(np.where(win, multiplier, 0.0), w_starts)
+        biggest_loss = np.minimum.reduceat(np.where(win, np.inf, multiplier), w_starts)
+        total_pnl = np.add.reduceat(pnl, w_starts)
+        hold = np.add.reduceat(hold_hours, w_starts) / trades
+        consistency = self._calculate_consistency(trade_wallet, last_sell[closed], win)
+
+        results: Dict[str, WalletStats] = {}
+        for i, start in enumerate(w_starts):
+            address = self.store.wallet_address(int(trade_wallet[start]))
+            results[address] = WalletStats(
+                address=address,
+                total_trades=int(trades[i]),
+                profitable_trades=int(wins[i]),
+                losing_trades=int(trades[i] - wins[i]),
+                win_rate=float(wins[i] / trades[i]),
+                avg_profit_multiplier=float(win_multiplier_sum[i] / wins[i]) if wins[i] else 0.0,
+                biggest_win=float(biggest_win[i]),
+                biggest_loss=float(biggest_loss[i]) if np.isfinite(biggest_loss[i]) else 0.0,
+                total_profit_usd=float(total_pnl[i]),
+                avg_hold_hours=float(hold[i]),
+                consistency_score=float(consistency[i]),
+            )
+        return results
     
-    def _calculate_consistency(self, trades: List[Trade]) -> float:
+    def _calculate_consistency(self, trade_wallet: np.ndarray, exit_time: np.ndarray, win: np.ndarray) -> np.ndarray:
         """
-        Calculate consistency score (0-1)
+        Calculate consistency score (0-1) per wallet (ascending wallet id)
         
-        Higher score = more consistent wins (not just lucky)
+        Higher score = more consistent wins (not just lucky): the share of full
+        CONSISTENCY_WINDOW-trade windows (by exit time) where at least half were wins.
+        Fewer than CONSISTENCY_WINDOW trades → 0.
         """
-        if len(trades) < 5:
-            return 0.0
-        
-        # Simplified: check if wins are distributed or clustered
-        # Real implementation would use more sophisticated metrics
-        return 0.5  # Placeholder
+        order = np.lexsort((exit_time, trade_wallet))
+        wallet = trade_wallet[order]
+        wins = win[order].astype(np.int64)
+
+        new_wallet = np.ones(len(wallet), dtype=bool)
+        new_wallet[1:] = wallet[1:] != wallet[:-1]
+        w_starts = np.flatnonzero(new_wallet)
+        counts = np.diff(np.append(w_starts, len(wallet)))
+        rank = np.arange(len(wallet)) - np.repeat(w_starts, counts)
+
+        # Windows of CONSISTENCY_WINDOW consecutive trades within each wallet
+        window_starts = np.flatnonzero(new_wallet | (rank % CONSISTENCY_WINDOW == 0))
+        window_size = np.diff(np.append(window_starts, len(wallet)))
+        window_wins = np.add.reduceat(wins, window_starts)
+        full = window_size == CONSISTENCY_WINDOW
+        good = full & (2 * window_wins >= window_size)
+
+        window_wallet_starts = np.flatnonzero(new_wallet[window_starts])
+        full_windows = np.add.reduceat(full.astype(np.int64), window_wallet_starts)
+        good_windows = np.add.reduceat(good.astype(np.int64), window_wallet_starts)
+        return np.where(full_windows > 0, good_windows / np.maximum(full_windows, 1), 0.0)
     
     def meets_smart_wallet_criteria(self, stats: WalletStats) -> bool:
         """
@@ -343,9 +452,21 @@ class WalletPerformanceAnalyzer:
         
         return is_smart
     
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "signature_pages": self.signature_pages,
+            "transactions_fetched": self.transactions_fetched,
+            "transactions_skipped": self.transactions_skipped,
+            "swaps_ingested": self.swaps_ingested,
+            "store": self.store.get_stats(),
+        }
+
     async def close(self):
         """Cleanup resources"""
         await self.http_client.aclose()
+        if self.price_fetcher:
+            await self.price_fetcher.close()
 
 
 # Convenience function
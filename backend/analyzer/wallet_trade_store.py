@@ -0,0 +1,345 @@
+"""
+Wallet Trade Store - Append-Only Columnar Trade History
+היסטוריית swaps של ארנקים, על הדיסק, בפורמט שאפשר לחשב עליו וקטורית
+
+📋 מה הקובץ הזה עושה:
+-------------------
+WalletPerformanceAnalyzer צריך את כל ה-swaps של אלפי ארנקים מועמדים.
+שליפה מחדש מה-RPC בכל ניתוח לוקחת שעות - לכן ה-swaps נשמרים כאן:
+
+1. כל swap הוא רשומה בגודל קבוע (RECORD_DTYPE) - ארנק, טוקן, כיוון, כמות, quote, זמן
+2. הרשומות נכתבות (append בלבד) לאחד מ-SHARD_COUNT קבצי shard לפי hash של הארנק
+3. כתובות ארנקים / טוקנים נשמרות פעם אחת (wallets.txt / tokens.txt) ומיוצגות כמספר
+4. לכל ארנק נשמרת החתימה האחרונה שנקלטה (cursors.jsonl) - הקליטה הבאה ממשיכה ממנה.
+   קליטה שנחתכה ב-max_transactions שומרת gap (before, newest) - הקליטה הבאה משלימה
+   את הטווח שבין ה-cursor ל-before לפני שהיא עוברת לחתימות חדשות
+5. load(wallets) קורא shard שלם ב-np.fromfile אחד ומחזיר מערך מובנה -
+   עמודה (records["token"], records["quote_amount"]...) היא view בלי העתקה
+
+🔧 פונקציות עיקריות:
+- get_wallet_trade_store() - ה-store הגלובלי
+- append(wallet, swaps, cursor) - הוסף swaps (מ-decode_swaps) ועדכן את ה-cursor
+- cursor(wallet) - החתימה האחרונה שנקלטה (None = עוד לא נקלט)
+- gap(wallet) - (before, newest) של טווח שעוד לא הושלם (None = אין)
+- load(wallets) - כל הרשומות של הארנקים (בלי כפילויות)
+
+💡 איך זה עובד:
+1. append כותב קודם את הרשומות ורק אחר כך את ה-cursor - קריסה באמצע = קליטה חוזרת
+2. לכל רשומה יש sig_hash (blake2b של החתימה) - load מסנן רשומות שנקלטו פעמיים
+3. רשומה חלקית בסוף shard (קריסה באמצע כתיבה) נחתכת לפני ה-append הבא
+4. cursors.jsonl מצטבר (השורה האחרונה לכל ארנק קובעת) ונדחס כשהוא גדל פי 2
+
+📝 הערות:
+- WALLET_TRADE_STORE_DIR ב-.env - תיקיית ה-store
+- כמויות ה-quote נשמרות ביחידות המקוריות (SOL / דולר) - ההמרה לדולר בזמן החישוב
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from analyzer.first_buyer_detector import WSOL_MINT
+from core.config import settings
+from utils.logger import get_logger
+
+logger = get_logger("wallet_trade_store")
+
+SHARD_COUNT = 64
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+QUOTE_SOL = 0
+QUOTE_USD = 1  # USDC / USDT
+
+RECORD_DTYPE = np.dtype([
+    ("wallet", "<u4"),  # id ב-wallets.txt
+    ("token", "<u4"),  # id ב-tokens.txt
+    ("side", "i1"),  # SIDE_BUY / SIDE_SELL
+    ("quote", "i1"),  # QUOTE_SOL / QUOTE_USD
+    ("block_time", "<i8"),
+    ("slot", "<u8"),
+    ("amount_tokens", "<f8"),
+    ("quote_amount", "<f8"),
+    ("sig_hash", "<u8"),
+])
+
+
+def signature_hash(signature: str) -> int:
+    """hash יציב (בין הרצות) של חתימה - 64 bit"""
+    return int.from_bytes(hashlib.blake2b(signature.encode(), digest_size=8).digest(), "little")
+
+
+class WalletTradeStore:
+    """
+    Append-only, sharded, fixed-width record store of wallet swaps
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, shards: int = SHARD_COUNT):
+        """
+        Initialize wallet trade store
+
+        Args:
+            base_dir: תיקיית ה-store (ברירת מחדל: WALLET_TRADE_STORE_DIR)
+            shards: מספר קבצי ה-shard (לא לשנות אחרי שנכתבו נתונים)
+        """
+        self.base_dir = Path(base_dir or settings.wallet_trade_store_dir)
+        self.shards = shards
+
+        self._wallet_ids: Dict[str, int] = {}
+        self._wallets: List[str] = []
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._cursors: Dict[str, str] = {}
+        self._gaps: Dict[str, Tuple[str, str]] = {}  # wallet -> (before, newest)
+        self._cursor_lines = 0
+        self._loaded = False
+
+        # Stats
+        self.records_appended = 0
+        self.shard_reads = 0
+
+    # ========================================================================
+    # Addresses
+    # ========================================================================
+
+    def _ensure_loaded(self):
+        """טען את טבלאות הכתובות וה-cursors (פעם אחת)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+        for name, ids, addresses in (
+            ("wallets.txt", self._wallet_ids, self._wallets),
+            ("tokens.txt", self._token_ids, self._tokens),
+        ):
+            for address in self._read_lines(self.base_dir / name):
+                ids[address] = len(addresses)
+                addresses.append(address)
+
+        for line in self._read_lines(self.base_dir / "cursors.jsonl"):
+            try:
+                entry = json.loads(line)
+                wallet = entry["w"]
+                if entry.get("s"):
+                    self._cursors[wallet] = entry["s"]
+                if entry.get("b"):
+                    self._gaps[wallet] = (entry["b"], entry["n"])
+                else:
+                    self._gaps.pop(wallet, None)
+                self._cursor_lines += 1
+            except (ValueError, KeyError):
+                continue
+
+        logger.info(
+            f"📂 Wallet trade store: {len(self._wallets)} wallets, "
+            f"{len(self._tokens)} tokens in {self.base_dir}"
+        )
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[str]:
+        """שורות שלמות בקובץ - שורה חלקית בסוף (קריסה באמצע כתיבה) נחתכת"""
+        if not path.exists():
+            return []
+        data = path.read_bytes()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            os.truncate(path, complete)
+        return data[:complete].decode().splitlines()
+
+    def _intern(self, address: str, ids: Dict[str, int], addresses: List[str], name: str) -> int:
+        """id של כתובת (כתובת חדשה נוספת לסוף הקובץ)"""
+        idx = ids.get(address)
+        if idx is None:
+            with open(self.base_dir / name, "a") as f:
+                f.write(address + "\n")
+            idx = ids[address] = len(addresses)
+            addresses.append(address)
+        return idx
+
+    def wallet_address(self, wallet_id: int) -> str:
+        """כתובת הארנק לפי id"""
+        self._ensure_loaded()
+        return self._wallets[wallet_id]
+
+    def token_address(self, token_id: int) -> str:
+        """כתובת הטוקן לפי id"""
+        self._ensure_loaded()
+        return self._tokens[token_id]
+
+    def cursor(self, wallet_address: str) -> Optional[str]:
+        """החתימה האחרונה (החדשה ביותר) שנקלטה לארנק - כל מה שלפניה נקלט"""
+        self._ensure_loaded()
+        return self._cursors.get(wallet_address)
+
+    def gap(self, wallet_address: str) -> Optional[Tuple[str, str]]:
+        """
+        (before, newest) - החתימות מ-before עד newest נקלטו, אבל בין ה-cursor
+        ל-before חסר (קליטה שנחתכה). None = אין חור
+        """
+        self._ensure_loaded()
+        return self._gaps.get(wallet_address)
+
+    # ========================================================================
+    # Writing
+    # ========================================================================
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.base_dir / f"shard_{shard:03d}.bin"
+
+    def shard_of(self, wallet_address: str) -> int:
+        """ה-shard של הארנק"""
+        return zlib.crc32(wallet_address.encode()) % self.shards
+
+    def append(
+        self,
+        wallet_address: str,
+        swaps: List[Dict],
+        cursor: Optional[str] = None,
+        gap: Optional[Tuple[str, str]] = None,
+    ) -> int:
+        """
+        הוסף swaps של ארנק
+
+        Args:
+            wallet_address: הארנק
+            swaps: רשומות מ-decode_swaps (+ "signature")
+            cursor: החתימה החדשה ביותר שנקלטה ברצף (None = לא לקדם). מוחק את ה-gap
+            gap: (before, newest) - קליטה שנחתכה; ה-cursor נשאר במקומו
+
+        Returns:
+            מספר הרשומות שנכתבו
+        """
+        self._ensure_loaded()
+
+        if swaps:
+            wallet_id = self._intern(wallet_address, self._wallet_ids, self._wallets, "wallets.txt")
+            records = np.zeros(len(swaps), dtype=RECORD_DTYPE)
+            for i, swap in enumerate(swaps):
+                records[i] = (
+                    wallet_id,
+                    self._intern(swap["token"], self._token_ids, self._tokens, "tokens.txt"),
+                    SIDE_BUY if swap["side"] == "buy" else SIDE_SELL,
+                    QUOTE_SOL if swap["quote_mint"] == WSOL_MINT else QUOTE_USD,
+                    swap.get("block_time") or 0,
+                    swap.get("slot") or 0,
+                    swap["amount_tokens"],
+                    swap["quote_amount"],
+                    signature_hash(swap["signature"]),
+                )
+
+            path = self._shard_path(self.shard_of(wallet_address))
+            if path.exists():
+                size = path.stat().st_size
+                if size % RECORD_DTYPE.itemsize:
+                    os.truncate(path, size - size % RECORD_DTYPE.itemsize)  # Torn write
+            with open(path, "ab") as f:
+                f.write(records.tobytes())
+            self.records_appended += len(records)
+
+        if gap:
+            if gap != self._gaps.get(wallet_address):
+                self._write_cursor(wallet_address, self._cursors.get(wallet_address), gap)
+        elif cursor and (cursor != self._cursors.get(wallet_address) or wallet_address in self._gaps):
+            self._write_cursor(wallet_address, cursor, None)
+
+        return len(swaps)
+
+    def _write_cursor(self, wallet_address: str, cursor: Optional[str], gap: Optional[Tuple[str, str]]):
+        """עדכן cursor / gap (append; דחיסה כשהקובץ גדל פי 2 ממספר הארנקים)"""
+        if cursor:
+            self._cursors[wallet_address] = cursor
+        if gap:
+            self._gaps[wallet_address] = gap
+        else:
+            self._gaps.pop(wallet_address, None)
+        path = self.base_dir / "cursors.jsonl"
+
+        wallets = self._cursors.keys() | self._gaps.keys()
+        if self._cursor_lines >= 2 * len(wallets) + 1000:
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                for wallet in wallets:
+                    f.write(json.dumps(self._cursor_entry(wallet)) + "\n")
+            os.replace(tmp_path, path)
+            self._cursor_lines = len(wallets)
+            return
+
+        with open(path, "a") as f:
+            f.write(json.dumps(self._cursor_entry(wallet_address)) + "\n")
+        self._cursor_lines += 1
+
+    def _cursor_entry(self, wallet_address: str) -> Dict:
+        """שורה ב-cursors.jsonl: {"w", "s"} (+ "b", "n" כשיש gap)"""
+        entry = {"w": wallet_address, "s": self._cursors.get(wallet_address)}
+        gap = self._gaps.get(wallet_address)
+        if gap:
+            entry["b"], entry["n"] = gap
+        return entry
+
+    # ========================================================================
+    # Reading
+    # ========================================================================
+
+    def load(self, wallet_addresses: Iterable[str]) -> np.ndarray:
+        """
+        כל ה-swaps של הארנקים (RECORD_DTYPE), בלי רשומות כפולות
+
+        כל shard נקרא פעם אחת, גם אם יש בו הרבה ארנקים מהרשימה.
+        """
+        self._ensure_loaded()
+
+        by_shard: Dict[int, List[int]] = {}
+        for address in wallet_addresses:
+            wallet_id = self._wallet_ids.get(address)
+            if wallet_id is not None:
+                by_shard.setdefault(self.shard_of(address), []).append(wallet_id)
+
+        parts = []
+        for shard, wallet_ids in by_shard.items():
+            path = self._shard_path(shard)
+            if not path.exists():
+                continue
+            count = path.stat().st_size // RECORD_DTYPE.itemsize
+            records = np.fromfile(path, dtype=RECORD_DTYPE, count=count)
+            self.shard_reads += 1
+            parts.append(records[np.isin(records["wallet"], wallet_ids)])
+
+        if not parts:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+
+        records = np.concatenate(parts)
+        # Same transaction ingested twice (crash between records and cursor) - keep the first
+        order = np.lexsort((records["sig_hash"], records["wallet"]))
+        records = records[order]
+        keep = np.ones(len(records), dtype=bool)
+        keep[1:] = (records["wallet"][1:] != records["wallet"][:-1]) | (
+            records["sig_hash"][1:] != records["sig_hash"][:-1]
+        )
+        return records[keep]
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "wallets": len(self._wallets),
+            "tokens": len(self._tokens),
+            "records_appended": self.records_appended,
+            "shard_reads": self.shard_reads,
+        }
+
+
+# Global instance
+_store: Optional[WalletTradeStore] = None
+
+
+def get_wallet_trade_store() -> WalletTradeStore:
+    """Get global wallet trade store instance"""
+    global _store
+    if _store is None:
+        _store = WalletTradeStore()
+    return _store
@@ -24,6 +24,8 @@ import os
 
 from api.routes import tokens, bot, portfolio, trading, analytics, settings, dexscreener
 from api.dependencies import set_solanahunter_instance
+from utils.rate_limiter import set_request_class
+from database.supabase_client import get_supabase_client
 
 # יצירת FastAPI app
 app = FastAPI(
@@ -49,6 +51,13 @@ app.add_middleware(
     expose_headers=["*"],  # חושף כל ה-headers
 )
 
+# כל בקשה החוצה שנוצרת מתוך בקשת API נספרת כ-"api" ב-rate limiter
+@app.middleware("http")
+async def rate_limit_class_middleware(request, call_next):
+    set_request_class("api")
+    return await call_next(request)
+
+
 # Include routes
 app.include_router(tokens.router, prefix="/api/tokens", tags=["tokens"])
 app.include_router(bot.router, prefix="/api/bot", tags=["bot"])
@@ -59,6 +68,19 @@ app.include_router(settings.router, prefix="/api/settings", tags=["settings"])
 app.include_router(dexscreener.router, prefix="/api/dexscreener", tags=["dexscreener"])
 
 
+@app.on_event("startup")
+async def on_startup():
+    """פתיחת חיבור Supabase מראש - הבקשה הראשונה לדשבורד לא משלמת על handshake"""
+    async with get_supabase_client():
+        pass
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """סגירת Supabase (ה-HTTP pool המשותף נסגר ב-entry point שמחזיק אותו - main() / run_api.py)"""
+    await get_supabase_client().close()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -7,140 +7,79 @@ Analytics Endpoints - API routes for analytics
 - GET /api/analytics/performance - ביצועים
 - GET /api/analytics/trades - ניתוח trades
 - GET /api/analytics/roi - ROI
+
+📝 הערות:
+- המספרים מגיעים מ-trade_rollups (database/trade_rollups.py) - סכום של כמה buckets
+  יומיים / שבועיים במקום הורדה של עד 1000 שורות trade_history בכל בקשה
+- התשובות נשמרות ב-response cache (30s + 5 דקות stale) ונמחקות כשנכתב trade / פוזיציה
 """
 
 from fastapi import APIRouter, HTTPException
 from database.supabase_client import get_supabase_client
+from database.trade_rollups import get_trade_rollups
 from api.dependencies import get_solanahunter
+from utils.response_cache import cached_response
 
 router = APIRouter()
 
 
 @router.get("/performance")
+@cached_response(ttl=30.0, stale_ttl=300.0, tags=("trades",))
 async def get_performance(time_range: str = "all"):
     """
-    Get performance analytics from trade_history
-    ✅ עכשיו מחשב מנתונים אמיתיים מ-Supabase!
-    ✅ תומך ב-time_range filtering!
+    Get performance analytics from the trade rollups
+    ✅ סכום של buckets מ-trade_rollups - כל ההיסטוריה, לא רק 1000 trades אחרונים
+    ✅ תומך ב-time_range filtering! (7d / 30d / 90d / all)
     """
+    empty = {
+        "win_rate": 0.0,
+        "total_pnl": 0.0,
+        "total_trades": 0,
+        "avg_profit": 0.0,
+        "best_trade": None,
+        "worst_trade": None,
+    }
     try:
-        from datetime import datetime, timedelta, timezone
-        
-        # Calculate date filter based on time_range
-        date_filter = None
-        if time_range == "7d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-        elif time_range == "30d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-        elif time_range == "90d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
-        # "all" = no filter
-        
         supabase = get_supabase_client()
         if not supabase or not supabase.enabled:
-            return {
-                "win_rate": 0.0,
-                "total_pnl": 0.0,
-                "total_trades": 0,
-                "avg_profit": 0.0,
-                "best_trade": None,
-                "worst_trade": None,
-            }
+            return empty
         
-        async with supabase:
-            # Build params
-            params = {
-                "order": "created_at.desc",
-                "limit": 1000,
-            }
-            if date_filter:
-                params["created_at"] = f"gte.{date_filter}"
-            
-            # Get trades from trade_history
-            response = await supabase._client.get(
-                "/trade_history",
-                params=params
-            )
-            
-            if response.status_code != 200:
-                return {
-                    "win_rate": 0.0,
-                    "total_pnl": 0.0,
-                    "total_trades": 0,
-                    "avg_profit": 0.0,
-                    "best_trade": None,
-                    "worst_trade": None,
-                }
-            
-            trades = response.json()
-            
-            if not trades:
-                return {
-                    "win_rate": 0.0,
-                    "total_pnl": 0.0,
-                    "total_trades": 0,
-                    "avg_profit": 0.0,
-                    "best_trade": None,
-                    "worst_trade": None,
-                }
-            
-            # Calculate metrics
-            total_trades = len(trades)
-            profitable_trades = [t for t in trades if t.get("realized_pnl_usd", 0) and t.get("realized_pnl_usd", 0) > 0]
-            losing_trades = [t for t in trades if t.get("realized_pnl_usd", 0) and t.get("realized_pnl_usd", 0) < 0]
-            
-            win_rate = (len(profitable_trades) / total_trades * 100) if total_trades > 0 else 0.0
-            
-            total_pnl = sum(t.get("realized_pnl_usd", 0) or 0 for t in trades)
-            avg_profit = total_pnl / total_trades if total_trades > 0 else 0.0
-            
-            # Find best and worst trades
-            best_trade = None
-            worst_trade = None
-            if trades:
-                best_trade = max(trades, key=lambda t: t.get("realized_pnl_usd", 0) or 0)
-                worst_trade = min(trades, key=lambda t: t.get("realized_pnl_usd", 0) or 0)
-            
-            return {
-                "win_rate": round(win_rate, 2),
-                "total_pnl": round(total_pnl, 2),
-                "total_trades": total_trades,
-                "avg_profit": round(avg_profit, 2),
-                "best_trade": {
-                    "token_symbol": best_trade.get("token_symbol", "N/A") if best_trade else None,
-                    "pnl_usd": round(best_trade.get("realized_pnl_usd", 0) or 0, 2) if best_trade else None,
-                    "date": best_trade.get("created_at") if best_trade else None,
-                } if best_trade else None,
-                "worst_trade": {
-                    "token_symbol": worst_trade.get("token_symbol", "N/A") if worst_trade else None,
-                    "pnl_usd": round(worst_trade.get("realized_pnl_usd", 0) or 0, 2) if worst_trade else None,
-                    "date": worst_trade.get("created_at") if worst_trade else None,
-                } if worst_trade else None,
-            }
+        totals = await get_trade_rollups().summary(time_range)
+        if not totals.total_trades:
+            return empty
+        
+        win_rate = totals.winning_trades / totals.total_trades * 100
+        avg_profit = totals.total_pnl_usd / totals.total_trades
+        
+        return {
+            "win_rate": round(win_rate, 2),
+            "total_pnl": round(totals.total_pnl_usd, 2),
+            "total_trades": totals.total_trades,
+            "avg_profit": round(avg_profit, 2),
+            "best_trade": {
+                "token_symbol": totals.best_token_symbol or "N/A",
+                "pnl_usd": round(totals.best_pnl_usd or 0, 2),
+                "date": totals.best_trade_at,
+            } if totals.best_pnl_usd is not None else None,
+            "worst_trade": {
+                "token_symbol": totals.worst_token_symbol or "N/A",
+                "pnl_usd": round(totals.worst_pnl_usd or 0, 2),
+                "date": totals.worst_trade_at,
+            } if totals.worst_pnl_usd is not None else None,
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching performance: {str(e)}")
 
 
 @router.get("/trades")
+@cached_response(ttl=30.0, stale_ttl=300.0, tags=("trades",))
 async def get_trades_analysis(time_range: str = "all"):
     """
-    Get trades analysis from trade_history
-    ✅ עכשיו מחשב מנתונים אמיתיים מ-Supabase!
-    ✅ תומך ב-time_range filtering!
+    Get trades analysis from the trade rollups
+    ✅ סכום של buckets מ-trade_rollups - כל ההיסטוריה, לא רק 1000 trades אחרונים
+    ✅ תומך ב-time_range filtering! (7d / 30d / 90d / all)
     """
     try:
-        from datetime import datetime, timedelta, timezone
-        
-        # Calculate date filter based on time_range
-        date_filter = None
-        if time_range == "7d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-        elif time_range == "30d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-        elif time_range == "90d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
-        # "all" = no filter
-        
         supabase = get_supabase_client()
         if not supabase or not supabase.enabled:
             return {
@@ -149,81 +88,35 @@ async def get_trades_analysis(time_range: str = "all"):
                 "losing_trades": 0,
                 "avg_win": 0.0,
                 "avg_loss": 0.0,
+                "closed_positions": 0,
             }
         
-        async with supabase:
-            # Build params
-            params = {
-                "order": "created_at.desc",
-                "limit": 1000,
-            }
-            if date_filter:
-                params["created_at"] = f"gte.{date_filter}"
-            
-            # Get trades
-            response = await supabase._client.get(
-                "/trade_history",
-                params=params
-            )
-            
-            if response.status_code != 200:
-                return {
-                    "total_trades": 0,
-                    "winning_trades": 0,
-                    "losing_trades": 0,
-                    "avg_win": 0.0,
-                    "avg_loss": 0.0,
-                }
-            
-            trades = response.json()
-            
-            if not trades:
-                return {
-                    "total_trades": 0,
-                    "winning_trades": 0,
-                    "losing_trades": 0,
-                    "avg_win": 0.0,
-                    "avg_loss": 0.0,
-                }
-            
-            # Analyze trades
-            winning_trades = [t for t in trades if t.get("realized_pnl_usd", 0) and t.get("realized_pnl_usd", 0) > 0]
-            losing_trades = [t for t in trades if t.get("realized_pnl_usd", 0) and t.get("realized_pnl_usd", 0) < 0]
-            
-            avg_win = sum(t.get("realized_pnl_usd", 0) or 0 for t in winning_trades) / len(winning_trades) if winning_trades else 0.0
-            avg_loss = sum(t.get("realized_pnl_usd", 0) or 0 for t in losing_trades) / len(losing_trades) if losing_trades else 0.0
-            
-            return {
-                "total_trades": len(trades),
-                "winning_trades": len(winning_trades),
-                "losing_trades": len(losing_trades),
-                "avg_win": round(avg_win, 2),
-                "avg_loss": round(avg_loss, 2),
-            }
+        totals = await get_trade_rollups().summary(time_range)
+        
+        avg_win = totals.win_pnl_usd / totals.winning_trades if totals.winning_trades else 0.0
+        avg_loss = totals.loss_pnl_usd / totals.losing_trades if totals.losing_trades else 0.0
+        
+        return {
+            "total_trades": totals.total_trades,
+            "winning_trades": totals.winning_trades,
+            "losing_trades": totals.losing_trades,
+            "avg_win": round(avg_win, 2),
+            "avg_loss": round(avg_loss, 2),
+            "closed_positions": totals.closed_positions,
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trades analysis: {str(e)}")
 
 
 @router.get("/roi")
+@cached_response(ttl=30.0, stale_ttl=300.0, tags=("trades", "positions"))
 async def get_roi(time_range: str = "all"):
     """
     Get ROI calculation from positions and trades
-    ✅ עכשיו מחשב מנתונים אמיתיים מ-Supabase!
-    ✅ תומך ב-time_range filtering!
+    ✅ רווח ממומש מ-trade_rollups, פוזיציות פעילות מ-Supabase
+    ✅ תומך ב-time_range filtering! (7d / 30d / 90d / all)
     """
     try:
-        from datetime import datetime, timedelta, timezone
-        
-        # Calculate date filter based on time_range
-        date_filter = None
-        if time_range == "7d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-        elif time_range == "30d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-        elif time_range == "90d":
-            date_filter = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
-        # "all" = no filter
-        
         solanahunter = get_solanahunter()
         if not solanahunter or not solanahunter.supabase or not solanahunter.supabase.enabled:
             return {
@@ -238,22 +131,9 @@ async def get_roi(time_range: str = "all"):
         async with solanahunter.supabase:
             # Get active positions
             positions = await solanahunter.supabase.get_positions(status="ACTIVE")
-            
-            # Build params for closed trades
-            params = {
-                "trade_type": "eq.SELL",
-                "limit": 1000,
-            }
-            if date_filter:
-                params["created_at"] = f"gte.{date_filter}"
-            
-            # Get closed positions (from trade_history where type=SELL)
-            trades_response = await solanahunter.supabase._client.get(
-                "/trade_history",
-                params=params
-            )
-            
-            closed_trades = trades_response.json() if trades_response.status_code == 200 else []
+        
+        # Realized profits of closed trades (only SELL trades carry realized PnL)
+        totals = await get_trade_rollups().summary(time_range)
         
         # Calculate total invested (from entry values)
         total_invested = sum(float(p.get("entry_value_usd", 0) or 0) for p in positions)
@@ -269,7 +149,7 @@ async def get_roi(time_range: str = "all"):
             total_value += current_price * amount
         
         # Add realized profits from closed trades
-        realized_profit = sum(t.get("realized_pnl_usd", 0) or 0 for t in closed_trades)
+        realized_profit = totals.total_pnl_usd
         
         # Total value = current positions + realized profits
         total_value_with_profit = total_value + realized_profit
@@ -13,6 +13,13 @@ Bot Control Endpoints - API routes for bot management
 
 from fastapi import APIRouter, HTTPException
 from api.dependencies import get_solanahunter
+from analyzer.pair_cache import get_pair_cache
+from analyzer.address_cache import get_address_cache
+from database.write_buffer import get_write_buffer
+from utils.response_cache import get_response_cache
+from executor.portfolio_snapshots import get_portfolio_snapshotter
+from analyzer.smart_money_tracker import get_smart_money_tracker
+from analyzer.smart_holdings_index import get_smart_holdings_index
 
 router = APIRouter()
 
@@ -161,6 +168,18 @@ async def get_bot_stats():
             "high_score_count": hunter._high_score_count,
             "alerts_sent": len(hunter._alerts_sent) if hasattr(hunter, '_alerts_sent') else 0,
             "uptime_seconds": uptime_seconds,
+            "pair_cache": get_pair_cache().get_stats(),
+            "address_cache": get_address_cache().get_stats(),
+            "write_buffer": get_write_buffer().get_stats(),
+            "response_cache": get_response_cache().get_stats(),
+            "portfolio_snapshots": get_portfolio_snapshotter().get_stats(),
+            "smart_discovery": hunter.discovery_engine.get_stats(),
+            "smart_wallets": get_smart_money_tracker().get_stats(),
+            "smart_holdings": get_smart_holdings_index().get_stats(),
+            "helius_stream": hunter.scanner.stream.get_stats() if hunter.scanner.stream else None,
+            "liquidity_watcher": (
+                hunter.position_monitor.liquidity_watcher.get_stats() if hunter.position_monitor else None
+            ),
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting bot stats: {str(e)}")
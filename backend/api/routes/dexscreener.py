@@ -14,6 +14,8 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List, Dict, Any
 import httpx
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from utils.response_cache import cached_response
 
 logger = get_logger("dexscreener")
 
@@ -24,6 +26,7 @@ DEXSCREENER_API_BASE = "https://api.dexscreener.com"
 
 
 @router.get("/trending")
+@cached_response(ttl=30.0, stale_ttl=120.0)
 async def get_trending_tokens(
     chain: str = Query("solana", description="Blockchain (solana, ethereum, etc.)"),
     limit: int = Query(20, ge=1, le=100, description="Number of tokens to return"),
@@ -63,7 +66,7 @@ async def get_trending_tokens(
                 "ETH/USDT",
             ]
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with create_http_client("api", timeout=15.0) as client:
             for query in search_queries:
                 try:
                     response = await client.get(url, params={"q": query})
@@ -170,7 +173,7 @@ async def search_tokens(
         url = f"{DEXSCREENER_BASE}/search"
         params = {"q": q}
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with create_http_client("api", timeout=15.0) as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -228,7 +231,7 @@ async def get_token_details(token_address: str):
     try:
         url = f"{DEXSCREENER_BASE}/tokens/{token_address}"
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with create_http_client("api", timeout=15.0) as client:
             response = await client.get(url)
             response.raise_for_status()
             data = response.json()
@@ -315,7 +318,7 @@ async def get_new_tokens(
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         cutoff_timestamp = int(cutoff_date.timestamp() * 1000)  # Convert to milliseconds
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with create_http_client("api", timeout=15.0) as client:
             # Search with multiple queries
             for query in search_queries:
                 try:
@@ -8,13 +8,16 @@ Portfolio Endpoints - API routes for portfolio management
 - GET /api/portfolio/stats - סטטיסטיקות תיק
 """
 
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 from executor.price_fetcher import PriceFetcher
+from analyzer.token_metrics import get_metrics_fetcher
 from executor.position_monitor import PositionStatus
 from api.dependencies import get_solanahunter
-import httpx
+from utils.http_pool import create_http_client
+from utils.response_cache import cached_response
+from executor.portfolio_snapshots import get_portfolio_snapshotter
 
 router = APIRouter()
 
@@ -29,6 +32,37 @@ class UpdatePositionRequest(BaseModel):
     take_profit_2_price: Optional[float] = None
 
 
+async def _get_current_prices(token_addresses: List[str]) -> Dict[str, Optional[float]]:
+    """
+    Current USD prices for many tokens
+    
+    Uses one batched DexScreener request (up to 30 tokens per call) and falls
+    back to PriceFetcher only for tokens without a price.
+    """
+    if not token_addresses:
+        return {}
+    
+    prices: Dict[str, Optional[float]] = {}
+    try:
+        metrics_map = await get_metrics_fetcher().get_metrics_batch(token_addresses)
+        for address, metrics in metrics_map.items():
+            if metrics.price_usd > 0:
+                prices[address] = metrics.price_usd
+    except Exception:
+        pass  # Fallback to PriceFetcher
+    
+    missing = [a for a in dict.fromkeys(token_addresses) if a not in prices]
+    if missing:
+        price_fetcher = PriceFetcher()
+        try:
+            for address in missing:
+                prices[address] = await price_fetcher.get_token_price(address)
+        finally:
+            await price_fetcher.close()
+    
+    return prices
+
+
 @router.get("")
 async def get_positions():
     """
@@ -53,62 +87,39 @@ async def get_positions():
         positions = position_monitor.get_all_positions()
         
         # Enrich with current prices and P&L
-        # Try DexScreener first for more accurate prices
-        price_fetcher = PriceFetcher()
+        # One batched DexScreener call for all positions, PriceFetcher as fallback
+        current_prices = await _get_current_prices([pos.token_mint for pos in positions])
         enriched_positions = []
         
-        # Try to get prices from DexScreener for better accuracy
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for pos in positions:
-                current_price = None
-                
-                # Try DexScreener first
-                try:
-                    dex_url = f"https://api.dexscreener.com/latest/dex/tokens/{pos.token_mint}"
-                    dex_response = await client.get(dex_url)
-                    if dex_response.status_code == 200:
-                        dex_data = dex_response.json()
-                        pairs = dex_data.get("pairs", [])
-                        if pairs:
-                            # Get the pair with highest liquidity
-                            main_pair = max(
-                                pairs,
-                                key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0)
-                            )
-                            current_price = float(main_pair.get("priceUsd", 0) or 0)
-                except Exception:
-                    pass  # Fallback to PriceFetcher
-                
-                # Fallback to PriceFetcher if DexScreener failed
-                if current_price is None or current_price == 0:
-                    current_price = await price_fetcher.get_token_price(pos.token_mint)
-                
-                if current_price is None or current_price == 0:
-                    current_price = pos.entry_price  # Final fallback to entry price
-                
-                entry_value = pos.entry_price * pos.amount_tokens
-                current_value = current_price * pos.amount_tokens
-                pnl_usd = current_value - entry_value
-                pnl_pct = (pnl_usd / entry_value * 100) if entry_value > 0 else 0
-                
-                enriched_positions.append({
-                    "id": pos.token_mint,
-                    "token_address": pos.token_mint,
-                    "token_symbol": pos.token_symbol,
-                    "token_name": pos.token_symbol,  # TODO: Get from token info
-                    "amount_tokens": pos.amount_tokens,
-                    "entry_price": pos.entry_price,
-                    "current_price": current_price,
-                    "entry_value_usd": entry_value,
-                    "current_value_usd": current_value,
-                    "unrealized_pnl_usd": pnl_usd,
-                    "unrealized_pnl_pct": pnl_pct,
-                    "stop_loss_price": pos.entry_price * (1 - pos.stop_loss_pct),
-                    "stop_loss_pct": pos.stop_loss_pct * 100,  # Convert to percentage
-                    "take_profit_1_price": None,  # TODO: Add to Position dataclass
-                    "take_profit_2_price": None,  # TODO: Add to Position dataclass
-                "opened_at": pos.opened_at.isoformat(),  # For frontend compatibility
-                "entry_timestamp": pos.opened_at.isoformat(),  # For database compatibility
+        for pos in positions:
+            current_price = current_prices.get(pos.token_mint)
+            
+            if current_price is None or current_price == 0:
+                current_price = pos.entry_price  # Final fallback to entry price
+            
+            entry_value = pos.entry_price * pos.amount_tokens
+            current_value = current_price * pos.amount_tokens
+            pnl_usd = current_value - entry_value
+            pnl_pct = (pnl_usd / entry_value * 100) if entry_value > 0 else 0
+            
+            enriched_positions.append({
+                "id": pos.token_mint,
+                "token_address": pos.token_mint,
+                "token_symbol": pos.token_symbol,
+                "token_name": pos.token_symbol,  # TODO: Get from token info
+                "amount_tokens": pos.amount_tokens,
+                "entry_price": pos.entry_price,
+                "current_price": current_price,
+                "entry_value_usd": entry_value,
+                "current_value_usd": current_value,
+                "unrealized_pnl_usd": pnl_usd,
+                "unrealized_pnl_pct": pnl_pct,
+                "stop_loss_price": pos.entry_price * (1 - pos.stop_loss_pct),
+                "stop_loss_pct": pos.stop_loss_pct * 100,  # Convert to percentage
+                "take_profit_1_price": None,  # TODO: Add to Position dataclass
+                "take_profit_2_price": None,  # TODO: Add to Position dataclass
+                "opened_at": pos.entry_timestamp.isoformat(),  # For frontend compatibility
+                "entry_timestamp": pos.entry_timestamp.isoformat(),  # For database compatibility
             })
         
         return {
@@ -149,7 +160,7 @@ async def get_wallet_info():
         # Get SOL price from DexScreener (SOL/USDC pair)
         sol_price = 0.0
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with create_http_client("api", timeout=10.0) as client:
                 # SOL/USDC pair on Raydium
                 sol_usdc_url = "https://api.dexscreener.com/latest/dex/pairs/solana/58oQChx4yWmvKdwLLZRBi080ChoZSdPHSkka5gYy2waM"
                 response = await client.get(sol_usdc_url)
@@ -193,15 +204,20 @@ async def get_wallet_info():
 
 
 @router.get("/performance/history")
-async def get_portfolio_performance_history(days: int = 30):
+@cached_response(ttl=60.0, stale_ttl=300.0)
+async def get_portfolio_performance_history(days: int = Query(30, ge=1, le=3650)):
     """
     Get portfolio performance history for charts
     
+    Served from portfolio_snapshots (executor/portfolio_snapshots.py) - the
+    resolution (5m / 1h / 1d) is picked so the chart never gets more than
+    MAX_POINTS points, whatever the range.
+    
     Args:
         days: Number of days to fetch (default: 30)
         
     Returns:
-        List of daily portfolio values and P&L
+        List of portfolio points (oldest first) and the resolution used
     """
     solanahunter = get_solanahunter()
     if not solanahunter:
@@ -212,55 +228,35 @@ async def get_portfolio_performance_history(days: int = 30):
         return {
             "data": [],
             "total_days": days,
+            "resolution": None,
         }
     
     try:
-        from datetime import datetime, timedelta, timezone
-        
-        # Get positions from Supabase
-        async with solanahunter.supabase:
-            positions = await solanahunter.supabase.get_positions(status="ACTIVE")
-        
-        # For now, return current snapshot
-        # TODO: In future, store daily snapshots for historical data
-        price_fetcher = PriceFetcher()
-        total_value = 0.0
-        total_cost = 0.0
-        
-        for pos_data in positions:
-            current_price = await price_fetcher.get_token_price(pos_data["token_address"])
-            if current_price is None:
-                current_price = float(pos_data.get("entry_price", 0))
-            
-            entry_value = float(pos_data.get("entry_value_usd", 0))
-            current_value = current_price * float(pos_data.get("amount_tokens", 0))
-            
-            total_cost += entry_value
-            total_value += current_value
+        resolution, points = await get_portfolio_snapshotter().get_history(days)
         
-        # Generate mock historical data (will be replaced with real data later)
-        # For now, create a simple trend
         data = []
-        now = datetime.now(timezone.utc)
-        for i in range(days, -1, -1):
-            date = now - timedelta(days=i)
-            # Simple mock: current value with small random variation
-            value = total_value * (1 + (i * 0.01 / days))
-            cost = total_cost
-            pnl = value - cost
-            pnl_pct = (pnl / cost * 100) if cost > 0 else 0
+        for point in points:
+            value = float(point.get("value_usd") or 0)
+            cost = float(point.get("cost_usd") or 0)
+            pnl = float(point.get("unrealized_pnl_usd") or 0)
+            bucket_at = str(point.get("bucket_at"))
             
             data.append({
-                "date": date.strftime("%Y-%m-%d"),
+                "date": bucket_at[:10] if resolution == "1d" else bucket_at[:16].replace("T", " "),
+                "timestamp": bucket_at,
                 "value": value,
                 "cost": cost,
                 "pnl": pnl,
-                "pnl_pct": pnl_pct,
+                "pnl_pct": (pnl / cost * 100) if cost > 0 else 0,
+                "realized_pnl": float(point.get("realized_pnl_usd") or 0),
+                "equity": float(point.get("equity_usd") or 0),
+                "open_positions": point.get("open_positions") or 0,
             })
         
         return {
             "data": data,
             "total_days": days,
+            "resolution": resolution,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"אופס, שגיאה בקבלת היסטוריית ביצועים: {str(e)}")
@@ -315,6 +311,7 @@ async def get_trade_history(limit: int = 50):
 
 
 @router.get("/stats")
+@cached_response(ttl=10.0, stale_ttl=30.0, tags=("positions",))
 async def get_portfolio_stats():
     """
     Get portfolio statistics
@@ -340,13 +337,13 @@ async def get_portfolio_stats():
         
         positions = position_monitor.get_all_positions()
         
-        price_fetcher = PriceFetcher()
+        current_prices = await _get_current_prices([pos.token_mint for pos in positions])
         total_cost = 0.0
         total_value = 0.0
         winning_positions = 0
         
         for pos in positions:
-            current_price = await price_fetcher.get_token_price(pos.token_mint)
+            current_price = current_prices.get(pos.token_mint)
             if current_price is None:
                 current_price = pos.entry_price  # Fallback
             
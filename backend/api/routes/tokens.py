@@ -54,6 +54,26 @@ async def get_tokens(
         raise HTTPException(status_code=500, detail=f"Error fetching tokens: {str(e)}")
 
 
+@router.get("/search")
+async def search_tokens(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Search tokens by symbol or name"""
+    try:
+        supabase = get_supabase_client()
+        if not supabase.enabled:
+            return {"tokens": []}
+        
+        async with supabase:
+            # Filter by symbol or name in the database (ilike + trigram index)
+            results = await supabase.search_tokens(q, limit=limit)
+            
+            return {"tokens": results, "query": q}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching tokens: {str(e)}")
+
+
 @router.get("/{address}")
 async def get_token(address: str):
     """Get token details by address"""
@@ -63,8 +83,7 @@ async def get_token(address: str):
             raise HTTPException(status_code=404, detail="Token not found")
         
         async with supabase:
-            tokens = await supabase.get_tokens(limit=1000)
-            token = next((t for t in tokens if t.get("address") == address), None)
+            token = await supabase.get_token_by_address(address)
             
             if not token:
                 raise HTTPException(status_code=404, detail="Token not found")
@@ -97,8 +116,7 @@ async def analyze_token(address: str):
         token_data = None
         if supabase.enabled:
             async with supabase:
-                tokens = await supabase.get_tokens(limit=1000)
-                token_data = next((t for t in tokens if t.get("address") == address), None)
+                token_data = await supabase.get_token_by_address(address)
         
         if not token_data:
             # Try to get from DexScreener
@@ -126,8 +144,11 @@ async def analyze_token(address: str):
             
             # Smart money check
             from analyzer.smart_money_tracker import get_smart_money_tracker
+            from analyzer.smart_holdings_index import get_smart_holdings_index
             holder_addresses = [h.get("address", "") for h in holders.top_holders]
-            smart_money_count = get_smart_money_tracker().check_if_holds(address, holder_addresses)
+            smart_money_count = get_smart_money_tracker().check_if_holds(
+                address, holder_addresses + list(get_smart_holdings_index().holders_of(address))
+            )
             
             # Calculate final score
             token_score = solanahunter.scoring_engine.calculate_score(
@@ -204,8 +225,7 @@ async def get_token_market_cap_history(address: str):
         
         async with supabase:
             # Get token basic info
-            tokens = await supabase.get_tokens(limit=1000)
-            token = next((t for t in tokens if t.get("address") == address), None)
+            token = await supabase.get_token_by_address(address)
             
             if not token:
                 raise HTTPException(status_code=404, detail="Token not found")
@@ -281,27 +301,3 @@ async def get_token_market_cap_history(address: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market cap history: {str(e)}")
-
-
-@router.get("/search")
-async def search_tokens(q: str = Query(..., min_length=1)):
-    """Search tokens by symbol or name"""
-    try:
-        supabase = get_supabase_client()
-        if not supabase.enabled:
-            return {"tokens": []}
-        
-        async with supabase:
-            tokens = await supabase.get_tokens(limit=1000)
-            query_lower = q.lower()
-            
-            # Filter by symbol or name
-            results = [
-                t for t in tokens
-                if query_lower in t.get("symbol", "").lower() or
-                   query_lower in t.get("name", "").lower()
-            ]
-            
-            return {"tokens": results, "query": q}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching tokens: {str(e)}")
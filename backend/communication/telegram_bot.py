@@ -75,6 +75,7 @@ import httpx
 from httpx import HTTPStatusError
 
 from core.config import settings
+from utils.http_pool import create_http_client
 from utils.logger import get_logger
 
 logger = get_logger("telegram")
@@ -209,7 +210,7 @@ class TelegramBotController:
         """
         if self._running or not self.is_configured:
             return
-        self._client = httpx.AsyncClient(timeout=40.0)
+        self._client = create_http_client("api", timeout=40.0)
         self._running = True
         self._task = asyncio.create_task(self._poll_loop())  # מריץ את הלולאה ברקע
         logger.info("Telegram long-polling started")
@@ -238,7 +239,7 @@ class TelegramBotController:
         reply_markup: Optional[dict] = None,
         disable_web_page_preview: bool = True,
     ) -> None:
-        client = self._client or httpx.AsyncClient(timeout=30.0)
+        client = self._client or create_http_client("api", timeout=30.0)
         try:
             payload = {
                 "chat_id": self.config.chat_id,
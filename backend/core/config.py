@@ -58,6 +58,11 @@ class Settings(BaseSettings):
     solana_rpc_url: Optional[str] = Field(None, env="SOLANA_RPC_URL")
     rpc_endpoint: Optional[str] = Field(None, env="RPC_ENDPOINT")  # NEW
     
+    # גילוי טוקנים בזמן אמת דרך Helius websocket (logsSubscribe)
+    # ברירת מחדל: wss://mainnet.helius-rpc.com/?api-key=HELIUS_API_KEY
+    helius_ws_enabled: bool = Field(True, env="HELIUS_WS_ENABLED")
+    helius_ws_url: Optional[str] = Field(None, env="HELIUS_WS_URL")
+    
     @validator("solana_rpc_url", always=True)
     def build_rpc_url(cls, v, values):
         """Build RPC URL if not provided"""
@@ -80,6 +85,11 @@ class Settings(BaseSettings):
     supabase_key: Optional[str] = Field(None, env="SUPABASE_KEY")
     supabase_service_key: Optional[str] = Field(None, env="SUPABASE_SERVICE_KEY")
     
+    # Write-behind buffer - שורות נאספות ונכתבות בבקשה אחת לכל טבלה
+    # flush כשמגיעים ל-X שורות או כשהשורה הראשונה מחכה Y שניות
+    db_write_buffer_max_rows: int = Field(200, env="DB_WRITE_BUFFER_MAX_ROWS")
+    db_write_buffer_max_age_seconds: float = Field(5.0, env="DB_WRITE_BUFFER_MAX_AGE_SECONDS")
+    
     # ============================================
     # Telegram Bot API
     # ============================================
@@ -120,12 +130,69 @@ class Settings(BaseSettings):
     max_position_size_pct: float = Field(5.0, env="MAX_POSITION_SIZE_PCT")
     stop_loss_pct: float = Field(15.0, env="STOP_LOSS_PCT")
     
+    # תדירות ה-price feed המשותף לכל הפוזיציות (stop loss + take profit)
+    price_feed_interval_seconds: float = Field(30.0, env="PRICE_FEED_INTERVAL_SECONDS")
+    
+    # בדיקת rug מלאה (holders, contract) לפוזיציה פתוחה - כל X שניות
+    # סיגנלים זולים (נזילות / מחיר) נבדקים בכל tick ומקדימים את הבדיקה המלאה אם חצו סף
+    rug_full_check_interval_seconds: float = Field(300.0, env="RUG_FULL_CHECK_INTERVAL_SECONDS")
+    
+    # זיהוי משיכת נזילות on-chain לפוזיציות פתוחות (accountSubscribe על ה-vaults של ה-pool)
+    # יציאת חירום אם יותר מ-X% מה-quote (SOL / USDC) יצא מה-pool בחלון של Y שניות
+    liquidity_watch_enabled: bool = Field(True, env="LIQUIDITY_WATCH_ENABLED")
+    liquidity_drain_threshold_pct: float = Field(50.0, env="LIQUIDITY_DRAIN_THRESHOLD_PCT")
+    liquidity_drain_window_seconds: float = Field(60.0, env="LIQUIDITY_DRAIN_WINDOW_SECONDS")
+    
+    # צילום מצב של התיק לגרפים (portfolio_snapshots) - כל X שניות
+    # נשמר ב-5m (יומיים), 1h (90 יום) ו-1d (לתמיד)
+    portfolio_snapshot_interval_seconds: float = Field(300.0, env="PORTFOLIO_SNAPSHOT_INTERVAL_SECONDS")
+    
+    # כמה טוקנים מנותחים במקביל בכל סריקה (במצב quiet - חצי)
+    analysis_concurrency: int = Field(10, env="ANALYSIS_CONCURRENCY")
+    
+    # כמה זמן (שניות) נתוני DexScreener נשמרים ב-cache המשותף
+    pair_cache_ttl_seconds: float = Field(15.0, env="PAIR_CACHE_TTL_SECONDS")
+    
+    # מטמון owner לכתובות (LP / burn) - קובץ מקומי + שיתוף אופציונלי דרך Supabase
+    address_cache_file: str = Field("data/address_owners.json", env="ADDRESS_CACHE_FILE")
+    address_cache_supabase: bool = Field(False, env="ADDRESS_CACHE_SUPABASE")
+    
+    # קונים ראשונים מה-chain (getSignaturesForAddress + getTransaction) - קובץ JSON לכל mint
+    # עמודי חתימות (1000 בעמוד) וטרנזקציות לפענוח מקסימום לכל קריאה - הקריאה הבאה ממשיכה
+    first_buyer_cache_dir: str = Field("data/first_buyers", env="FIRST_BUYER_CACHE_DIR")
+    first_buyer_max_signature_pages: int = Field(100, env="FIRST_BUYER_MAX_SIGNATURE_PAGES")
+    first_buyer_max_transactions: int = Field(2000, env="FIRST_BUYER_MAX_TRANSACTIONS")
+    
+    # היסטוריית swaps של ארנקים (analyzer/wallet_trade_store.py) - קבצי shard בתיקייה
+    # טרנזקציות חדשות מקסימום לכל קליטה של ארנק (ארנק פעיל מאוד - רק החדשות נקלטות)
+    wallet_trade_store_dir: str = Field("data/wallet_trades", env="WALLET_TRADE_STORE_DIR")
+    wallet_history_max_transactions: int = Field(1000, env="WALLET_HISTORY_MAX_TRANSACTIONS")
+    
+    # גילוי Smart Money ברקע (analyzer/discovery_runner.py) - workers במקביל,
+    # קונים ראשונים לבדוק לכל טוקן, וקובץ התקדמות (הפעלה מחדש ממשיכה ממנו)
+    discovery_workers: int = Field(8, env="DISCOVERY_WORKERS")
+    discovery_buyers_per_token: int = Field(100, env="DISCOVERY_BUYERS_PER_TOKEN")
+    discovery_checkpoint_file: str = Field("data/discovery_checkpoint.json", env="DISCOVERY_CHECKPOINT_FILE")
+    
+    # bloom filter לפני אינדקס ה-Smart Money (analyzer/smart_wallet_index.py)
+    smart_wallet_bloom_filter: bool = Field(False, env="SMART_WALLET_BLOOM_FILTER")
+    
+    # אינדקס הפוך של החזקות ה-Smart Money (analyzer/smart_holdings_index.py)
+    # getTokenAccountsByOwner לכל ארנק חכם ברקע - כל ארנק מרוענן כל X שניות
+    smart_holdings_enabled: bool = Field(True, env="SMART_HOLDINGS_ENABLED")
+    smart_holdings_file: str = Field("data/smart_holdings.json", env="SMART_HOLDINGS_FILE")
+    smart_holdings_refresh_seconds: float = Field(900.0, env="SMART_HOLDINGS_REFRESH_SECONDS")
+    
     # ============================================
     # External APIs (Optional)
     # ============================================
     birdeye_api_key: Optional[str] = Field(None, env="BIRDEYE_API_KEY")
     solscan_api_key: Optional[str] = Field(None, env="SOLSCAN_API_KEY")
     
+    # דריסת תקציב בקשות לכל host (ראה utils/rate_limiter.py)
+    # פורמט: host=rps/burst,host=rps  (לדוגמה: api.dexscreener.com=5/10)
+    rate_limits: Optional[str] = Field(None, env="RATE_LIMITS")
+    
     # (legacy Config removed; model_config above is the v2 way)
 
 
@@ -16,7 +16,9 @@ from typing import Optional, Dict, List
 from datetime import datetime, timezone, timedelta
 import httpx
 from core.config import settings
+from utils.http_pool import create_http_client
 from utils.logger import get_logger
+from utils.response_cache import get_response_cache
 
 logger = get_logger("supabase")
 
@@ -45,11 +47,12 @@ class SupabaseClient:
             self._base_url = f"{self.url}/rest/v1"
             logger.info(f"✅ Supabase configured: {self.url}")
     
-    async def __aenter__(self):
-        """Async context manager entry"""
-        if self.enabled:
+    def _ensure_client(self) -> Optional[httpx.AsyncClient]:
+        """Create the long-lived client on first use (shared connection pool)"""
+        if self.enabled and self._client is None:
             try:
-                self._client = httpx.AsyncClient(
+                self._client = create_http_client(
+                    "api",
                     base_url=self._base_url,
                     headers={
                         "apikey": self.key,
@@ -64,10 +67,24 @@ class SupabaseClient:
                 logger.error(f"❌ Failed to initialize Supabase client: {e}")
                 logger.error(f"   URL: {self._base_url}")
                 self._client = None
+        return self._client
+    
+    async def __aenter__(self):
+        """
+        Async context manager entry
+        
+        The client stays open between blocks (keep-alive) - safe to use
+        from concurrent tasks. Real cleanup happens in close().
+        """
+        self._ensure_client()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
+        """Async context manager exit - connection is kept for reuse"""
+        pass
+    
+    async def close(self):
+        """Close the client (on shutdown)"""
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -89,127 +106,51 @@ class SupabaseClient:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled or not self._client:
+        return await self.save_tokens([token])
+    
+    async def save_tokens(self, tokens: List[Dict], chunk_size: int = 500) -> bool:
+        """
+        Bulk upsert tokens (scanned_tokens_history table) - one request per chunk
+        
+        Args:
+            tokens: Token dictionaries with analysis data (see save_token)
+            chunk_size: Max rows per request
+            
+        Returns:
+            True if all chunks were saved, False otherwise
+        """
+        if not self.enabled or not self._client or not tokens:
             return False
         
         try:
-            # Calculate smart_money_score if not provided
-            smart_money_score = token.get("smart_money_score")
-            if smart_money_score is None:
-                # Calculate from final_score - safety_score - holder_score
-                smart_money_score = max(0, token.get("final_score", 0) - token.get("safety_score", 0) - token.get("holder_score", 0))
-            
-            # Get token creation time
-            token_created_at = token.get("created_at")
-            if isinstance(token_created_at, str):
-                try:
-                    token_created_at = datetime.fromisoformat(token_created_at.replace('Z', '+00:00'))
-                except:
-                    token_created_at = None
-            elif isinstance(token_created_at, datetime):
-                pass  # Already datetime
-            else:
-                token_created_at = None
-            
-            # Calculate token age in hours
             now = datetime.now(timezone.utc)
-            token_age_hours = None
-            if token_created_at:
-                if isinstance(token_created_at, datetime):
-                    if token_created_at.tzinfo is None:
-                        token_created_at = token_created_at.replace(tzinfo=timezone.utc)
-                    age_delta = now - token_created_at
-                    token_age_hours = int(age_delta.total_seconds() / 3600)
-            
-            # Calculate scan priority and next_scan_at based on score and age
-            final_score = token.get("final_score", 0)
-            scan_priority = 0
-            next_scan_at = None
-            
-            if token_age_hours is not None:
-                # Very new tokens (0-2 hours) with high score = highest priority
-                if token_age_hours < 2 and final_score >= 85:
-                    scan_priority = 100
-                    next_scan_at = (now + timedelta(minutes=5)).isoformat()
-                # New tokens (2-24 hours) with high score = high priority
-                elif token_age_hours < 24 and final_score >= 80:
-                    scan_priority = 70
-                    next_scan_at = (now + timedelta(minutes=30)).isoformat()
-                # Medium score tokens = medium priority
-                elif final_score >= 60:
-                    scan_priority = 40
-                    next_scan_at = (now + timedelta(hours=2)).isoformat()
-                # Low score or old tokens = low priority
-                else:
-                    scan_priority = 10
-                    next_scan_at = (now + timedelta(hours=24)).isoformat()
-            else:
-                # If we don't know token age, use score only
-                if final_score >= 85:
-                    scan_priority = 80
-                    next_scan_at = (now + timedelta(minutes=30)).isoformat()
-                elif final_score >= 60:
-                    scan_priority = 40
-                    next_scan_at = (now + timedelta(hours=2)).isoformat()
-                else:
-                    scan_priority = 10
-                    next_scan_at = (now + timedelta(hours=24)).isoformat()
-            
-            # Prepare token data for scanned_tokens_history table
-            # Note: first_seen is not included - it will use DEFAULT NOW() for new tokens
-            # and won't be updated for existing tokens (preserves original first_seen)
-            token_data = {
-                "address": token.get("address"),
-                "symbol": token.get("symbol", "UNKNOWN"),
-                "name": token.get("name", ""),
-                "final_score": token.get("final_score", 0),
-                "safety_score": token.get("safety_score", 0),
-                "holder_score": token.get("holder_score", 0),
-                "smart_money_score": smart_money_score,
-                # Additional scores (default to 0 if not available)
-                "liquidity_score": token.get("liquidity_score", 0),
-                "volume_score": token.get("volume_score", 0),
-                "price_action_score": token.get("price_action_score", 0),
-                "grade": token.get("grade", "F"),
-                "category": token.get("category", "POOR"),
-                "holder_count": token.get("holder_count", 0),
-                "smart_money_count": token.get("smart_money_count", 0),
-                # Market data
-                "liquidity_sol": token.get("liquidity_sol", 0.0),
-                "volume_24h": token.get("volume_24h", 0.0),
-                "price_usd": token.get("price_usd", 0.0),
-                "market_cap": token.get("market_cap", 0.0),
-                # Source and status
-                "source": token.get("source", "dexscreener"),
-                "status": token.get("status", "active"),
-                # 🆕 New fields for smart scanning
-                "token_created_at": token_created_at.isoformat() if token_created_at else None,
-                "token_age_hours": token_age_hours,
-                "last_scanned_at": now.isoformat(),
-                "next_scan_at": next_scan_at,
-                "scan_priority": scan_priority,
-            }
+            # One row per address - the same address twice in one upsert is rejected by Postgres
+            rows = list({
+                row["address"]: row
+                for row in (self._token_row(token, now) for token in tokens)
+                if row["address"]
+            }.values())
             
-            # Upsert (insert or update if exists)
-            # Supabase REST API: Use POST with Prefer header for upsert
-            # The on_conflict parameter tells Supabase which column to check for conflicts
-            # Note: The 'address' column must have a UNIQUE constraint in the database
-            headers = {
-                "Prefer": "resolution=merge-duplicates,return=representation"
-            }
-            response = await self._client.post(
-                "/scanned_tokens_history",  # ✅ שינוי: שמירה ל-scanned_tokens_history במקום tokens
-                json=token_data,
-                headers=headers,
-                params={"on_conflict": "address"}
-            )
+            saved = True
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                # Upsert (insert or update if exists)
+                # The on_conflict parameter tells Supabase which column to check for conflicts
+                # Note: The 'address' column must have a UNIQUE constraint in the database
+                response = await self._client.post(
+                    "/scanned_tokens_history",  # ✅ שינוי: שמירה ל-scanned_tokens_history במקום tokens
+                    json=chunk,
+                    headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                    params={"on_conflict": "address"}
+                )
+                
+                if response.status_code in (200, 201, 204):
+                    logger.info(f"✅ Saved {len(chunk)} tokens to scanned_tokens_history (status: {response.status_code})")
+                else:
+                    logger.warning(f"⚠️ Failed to save {len(chunk)} tokens: {response.status_code} - {response.text[:200]}")
+                    saved = False
             
-            if response.status_code in (200, 201):
-                logger.info(f"✅ Saved token {token.get('symbol', 'UNKNOWN')} to scanned_tokens_history (status: {response.status_code})")
-                return True
-            else:
-                logger.warning(f"⚠️ Failed to save token {token.get('symbol', 'UNKNOWN')}: {response.status_code} - {response.text[:200]}")
-                return False
+            return saved
                 
         except Exception as e:
             error_msg = str(e)
@@ -217,9 +158,109 @@ class SupabaseClient:
                 logger.error(f"❌ DNS Error - Cannot resolve Supabase URL: {self.url}")
                 logger.error(f"   Check SUPABASE_URL in Railway: should be 'https://[project].supabase.co'")
             else:
-                logger.error(f"❌ Error saving token to database: {e}")
+                logger.error(f"❌ Error saving tokens to database: {e}")
             return False
     
+    @staticmethod
+    def _token_row(token: Dict, now: datetime) -> Dict:
+        """scanned_tokens_history row from a token dictionary (same columns for every token)"""
+        # Calculate smart_money_score if not provided
+        smart_money_score = token.get("smart_money_score")
+        if smart_money_score is None:
+            # Calculate from final_score - safety_score - holder_score
+            smart_money_score = max(0, token.get("final_score", 0) - token.get("safety_score", 0) - token.get("holder_score", 0))
+        
+        # Get token creation time
+        token_created_at = token.get("created_at")
+        if isinstance(token_created_at, str):
+            try:
+                token_created_at = datetime.fromisoformat(token_created_at.replace('Z', '+00:00'))
+            except:
+                token_created_at = None
+        elif isinstance(token_created_at, datetime):
+            pass  # Already datetime
+        else:
+            token_created_at = None
+        
+        # Calculate token age in hours
+        token_age_hours = None
+        if token_created_at:
+            if isinstance(token_created_at, datetime):
+                if token_created_at.tzinfo is None:
+                    token_created_at = token_created_at.replace(tzinfo=timezone.utc)
+                age_delta = now - token_created_at
+                token_age_hours = int(age_delta.total_seconds() / 3600)
+        
+        # Calculate scan priority and next_scan_at based on score and age
+        final_score = token.get("final_score", 0)
+        scan_priority = 0
+        next_scan_at = None
+        
+        if token_age_hours is not None:
+            # Very new tokens (0-2 hours) with high score = highest priority
+            if token_age_hours < 2 and final_score >= 85:
+                scan_priority = 100
+                next_scan_at = (now + timedelta(minutes=5)).isoformat()
+            # New tokens (2-24 hours) with high score = high priority
+            elif token_age_hours < 24 and final_score >= 80:
+                scan_priority = 70
+                next_scan_at = (now + timedelta(minutes=30)).isoformat()
+            # Medium score tokens = medium priority
+            elif final_score >= 60:
+                scan_priority = 40
+                next_scan_at = (now + timedelta(hours=2)).isoformat()
+            # Low score or old tokens = low priority
+            else:
+                scan_priority = 10
+                next_scan_at = (now + timedelta(hours=24)).isoformat()
+        else:
+            # If we don't know token age, use score only
+            if final_score >= 85:
+                scan_priority = 80
+                next_scan_at = (now + timedelta(minutes=30)).isoformat()
+            elif final_score >= 60:
+                scan_priority = 40
+                next_scan_at = (now + timedelta(hours=2)).isoformat()
+            else:
+                scan_priority = 10
+                next_scan_at = (now + timedelta(hours=24)).isoformat()
+        
+        # Prepare token data for scanned_tokens_history table
+        # Note: first_seen is not included - it will use DEFAULT NOW() for new tokens
+        # and won't be updated for existing tokens (preserves original first_seen)
+        token_data = {
+            "address": token.get("address"),
+            "symbol": token.get("symbol", "UNKNOWN"),
+            "name": token.get("name", ""),
+            "final_score": token.get("final_score", 0),
+            "safety_score": token.get("safety_score", 0),
+            "holder_score": token.get("holder_score", 0),
+            "smart_money_score": smart_money_score,
+            # Additional scores (default to 0 if not available)
+            "liquidity_score": token.get("liquidity_score", 0),
+            "volume_score": token.get("volume_score", 0),
+            "price_action_score": token.get("price_action_score", 0),
+            "grade": token.get("grade", "F"),
+            "category": token.get("category", "POOR"),
+            "holder_count": token.get("holder_count", 0),
+            "smart_money_count": token.get("smart_money_count", 0),
+            # Market data
+            "liquidity_sol": token.get("liquidity_sol", 0.0),
+            "volume_24h": token.get("volume_24h", 0.0),
+            "price_usd": token.get("price_usd", 0.0),
+            "market_cap": token.get("market_cap", 0.0),
+            # Source and status
+            "source": token.get("source", "dexscreener"),
+            "status": token.get("status", "active"),
+            # 🆕 New fields for smart scanning
+            "token_created_at": token_created_at.isoformat() if token_created_at else None,
+            "token_age_hours": token_age_hours,
+            "last_scanned_at": now.isoformat(),
+            "next_scan_at": next_scan_at,
+            "scan_priority": scan_priority,
+        }
+        return token_data
+    
     async def get_tokens(self, limit: int = 100, min_score: Optional[int] = None) -> List[Dict]:
         """
         Get tokens from database (scanned_tokens_history table)
@@ -255,6 +296,82 @@ class SupabaseClient:
             logger.error(f"❌ Error getting tokens from database: {e}")
             return []
     
+    async def get_token_by_address(self, address: str) -> Optional[Dict]:
+        """
+        Get one token by address (scanned_tokens_history) - indexed point lookup
+        
+        Args:
+            address: Token mint address
+            
+        Returns:
+            Token dictionary or None if not found
+        """
+        if not self.enabled or not self._client or not address:
+            return None
+        
+        try:
+            response = await self._client.get(
+                "/scanned_tokens_history",
+                params={"address": f"eq.{address}", "limit": 1}
+            )
+            
+            if response.status_code == 200:
+                rows = response.json()
+                return rows[0] if rows else None
+            logger.warning(f"⚠️ Failed to get token {address[:8]}...: {response.status_code}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting token from database: {e}")
+            return None
+    
+    async def search_tokens(self, query: str, limit: int = 50) -> List[Dict]:
+        """
+        Search tokens by symbol or name (case-insensitive substring, trigram index)
+        
+        Args:
+            query: Text to search for
+            limit: Maximum number of tokens to return
+            
+        Returns:
+            List of matching tokens (highest score first)
+        """
+        if not self.enabled or not self._client or not query:
+            return []
+        
+        try:
+            pattern = self._ilike_pattern(query)
+            params = {
+                "or": f"(symbol.ilike.{pattern},name.ilike.{pattern})",
+                "order": "final_score.desc.nullslast",
+                "limit": limit
+            }
+            
+            response = await self._client.get("/scanned_tokens_history", params=params)
+            
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"⚠️ Failed to search tokens: {response.status_code}")
+            return []
+            
+        except Exception as e:
+            logger.error(f"❌ Error searching tokens: {e}")
+            return []
+    
+    @staticmethod
+    def _ilike_pattern(query: str) -> str:
+        """
+        Quoted PostgREST ilike value for a substring match
+        
+        LIKE wildcards typed by the user (% _) are matched literally, and the
+        value is quoted so commas / parentheses don't break the or=() filter.
+        """
+        # LIKE escaping
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        # PostgREST quoted value escaping
+        escaped = escaped.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"*{escaped}*"'
+    
     async def get_tokens_to_rescan(self, limit: int = 50) -> List[Dict]:
         """
         Get tokens that need to be rescanned based on next_scan_at and scan_priority
@@ -389,6 +506,7 @@ class SupabaseClient:
             
             if patch_response.status_code == 200:
                 # Updated existing position
+                get_response_cache().invalidate("positions")
                 return True
             
             # If not found, insert new
@@ -400,6 +518,7 @@ class SupabaseClient:
             
             if response.status_code in (200, 201):
                 logger.debug(f"✅ Position saved: {position.get('token_symbol')}")
+                get_response_cache().invalidate("positions")
                 return True
             else:
                 logger.warning(f"⚠️ Failed to save position: {response.status_code} - {response.text}")
@@ -449,6 +568,39 @@ class SupabaseClient:
             logger.error(f"❌ Error updating position price: {e}")
             return False
     
+    async def update_position_prices(self, rows: List[Dict]) -> bool:
+        """
+        Bulk update of position prices / P&L in one upsert (positions table)
+        
+        Rows must include the NOT NULL columns (token_address, token_symbol,
+        amount_tokens, entry_price, entry_value_usd) - only the columns sent are updated.
+        
+        Args:
+            rows: Position rows keyed by token_address
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or not self._client or not rows:
+            return False
+        
+        try:
+            response = await self._client.post(
+                "/positions",
+                json=rows,
+                headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                params={"on_conflict": "token_address"}
+            )
+            
+            if response.status_code in (200, 201, 204):
+                return True
+            logger.warning(f"⚠️ Failed to update position prices: {response.status_code} - {response.text[:200]}")
+            return False
+            
+        except Exception as e:
+            logger.error(f"❌ Error updating position prices: {e}")
+            return False
+    
     async def get_positions(self, user_id: str = "default", status: Optional[str] = None) -> List[Dict]:
         """
         Get positions from Supabase
@@ -515,6 +667,9 @@ class SupabaseClient:
             
             if response.status_code == 200:
                 logger.info(f"✅ Position closed: {token_address[:8]}...")
+                from database.trade_rollups import get_trade_rollups
+                await get_trade_rollups().record_position_closed()
+                get_response_cache().invalidate("positions")
                 return True
             else:
                 logger.warning(f"⚠️ Failed to close position: {response.status_code}")
@@ -563,6 +718,9 @@ class SupabaseClient:
             
             if response.status_code in (200, 201):
                 logger.debug(f"✅ Trade saved: {trade.get('trade_type')} {trade.get('token_symbol')}")
+                from database.trade_rollups import get_trade_rollups
+                await get_trade_rollups().record_trade(trade_data, user_id=trade_data["user_id"])
+                get_response_cache().invalidate("trades")
                 return True
             else:
                 logger.warning(f"⚠️ Failed to save trade: {response.status_code} - {response.text}")
@@ -571,6 +729,293 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"❌ Error saving trade: {e}")
             return False
+    
+    async def save_trade_rollups(self, rows: List[Dict]) -> bool:
+        """
+        Upsert trade rollup buckets (trade_rollups table)
+        
+        Args:
+            rows: Bucket rows (see database/trade_rollups.py) - absolute totals, not deltas
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or not self._client or not rows:
+            return False
+        
+        try:
+            response = await self._client.post(
+                "/trade_rollups",
+                json=rows,
+                headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                params={"on_conflict": "user_id,granularity,bucket_start"}
+            )
+            
+            if response.status_code in (200, 201, 204):
+                return True
+            logger.warning(f"⚠️ Failed to save trade rollups: {response.status_code} - {response.text[:200]}")
+            return False
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving trade rollups: {e}")
+            return False
+    
+    async def get_trade_rollups(self, user_id: str, since_day: str) -> Optional[List[Dict]]:
+        """
+        Get trade rollup buckets - every weekly bucket + daily buckets since a day
+        
+        Args:
+            user_id: User ID
+            since_day: First daily bucket to load (YYYY-MM-DD)
+            
+        Returns:
+            List of bucket rows, or None on failure (so callers don't mistake it for "no trades")
+        """
+        if not self.enabled or not self._client:
+            return None
+        
+        try:
+            response = await self._client.get(
+                "/trade_rollups",
+                params={
+                    "user_id": f"eq.{user_id}",
+                    "or": f"(granularity.eq.week,bucket_start.gte.{since_day})",
+                    "order": "bucket_start.asc",
+                }
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"⚠️ Failed to get trade rollups: {response.status_code}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting trade rollups: {e}")
+            return None
+
+    
+    async def save_portfolio_snapshots(self, rows: List[Dict]) -> bool:
+        """
+        Upsert portfolio snapshot points (portfolio_snapshots table)
+        
+        Args:
+            rows: One row per resolution (see executor/portfolio_snapshots.py)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or not self._client or not rows:
+            return False
+        
+        try:
+            response = await self._client.post(
+                "/portfolio_snapshots",
+                json=rows,
+                headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                params={"on_conflict": "user_id,resolution,bucket_at"}
+            )
+            
+            if response.status_code in (200, 201, 204):
+                return True
+            logger.warning(f"⚠️ Failed to save portfolio snapshot: {response.status_code} - {response.text[:200]}")
+            return False
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving portfolio snapshot: {e}")
+            return False
+    
+    async def get_portfolio_snapshots(self, user_id: str, resolution: str, since: str, limit: int = 1000) -> List[Dict]:
+        """
+        Get portfolio snapshot points of one resolution since a time (oldest first)
+        
+        Args:
+            user_id: User ID
+            resolution: 5m / 1h / 1d
+            since: ISO timestamp
+            limit: Max points
+            
+        Returns:
+            List of points (without per-position values)
+        """
+        if not self.enabled or not self._client:
+            return []
+        
+        try:
+            response = await self._client.get(
+                "/portfolio_snapshots",
+                params={
+                    "select": "bucket_at,value_usd,cost_usd,unrealized_pnl_usd,realized_pnl_usd,equity_usd,open_positions",
+                    "user_id": f"eq.{user_id}",
+                    "resolution": f"eq.{resolution}",
+                    "bucket_at": f"gte.{since}",
+                    "order": "bucket_at.asc",
+                    "limit": limit,
+                }
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"⚠️ Failed to get portfolio snapshots: {response.status_code}")
+            return []
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting portfolio snapshots: {e}")
+            return []
+    
+    async def delete_portfolio_snapshots(self, user_id: str, resolution: str, before: str) -> int:
+        """
+        Delete portfolio snapshot points of one resolution older than a time
+        
+        Args:
+            user_id: User ID
+            resolution: 5m / 1h / 1d
+            before: ISO timestamp
+            
+        Returns:
+            Number of deleted points (0 on failure)
+        """
+        if not self.enabled or not self._client:
+            return 0
+        
+        try:
+            response = await self._client.delete(
+                "/portfolio_snapshots",
+                params={
+                    "user_id": f"eq.{user_id}",
+                    "resolution": f"eq.{resolution}",
+                    "bucket_at": f"lt.{before}",
+                },
+                headers={"Prefer": "return=minimal,count=exact"}
+            )
+            
+            if response.status_code in (200, 204):
+                # Content-Range: */N
+                content_range = response.headers.get("content-range", "")
+                total = content_range.rsplit("/", 1)[-1]
+                return int(total) if total.isdigit() else 0
+            logger.warning(f"⚠️ Failed to delete portfolio snapshots: {response.status_code}")
+            return 0
+            
+        except Exception as e:
+            logger.error(f"❌ Error deleting portfolio snapshots: {e}")
+            return 0
+    
+    async def get_address_owners(self, addresses: List[str]) -> Dict[str, Dict]:
+        """
+        Get cached owner / classification for addresses (address_owners table)
+        
+        Args:
+            addresses: Account addresses
+            
+        Returns:
+            Dict address -> {"owner", "kind", "label"}
+        """
+        if not self.enabled or not self._client or not addresses:
+            return {}
+        
+        owners: Dict[str, Dict] = {}
+        try:
+            # Keep the query string short - chunk the in.() filter
+            for i in range(0, len(addresses), 100):
+                chunk = addresses[i:i + 100]
+                response = await self._client.get(
+                    "/address_owners",
+                    params={
+                        "select": "address,owner,kind,label",
+                        "address": f"in.({','.join(chunk)})",
+                    }
+                )
+                if response.status_code != 200:
+                    logger.debug(f"Failed to get address owners: {response.status_code}")
+                    continue
+                for row in response.json():
+                    owners[row["address"]] = {
+                        "owner": row.get("owner") or "",
+                        "kind": row.get("kind") or "other",
+                        "label": row.get("label") or "",
+                    }
+        except Exception as e:
+            logger.error(f"❌ Error getting address owners: {e}")
+        
+        return owners
+    
+    async def save_address_owners(self, entries: Dict[str, Dict]) -> bool:
+        """
+        Upsert address owners (address_owners table) in one request
+        
+        Args:
+            entries: Dict address -> {"owner", "kind", "label"}
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or not self._client or not entries:
+            return False
+        
+        try:
+            rows = [
+                {
+                    "address": address,
+                    "owner": entry.get("owner"),
+                    "kind": entry.get("kind", "other"),
+                    "label": entry.get("label"),
+                }
+                for address, entry in entries.items()
+            ]
+            response = await self._client.post(
+                "/address_owners",
+                json=rows,
+                headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                params={"on_conflict": "address"}
+            )
+            
+            if response.status_code in (200, 201, 204):
+                logger.debug(f"✅ Saved {len(rows)} address owners")
+                return True
+            logger.warning(f"⚠️ Failed to save address owners: {response.status_code} - {response.text[:200]}")
+            return False
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving address owners: {e}")
+            return False
+
+    
+    async def save_performance_rows(self, rows: List[Dict], chunk_size: int = 500) -> bool:
+        """
+        Bulk upsert tracked tokens (performance_tracking table)
+        
+        Args:
+            rows: Rows keyed by address (see PerformanceTracker._to_row)
+            chunk_size: Max rows per request
+            
+        Returns:
+            True if all chunks were saved, False otherwise
+        """
+        if not self.enabled or not self._client or not rows:
+            return False
+        
+        saved = True
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                response = await self._client.post(
+                    "/performance_tracking",
+                    json=chunk,
+                    headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+                    params={"on_conflict": "address"}
+                )
+                
+                if response.status_code not in (200, 201, 204):
+                    logger.warning(f"⚠️ Failed to save performance rows: {response.status_code} - {response.text[:200]}")
+                    saved = False
+            
+            if saved:
+                logger.debug(f"✅ Saved {len(rows)} performance rows")
+            return saved
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving performance rows: {e}")
+            return False
 
 
 # Global instance
@@ -0,0 +1,371 @@
+"""
+Trade Rollups - Incremental Analytics Aggregates
+סיכומים מצטברים של trades לפי יום / שבוע (במקום חישוב מחדש מ-trade_history)
+
+📋 מה הקובץ הזה עושה:
+-------------------
+api/routes/analytics.py הוריד עד 1000 שורות trade_history בכל בקשה וחישב win rate,
+PnL, best / worst trade ו-avg win / loss ב-Python. זה איטי יותר ככל שההיסטוריה גדלה,
+ו-"all time" שגוי ברגע שעוברים 1000 trades.
+
+הקובץ הזה:
+1. מחזיק סיכום (RollupBucket) לכל יום ולכל שבוע - מונים, סכומי PnL, best / worst
+2. מעדכן את ה-bucket של היום ושל השבוע בכל save_trade / close_position
+3. שומר את ה-buckets בטבלה trade_rollups (upsert של השורות שהשתנו)
+4. עונה ל-7d / 30d / 90d מסכום של buckets יומיים, ול-all מסכום של buckets שבועיים
+
+🔧 פונקציות עיקריות:
+- get_trade_rollups() - המנוע הגלובלי
+- record_trade(trade) - נקרא מ-SupabaseClient.save_trade
+- record_position_closed() - נקרא מ-SupabaseClient.close_position
+- summary(time_range) - RollupBucket אחד לטווח המבוקש
+
+💡 איך זה עובד:
+1. שימוש ראשון טוען מהטבלה את כל ה-buckets השבועיים + היומיים של 91 הימים האחרונים
+2. trade מעדכן את ה-buckets בזיכרון ושומר רק אותם (2 שורות)
+3. summary ממזג לכל היותר 91 buckets יומיים / bucket אחד לכל שבוע בהיסטוריה
+   ורענן מהטבלה אם עברו SUMMARY_RELOAD_SECONDS - ה-API רץ בתהליך נפרד מהבוט
+   (run_api.py) ורק הבוט כותב trades, אז הזיכרון של ה-API לבד היה קופא
+4. כתיבה שנכשלה נשארת "dirty" ונשלחת שוב עם ה-trade הבא (הערכים מוחלטים, לא deltas)
+
+📝 הערות:
+- buckets לפי UTC, שבוע מתחיל ביום שני (כמו date_trunc('week') ב-Postgres)
+- 7d = היום + 6 הימים הקודמים (ברזולוציה של יום, לא של שעה)
+- migration 008 יוצרת את הטבלה וממלאת אותה מ-trade_history הקיים
+- trades מלפני טעינה מוצלחת מחכים בזיכרון - לא דורסים סיכומים שכבר בטבלה
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from database.supabase_client import SupabaseClient, get_supabase_client
+from utils.logger import get_logger
+
+logger = get_logger("trade_rollups")
+
+DAY = "day"
+WEEK = "week"
+
+# time_range -> days of daily buckets (None = all weekly buckets)
+TIME_RANGES: Dict[str, Optional[int]] = {
+    "7d": 7,
+    "30d": 30,
+    "90d": 90,
+    "all": None,
+}
+
+DAY_BUCKETS_KEPT = 91  # Longest daily range + today
+SUMMARY_RELOAD_SECONDS = 15.0  # Max age of the buckets a summary is built from
+
+
+@dataclass
+class RollupBucket:
+    """סיכום trades של יום / שבוע אחד (או מיזוג של כמה)"""
+    granularity: str
+    bucket_start: date
+    total_trades: int = 0
+    buy_trades: int = 0
+    sell_trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    closed_positions: int = 0
+    total_pnl_usd: float = 0.0
+    win_pnl_usd: float = 0.0
+    loss_pnl_usd: float = 0.0
+    volume_usd: float = 0.0
+    best_pnl_usd: Optional[float] = None
+    best_token_symbol: Optional[str] = None
+    best_trade_at: Optional[str] = None
+    worst_pnl_usd: Optional[float] = None
+    worst_token_symbol: Optional[str] = None
+    worst_trade_at: Optional[str] = None
+
+    def add_trade(self, trade_type: str, pnl_usd: float, value_usd: float, token_symbol: Optional[str], at: str):
+        """
+        הוסף trade אחד
+
+        Args:
+            trade_type: BUY / SELL
+            pnl_usd: realized PnL (0 ל-BUY)
+            value_usd: ערך ה-trade
+            token_symbol: סימבול
+            at: זמן ה-trade (ISO)
+        """
+        self.total_trades += 1
+        if trade_type == "BUY":
+            self.buy_trades += 1
+        elif trade_type == "SELL":
+            self.sell_trades += 1
+
+        self.total_pnl_usd += pnl_usd
+        self.volume_usd += value_usd
+        if pnl_usd > 0:
+            self.winning_trades += 1
+            self.win_pnl_usd += pnl_usd
+        elif pnl_usd < 0:
+            self.losing_trades += 1
+            self.loss_pnl_usd += pnl_usd
+
+        # >= - on ties the later trade wins (same as max() over newest-first rows)
+        if self.best_pnl_usd is None or pnl_usd >= self.best_pnl_usd:
+            self.best_pnl_usd, self.best_token_symbol, self.best_trade_at = pnl_usd, token_symbol, at
+        if self.worst_pnl_usd is None or pnl_usd <= self.worst_pnl_usd:
+            self.worst_pnl_usd, self.worst_token_symbol, self.worst_trade_at = pnl_usd, token_symbol, at
+
+    def merge(self, other: "RollupBucket"):
+        """הוסף bucket מאוחר יותר לסיכום הזה"""
+        for name in (
+            "total_trades", "buy_trades", "sell_trades", "winning_trades", "losing_trades",
+            "closed_positions", "total_pnl_usd", "win_pnl_usd", "loss_pnl_usd", "volume_usd",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+        if other.best_pnl_usd is not None and (self.best_pnl_usd is None or other.best_pnl_usd >= self.best_pnl_usd):
+            self.best_pnl_usd = other.best_pnl_usd
+            self.best_token_symbol = other.best_token_symbol
+            self.best_trade_at = other.best_trade_at
+        if other.worst_pnl_usd is not None and (self.worst_pnl_usd is None or other.worst_pnl_usd <= self.worst_pnl_usd):
+            self.worst_pnl_usd = other.worst_pnl_usd
+            self.worst_token_symbol = other.worst_token_symbol
+            self.worst_trade_at = other.worst_trade_at
+
+    def to_row(self, user_id: str) -> Dict:
+        """שורה לטבלה trade_rollups"""
+        return {
+            "user_id": user_id,
+            "granularity": self.granularity,
+            "bucket_start": self.bucket_start.isoformat(),
+            "total_trades": self.total_trades,
+            "buy_trades": self.buy_trades,
+            "sell_trades": self.sell_trades,
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "closed_positions": self.closed_positions,
+            "total_pnl_usd": round(self.total_pnl_usd, 2),
+            "win_pnl_usd": round(self.win_pnl_usd, 2),
+            "loss_pnl_usd": round(self.loss_pnl_usd, 2),
+            "volume_usd": round(self.volume_usd, 2),
+            "best_pnl_usd": self.best_pnl_usd,
+            "best_token_symbol": self.best_token_symbol,
+            "best_trade_at": self.best_trade_at,
+            "worst_pnl_usd": self.worst_pnl_usd,
+            "worst_token_symbol": self.worst_token_symbol,
+            "worst_trade_at": self.worst_trade_at,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "RollupBucket":
+        """bucket משורה בטבלה"""
+        def number(name: str) -> Optional[float]:
+            value = row.get(name)
+            return float(value) if value is not None else None
+
+        return cls(
+            granularity=row["granularity"],
+            bucket_start=date.fromisoformat(str(row["bucket_start"])[:10]),
+            total_trades=int(row.get("total_trades") or 0),
+            buy_trades=int(row.get("buy_trades") or 0),
+            sell_trades=int(row.get("sell_trades") or 0),
+            winning_trades=int(row.get("winning_trades") or 0),
+            losing_trades=int(row.get("losing_trades") or 0),
+            closed_positions=int(row.get("closed_positions") or 0),
+            total_pnl_usd=number("total_pnl_usd") or 0.0,
+            win_pnl_usd=number("win_pnl_usd") or 0.0,
+            loss_pnl_usd=number("loss_pnl_usd") or 0.0,
+            volume_usd=number("volume_usd") or 0.0,
+            best_pnl_usd=number("best_pnl_usd"),
+            best_token_symbol=row.get("best_token_symbol"),
+            best_trade_at=row.get("best_trade_at"),
+            worst_pnl_usd=number("worst_pnl_usd"),
+            worst_token_symbol=row.get("worst_token_symbol"),
+            worst_trade_at=row.get("worst_trade_at"),
+        )
+
+
+def bucket_starts(day: date) -> Dict[str, date]:
+    """תחילת ה-bucket היומי והשבועי של יום מסוים"""
+    return {DAY: day, WEEK: day - timedelta(days=day.weekday())}
+
+
+@dataclass
+class _UserRollups:
+    """ה-buckets של משתמש אחד בזיכרון"""
+    buckets: Dict[Tuple[str, date], RollupBucket] = field(default_factory=dict)
+    dirty: Set[Tuple[str, date]] = field(default_factory=set)  # (granularity, bucket_start) not persisted yet
+    loaded: bool = False
+    loaded_at: float = 0.0  # time.monotonic() of the last successful load
+    pending: List[Tuple] = field(default_factory=list)  # events recorded before the first load
+
+
+class TradeRollups:
+    """
+    Incremental trade aggregates per day / week, persisted in trade_rollups
+    """
+
+    def __init__(self, supabase: Optional[SupabaseClient] = None):
+        """
+        Initialize trade rollups
+
+        Args:
+            supabase: SupabaseClient (ברירת מחדל: הגלובלי)
+        """
+        self.supabase = supabase or get_supabase_client()
+        self._users: Dict[str, _UserRollups] = {}
+        self._lock = asyncio.Lock()
+
+    # ========================================================================
+    # Writes
+    # ========================================================================
+
+    async def record_trade(self, trade: Dict, user_id: str = "default"):
+        """
+        עדכן את הסיכומים עם trade שנשמר
+
+        Args:
+            trade: השורה שנשמרה ב-trade_history
+            user_id: משתמש
+        """
+        now = datetime.now(timezone.utc)
+        event = (
+            "trade",
+            now,
+            trade.get("trade_type"),
+            float(trade.get("realized_pnl_usd") or 0),
+            float(trade.get("value_usd") or 0),
+            trade.get("token_symbol"),
+        )
+        await self._record(user_id, event)
+
+    async def record_position_closed(self, user_id: str = "default"):
+        """עדכן את מונה הפוזיציות שנסגרו"""
+        await self._record(user_id, ("close", datetime.now(timezone.utc)))
+
+    async def _record(self, user_id: str, event: Tuple):
+        try:
+            async with self._lock:
+                rollups = self._users.setdefault(user_id, _UserRollups())
+                rollups.pending.append(event)
+                if not await self._load(user_id, rollups):
+                    return  # Applied after the next successful load
+
+                self._apply_pending(rollups)
+                await self._persist(user_id, rollups)
+        except Exception as e:
+            logger.error(f"❌ Error updating trade rollups: {e}")
+
+    def _apply_pending(self, rollups: _UserRollups):
+        for event in rollups.pending:
+            at = event[1]
+            for granularity, start in bucket_starts(at.date()).items():
+                key = (granularity, start)
+                bucket = rollups.buckets.get(key)
+                if bucket is None:
+                    bucket = rollups.buckets[key] = RollupBucket(granularity, start)
+
+                if event[0] == "trade":
+                    _, _, trade_type, pnl_usd, value_usd, token_symbol = event
+                    bucket.add_trade(trade_type, pnl_usd, value_usd, token_symbol, at.isoformat())
+                else:
+                    bucket.closed_positions += 1
+                rollups.dirty.add(key)
+        rollups.pending.clear()
+
+    async def _persist(self, user_id: str, rollups: _UserRollups):
+        """שמור את כל ה-buckets שהשתנו (כולל כאלה שכתיבה קודמת שלהם נכשלה)"""
+        if not rollups.dirty:
+            return
+        keys = list(rollups.dirty)
+        rows = [rollups.buckets[key].to_row(user_id) for key in keys]
+        async with self.supabase:
+            saved = await self.supabase.save_trade_rollups(rows)
+        if saved:
+            rollups.dirty.difference_update(keys)
+
+    # ========================================================================
+    # Reads
+    # ========================================================================
+
+    async def summary(self, time_range: str = "all", user_id: str = "default") -> RollupBucket:
+        """
+        סיכום אחד לטווח זמן
+
+        Args:
+            time_range: 7d / 30d / 90d / all (ערך לא מוכר = all)
+            user_id: משתמש
+
+        Returns:
+            RollupBucket ממוזג (ריק אם אין נתונים / הטעינה נכשלה)
+        """
+        days = TIME_RANGES.get(time_range)
+        today = datetime.now(timezone.utc).date()
+
+        async with self._lock:
+            rollups = self._users.setdefault(user_id, _UserRollups())
+            if await self._load(user_id, rollups, SUMMARY_RELOAD_SECONDS) and rollups.pending:
+                self._apply_pending(rollups)
+                await self._persist(user_id, rollups)
+
+            if days is None:
+                granularity, since = WEEK, date.min
+            else:
+                granularity, since = DAY, today - timedelta(days=days - 1)
+
+            selected = sorted(
+                (b for (g, start), b in rollups.buckets.items() if g == granularity and start >= since),
+                key=lambda b: b.bucket_start,
+            )
+
+        result = RollupBucket(granularity, since if days is not None else today)
+        for bucket in selected:
+            result.merge(bucket)
+        return result
+
+    async def _load(self, user_id: str, rollups: _UserRollups, max_age: Optional[float] = None) -> bool:
+        """
+        טען את ה-buckets מהטבלה
+
+        Args:
+            user_id: משתמש
+            rollups: ה-buckets בזיכרון
+            max_age: טען מחדש אם הטעינה האחרונה ישנה מזה (None = פעם אחת בלבד)
+
+        Returns:
+            True אם יש buckets טעונים (גם אם הרענון נכשל ונשארו הקודמים)
+        """
+        if rollups.loaded and (max_age is None or time.monotonic() - rollups.loaded_at < max_age):
+            return True
+        if not self.supabase.enabled:
+            return False
+
+        since = datetime.now(timezone.utc).date() - timedelta(days=DAY_BUCKETS_KEPT)
+        async with self.supabase:
+            rows = await self.supabase.get_trade_rollups(user_id, since.isoformat())
+        if rows is None:
+            return rollups.loaded
+
+        for row in rows:
+            bucket = RollupBucket.from_row(row)
+            key = (bucket.granularity, bucket.bucket_start)
+            if key not in rollups.dirty:  # Our unsaved version is newer than the table's
+                rollups.buckets[key] = bucket
+        if not rollups.loaded:
+            logger.info(f"📊 Loaded {len(rows)} trade rollup buckets for {user_id}")
+        rollups.loaded = True
+        rollups.loaded_at = time.monotonic()
+        return True
+
+
+# Global instance
+_trade_rollups: Optional[TradeRollups] = None
+
+
+def get_trade_rollups() -> TradeRollups:
+    """Get global trade rollups instance"""
+    global _trade_rollups
+    if _trade_rollups is None:
+        _trade_rollups = TradeRollups()
+    return _trade_rollups
@@ -0,0 +1,259 @@
+"""
+Write-Behind Buffer - Batched Database Writes
+
+📋 מה הקובץ הזה עושה:
+-------------------
+במקום POST נפרד לכל שורה (טוקן שנסרק, עדכון ROI, מחיר של פוזיציה) - השורות נאספות
+בזיכרון ונכתבות ל-Supabase בבקשת upsert אחת (PostgREST array) לכל טבלה.
+
+הקובץ הזה:
+1. מקבל שורות מהסריקה, מ-PerformanceTracker ומ-PositionMonitor (add)
+2. שומר רק את הגרסה האחרונה לכל מפתח (אותו טוקן פעמיים = שורה אחת)
+3. כותב לפי גודל (DB_WRITE_BUFFER_MAX_ROWS) או לפי גיל (DB_WRITE_BUFFER_MAX_AGE_SECONDS)
+4. מנסה שוב עם backoff אם הכתיבה נכשלה
+5. כותב את כל מה שנשאר ב-close() (shutdown)
+
+🔧 פונקציות עיקריות:
+- get_write_buffer() - ה-buffer הגלובלי
+- add(table, row) - הוספת שורה
+- flush() - כתיבה מיידית של הכל
+- get_stats() / close()
+
+💡 איך זה עובד:
+1. כל טבלה ממופה למפתח ולמתודת bulk ב-SupabaseClient (TABLES)
+2. השורה הראשונה שנכנסת מפעילה טיימר - אחרי max_age שניות יש flush
+3. אם מגיעים ל-max_rows לפני כן - flush מיד
+4. flush שנכשל מחזיר את השורות ל-buffer (אם לא הגיעה גרסה חדשה יותר) ומחכה
+   1s, 2s, 4s... - אחרי max_retries ניסיונות השורות נזרקות עם שגיאה בלוג
+
+📝 הערות:
+- סבב סריקה = בקשה אחת ל-scanned_tokens_history במקום N
+- שורה שעדיין ב-buffer לא נראית בשאילתות - עיכוב של עד max_age שניות
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from database.supabase_client import SupabaseClient, get_supabase_client
+from utils.logger import get_logger
+
+logger = get_logger("write_buffer")
+
+# table -> (key column, SupabaseClient bulk method)
+TABLES: Dict[str, Tuple[str, str]] = {
+    "scanned_tokens_history": ("address", "save_tokens"),
+    "performance_tracking": ("address", "save_performance_rows"),
+    "positions": ("token_address", "update_position_prices"),
+}
+
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+
+class WriteBehindBuffer:
+    """
+    Collects rows per table and writes them in one bulk upsert
+    """
+
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        max_rows: int = 200,
+        max_age_seconds: float = 5.0,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize write-behind buffer
+
+        Args:
+            supabase: SupabaseClient (ברירת מחדל: הגלובלי)
+            max_rows: flush כשיש כל כך הרבה שורות ממתינות
+            max_age_seconds: flush כשהשורה הוותיקה ממתינה כל כך הרבה זמן
+            max_retries: ניסיונות לכל שורה לפני שזורקים אותה
+        """
+        self.supabase = supabase or get_supabase_client()
+        self.max_rows = max_rows
+        self.max_age = max_age_seconds
+        self.max_retries = max_retries
+
+        self._rows: Dict[str, Dict[str, Dict]] = {table: {} for table in TABLES}  # table -> key -> row
+        self._attempts: Dict[Tuple[str, str], int] = {}  # (table, key) -> failed flushes
+        self._oldest: Optional[float] = None  # time.monotonic() of the oldest pending row
+        self._retry_delay = 0.0
+        self._lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.rows_added = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def add(self, table: str, row: Dict):
+        """
+        הוסף שורה לכתיבה (מחליף גרסה קודמת של אותו מפתח שעוד לא נכתבה)
+
+        Args:
+            table: אחת מהטבלאות ב-TABLES
+            row: השורה (חייבת לכלול את עמודת המפתח)
+        """
+        if not self.supabase.enabled:
+            return
+
+        key_column, _ = TABLES[table]
+        key = row.get(key_column)
+        if not key:
+            return
+
+        self._rows[table][key] = row
+        self.rows_added += 1
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+
+        self._ensure_task()
+        if self.pending() >= self.max_rows:
+            self._wakeup.set()
+
+    def add_many(self, table: str, rows: List[Dict]):
+        """הוסף כמה שורות לאותה טבלה"""
+        for row in rows:
+            self.add(table, row)
+
+    def pending(self) -> int:
+        """מספר השורות שממתינות לכתיבה"""
+        return sum(len(rows) for rows in self._rows.values())
+
+    async def flush(self) -> bool:
+        """
+        כתוב עכשיו את כל השורות הממתינות (בקשה אחת לכל טבלה)
+
+        Returns:
+            True אם כל הטבלאות נכתבו בהצלחה
+        """
+        async with self._lock:
+            batches = {table: rows for table, rows in self._rows.items() if rows}
+            if not batches:
+                return True
+
+            self._rows = {table: {} for table in TABLES}
+            self._oldest = None
+            self.flushes += 1
+
+            ok = True
+            unsent = dict(batches)
+            try:
+                async with self.supabase:
+                    for table, rows in batches.items():
+                        _, method = TABLES[table]
+                        try:
+                            saved = await getattr(self.supabase, method)(list(rows.values()))
+                        except Exception as e:
+                            logger.error(f"❌ Bulk write to {table} failed: {e}")
+                            saved = False
+                        del unsent[table]
+
+                        if saved:
+                            self.rows_written += len(rows)
+                            for key in rows:
+                                self._attempts.pop((table, key), None)
+                        else:
+                            ok = False
+                            self._requeue(table, rows)
+            finally:
+                # Cancelled mid-flush (shutdown) - keep what was not sent yet
+                for table, rows in unsent.items():
+                    for key, row in rows.items():
+                        self._rows[table].setdefault(key, row)
+                if self.pending() and self._oldest is None:
+                    self._oldest = time.monotonic()
+
+            if ok:
+                self._retry_delay = 0.0
+            else:
+                self.failed_flushes += 1
+                self._retry_delay = min(
+                    max(self._retry_delay * 2, RETRY_BASE_SECONDS), RETRY_MAX_SECONDS
+                )
+            return ok
+
+    def _requeue(self, table: str, rows: Dict[str, Dict]):
+        """Put failed rows back (newer versions that arrived meanwhile win)"""
+        for key, row in rows.items():
+            attempts = self._attempts.get((table, key), 0) + 1
+            if attempts >= self.max_retries:
+                self._attempts.pop((table, key), None)
+                self.rows_dropped += 1
+                logger.error(f"❌ Dropping {table} row {str(key)[:16]} after {attempts} failed writes")
+                continue
+            self._attempts[(table, key)] = attempts
+            self._rows[table].setdefault(key, row)
+
+    # ========================================================================
+    # Background flush
+    # ========================================================================
+
+    def _ensure_task(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """flush לפי גיל / גודל, עם backoff אחרי כשלון"""
+        while self.pending():
+            age = time.monotonic() - (self._oldest or time.monotonic())
+            wait = max(self.max_age - age, self._retry_delay, 0.0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Write buffer flush failed: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "pending": self.pending(),
+            "rows_added": self.rows_added,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+        }
+
+    async def close(self):
+        """עצור את ה-flush ברקע וכתוב את כל מה שנשאר"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.pending():
+            logger.info(f"💾 Flushing {self.pending()} buffered rows before shutdown...")
+            await self.flush()
+
+
+# Global instance
+_write_buffer: Optional[WriteBehindBuffer] = None
+
+
+def get_write_buffer() -> WriteBehindBuffer:
+    """Get global write-behind buffer instance"""
+    global _write_buffer
+    if _write_buffer is None:
+        _write_buffer = WriteBehindBuffer(
+            max_rows=settings.db_write_buffer_max_rows,
+            max_age_seconds=settings.db_write_buffer_max_age_seconds,
+        )
+    return _write_buffer
@@ -52,6 +52,7 @@ import base64
 
 from executor.wallet_manager import WalletManager
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
 
 logger = get_logger(__name__)
 
@@ -83,7 +84,7 @@ class JupiterClient:
         """
         self.wallet_manager = wallet_manager
         self.rpc_client = wallet_manager.rpc_client
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = create_http_client("trading", timeout=30.0)
         
         logger.info("✅ JupiterClient initialized")
     
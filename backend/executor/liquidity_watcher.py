@@ -0,0 +1,490 @@
+"""
+Liquidity Watcher
+זיהוי משיכת נזילות בזמן אמת דרך accountSubscribe על ה-vaults של ה-pool
+
+📋 מה הקובץ הזה עושה:
+-------------------
+הזיהוי של rug pull בפוזיציות פתוחות מבוסס על נזילות מ-DexScreener, שמפגרת אחרי
+ה-chain בעשרות שניות. כשה-LP נמשך - עשרות שניות זה ההבדל בין לצאת לפני או אחרי.
+
+הקובץ הזה:
+1. מוצא את ה-vaults של ה-pool (base + quote) מתוך חשבון ה-pool (Raydium AMM v4)
+2. נרשם ל-accountSubscribe על שני ה-vaults בחיבור websocket אחד לכל הפוזיציות
+3. מחשב בכל עדכון כמה מה-quote (SOL / USDC) יצא מה-pool בחלון הזמן האחרון
+4. כשהירידה חוצה את הסף - קורא ל-callback של הפוזיציה (PositionMonitor → _emergency_exit)
+5. מתחבר מחדש אוטומטית (backoff) ונרשם מחדש לכל ה-vaults
+
+🔧 פונקציות עיקריות:
+- get_liquidity_watcher() - ה-watcher הגלובלי
+- watch(token_mint, on_drain, pool_address / vaults) - התחל מעקב
+- unwatch(token_mint) - הפסק מעקב
+- get_stats() / close()
+
+💡 איך זה עובד:
+1. יתרת vault = שדה amount בחשבון SPL token (offset 64) - בלי jsonParsed
+2. לכל pool נשמרת היסטוריה של יתרת ה-quote בחלון LIQUIDITY_DRAIN_WINDOW_SECONDS
+3. drain = ירידה מהשיא בחלון לעומת היתרה הנוכחית (באחוזים)
+4. base ו-quote יורדים ביחד = משיכת LP, רק quote יורד = מכירה כבדה - שניהם מפעילים יציאה
+5. כל pool מפעיל את ה-callback פעם אחת בלבד
+
+📝 הערות:
+- דורש את החבילה websockets - בלעדיה ה-watcher כבוי (DexScreener polling ממשיך כרגיל)
+- LIQUIDITY_WATCH_ENABLED=false מכבה, LIQUIDITY_DRAIN_THRESHOLD_PCT קובע את הסף
+- כרגע רק pools של Raydium AMM v4 מפוענחים אוטומטית - לשאר אפשר להעביר vaults ידנית
+"""
+
+import asyncio
+import base64
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import base58
+
+from core.config import settings
+from scanner.helius_stream import QUOTE_MINTS, RAYDIUM_AMM_V4
+from utils.http_pool import create_http_client
+from utils.logger import get_logger
+
+logger = get_logger("liquidity_watcher")
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+
+# ============================================================================
+# Account layouts
+# ============================================================================
+
+# Raydium AMM v4 (LIQUIDITY_STATE_LAYOUT_V4)
+RAYDIUM_V4_POOL_SIZE = 752
+RAYDIUM_V4_BASE_VAULT_OFFSET = 336
+RAYDIUM_V4_QUOTE_VAULT_OFFSET = 368
+RAYDIUM_V4_BASE_MINT_OFFSET = 400
+RAYDIUM_V4_QUOTE_MINT_OFFSET = 432
+
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64  # mint (32) + owner (32) → amount (u64)
+
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class PoolVaults:
+    """Vault accounts of a pool (quote = SOL / USDC / USDT side)"""
+    pool_address: str
+    base_vault: str
+    quote_vault: str
+
+
+@dataclass(frozen=True)
+class LiquidityDrain:
+    """Quote-side liquidity left the pool faster than the threshold"""
+    token_mint: str
+    pool_address: str
+    quote_before: int  # Peak quote amount in the window (raw units)
+    quote_after: int
+    drain_pct: float
+    window_seconds: float
+    base_dropped: bool  # Base side went down too = LP removed (not just a sell)
+
+    @property
+    def reason(self) -> str:
+        kind = "LP REMOVED" if self.base_dropped else "Heavy sell"
+        return (
+            f"🚨 {kind}: {self.drain_pct:.0f}% of pool quote liquidity gone "
+            f"within {self.window_seconds:.0f}s (on-chain)"
+        )
+
+
+DrainCallback = Callable[[LiquidityDrain], None]
+
+
+def decode_token_amount(data: bytes) -> Optional[int]:
+    """amount of an SPL token account (None if the data is too short)"""
+    if len(data) < TOKEN_ACCOUNT_AMOUNT_OFFSET + 8:
+        return None
+    return int.from_bytes(data[TOKEN_ACCOUNT_AMOUNT_OFFSET:TOKEN_ACCOUNT_AMOUNT_OFFSET + 8], "little")
+
+
+def decode_raydium_v4_vaults(pool_address: str, data: bytes) -> Optional[PoolVaults]:
+    """
+    Base / quote vaults from a Raydium AMM v4 pool account
+
+    Returns:
+        PoolVaults with the SOL / USDC side as quote (None if the layout does not match)
+    """
+    if len(data) < RAYDIUM_V4_POOL_SIZE:
+        return None
+
+    def pubkey(offset: int) -> str:
+        return base58.b58encode(data[offset:offset + 32]).decode()
+
+    base_vault = pubkey(RAYDIUM_V4_BASE_VAULT_OFFSET)
+    quote_vault = pubkey(RAYDIUM_V4_QUOTE_VAULT_OFFSET)
+
+    # Some pools are created "backwards" (SOL as base)
+    if pubkey(RAYDIUM_V4_BASE_MINT_OFFSET) in QUOTE_MINTS and pubkey(RAYDIUM_V4_QUOTE_MINT_OFFSET) not in QUOTE_MINTS:
+        base_vault, quote_vault = quote_vault, base_vault
+
+    return PoolVaults(pool_address=pool_address, base_vault=base_vault, quote_vault=quote_vault)
+
+
+def _account_data(value: Optional[Dict]) -> Optional[bytes]:
+    """Raw bytes from a base64 account value (getAccountInfo / accountNotification)"""
+    if not value:
+        return None
+    data = value.get("data")
+    if not isinstance(data, list) or not data:
+        return None
+    try:
+        return base64.b64decode(data[0])
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# Per-pool state
+# ============================================================================
+
+class _PoolState:
+    """Live balances + quote history of one watched pool"""
+
+    def __init__(self, token_mint: str, vaults: PoolVaults, on_drain: DrainCallback):
+        self.token_mint = token_mint
+        self.vaults = vaults
+        self.on_drain = on_drain
+        self.base_amount: Optional[int] = None
+        self.quote_amount: Optional[int] = None
+        self.history: Deque[Tuple[float, int, Optional[int]]] = deque()  # (time, quote, base)
+        self.fired = False
+
+    def update(self, side: str, amount: int, window: float, threshold_pct: float) -> Optional[LiquidityDrain]:
+        """Apply a balance update - returns a LiquidityDrain the first time the threshold is crossed"""
+        if side == "base":
+            self.base_amount = amount
+            return None
+
+        self.quote_amount = amount
+        now = time.monotonic()
+        self.history.append((now, amount, self.base_amount))
+        while len(self.history) > 1 and now - self.history[0][0] > window:
+            self.history.popleft()
+
+        if self.fired:
+            return None
+
+        _, peak_quote, peak_base = max(self.history, key=lambda entry: entry[1])
+        if peak_quote <= 0:
+            return None
+
+        drain_pct = (peak_quote - amount) / peak_quote * 100
+        if drain_pct < threshold_pct:
+            return None
+
+        self.fired = True
+        return LiquidityDrain(
+            token_mint=self.token_mint,
+            pool_address=self.vaults.pool_address,
+            quote_before=peak_quote,
+            quote_after=amount,
+            drain_pct=drain_pct,
+            window_seconds=window,
+            base_dropped=(
+                peak_base is not None
+                and self.base_amount is not None
+                and self.base_amount < peak_base
+            ),
+        )
+
+
+# ============================================================================
+# Watcher
+# ============================================================================
+
+class LiquidityWatcher:
+    """
+    Real-time quote-side liquidity drain detection for open positions
+    """
+
+    def __init__(
+        self,
+        ws_url: Optional[str] = None,
+        rpc_url: Optional[str] = None,
+        drain_threshold_pct: float = 50.0,
+        window_seconds: float = 60.0,
+    ):
+        """
+        Initialize liquidity watcher
+
+        Args:
+            ws_url: Solana websocket URL (ברירת מחדל: Helius)
+            rpc_url: Solana RPC URL לשליפת חשבון ה-pool והיתרות הראשונות
+            drain_threshold_pct: % מה-quote שיוצא בחלון → יציאת חירום
+            window_seconds: גודל החלון (שניות)
+        """
+        self.ws_url = ws_url or settings.helius_ws_url or (
+            f"wss://mainnet.helius-rpc.com/?api-key={settings.helius_api_key}"
+        )
+        self.rpc_url = rpc_url or settings.solana_rpc_url
+        self.drain_threshold_pct = drain_threshold_pct
+        self.window_seconds = window_seconds
+        self.http_client = create_http_client("monitor", timeout=10.0)
+
+        self._pools: Dict[str, _PoolState] = {}  # token_mint -> state
+        self._subscriptions: Dict[int, Tuple[str, str]] = {}  # subscription id -> (token_mint, side)
+        self._pending: Dict[int, Tuple[str, str]] = {}  # request id -> (token_mint, side)
+        self._request_id = 0
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.connected = False
+        self.connections = 0
+        self.notifications = 0
+        self.drains = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    async def watch(
+        self,
+        token_mint: str,
+        on_drain: DrainCallback,
+        pool_address: Optional[str] = None,
+        vaults: Optional[PoolVaults] = None,
+    ) -> bool:
+        """
+        התחל מעקב אחרי ה-pool של טוקן
+
+        Args:
+            token_mint: כתובת הטוקן
+            on_drain: נקרא פעם אחת כשה-quote יורד מעבר לסף
+            pool_address: כתובת ה-pool (Raydium AMM v4) - ה-vaults נשלפים ממנו
+            vaults: vaults ידועים מראש (במקום pool_address)
+
+        Returns:
+            True אם המעקב פעיל
+        """
+        if not WEBSOCKETS_AVAILABLE:
+            logger.debug("websockets package not installed - liquidity watcher disabled")
+            return False
+
+        if vaults is None and pool_address:
+            vaults = await self._resolve_vaults(pool_address)
+        if vaults is None:
+            return False
+
+        state = _PoolState(token_mint, vaults, on_drain)
+
+        # Baseline before the first notification
+        balances = await self._get_balances([vaults.base_vault, vaults.quote_vault])
+        for side, vault in (("base", vaults.base_vault), ("quote", vaults.quote_vault)):
+            if balances.get(vault) is not None:
+                state.update(side, balances[vault], self.window_seconds, self.drain_threshold_pct)
+
+        self._pools[token_mint] = state
+        if self._ws is not None:
+            await self._subscribe_pool(self._ws, state)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._connection_loop())
+
+        logger.info(f"👁️ Watching pool liquidity for {token_mint[:8]}... ({vaults.pool_address[:8]}...)")
+        return True
+
+    def unwatch(self, token_mint: str):
+        """הפסק מעקב (ה-subscriptions נסגרים; החיבור נסגר כשאין יותר pools)"""
+        if self._pools.pop(token_mint, None) is None:
+            return
+
+        stale = [sub_id for sub_id, (mint, _) in self._subscriptions.items() if mint == token_mint]
+        for sub_id in stale:
+            del self._subscriptions[sub_id]
+            if self._ws is not None:
+                asyncio.create_task(self._send(self._ws, "accountUnsubscribe", [sub_id]))
+
+        if not self._pools and self._ws is not None:
+            asyncio.create_task(self._ws.close())
+
+    # ========================================================================
+    # Websocket
+    # ========================================================================
+
+    async def _connection_loop(self):
+        """Connect, subscribe all pools, read - reconnect with backoff while pools are watched"""
+        delay = RECONNECT_MIN_SECONDS
+
+        while self._pools:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=20) as ws:
+                    self.connections += 1
+                    self._subscriptions.clear()
+                    self._pending.clear()
+                    self._ws = ws
+                    self.connected = True
+                    delay = RECONNECT_MIN_SECONDS
+
+                    for state in list(self._pools.values()):
+                        await self._subscribe_pool(ws, state)
+                    logger.info(f"✅ Liquidity watcher connected ({len(self._pools)} pools)")
+
+                    async for raw in ws:
+                        self._handle_message(raw)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Liquidity watcher error: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self._pools:
+                logger.info(f"🔄 Reconnecting liquidity watcher in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _subscribe_pool(self, ws, state: _PoolState):
+        for side, vault in (("base", state.vaults.base_vault), ("quote", state.vaults.quote_vault)):
+            request_id = await self._send(
+                ws,
+                "accountSubscribe",
+                [vault, {"encoding": "base64", "commitment": "processed"}],
+            )
+            self._pending[request_id] = (state.token_mint, side)
+
+    async def _send(self, ws, method: str, params: List) -> int:
+        self._request_id += 1
+        try:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": self._request_id,
+                "method": method,
+                "params": params,
+            }))
+        except Exception as e:
+            logger.debug(f"{method} send failed: {e}")
+        return self._request_id
+
+    def _handle_message(self, raw):
+        """Subscription confirmations + accountNotification balance updates"""
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+
+        request_id = message.get("id")
+        if request_id in self._pending:
+            target = self._pending.pop(request_id)
+            if "result" in message and target[0] in self._pools:
+                self._subscriptions[message["result"]] = target
+            elif "error" in message:
+                logger.warning(f"⚠️ accountSubscribe failed: {message['error']}")
+            return
+
+        if message.get("method") != "accountNotification":
+            return
+
+        params = message.get("params") or {}
+        target = self._subscriptions.get(params.get("subscription"))
+        if not target:
+            return
+
+        token_mint, side = target
+        state = self._pools.get(token_mint)
+        data = _account_data((params.get("result") or {}).get("value"))
+        amount = decode_token_amount(data) if data else None
+        if state is None or amount is None:
+            return
+
+        self.notifications += 1
+        drain = state.update(side, amount, self.window_seconds, self.drain_threshold_pct)
+        if drain:
+            self.drains += 1
+            logger.warning(f"🚨 Liquidity drain on {token_mint[:8]}...: {drain.reason}")
+            try:
+                state.on_drain(drain)
+            except Exception as e:
+                logger.error(f"❌ Drain callback failed for {token_mint[:8]}...: {e}", exc_info=True)
+
+    # ========================================================================
+    # RPC
+    # ========================================================================
+
+    async def _rpc(self, method: str, params: List) -> Optional[Dict]:
+        try:
+            resp = await self.http_client.post(
+                self.rpc_url,
+                json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+            )
+            if resp.status_code == 200:
+                return resp.json().get("result")
+        except Exception as e:
+            logger.debug(f"{method} failed: {e}")
+        return None
+
+    async def _resolve_vaults(self, pool_address: str) -> Optional[PoolVaults]:
+        """Vaults of a Raydium AMM v4 pool (None for other pool types)"""
+        result = await self._rpc("getAccountInfo", [pool_address, {"encoding": "base64"}])
+        value = (result or {}).get("value")
+        if not value or value.get("owner") != RAYDIUM_AMM_V4:
+            return None
+        data = _account_data(value)
+        return decode_raydium_v4_vaults(pool_address, data) if data else None
+
+    async def _get_balances(self, vaults: List[str]) -> Dict[str, Optional[int]]:
+        result = await self._rpc("getMultipleAccounts", [vaults, {"encoding": "base64"}])
+        values = (result or {}).get("value") or []
+        balances: Dict[str, Optional[int]] = {}
+        for vault, value in zip(vaults, values):
+            data = _account_data(value)
+            balances[vault] = decode_token_amount(data) if data else None
+        return balances
+
+    # ========================================================================
+    # Stats / cleanup
+    # ========================================================================
+
+    def get_stats(self) -> Dict:
+        """Watcher counters"""
+        return {
+            "connected": self.connected,
+            "connections": self.connections,
+            "pools": len(self._pools),
+            "subscriptions": len(self._subscriptions),
+            "notifications": self.notifications,
+            "drains": self.drains,
+            "drain_threshold_pct": self.drain_threshold_pct,
+            "window_seconds": self.window_seconds,
+        }
+
+    async def close(self):
+        """Stop watching everything and release resources"""
+        self._pools.clear()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.http_client.aclose()
+
+
+# Global instance
+_liquidity_watcher: Optional[LiquidityWatcher] = None
+
+
+def get_liquidity_watcher() -> LiquidityWatcher:
+    """Get global liquidity watcher instance"""
+    global _liquidity_watcher
+    if _liquidity_watcher is None:
+        _liquidity_watcher = LiquidityWatcher(
+            drain_threshold_pct=settings.liquidity_drain_threshold_pct,
+            window_seconds=settings.liquidity_drain_window_seconds,
+        )
+    return _liquidity_watcher
@@ -12,6 +12,7 @@ Features:
 How it works:
 1. When bot alerts on a token → track_token()
 2. Every 5 minutes → update_all_tracked_tokens()
+   (batch price fetch → one ROI / status pass → one bulk upsert)
 3. If ROI > 50% → mark as SUCCESS, update smart wallets
 4. If ROI < -20% → mark as FAILURE, penalize smart wallets
 """
@@ -20,9 +21,9 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
-import json
 
 from database.supabase_client import get_supabase_client
+from database.write_buffer import get_write_buffer
 from analyzer.smart_money_tracker import get_smart_money_tracker
 from executor.price_fetcher import PriceFetcher
 from utils.logger import get_logger
@@ -117,106 +118,100 @@ class PerformanceTracker:
         """
         Update prices for all actively tracked tokens
         
-        Should be called every 5 minutes
+        Should be called every 5 minutes.
+        One batched price fetch, one pass for ROI / status, one bulk upsert.
         """
         if not self.tracked_tokens:
             return
         
         logger.info(f"🔄 Updating {len(self.tracked_tokens)} tracked tokens...")
         
-        for token_address, tracked in list(self.tracked_tokens.items()):
+        now = datetime.now(timezone.utc)
+        max_age = timedelta(days=self.max_tracking_days)
+        changed: List[TrackedToken] = []
+        active: List[TrackedToken] = []
+        
+        for tracked in list(self.tracked_tokens.values()):
             # Skip if already finished
             if tracked.status != "ACTIVE":
                 continue
             
             # Check if too old (stop tracking after 7 days)
-            age = datetime.now(timezone.utc) - tracked.entry_time
-            if age > timedelta(days=self.max_tracking_days):
+            if now - tracked.entry_time > max_age:
                 logger.info(f"⏰ {tracked.symbol} is too old, stopping tracking")
                 tracked.status = "EXPIRED"
-                await self._save_to_db(tracked)
+                changed.append(tracked)
                 continue
             
-            # Fetch current price
+            active.append(tracked)
+        
+        # Fetch current prices for all active tokens (chunked batch requests)
+        prices: Dict[str, Optional[float]] = {}
+        if active:
             try:
-                current_price = await self.price_fetcher.get_price(token_address)
-                
-                if current_price and current_price > 0:
-                    # Update price and ROI
-                    tracked.current_price = current_price
-                    tracked.roi = ((current_price - tracked.entry_price) / tracked.entry_price) * 100
-                    
-                    # Check if should mark as success/failure
-                    if tracked.roi >= self.success_threshold:
-                        await self._mark_success(tracked)
-                    elif tracked.roi <= self.failure_threshold:
-                        await self._mark_failure(tracked)
-                    else:
-                        # Just update in DB
-                        await self._save_to_db(tracked)
-                    
-                    logger.info(
-                        f"📊 {tracked.symbol}: "
-                        f"${tracked.current_price:.8f} ({tracked.roi:+.1f}%) "
-                        f"[{tracked.status}]"
-                    )
-            
+                prices = await self.price_fetcher.get_token_prices([t.address for t in active])
             except Exception as e:
-                logger.error(f"Error updating {tracked.symbol}: {e}")
-    
-    async def _mark_success(self, tracked: TrackedToken):
-        """
-        Mark token as successful and update smart wallets
-        
-        Called when ROI >= 50%
-        """
-        if tracked.status != "ACTIVE":
-            return  # Already processed
-        
-        logger.warning(
-            f"🎉 SUCCESS: {tracked.symbol} reached {tracked.roi:+.1f}% ROI!"
-        )
-        
-        tracked.status = "SUCCESS"
-        tracked.exit_price = tracked.current_price
-        tracked.exit_time = datetime.now(timezone.utc)
+                logger.error(f"Error fetching prices for tracked tokens: {e}")
         
-        # Update smart wallets - they were RIGHT!
-        for wallet_address in tracked.smart_wallets:
-            await self._update_wallet_success(wallet_address, True)
-        
-        # Save to DB
-        await self._save_to_db(tracked)
+        # ROI + status transitions in one pass
+        wallet_outcomes: List[tuple] = []  # (wallet_address, was_successful)
+        for tracked in active:
+            current_price = prices.get(tracked.address)
+            if not current_price or current_price <= 0 or current_price == tracked.current_price:
+                continue
+            
+            tracked.current_price = current_price
+            tracked.roi = ((current_price - tracked.entry_price) / tracked.entry_price) * 100
+            
+            # Check if should mark as success/failure
+            if tracked.roi >= self.success_threshold:
+                self._close_tracked(tracked, "SUCCESS", now)
+            elif tracked.roi <= self.failure_threshold:
+                self._close_tracked(tracked, "FAILURE", now)
+            
+            if tracked.status != "ACTIVE":
+                was_successful = tracked.status == "SUCCESS"
+                wallet_outcomes.extend((w, was_successful) for w in tracked.smart_wallets)
+            
+            changed.append(tracked)
+            logger.info(
+                f"📊 {tracked.symbol}: "
+                f"${tracked.current_price:.8f} ({tracked.roi:+.1f}%) "
+                f"[{tracked.status}]"
+            )
+        
+        # Smart wallets learn from the results - saved once for all of them
+        if wallet_outcomes:
+            for wallet_address, was_successful in wallet_outcomes:
+                self._update_wallet_success(wallet_address, was_successful)
+            self.smart_money_tracker.save_wallets()
+        
+        # All changed rows in one bulk upsert
+        await self._save_many_to_db(changed)
     
-    async def _mark_failure(self, tracked: TrackedToken):
+    def _close_tracked(self, tracked: TrackedToken, status: str, exit_time: datetime):
         """
-        Mark token as failed and penalize smart wallets
+        Mark token as SUCCESS (ROI >= 50%) or FAILURE (ROI <= -20%)
         
-        Called when ROI <= -20%
+        Smart wallet updates and the DB write are done by the caller (batched).
         """
         if tracked.status != "ACTIVE":
             return  # Already processed
         
-        logger.warning(
-            f"❌ FAILURE: {tracked.symbol} dropped to {tracked.roi:+.1f}% ROI"
-        )
+        if status == "SUCCESS":
+            logger.warning(f"🎉 SUCCESS: {tracked.symbol} reached {tracked.roi:+.1f}% ROI!")
+        else:
+            logger.warning(f"❌ FAILURE: {tracked.symbol} dropped to {tracked.roi:+.1f}% ROI")
         
-        tracked.status = "FAILURE"
+        tracked.status = status
         tracked.exit_price = tracked.current_price
-        tracked.exit_time = datetime.now(timezone.utc)
-        
-        # Update smart wallets - they were WRONG!
-        for wallet_address in tracked.smart_wallets:
-            await self._update_wallet_success(wallet_address, False)
-        
-        # Save to DB
-        await self._save_to_db(tracked)
+        tracked.exit_time = exit_time
     
-    async def _update_wallet_success(self, wallet_address: str, was_successful: bool):
+    def _update_wallet_success(self, wallet_address: str, was_successful: bool):
         """
         Update smart wallet's success rate
         
-        This is how the bot learns!
+        This is how the bot learns! (call smart_money_tracker.save_wallets() afterwards)
         
         Args:
             wallet_address: Smart wallet address
@@ -244,51 +239,55 @@ class PerformanceTracker:
             f"{wallet_info.profitable_trades}/{wallet_info.total_trades} "
             f"({wallet_info.success_rate:.1f}% success rate)"
         )
-        
-        # Save updated wallets
-        self.smart_money_tracker.save_wallets()
     
-    async def _save_to_db(self, tracked: TrackedToken):
+    @staticmethod
+    def _to_row(tracked: TrackedToken) -> Dict:
         """
-        Save tracked token to Supabase
+        performance_tracking row
         
-        Table: performance_tracking
         Columns:
         - address (text, primary key)
         - symbol (text)
         - entry_price (float)
         - entry_time (timestamp)
         - entry_score (int)
-        - smart_wallets (json)
+        - smart_wallets (jsonb)
         - current_price (float)
         - roi (float)
         - status (text)
         - exit_price (float, nullable)
         - exit_time (timestamp, nullable)
         """
-        if not self.supabase:
-            return
+        return {
+            "address": tracked.address,
+            "symbol": tracked.symbol,
+            "entry_price": tracked.entry_price,
+            "entry_time": tracked.entry_time.isoformat(),
+            "entry_score": tracked.entry_score,
+            "smart_wallets": tracked.smart_wallets,
+            "current_price": tracked.current_price,
+            "roi": tracked.roi,
+            "status": tracked.status,
+            "exit_price": tracked.exit_price,
+            "exit_time": tracked.exit_time.isoformat() if tracked.exit_time else None,
+        }
+    
+    async def _save_to_db(self, tracked: TrackedToken):
+        """Save one tracked token to Supabase"""
+        await self._save_many_to_db([tracked])
+    
+    async def _save_many_to_db(self, tracked_tokens: List[TrackedToken]):
+        """
+        Save tracked tokens to Supabase (table: performance_tracking)
         
-        try:
-            data = {
-                "address": tracked.address,
-                "symbol": tracked.symbol,
-                "entry_price": tracked.entry_price,
-                "entry_time": tracked.entry_time.isoformat(),
-                "entry_score": tracked.entry_score,
-                "smart_wallets": json.dumps(tracked.smart_wallets),
-                "current_price": tracked.current_price,
-                "roi": tracked.roi,
-                "status": tracked.status,
-                "exit_price": tracked.exit_price,
-                "exit_time": tracked.exit_time.isoformat() if tracked.exit_time else None,
-            }
-            
-            # Upsert (insert or update)
-            self.supabase.client.table("performance_tracking").upsert(data).execute()
+        Rows go through the write-behind buffer - one bulk upsert per flush.
+        """
+        if not self.supabase or not tracked_tokens:
+            return
         
-        except Exception as e:
-            logger.error(f"Error saving to DB: {e}")
+        get_write_buffer().add_many(
+            "performance_tracking", [self._to_row(t) for t in tracked_tokens]
+        )
     
     async def get_statistics(self) -> Dict:
         """
@@ -0,0 +1,259 @@
+"""
+Portfolio Snapshots - Time-Series Store for Portfolio Charts
+צילומי מצב של התיק בקצב קבוע, עם דילול (downsampling) של נתונים ישנים
+
+📋 מה הקובץ הזה עושה:
+-------------------
+/api/portfolio/performance/history בנה עד עכשיו סדרה מומצאת מהפוזיציות הנוכחיות.
+הקובץ הזה שומר נתונים אמיתיים:
+
+1. כל PORTFOLIO_SNAPSHOT_INTERVAL_SECONDS (ברירת מחדל 5 דקות) - צילום של התיק:
+   שווי הפוזיציות הפתוחות, עלות, PnL לא ממומש, PnL ממומש ושווי לכל פוזיציה
+2. הצילום נכתב לשלוש רזולוציות בטבלה portfolio_snapshots (upsert אחד):
+   5m (נשמר יומיים), 1h (נשמר 90 יום), 1d (נשמר לתמיד)
+3. פעם בשעה - מחיקת נקודות שעברו את זמן השמירה של הרזולוציה שלהן
+4. get_history(days) בוחרת את הרזולוציה העדינה ביותר שמכסה את הטווח
+   בלי לעבור MAX_POINTS נקודות - גרף נטען בזמן קבוע
+
+🔧 פונקציות עיקריות:
+- get_portfolio_snapshotter() - ה-snapshotter הגלובלי
+- run(position_monitor) - לולאת הצילומים (רצה ברקע מ-main.py)
+- take_snapshot(position_monitor) - צילום אחד
+- get_history(days) - (רזולוציה, נקודות) לגרף
+
+💡 איך זה עובד:
+1. כל נקודה מזוהה לפי (user_id, resolution, bucket_at) - bucket_at מעוגל לגודל הצעד
+2. צילום באמצע שעה דורס את נקודת ה-1h של אותה שעה → הנקודה היא הערך האחרון (close)
+3. מחירים מה-price feed המשותף (כבר נשלפו לניטור), PriceFetcher רק למה שחסר
+4. PnL ממומש מ-trade_rollups (database/trade_rollups.py) - בלי שאילתה על trade_history
+
+📝 הערות:
+- migration 009 יוצרת את הטבלה
+- אין פוזיציות פתוחות → עדיין נשמרת נקודה (שווי 0) כדי שהגרף יהיה רציף
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from database.supabase_client import SupabaseClient, get_supabase_client
+from database.trade_rollups import get_trade_rollups
+from utils.logger import get_logger
+
+logger = get_logger("portfolio_snapshots")
+
+
+@dataclass(frozen=True)
+class SnapshotTier:
+    """רזולוציה אחת של הסדרה"""
+    name: str
+    step_seconds: int
+    retention_days: Optional[int]  # None = לתמיד
+
+
+TIERS: Tuple[SnapshotTier, ...] = (
+    SnapshotTier("5m", 300, 2),
+    SnapshotTier("1h", 3600, 90),
+    SnapshotTier("1d", 86400, None),
+)
+
+MAX_POINTS = 800  # נקודות מקסימום לגרף אחד (30 יום בשעתי = 720)
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def select_tier(days: float) -> SnapshotTier:
+    """הרזולוציה העדינה ביותר ששומרת את כל הטווח ולא עוברת MAX_POINTS"""
+    for tier in TIERS:
+        covers = tier.retention_days is None or days <= tier.retention_days
+        if covers and days * 86400 / tier.step_seconds <= MAX_POINTS:
+            return tier
+    return TIERS[-1]
+
+
+def bucket_at(moment: datetime, tier: SnapshotTier) -> datetime:
+    """תחילת ה-bucket של הרגע ברזולוציה (UTC)"""
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % tier.step_seconds, tz=timezone.utc)
+
+
+class PortfolioSnapshotter:
+    """
+    Records portfolio snapshots at a fixed cadence into portfolio_snapshots
+    """
+
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        interval_seconds: float = 300.0,
+        user_id: str = "default",
+    ):
+        """
+        Initialize portfolio snapshotter
+
+        Args:
+            supabase: SupabaseClient (ברירת מחדל: הגלובלי)
+            interval_seconds: כל כמה שניות לצלם
+            user_id: משתמש
+        """
+        self.supabase = supabase or get_supabase_client()
+        self.interval = interval_seconds
+        self.user_id = user_id
+        self._last_prune = 0.0
+
+        # Stats
+        self.snapshots_taken = 0
+        self.snapshots_failed = 0
+        self.rows_pruned = 0
+        self.last_snapshot: Optional[Dict] = None
+
+    # ========================================================================
+    # Recording
+    # ========================================================================
+
+    async def run(self, position_monitor):
+        """
+        לולאת הצילומים - רצה עד שה-task מבוטל
+
+        Args:
+            position_monitor: PositionMonitor שממנו נלקחות הפוזיציות
+        """
+        logger.info(f"📸 Portfolio snapshots started (every {self.interval:g}s)")
+
+        while True:
+            started = time.monotonic()
+            try:
+                await self.take_snapshot(position_monitor)
+                if time.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                    await self.prune()
+            except Exception as e:
+                self.snapshots_failed += 1
+                logger.error(f"❌ Portfolio snapshot failed: {e}", exc_info=True)
+
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    async def take_snapshot(self, position_monitor) -> Optional[Dict]:
+        """
+        צלם את התיק ושמור את הנקודה בכל הרזולוציות
+
+        Returns:
+            הצילום (dict) או None אם השמירה נכשלה
+        """
+        if not self.supabase.enabled:
+            return None
+
+        positions = position_monitor.get_all_positions()
+        prices: Dict[str, Optional[float]] = {
+            p.token_mint: position_monitor.price_feed.last_price(p.token_mint) for p in positions
+        }
+        missing = [mint for mint, price in prices.items() if price is None]
+        if missing:
+            prices.update(await position_monitor.price_fetcher.get_token_prices(missing))
+
+        value_usd = 0.0
+        cost_usd = 0.0
+        position_values: Dict[str, float] = {}
+        for pos in positions:
+            price = prices.get(pos.token_mint) or pos.entry_price  # Fallback (same as /portfolio)
+            value = price * pos.amount_tokens
+            value_usd += value
+            cost_usd += pos.entry_price * pos.amount_tokens
+            position_values[pos.token_mint] = round(value, 2)
+
+        realized_pnl_usd = (await get_trade_rollups().summary("all", user_id=self.user_id)).total_pnl_usd
+
+        now = datetime.now(timezone.utc)
+        snapshot = {
+            "taken_at": now.isoformat(),
+            "value_usd": round(value_usd, 2),
+            "cost_usd": round(cost_usd, 2),
+            "unrealized_pnl_usd": round(value_usd - cost_usd, 2),
+            "realized_pnl_usd": round(realized_pnl_usd, 2),
+            "equity_usd": round(value_usd + realized_pnl_usd, 2),
+            "open_positions": len(positions),
+            "positions": position_values,
+        }
+        rows = [
+            {
+                "user_id": self.user_id,
+                "resolution": tier.name,
+                "bucket_at": bucket_at(now, tier).isoformat(),
+                **snapshot,
+            }
+            for tier in TIERS
+        ]
+
+        async with self.supabase:
+            saved = await self.supabase.save_portfolio_snapshots(rows)
+        if not saved:
+            self.snapshots_failed += 1
+            return None
+
+        self.snapshots_taken += 1
+        self.last_snapshot = snapshot
+        logger.debug(
+            f"📸 Portfolio snapshot: ${snapshot['value_usd']:,.2f} in {len(positions)} positions, "
+            f"realized ${snapshot['realized_pnl_usd']:,.2f}"
+        )
+        return snapshot
+
+    async def prune(self):
+        """מחק נקודות שעברו את זמן השמירה של הרזולוציה שלהן"""
+        self._last_prune = time.monotonic()
+        now = datetime.now(timezone.utc)
+
+        async with self.supabase:
+            for tier in TIERS:
+                if tier.retention_days is None:
+                    continue
+                before = (now - timedelta(days=tier.retention_days)).isoformat()
+                deleted = await self.supabase.delete_portfolio_snapshots(self.user_id, tier.name, before)
+                self.rows_pruned += deleted
+
+    # ========================================================================
+    # Reading
+    # ========================================================================
+
+    async def get_history(self, days: float) -> Tuple[str, List[Dict]]:
+        """
+        נקודות לגרף
+
+        Args:
+            days: כמה ימים אחורה
+
+        Returns:
+            (שם הרזולוציה, נקודות מהישנה לחדשה)
+        """
+        tier = select_tier(days)
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+        async with self.supabase:
+            points = await self.supabase.get_portfolio_snapshots(
+                self.user_id, tier.name, since, limit=MAX_POINTS + 1
+            )
+        return tier.name, points
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "interval_seconds": self.interval,
+            "snapshots_taken": self.snapshots_taken,
+            "snapshots_failed": self.snapshots_failed,
+            "rows_pruned": self.rows_pruned,
+            "last_snapshot_at": self.last_snapshot["taken_at"] if self.last_snapshot else None,
+        }
+
+
+# Global instance
+_snapshotter: Optional[PortfolioSnapshotter] = None
+
+
+def get_portfolio_snapshotter() -> PortfolioSnapshotter:
+    """Get global portfolio snapshotter instance"""
+    global _snapshotter
+    if _snapshotter is None:
+        _snapshotter = PortfolioSnapshotter(interval_seconds=settings.portfolio_snapshot_interval_seconds)
+    return _snapshotter
@@ -7,7 +7,7 @@ Position Monitor
 זה הקובץ שמנהל את ניטור הפוזיציות - בדיקת מחיר, stop loss, מכירה אוטומטית.
 
 הקובץ הזה:
-1. ניטור מחיר כל 30 שניות
+1. ניטור מחיר כל 30 שניות (דרך ה-price feed המשותף - executor/price_feed.py)
 2. בדיקת stop loss (-15%)
 3. מכירה אוטומטית אם stop loss הופעל
 4. התראות בטלגרם
@@ -18,6 +18,9 @@ Position Monitor
 - Stop Loss: ALWAYS -15% (אין יוצאים מהכלל!)
 - Time Limit: 7 ימים מקסימום
 - Emergency Exit: אם Rug Pull מזוהה → מכירה מיידית
+- Rug checks מדורגים: נזילות / מחיר בכל tick, בדיקה מלאה ברקע כל RUG_FULL_CHECK_INTERVAL_SECONDS
+  (או מיד כשסיגנל זול חוצה סף) - stop loss לא מחכה לניתוח rug
+- Liquidity watcher: accountSubscribe על ה-vaults של ה-pool → יציאת חירום בלי לחכות ל-tick
 
 🔧 שימוש:
 ```python
@@ -54,10 +57,15 @@ class PositionStatus(Enum):
     COMPLETED = "COMPLETED"
 from executor.wallet_manager import WalletManager
 from executor.price_fetcher import PriceFetcher
-from analyzer.rug_detector import get_rug_detector
+from executor.price_feed import PriceSubscription, PriceTick, get_price_feed
+from executor.liquidity_watcher import LiquidityDrain, get_liquidity_watcher
+from analyzer.pair_cache import get_pair_cache
+from analyzer.rug_detector import RugPullAlert, RugWatchState, get_rug_detector
 from database.supabase_client import SupabaseClient
+from database.write_buffer import get_write_buffer
 from core.config import settings
 from utils.logger import get_logger
+from utils.rate_limiter import set_request_class
 
 logger = get_logger(__name__)
 
@@ -141,14 +149,16 @@ class PositionMonitor:
             jupiter_client: JupiterClient לביצוע swaps
             wallet_manager: WalletManager לבדיקת balances
             price_fetcher: PriceFetcher לקבלת מחירים (אופציונלי - יוצר חדש אם לא מוגדר)
-            check_interval_seconds: תדירות בדיקה (ברירת מחדל: 30 שניות)
+            check_interval_seconds: זמן מקסימום לחכות ל-tick לפני בדיקת time limit / rug (ברירת מחדל: 30 שניות)
             alert_callback: פונקציה להתראות (אופציונלי)
             supabase_client: SupabaseClient לשמירת פוזיציות (אופציונלי)
         """
         self.jupiter = jupiter_client
         self.wallet = wallet_manager
         self.price_fetcher = price_fetcher or PriceFetcher()
+        self.price_feed = get_price_feed(self.price_fetcher)  # tick אחד לכל הפוזיציות
         self.rug_detector = get_rug_detector()  # NEW
+        self.liquidity_watcher = get_liquidity_watcher()  # משיכת נזילות on-chain
         self.check_interval = check_interval_seconds
         self.alert_callback = alert_callback
         self.supabase = supabase_client
@@ -242,10 +252,34 @@ class PositionMonitor:
             f"({position.token_mint[:8]}...)"
         )
         
+        # בקשות מתוך לולאת הניטור מקבלות תור משלהן ב-rate limiter (לא מחכות לסורק)
+        set_request_class("monitor")
+        
+        # מחירים מה-price feed המשותף - אותו tick ש-TakeProfitStrategy רואה
+        subscription = self.price_feed.subscribe(position.token_mint)
+        
+        rug_state = RugWatchState()
+        full_check: Optional[asyncio.Task] = None
+        
+        # משיכת נזילות on-chain (accountSubscribe) - מגיעה לפני ה-tick הבא
+        drain: asyncio.Future = asyncio.get_running_loop().create_future()
+        
         try:
+            await self._watch_liquidity(position, drain)
+            
             while not self._stop_monitoring:
+                # חכה ל-tick הבא (או timeout - time limit / rug נבדקים בכל מקרה)
+                tick = await self._next_tick(subscription, drain)
+                
+                if drain.done():
+                    await self._emergency_exit(position, self._drain_alert(drain.result()))
+                    break
+                
                 # בדוק stop loss
-                should_sell, reason = await self._check_stop_loss(position)
+                should_sell, reason = await self._check_stop_loss(
+                    position,
+                    tick.price if tick else None,
+                )
                 
                 if should_sell:
                     await self._sell_position(position, reason)
@@ -263,33 +297,31 @@ class PositionMonitor:
                     )
                     break
                 
-                # בדוק Rug Pull (NEW)
-                try:
-                    rug_alert = await self.rug_detector.check_rug_pull(position.token_mint)
-                    
-                    if rug_alert.is_rug_pull:
-                        logger.warning(
-                            f"🚨 RUG PULL DETECTED for {position.token_symbol}! "
-                            f"Severity: {rug_alert.severity}, Score: {rug_alert.score}/100"
-                        )
-                        for reason in rug_alert.reasons:
-                            logger.warning(f"  • {reason}")
-                        
-                        # Emergency exit!
-                        await self._emergency_exit(position, rug_alert)
+                # Rug tier 1: סיגנלים זולים מה-tick (נזילות / מחיר) - כל tick
+                if tick:
+                    quick_alert = self.rug_detector.check_tick(
+                        rug_state, tick.price, tick.liquidity_usd
+                    )
+                    if quick_alert.is_rug_pull:
+                        logger.warning(f"🚨 RUG PULL DETECTED for {position.token_symbol}!")
+                        await self._emergency_exit(position, quick_alert)
                         break
-                    
-                    elif rug_alert.severity in ["HIGH", "CRITICAL"]:
-                        logger.warning(
-                            f"⚠️ HIGH RUG RISK for {position.token_symbol} "
-                            f"(Score: {rug_alert.score}/100) - Consider manual exit"
-                        )
                 
-                except Exception as e:
-                    logger.error(f"Error checking rug pull for {position.token_symbol}: {e}")
+                # Rug tier 2: תוצאה של בדיקה מלאה שרצה ברקע
+                if full_check and full_check.done():
+                    rug_alert = self._rug_check_result(position, full_check)
+                    full_check = None
+                    if rug_alert and rug_alert.is_rug_pull:
+                        await self._emergency_exit(position, rug_alert)
+                        break
                 
-                # חכה לפני הבדיקה הבאה
-                await asyncio.sleep(self.check_interval)
+                # בדיקה מלאה (holders, contract) - בקצב איטי או כשסיגנל זול חצה סף.
+                # רצה ברקע כדי שה-stop loss לא יחכה לה
+                if full_check is None and self.rug_detector.should_run_full_check(rug_state):
+                    self.rug_detector.mark_full_check(rug_state)
+                    full_check = asyncio.create_task(
+                        self.rug_detector.check_rug_pull(position.token_mint)
+                    )
         
         except asyncio.CancelledError:
             logger.info(f"⏹️ Monitoring cancelled for {position.token_symbol}")
@@ -299,23 +331,128 @@ class PositionMonitor:
                 exc_info=True
             )
         finally:
+            subscription.close()
+            self.liquidity_watcher.unwatch(position.token_mint)
+            if full_check and not full_check.done():
+                full_check.cancel()
             # נקה את הפוזיציה
             if position.token_mint in self.positions:
                 del self.positions[position.token_mint]
             if position.token_mint in self.monitoring_tasks:
                 del self.monitoring_tasks[position.token_mint]
     
-    async def _check_stop_loss(self, position: Position) -> Tuple[bool, Optional[PositionStatus]]:
+    async def _watch_liquidity(self, position: Position, drain: asyncio.Future) -> bool:
+        """
+        מעקב on-chain אחרי ה-vaults של ה-pool (Raydium AMM v4)
+        
+        Args:
+            position: Position למעקב
+            drain: Future שמקבל את ה-LiquidityDrain הראשון
+        
+        Returns:
+            True אם המעקב פעיל
+        """
+        if not settings.liquidity_watch_enabled:
+            return False
+        
+        def on_drain(event: LiquidityDrain):
+            if not drain.done():
+                drain.set_result(event)
+        
+        try:
+            pairs = await get_pair_cache().get_pairs(position.token_mint)
+            for pair in pairs or []:
+                if pair.get("dexId") == "raydium" and pair.get("pairAddress"):
+                    if await self.liquidity_watcher.watch(
+                        position.token_mint, on_drain, pool_address=pair["pairAddress"]
+                    ):
+                        return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not watch pool liquidity for {position.token_symbol}: {e}")
+        return False
+    
+    async def _next_tick(
+        self,
+        subscription: PriceSubscription,
+        drain: asyncio.Future,
+    ) -> Optional[PriceTick]:
+        """
+        ה-tick הבא - או None מיד אם ה-liquidity watcher זיהה משיכה בינתיים
+        """
+        if drain.done():
+            return None
+        
+        tick_task = asyncio.ensure_future(subscription.next_tick(timeout=self.check_interval * 2))
+        try:
+            await asyncio.wait({tick_task, drain}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not tick_task.done():
+                tick_task.cancel()
+        
+        if tick_task.done() and not tick_task.cancelled():
+            return tick_task.result()
+        return None
+    
+    @staticmethod
+    def _drain_alert(event: LiquidityDrain) -> RugPullAlert:
+        """RugPullAlert ל-_emergency_exit מתוך LiquidityDrain"""
+        return RugPullAlert(
+            is_rug_pull=True,
+            severity="CRITICAL",
+            reasons=[event.reason],
+            score=100,
+            recommendations=["📤 Exit immediately"],
+        )
+    
+    def _rug_check_result(
+        self,
+        position: Position,
+        full_check: asyncio.Task,
+    ) -> Optional[RugPullAlert]:
+        """
+        תוצאת בדיקת rug מלאה שהסתיימה (None אם נכשלה)
+        
+        Args:
+            position: Position שנבדקה
+            full_check: ה-task של check_rug_pull
+        """
+        try:
+            rug_alert = full_check.result()
+        except Exception as e:
+            logger.error(f"Error checking rug pull for {position.token_symbol}: {e}")
+            return None
+        
+        if rug_alert.is_rug_pull:
+            logger.warning(
+                f"🚨 RUG PULL DETECTED for {position.token_symbol}! "
+                f"Severity: {rug_alert.severity}, Score: {rug_alert.score}/100"
+            )
+            for reason in rug_alert.reasons:
+                logger.warning(f"  • {reason}")
+        elif rug_alert.severity in ["HIGH", "CRITICAL"]:
+            logger.warning(
+                f"⚠️ HIGH RUG RISK for {position.token_symbol} "
+                f"(Score: {rug_alert.score}/100) - Consider manual exit"
+            )
+        
+        return rug_alert
+    
+    async def _check_stop_loss(
+        self,
+        position: Position,
+        current_price: Optional[float],
+    ) -> Tuple[bool, Optional[PositionStatus]]:
         """
         בדוק אם stop loss הופעל
         
+        Args:
+            position: Position לבדיקה
+            current_price: מחיר נוכחי (מה-tick של ה-price feed)
+        
         Returns:
             (should_sell, reason) - האם למכור ולמה
         """
         try:
-            # קבל מחיר נוכחי
-            current_price = await self._get_current_price(position.token_mint)
-            
             if current_price is None:
                 logger.warning(f"⚠️ Could not get price for {position.token_symbol}")
                 return False, None
@@ -333,7 +470,7 @@ class PositionMonitor:
                 )
                 return True, PositionStatus.STOP_LOSS_HIT
             
-            # עדכן מחיר ב-Supabase
+            # עדכן מחיר ב-Supabase (write-behind - כל הפוזיציות ב-upsert אחד)
             if self.supabase and self.supabase.enabled:
                 try:
                     current_value_usd = current_price * position.amount_tokens
@@ -341,14 +478,17 @@ class PositionMonitor:
                     pnl_usd = current_value_usd - entry_value_usd
                     pnl_pct = (pnl_usd / entry_value_usd * 100) if entry_value_usd > 0 else 0
                     
-                    async with self.supabase:
-                        await self.supabase.update_position_price(
-                            position.token_mint,
-                            current_price,
-                            current_value_usd,
-                            pnl_usd,
-                            pnl_pct
-                        )
+                    get_write_buffer().add("positions", {
+                        "token_address": position.token_mint,
+                        "token_symbol": position.token_symbol,
+                        "amount_tokens": float(position.amount_tokens),
+                        "entry_price": float(position.entry_price),
+                        "entry_value_usd": float(entry_value_usd),
+                        "current_price": float(current_price),
+                        "current_value_usd": float(current_value_usd),
+                        "unrealized_pnl_usd": float(pnl_usd),
+                        "unrealized_pnl_pct": float(pnl_pct),
+                    })
                 except Exception as e:
                     logger.error(f"❌ Error updating position price in Supabase: {e}")
             
@@ -377,8 +517,10 @@ class PositionMonitor:
             מחיר ב-USD או None אם יש שגיאה
         """
         try:
-            # השתמש ב-PriceFetcher לקבלת מחיר
-            price = await self.price_fetcher.get_token_price(token_mint)
+            # המחיר האחרון מה-price feed (אם הטוקן במעקב), אחרת PriceFetcher
+            price = self.price_feed.last_price(token_mint)
+            if price is None:
+                price = await self.price_fetcher.get_token_price(token_mint)
             return price
         
         except Exception as e:
@@ -0,0 +1,240 @@
+"""
+Price Feed Hub
+מקור מחירים אחד לכל הפוזיציות - polling מרוכז ו-fan-out למנויים
+
+📋 מה הקובץ הזה עושה:
+-------------------
+עד עכשיו כל פוזיציה הריצה לולאה משלה ב-PositionMonitor ועוד לולאה ב-TakeProfitStrategy,
+וכל לולאה שאלה את PriceFetcher בנפרד - 2N קריאות לכל סבב, ו-stop loss / take profit
+יכלו לראות מחירים שונים לאותו טוקן.
+
+הקובץ הזה:
+1. מחזיק רשימה של כל ה-mints שמישהו עוקב אחריהם
+2. שולף את כל המחירים + הנזילות ביחד (batch, עד 30 ב-call) בקצב אחד
+3. שולח את אותו PriceTick לכל המנויים של ה-mint (async queue)
+4. שומר את המחיר האחרון לכל mint (לשימושים חד-פעמיים)
+
+🔧 פונקציות עיקריות:
+- get_price_feed() - ה-hub הגלובלי
+- subscribe(mint) - מנוי חדש (PriceSubscription)
+- PriceSubscription.next_tick(timeout) - חכה ל-tick הבא
+- last_price(mint) - המחיר האחרון שנשלף
+- unsubscribe(subscription) / close()
+
+💡 איך זה עובד:
+1. המנוי הראשון מפעיל את לולאת ה-polling, האחרון שיוצא עוצר אותה
+2. כל tick: PriceFetcher.get_token_quotes(כל ה-mints) - קריאות batch
+3. אותו אובייקט PriceTick נשלח לכל המנויים → stop loss, take profit ו-trailing stop
+   מגיבים לאותו מחיר
+4. כל מנוי מחזיק רק את ה-tick האחרון - מנוי איטי לא מצטבר בזיכרון
+
+📝 הערות:
+- PRICE_FEED_INTERVAL_SECONDS ב-.env (ברירת מחדל: 30 שניות)
+- הבקשות יוצאות עם request class "monitor" ב-rate limiter
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from core.config import settings
+from executor.price_fetcher import PriceFetcher
+from utils.logger import get_logger
+from utils.rate_limiter import request_class
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PriceTick:
+    """מחיר אחד של טוקן מסבב polling אחד"""
+    token_mint: str
+    price: Optional[float]  # None אם לא נמצא מחיר
+    timestamp: float  # time.time()
+    seq: int  # מספר הסבב (זהה לכל ה-mints באותו סבב)
+    liquidity_usd: Optional[float] = None  # נזילות כוללת מאותם pairs (None אם לא נמצא)
+
+
+class PriceSubscription:
+    """מנוי למחירי טוקן אחד"""
+
+    def __init__(self, hub: "PriceFeedHub", token_mint: str):
+        self.hub = hub
+        self.token_mint = token_mint
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def _push(self, tick: PriceTick):
+        # שומרים רק את ה-tick האחרון
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(tick)
+
+    async def next_tick(self, timeout: Optional[float] = None) -> Optional[PriceTick]:
+        """
+        חכה ל-tick הבא
+
+        Args:
+            timeout: שניות מקסימום (None = ללא הגבלה)
+
+        Returns:
+            PriceTick או None אם עבר ה-timeout
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """בטל את המנוי"""
+        self.hub.unsubscribe(self)
+
+
+class PriceFeedHub:
+    """
+    Price Feed Hub - polling אחד לכל ה-mints במעקב
+    """
+
+    def __init__(
+        self,
+        price_fetcher: Optional[PriceFetcher] = None,
+        interval_seconds: float = 30.0,
+    ):
+        """
+        אתחול PriceFeedHub
+
+        Args:
+            price_fetcher: PriceFetcher לשליפת מחירים (אופציונלי - יוצר חדש אם לא מוגדר)
+            interval_seconds: תדירות polling
+        """
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.interval = interval_seconds
+
+        self._subscribers: Dict[str, Set[PriceSubscription]] = {}
+        self._last_ticks: Dict[str, PriceTick] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._seq = 0
+
+        # Stats
+        self.polls = 0
+        self.prices_fetched = 0
+
+    def subscribe(self, token_mint: str) -> PriceSubscription:
+        """
+        מנוי למחירי טוקן
+
+        Args:
+            token_mint: כתובת הטוקן
+
+        Returns:
+            PriceSubscription
+        """
+        subscription = PriceSubscription(self, token_mint)
+        self._subscribers.setdefault(token_mint, set()).add(subscription)
+
+        # המנוי מקבל מיד את המחיר האחרון (אם יש)
+        last_tick = self._last_ticks.get(token_mint)
+        if last_tick:
+            subscription._push(last_tick)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+        return subscription
+
+    def unsubscribe(self, subscription: PriceSubscription):
+        """בטל מנוי"""
+        subscribers = self._subscribers.get(subscription.token_mint)
+        if not subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.token_mint]
+            self._last_ticks.pop(subscription.token_mint, None)
+
+    def watched_mints(self) -> List[str]:
+        """כל ה-mints במעקב"""
+        return list(self._subscribers.keys())
+
+    def last_price(self, token_mint: str) -> Optional[float]:
+        """המחיר האחרון שנשלף (None אם אין)"""
+        tick = self._last_ticks.get(token_mint)
+        return tick.price if tick else None
+
+    async def _poll_loop(self):
+        """לולאת polling - רצה כל עוד יש מנויים"""
+        logger.info(f"📡 Price feed started (every {self.interval:.0f}s)")
+
+        with request_class("monitor"):
+            while self._subscribers:
+                started = time.monotonic()
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.error(f"❌ Price feed poll failed: {e}", exc_info=True)
+
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+        logger.info("⏹️ Price feed stopped (no subscribers)")
+
+    async def poll_once(self):
+        """סבב אחד: שליפת כל המחירים ושליחה לכל המנויים"""
+        mints = self.watched_mints()
+        if not mints:
+            return
+
+        quotes = await self.price_fetcher.get_token_quotes(mints)
+        self._seq += 1
+        self.polls += 1
+        now = time.time()
+
+        for mint in mints:
+            price, liquidity_usd = quotes.get(mint, (None, None))
+            tick = PriceTick(
+                token_mint=mint,
+                price=price,
+                timestamp=now,
+                seq=self._seq,
+                liquidity_usd=liquidity_usd,
+            )
+            if tick.price is not None:
+                self.prices_fetched += 1
+            if mint not in self._subscribers:
+                continue  # Unsubscribed during the fetch
+            self._last_ticks[mint] = tick
+            for subscription in list(self._subscribers[mint]):
+                subscription._push(tick)
+
+    def get_stats(self) -> Dict:
+        """מונים"""
+        return {
+            "watched_mints": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "polls": self.polls,
+            "prices_fetched": self.prices_fetched,
+            "interval_seconds": self.interval,
+        }
+
+    async def close(self):
+        """עצור את ה-polling"""
+        self._subscribers.clear()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global instance
+_price_feed: Optional[PriceFeedHub] = None
+
+
+def get_price_feed(price_fetcher: Optional[PriceFetcher] = None) -> PriceFeedHub:
+    """Get global price feed hub instance"""
+    global _price_feed
+    if _price_feed is None:
+        _price_feed = PriceFeedHub(
+            price_fetcher=price_fetcher,
+            interval_seconds=settings.price_feed_interval_seconds,
+        )
+    return _price_feed
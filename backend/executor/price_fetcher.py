@@ -17,6 +17,8 @@ from executor.price_fetcher import PriceFetcher
 
 fetcher = PriceFetcher()
 price = await fetcher.get_token_price(token_mint)
+prices = await fetcher.get_token_prices([mint1, mint2])  # batch
+quotes = await fetcher.get_token_quotes([mint1, mint2])  # batch - (price, liquidity)
 ```
 
 📝 הערות:
@@ -26,14 +28,14 @@ price = await fetcher.get_token_price(token_mint)
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import httpx
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from analyzer.pair_cache import get_pair_cache
 
 logger = get_logger(__name__)
 
-DEXSCREENER_API = "https://api.dexscreener.com/latest/dex/tokens"
-
 
 class PriceFetcher:
     """
@@ -47,7 +49,7 @@ class PriceFetcher:
     
     def __init__(self):
         """אתחול PriceFetcher"""
-        self.http_client = httpx.AsyncClient(timeout=10.0)
+        self.http_client = create_http_client("monitor", timeout=10.0)
         logger.info("✅ PriceFetcher initialized")
     
     async def get_token_price(self, token_mint: str) -> Optional[float]:
@@ -61,29 +63,9 @@ class PriceFetcher:
             מחיר ב-USD או None אם יש שגיאה
         """
         try:
-            url = f"{DEXSCREENER_API}/{token_mint}"
-            
-            response = await self.http_client.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if "pairs" not in data or not data["pairs"]:
-                logger.warning(f"⚠️ No pairs found for {token_mint[:8]}...")
-                return None
-            
-            # קח את ה-pair הראשון (הכי נזיל בדרך כלל)
-            pair = data["pairs"][0]
-            
-            price_usd = pair.get("priceUsd")
-            
-            if price_usd:
-                price = float(price_usd)
-                logger.debug(f"💰 Price for {token_mint[:8]}...: ${price:.6f}")
-                return price
-            else:
-                logger.warning(f"⚠️ No price in pair data for {token_mint[:8]}...")
-                return None
+            # pairs מה-cache המשותף (מאוחד עם שאר המודולים שמבקשים את אותו טוקן)
+            pairs = await get_pair_cache().get_pairs(token_mint)
+            return self._price_from_pairs(token_mint, pairs)
         
         except httpx.HTTPError as e:
             logger.error(f"❌ HTTP error getting price: {e}")
@@ -92,6 +74,79 @@ class PriceFetcher:
             logger.error(f"❌ Error getting price: {e}", exc_info=True)
             return None
     
+    async def get_token_prices(self, token_mints: List[str]) -> Dict[str, Optional[float]]:
+        """
+        קבל מחירים של הרבה טוקנים ביחד (batch - עד 30 ב-call)
+        
+        Args:
+            token_mints: כתובות הטוקנים
+        
+        Returns:
+            Dict mint -> מחיר ב-USD (None אם אין מחיר)
+        """
+        quotes = await self.get_token_quotes(token_mints)
+        return {mint: price for mint, (price, _) in quotes.items()}
+    
+    async def get_token_quotes(
+        self,
+        token_mints: List[str],
+    ) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """
+        מחיר + נזילות של הרבה טוקנים ביחד (אותם pairs - בלי קריאות נוספות)
+        
+        Args:
+            token_mints: כתובות הטוקנים
+        
+        Returns:
+            Dict mint -> (מחיר ב-USD, נזילות ב-USD) - None אם אין נתון
+        """
+        try:
+            pairs_map = await get_pair_cache().get_pairs_many(token_mints)
+        except Exception as e:
+            logger.error(f"❌ Error getting prices: {e}", exc_info=True)
+            return {mint: (None, None) for mint in token_mints}
+        
+        quotes = {}
+        for mint in token_mints:
+            pairs = pairs_map.get(mint) or []
+            quotes[mint] = (self._price_from_pairs(mint, pairs), self._liquidity_from_pairs(pairs))
+        return quotes
+    
+    @staticmethod
+    def _price_from_pairs(token_mint: str, pairs: List[Dict]) -> Optional[float]:
+        """מחיר מתוך pairs של DexScreener"""
+        if not pairs:
+            logger.warning(f"⚠️ No pairs found for {token_mint[:8]}...")
+            return None
+        
+        # קח את ה-pair הראשון (הכי נזיל בדרך כלל)
+        pair = pairs[0]
+        
+        price_usd = pair.get("priceUsd")
+        
+        if price_usd:
+            price = float(price_usd)
+            logger.debug(f"💰 Price for {token_mint[:8]}...: ${price:.6f}")
+            return price
+        else:
+            logger.warning(f"⚠️ No price in pair data for {token_mint[:8]}...")
+            return None
+    
+    @staticmethod
+    def _liquidity_from_pairs(pairs: List[Dict]) -> Optional[float]:
+        """
+        נזילות כוללת (USD) בכל ה-pools של הטוקן
+        
+        pairs בלי liquidity.usd (תגובה חלקית) לא נספרים כ-$0 - אחרת pool ראשי
+        שחסר לו השדה נראה כמו משיכת נזילות. None אם לאף pair אין נתון
+        """
+        total = None
+        for pair in pairs or []:
+            usd = (pair.get("liquidity") or {}).get("usd")
+            if usd is not None:
+                total = (total or 0.0) + float(usd)
+        return total
+    
     async def get_token_info(self, token_mint: str) -> Optional[Dict[str, Any]]:
         """
         קבל מידע מלא על טוקן (מחיר, volume, liquidity, וכו')
@@ -103,18 +158,13 @@ class PriceFetcher:
             Dict עם מידע על הטוקן או None
         """
         try:
-            url = f"{DEXSCREENER_API}/{token_mint}"
-            
-            response = await self.http_client.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
+            pairs = await get_pair_cache().get_pairs(token_mint)
             
-            if "pairs" not in data or not data["pairs"]:
+            if not pairs:
                 return None
             
             # קח את ה-pair הראשון
-            pair = data["pairs"][0]
+            pair = pairs[0]
             
             return {
                 "price_usd": float(pair.get("priceUsd", 0)),
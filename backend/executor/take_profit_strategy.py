@@ -33,6 +33,7 @@ await strategy.monitor_and_sell(position)
 - האסטרטגיה: 30% @ x2, 30% @ x5, 40% trailing stop
 - Trailing stop: עולה עם המחיר, לא יורד
 - ניטור רציף עד שכל ה-60% נמכר
+- המחירים מגיעים מה-price feed המשותף - אותו tick ש-PositionMonitor רואה
 """
 
 import asyncio
@@ -42,6 +43,7 @@ from datetime import datetime, timezone
 
 from executor.jupiter_client import JupiterClient
 from executor.price_fetcher import PriceFetcher
+from executor.price_feed import get_price_feed
 from executor.wallet_manager import WalletManager
 from executor.position_monitor import Position, PositionStatus
 from core.config import settings
@@ -107,7 +109,7 @@ class TakeProfitStrategy:
         jupiter_client: JupiterClient,
         price_fetcher: PriceFetcher,
         wallet_manager: Optional[WalletManager] = None,
-        check_interval_seconds: int = 60,  # בדיקה כל דקה
+        check_interval_seconds: int = 60,  # legacy - הקצב נקבע ב-price feed
     ):
         """
         אתחול TakeProfitStrategy
@@ -116,10 +118,11 @@ class TakeProfitStrategy:
             jupiter_client: JupiterClient לביצוע swaps
             price_fetcher: PriceFetcher לקבלת מחירים
             wallet_manager: WalletManager להעברת SOL (אופציונלי)
-            check_interval_seconds: תדירות בדיקה (ברירת מחדל: 60 שניות)
+            check_interval_seconds: לא בשימוש - התדירות נקבעת ב-PRICE_FEED_INTERVAL_SECONDS
         """
         self.jupiter = jupiter_client
         self.price_fetcher = price_fetcher
+        self.price_feed = get_price_feed(price_fetcher)
         self.wallet_manager = wallet_manager
         self.check_interval = check_interval_seconds
         
@@ -167,16 +170,17 @@ class TakeProfitStrategy:
         original_amount = position.amount_tokens
         remaining_amount = original_amount
         
+        # מחירים מה-price feed המשותף (אותו tick כמו ה-stop loss)
+        subscription = self.price_feed.subscribe(position.token_mint)
+        
         try:
             while remaining_amount > 0:
-                # קבל מחיר נוכחי
-                current_price = await self.price_fetcher.get_token_price(
-                    position.token_mint
-                )
+                # חכה ל-tick הבא
+                tick = await subscription.next_tick()
+                current_price = tick.price
                 
                 if current_price is None:
                     logger.warning(f"⚠️ Could not get price for {position.token_symbol}")
-                    await asyncio.sleep(self.check_interval)
                     continue
                 
                 # חשב multiple (כמה פעמים המחיר)
@@ -332,9 +336,6 @@ class TakeProfitStrategy:
                 if remaining_amount == 0:
                     logger.info(f"✅ Take Profit complete! All sold.")
                     break
-                
-                # חכה לפני הבדיקה הבאה
-                await asyncio.sleep(self.check_interval)
         
         except asyncio.CancelledError:
             logger.info(f"⏹️ Take Profit monitoring cancelled for {position.token_symbol}")
@@ -346,6 +347,8 @@ class TakeProfitStrategy:
             )
             result["final_status"] = "error"
             result["error"] = str(e)
+        finally:
+            subscription.close()
         
         return result
     
@@ -362,7 +365,9 @@ class TakeProfitStrategy:
         Returns:
             Dict עם סטטוס ה-targets
         """
-        current_price = await self.price_fetcher.get_token_price(position.token_mint)
+        current_price = self.price_feed.last_price(position.token_mint)
+        if current_price is None:
+            current_price = await self.price_fetcher.get_token_price(position.token_mint)
         
         if current_price is None:
             return {"error": "Could not get price"}
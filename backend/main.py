@@ -49,21 +49,26 @@ from rich.panel import Panel
 from core.config import settings
 from utils.logger import get_logger, setup_logger
 from scanner.token_scanner import TokenScanner
-from analyzer.contract_checker import ContractChecker
-from analyzer.holder_analyzer import HolderAnalyzer
+from analyzer.contract_checker import ContractChecker, ContractSafety
+from analyzer.holder_analyzer import HolderAnalyzer, HolderAnalysis
 from analyzer.scoring_engine import ScoringEngine
 from analyzer.smart_money_tracker import get_smart_money_tracker
+from analyzer.smart_wallet_index import SmartHolderStats
+from analyzer.smart_holdings_index import get_smart_holdings_index
 from analyzer.smart_money_discovery import get_discovery_engine
 from communication.telegram_bot import build_telegram_controller
 from database.supabase_client import get_supabase_client
+from database.write_buffer import get_write_buffer
 from executor.wallet_manager import get_wallet_manager
 from executor.jupiter_client import JupiterClient
 from executor.dca_strategy import DCAStrategy
 from executor.position_monitor import PositionMonitor
 from executor.take_profit_strategy import TakeProfitStrategy
 from executor.price_fetcher import PriceFetcher
-from analyzer.token_metrics import TokenMetricsFetcher
+from analyzer.token_metrics import TokenMetricsFetcher, TokenMetrics
 from executor.performance_tracker import get_performance_tracker
+from executor.portfolio_snapshots import get_portfolio_snapshotter
+from utils.http_pool import close_http_pool
 
 # Setup logging
 logger = setup_logger("solanahunter", settings.log_level)
@@ -86,6 +91,8 @@ class SolanaHunter:
         self._last_scan_ts: float | None = None
         self._start_time: float | None = None  # Track when bot started
         self._scan_task: Optional[asyncio.Task] = None  # Background scan task
+        self._snapshot_task: Optional[asyncio.Task] = None  # Portfolio snapshots (charts)
+        self._holdings_task: Optional[asyncio.Task] = None  # Smart wallet holdings index
         self._mode: str = "normal"  # "normal" or "quiet"
         self._paused: bool = False
         self._scan_count: int = 0
@@ -202,6 +209,12 @@ class SolanaHunter:
         # Start performance tracking in background (NEW)
         asyncio.create_task(self.performance_tracker.start_monitoring())
         
+        # Reverse index of smart wallet holdings (smart money lookups in the scan)
+        if settings.smart_holdings_enabled:
+            self._holdings_task = asyncio.create_task(
+                get_smart_holdings_index().run(get_smart_money_tracker())
+            )
+        
         # Load positions from Supabase if available
         if self.position_monitor and self.supabase and self.supabase.enabled:
             try:
@@ -209,6 +222,13 @@ class SolanaHunter:
             except Exception as e:
                 logger.error(f"❌ Error loading positions from database: {e}")
         
+        # Portfolio snapshots for the history charts (after the load - otherwise
+        # the first snapshot after a restart records an empty portfolio)
+        if self.position_monitor and self.supabase and self.supabase.enabled:
+            self._snapshot_task = asyncio.create_task(
+                get_portfolio_snapshotter().run(self.position_monitor)
+            )
+        
         # Start scanning loop
         try:
             await self._scan_loop()
@@ -268,6 +288,11 @@ class SolanaHunter:
         self.contract_checker = ContractChecker()
         await self.contract_checker.__aenter__()
         
+        # Real-time discovery next to the periodic scan
+        stream_task = None
+        if await self.scanner.start_stream():
+            stream_task = asyncio.create_task(self._stream_loop())
+        
         try:
             while self.running:
                 # Check if paused
@@ -280,173 +305,7 @@ class SolanaHunter:
                     tokens = await self.scanner.discover_new_tokens(hours=24)
                     
                     if tokens:
-                        # Analyze each token
-                        analyze_limit = 10 if self._mode == "normal" else 5  # Quiet mode: analyze less
-                        for token in tokens[:analyze_limit]:  # Analyze top N to avoid rate limits
-                            try:
-                                self._tokens_analyzed += 1
-                                # Contract safety check
-                                safety = await self.contract_checker.check_contract(token["address"])
-                                token["safety_score"] = safety.safety_score
-                                token["ownership_renounced"] = safety.ownership_renounced
-                                token["liquidity_locked"] = safety.liquidity_locked
-                                token["mint_authority_disabled"] = safety.mint_authority_disabled
-                                
-                                # Holder analysis (UPGRADED)
-                                holders = await self.holder_analyzer.analyze(token["address"])
-                                token["holder_count"] = holders.holder_count
-                                token["top_10_percentage"] = holders.top_10_percentage
-                                token["total_lp_percentage"] = holders.total_lp_percentage  # NEW
-                                token["total_burn_percentage"] = holders.total_burn_percentage  # NEW
-                                token["is_concentrated"] = holders.is_concentrated
-                                token["holder_score"] = holders.holder_score
-                                
-                                # Token Metrics (NEW)
-                                metrics = await self.metrics_fetcher.get_metrics(token["address"])
-                                token["liquidity_sol"] = metrics.liquidity_sol
-                                token["liquidity_usd"] = metrics.liquidity_usd
-                                token["volume_24h"] = metrics.volume_24h
-                                token["price_usd"] = metrics.price_usd
-                                token["market_cap"] = metrics.market_cap  # ✅ FIX: שמירת market cap
-                                token["price_change_5m"] = metrics.price_change_5m
-                                token["price_change_1h"] = metrics.price_change_1h
-                                token["price_change_24h"] = metrics.price_change_24h
-                                
-                                # Smart money check
-                                smart_money_tracker = get_smart_money_tracker()
-                                holder_addresses = [h.get("address", "") for h in holders.top_holders]
-                                smart_money_count = smart_money_tracker.check_if_holds(
-                                    token["address"],
-                                    holder_addresses
-                                )
-                                token["smart_money_count"] = smart_money_count
-                                
-                                # Calculate final score (UPGRADED)
-                                token_score = self.scoring_engine.calculate_score(
-                                    safety=safety,
-                                    holders=holders,
-                                    liquidity_sol=metrics.liquidity_sol,  # NEW
-                                    volume_24h=metrics.volume_24h,  # NEW
-                                    price_change_5m=metrics.price_change_5m,  # NEW
-                                    price_change_1h=metrics.price_change_1h,  # NEW
-                                    smart_money_count=smart_money_count
-                                )
-                                
-                                token["final_score"] = token_score.final_score
-                                token["grade"] = token_score.grade.value
-                                token["category"] = token_score.category.value
-                                
-                                # Check if should alert
-                                if self.scoring_engine.should_alert(token_score):
-                                    self._high_score_count += 1
-                                    logger.warning(
-                                        f"🔥 HIGH SCORE ALERT: {token['symbol']} - "
-                                        f"{token_score.final_score}/100 ({token_score.grade.value})"
-                                    )
-
-                                    # Telegram alert (send once per token, only if not quiet mode)
-                                    if (
-                                        self.telegram 
-                                        and token.get("address") 
-                                        and token["address"] not in self._alerts_sent
-                                        and self._mode != "quiet"
-                                    ):
-                                        self._alerts_sent.add(token["address"])
-                                        # שמור בהיסטוריה
-                                        self._alert_history.append({
-                                            "timestamp": datetime.now(timezone.utc),
-                                            "token": token.copy(),
-                                        })
-                                        # שמור רק 100 האחרונות
-                                        if len(self._alert_history) > 100:
-                                            self._alert_history.pop(0)
-                                        asyncio.create_task(self.telegram.send_alert(token))
-                                        
-                                        # Track token for performance learning (NEW)
-                                        if token.get("price_usd", 0) > 0:
-                                            asyncio.create_task(self.performance_tracker.track_token(
-                                                token_address=token["address"],
-                                                symbol=token["symbol"],
-                                                entry_price=token["price_usd"],
-                                                entry_score=token_score.final_score,
-                                                smart_wallets=holder_addresses
-                                            ))
-                                    
-                                    # בדוק אם טוקן במעקב
-                                    if token.get("address") in self._watched_tokens:
-                                        # אפשר לשלוח התראה מיוחדת על טוקנים במעקב
-                                        pass
-                                
-                                # Auto-discovery: If token performs well, discover smart wallets
-                                # This runs in background to not slow down scanning
-                                if token.get("price_usd", 0) > 0:
-                                    # Check performance (simplified - would need entry price tracking)
-                                    # For now, we'll discover from historical analysis
-                                    pass
-                                
-                                logger.info(
-                                    f"📊 {token['symbol']}: "
-                                    f"Final={token_score.final_score}/100 ({token_score.grade.value}) | "
-                                    f"Safety={safety.safety_score}/100 | "
-                                    f"Holders={holders.holder_count} ({holders.holder_score}/20) | "
-                                    f"SmartMoney={smart_money_count} ({token_score.smart_money_score}/15) | "
-                                    f"Top10%={holders.top_10_percentage:.1f}%"
-                                )
-                                
-                                # Save token to Supabase database
-                                if self.supabase and self.supabase.enabled:
-                                    try:
-                                        async with self.supabase:
-                                            saved = await self.supabase.save_token(token)
-                                            if saved:
-                                                logger.info(f"✅ Saved {token.get('symbol', 'UNKNOWN')} ({token.get('address', '')[:8]}...) to Supabase")
-                                            else:
-                                                logger.warning(f"⚠️ Failed to save {token.get('symbol', 'UNKNOWN')} to Supabase")
-                                    except Exception as db_error:
-                                        logger.error(f"❌ Database error saving {token.get('symbol', 'UNKNOWN')}: {db_error}")
-                            except Exception as e:
-                                logger.warning(f"⚠️ Failed to analyze {token.get('symbol', 'unknown')}: {e}")
-                        
-                        # Save remaining tokens (without full analysis) to database
-                        # This ensures all discovered tokens appear in the dashboard
-                        if len(tokens) > analyze_limit and self.supabase and self.supabase.enabled:
-                            remaining_tokens = tokens[analyze_limit:]
-                            logger.info(f"💾 Saving {len(remaining_tokens)} additional tokens (without full analysis) to database...")
-                            
-                            for token in remaining_tokens:
-                                try:
-                                    # Prepare basic token data (without full analysis)
-                                    # These will have default scores and can be analyzed later
-                                    basic_token = {
-                                        "address": token.get("address"),
-                                        "symbol": token.get("symbol", "UNKNOWN"),
-                                        "name": token.get("name", ""),
-                                        "created_at": token.get("created_at"),  # Keep creation time
-                                        "source": token.get("source", "dexscreener"),
-                                        # Basic metrics if available
-                                        "price_usd": token.get("price_usd", 0.0),
-                                        "volume_24h": token.get("volume_24h", 0.0),
-                                        "liquidity_sol": token.get("liquidity_sol", 0.0),
-                                        # Default scores (will be updated when fully analyzed)
-                                        "final_score": 0,
-                                        "safety_score": 0,
-                                        "holder_score": 0,
-                                        "grade": "F",
-                                        "category": "POOR",
-                                        "status": "pending_analysis",  # Mark as pending
-                                    }
-                                    
-                                    async with self.supabase:
-                                        saved = await self.supabase.save_token(basic_token)
-                                        if saved:
-                                            logger.debug(f"💾 Saved basic data for {token.get('symbol', 'UNKNOWN')} ({token.get('address', '')[:8]}...)")
-                                except Exception as e:
-                                    logger.warning(f"⚠️ Failed to save basic token {token.get('symbol', 'UNKNOWN')}: {e}")
-                        
-                        self.scanner.display_tokens(tokens)
-                        logger.info(f"✅ Discovered {len(tokens)} new tokens ({analyze_limit} fully analyzed, {len(tokens) - analyze_limit} saved as basic)")
-                        self._last_tokens = tokens[:]
-                        self._last_scan_ts = asyncio.get_event_loop().time()
+                        await self._process_tokens(tokens)
                     else:
                         logger.info("⏳ No new tokens found")
                         self._last_tokens = []
@@ -459,10 +318,271 @@ class SolanaHunter:
                     logger.error(f"❌ Error in scan loop: {e}", exc_info=True)
                     await asyncio.sleep(60)  # Wait before retry
         finally:
+            if stream_task:
+                stream_task.cancel()
             # Cleanup contract checker
             if self.contract_checker:
                 await self.contract_checker.__aexit__(None, None, None)
     
+    async def _stream_loop(self):
+        """Analyze tokens from the Helius stream as soon as they appear"""
+        while self.running:
+            try:
+                tokens = await self.scanner.next_stream_batch()
+                if tokens and not self._paused:
+                    await self._process_tokens(tokens)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Error in stream loop: {e}", exc_info=True)
+                await asyncio.sleep(5)
+    
+    async def _process_tokens(self, tokens: list):
+        """
+        ניתוח batch של טוקנים חדשים (מהסריקה או מהסטרים) ושמירה למסד
+        
+        Args:
+            tokens: New token dicts from the scanner (updated in place)
+        """
+        # Analyze all tokens concurrently (bounded - not one by one)
+        concurrency = max(1, settings.analysis_concurrency)
+        if self._mode == "quiet":
+            concurrency = max(1, concurrency // 2)  # Quiet mode: less pressure on APIs
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        started = asyncio.get_event_loop().time()
+        
+        # Market metrics, contract safety and holders for the whole batch
+        # (a few DexScreener calls + a few batched RPC round trips)
+        addresses = [t["address"] for t in tokens if t.get("address")]
+        metrics_map, safety_map, holders_map = await asyncio.gather(
+            self.metrics_fetcher.get_metrics_batch(addresses),
+            self.contract_checker.check_contracts(addresses),
+            self.holder_analyzer.analyze_many(addresses),
+        )
+        
+        # Smart money among the holders of the whole batch - one index pass
+        holdings_index = get_smart_holdings_index()
+        smart_map = get_smart_money_tracker().check_many({
+            address: [h.get("address", "") for h in holders.top_holders]
+            + list(holdings_index.holders_of(address))
+            for address, holders in holders_map.items()
+            if holders
+        })
+        
+        async def _bounded_analyze(token: dict) -> bool:
+            address = token.get("address")
+            async with semaphore:
+                return await self._analyze_token(
+                    token,
+                    metrics_map.get(address),
+                    safety_map.get(address),
+                    holders_map.get(address),
+                    smart_map.get(address),
+                )
+        
+        results = await asyncio.gather(*(_bounded_analyze(t) for t in tokens))
+        elapsed = asyncio.get_event_loop().time() - started
+        
+        analyzed = [t for t, ok in zip(tokens, results) if ok]
+        failed = [t for t, ok in zip(tokens, results) if not ok]
+        
+        # Save tokens to Supabase database (write-behind - one upsert for the whole batch)
+        if self.supabase and self.supabase.enabled:
+            await self._save_scanned_tokens(analyzed, failed)
+        
+        self.scanner.display_tokens(tokens)
+        logger.info(
+            f"✅ Discovered {len(tokens)} new tokens "
+            f"({len(analyzed)} fully analyzed in {elapsed:.1f}s, "
+            f"concurrency={concurrency}, {len(failed)} saved as basic)"
+        )
+        self._last_tokens = tokens[:]
+        self._last_scan_ts = asyncio.get_event_loop().time()
+    
+    async def _analyze_token(
+        self,
+        token: dict,
+        metrics: Optional[TokenMetrics] = None,
+        safety: Optional[ContractSafety] = None,
+        holders: Optional[HolderAnalysis] = None,
+        smart_holders: Optional[SmartHolderStats] = None,
+    ) -> bool:
+        """
+        ניתוח מלא של טוקן אחד - בדיקת חוזה, מחזיקים ומטריקות רצות במקביל
+        
+        Args:
+            token: Token dict from the scanner (updated in place)
+            metrics: Metrics already fetched in batch (fetched here if None)
+            safety: Contract safety already checked in batch (checked here if None)
+            holders: Holder analysis already done in batch (analyzed here if None)
+            smart_holders: Smart money among the batch holders (checked here if None)
+        
+        Returns:
+            True if the token was fully analyzed and scored
+        """
+        async def _given(value):
+            return value
+        
+        try:
+            self._tokens_analyzed += 1
+            
+            # Contract safety, holder analysis and metrics are independent - fetch together
+            safety, holders, metrics = await asyncio.gather(
+                _given(safety) if safety else self.contract_checker.check_contract(token["address"]),
+                _given(holders) if holders else self.holder_analyzer.analyze(token["address"]),
+                _given(metrics) if metrics else self.metrics_fetcher.get_metrics(token["address"]),
+            )
+            
+            # Contract safety check
+            token["safety_score"] = safety.safety_score
+            token["ownership_renounced"] = safety.ownership_renounced
+            token["liquidity_locked"] = safety.liquidity_locked
+            token["mint_authority_disabled"] = safety.mint_authority_disabled
+            
+            # Holder analysis (UPGRADED)
+            token["holder_count"] = holders.holder_count
+            token["top_10_percentage"] = holders.top_10_percentage
+            token["total_lp_percentage"] = holders.total_lp_percentage  # NEW
+            token["total_burn_percentage"] = holders.total_burn_percentage  # NEW
+            token["is_concentrated"] = holders.is_concentrated
+            token["holder_score"] = holders.holder_score
+            
+            # Token Metrics (NEW)
+            token["liquidity_sol"] = metrics.liquidity_sol
+            token["liquidity_usd"] = metrics.liquidity_usd
+            token["volume_24h"] = metrics.volume_24h
+            token["price_usd"] = metrics.price_usd
+            token["market_cap"] = metrics.market_cap  # ✅ FIX: שמירת market cap
+            token["price_change_5m"] = metrics.price_change_5m
+            token["price_change_1h"] = metrics.price_change_1h
+            token["price_change_24h"] = metrics.price_change_24h
+            
+            # Smart money check - top holders + every smart wallet the holdings index saw with this token
+            if smart_holders is None:
+                holder_addresses = [h.get("address", "") for h in holders.top_holders]
+                smart_holders = get_smart_money_tracker().smart_holders(
+                    token["address"],
+                    holder_addresses + list(get_smart_holdings_index().holders_of(token["address"]))
+                )
+            smart_money_count = smart_holders.count
+            token["smart_money_count"] = smart_money_count
+            
+            # Calculate final score (UPGRADED)
+            token_score = self.scoring_engine.calculate_score(
+                safety=safety,
+                holders=holders,
+                liquidity_sol=metrics.liquidity_sol,  # NEW
+                volume_24h=metrics.volume_24h,  # NEW
+                price_change_5m=metrics.price_change_5m,  # NEW
+                price_change_1h=metrics.price_change_1h,  # NEW
+                smart_money_count=smart_money_count,
+                smart_money_avg_trust=smart_holders.avg_trust,
+            )
+            
+            token["final_score"] = token_score.final_score
+            token["grade"] = token_score.grade.value
+            token["category"] = token_score.category.value
+            
+            # Check if should alert
+            if self.scoring_engine.should_alert(token_score):
+                self._high_score_count += 1
+                logger.warning(
+                    f"🔥 HIGH SCORE ALERT: {token['symbol']} - "
+                    f"{token_score.final_score}/100 ({token_score.grade.value})"
+                )
+
+                # Telegram alert (send once per token, only if not quiet mode)
+                if (
+                    self.telegram 
+                    and token.get("address") 
+                    and token["address"] not in self._alerts_sent
+                    and self._mode != "quiet"
+                ):
+                    self._alerts_sent.add(token["address"])
+                    # שמור בהיסטוריה
+                    self._alert_history.append({
+                        "timestamp": datetime.now(timezone.utc),
+                        "token": token.copy(),
+                    })
+                    # שמור רק 100 האחרונות
+                    if len(self._alert_history) > 100:
+                        self._alert_history.pop(0)
+                    asyncio.create_task(self.telegram.send_alert(token))
+                    
+                    # Track token for performance learning (NEW)
+                    if token.get("price_usd", 0) > 0:
+                        asyncio.create_task(self.performance_tracker.track_token(
+                            token_address=token["address"],
+                            symbol=token["symbol"],
+                            entry_price=token["price_usd"],
+                            entry_score=token_score.final_score,
+                            smart_wallets=smart_holders.wallets
+                        ))
+                
+                # בדוק אם טוקן במעקב
+                if token.get("address") in self._watched_tokens:
+                    # אפשר לשלוח התראה מיוחדת על טוקנים במעקב
+                    pass
+            
+            logger.info(
+                f"📊 {token['symbol']}: "
+                f"Final={token_score.final_score}/100 ({token_score.grade.value}) | "
+                f"Safety={safety.safety_score}/100 | "
+                f"Holders={holders.holder_count} ({holders.holder_score}/20) | "
+                f"SmartMoney={smart_money_count} ({token_score.smart_money_score}/15) | "
+                f"Top10%={holders.top_10_percentage:.1f}%"
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to analyze {token.get('symbol', 'unknown')}: {e}")
+            return False
+    
+    async def _save_scanned_tokens(self, analyzed: list[dict], failed: list[dict]):
+        """
+        שמירת תוצאות הסריקה ל-Supabase (דרך ה-write-behind buffer)
+        
+        Args:
+            analyzed: Fully analyzed tokens
+            failed: Tokens whose analysis failed (saved as pending_analysis)
+        """
+        try:
+            buffer = get_write_buffer()
+            
+            # Write-behind: כל הסבב נכתב ב-upsert אחד (flush לפי גודל / גיל)
+            buffer.add_many("scanned_tokens_history", analyzed)
+            
+            # Save tokens that failed analysis with basic data
+            # This ensures all discovered tokens appear in the dashboard
+            if failed:
+                logger.info(f"💾 Saving {len(failed)} additional tokens (without full analysis) to database...")
+            
+            for token in failed:
+                # Prepare basic token data (without full analysis)
+                # These will have default scores and can be analyzed later
+                buffer.add("scanned_tokens_history", {
+                    "address": token.get("address"),
+                    "symbol": token.get("symbol", "UNKNOWN"),
+                    "name": token.get("name", ""),
+                    "created_at": token.get("created_at"),  # Keep creation time
+                    "source": token.get("source", "dexscreener"),
+                    # Basic metrics if available
+                    "price_usd": token.get("price_usd", 0.0),
+                    "volume_24h": token.get("volume_24h", 0.0),
+                    "liquidity_sol": token.get("liquidity_sol", 0.0),
+                    # Default scores (will be updated when fully analyzed)
+                    "final_score": 0,
+                    "safety_score": 0,
+                    "holder_score": 0,
+                    "grade": "F",
+                    "category": "POOR",
+                    "status": "pending_analysis",  # Mark as pending
+                })
+            
+            logger.info(f"💾 Queued {len(analyzed) + len(failed)} tokens for Supabase")
+        except Exception as db_error:
+            logger.error(f"❌ Database error saving scan results: {db_error}")
+    
     async def stop(self):
         """Stop the bot (alias for shutdown)"""
         self.running = False
@@ -484,7 +604,17 @@ class SolanaHunter:
         self.running = False
         await self.scanner.close()
         await self.holder_analyzer.close()
+        await self.metrics_fetcher.close()
         await self.discovery_engine.close()
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+        if self._holdings_task:
+            self._holdings_task.cancel()
+        await get_smart_holdings_index().close()
+        if self.position_monitor:
+            await self.position_monitor.price_feed.close()
+            await self.position_monitor.liquidity_watcher.close()
+        await get_write_buffer().close()  # כתיבת שורות שעוד ב-buffer
         if self.telegram:
             await self.telegram.stop()
         logger.info("✅ Shutdown complete")
@@ -595,7 +725,10 @@ class SolanaHunter:
 
         holders = await self.holder_analyzer.analyze(token_address)
         holder_addresses = [h.get("address", "") for h in holders.top_holders]
-        smart_money_count = get_smart_money_tracker().check_if_holds(token_address, holder_addresses)
+        smart_money_count = get_smart_money_tracker().check_if_holds(
+            token_address,
+            holder_addresses + list(get_smart_holdings_index().holders_of(token_address))
+        )
 
         # Get token metrics for detailed analysis
         metrics = await self.metrics_fetcher.get_metrics(token_address)
@@ -1362,6 +1495,9 @@ async def main():
         except Exception as e:
             logger.critical(f"💥 API server crashed: {e}", exc_info=True)
             raise
+        finally:
+            # Shared HTTP pool is closed once, after both bot and API are done
+            await close_http_pool()
     except Exception as e:
         logger.critical(f"💥 Fatal error: {e}", exc_info=True)
         sys.exit(1)
@@ -3,9 +3,11 @@ Standalone API Server for Railway Deployment
 This runs ONLY the FastAPI server without the bot
 """
 
+import asyncio
 import os
 import uvicorn
 from api.main import app, init_app
+from utils.http_pool import close_http_pool
 
 # Create a minimal mock instance for API-only mode
 # This allows the API to work even without the full bot running
@@ -39,11 +41,21 @@ if __name__ == "__main__":
     print(f"🚀 Starting SolanaHunter API Server on port {port}")
     print(f"📡 API-only mode (bot disabled)")
     
-    # Run the server
-    uvicorn.run(
+    config = uvicorn.Config(
         api_app,
         host="0.0.0.0",
         port=port,
         log_level="info",
         access_log=True
-    )
\ No newline at end of file
+    )
+    server = uvicorn.Server(config)
+    
+    async def serve():
+        try:
+            await server.serve()
+        finally:
+            # This entry point owns the shared HTTP pool - close it on the same loop
+            await close_http_pool()
+    
+    # Run the server
+    asyncio.run(serve())
\ No newline at end of file
@@ -0,0 +1,408 @@
+"""
+Helius Log Stream
+Event-driven token discovery over Helius websockets (logsSubscribe)
+
+📋 מה הקובץ הזה עושה:
+-------------------
+במקום לחכות לסריקה הבאה (כל 5 דקות) - מאזין בזמן אמת ללוגים של תוכניות
+ה-DEX ומזהה pools / טוקנים חדשים תוך שניות.
+
+הקובץ הזה:
+1. מתחבר ל-Helius websocket ונרשם ל-logsSubscribe לכל תוכנית
+   (Raydium AMM, Pump.fun, Meteora DLMM / Dynamic AMM)
+2. מסנן לוגים של יצירת pool / טוקן (initialize2, Create, InitializeLbPair...)
+3. שולף את הטרנזקציה (getTransaction) ומוציא ממנה את ה-mint החדש
+4. דוחף את הטוקן לתור (asyncio.Queue) שמזין את הניתוח
+5. מתחבר מחדש אוטומטית (backoff) ומשלים חתימות שפוספסו (backfill)
+
+🔧 פונקציות עיקריות:
+- HeliusLogStream.start() / stop() - הפעלה וכיבוי
+- HeliusLogStream.queue - תור הטוקנים החדשים
+- get_stats() - מונים (חיבורים, התראות, mints)
+
+💡 איך זה עובד:
+1. subscription לכל תוכנית (mentions) - קודם נרשמים, ואז backfill, כדי שלא יהיה חור
+2. כל התראה נבדקת מול regex של הוראת היצירה - swaps רגילים נזרקים מקומית
+3. חתימות שעוברות נכנסות לתור פנימי ו-workers שולפים את הטרנזקציה
+4. ה-mint = postTokenBalances בלי SOL / USDC / USDT ובלי LP mint
+   (mint חדש שכל היתרות שלו אצל החותמים - ה-LP tokens של יוצר ה-pool)
+5. אחרי ניתוק: getSignaturesForAddress(until=החתימה האחרונה) לכל תוכנית
+
+📝 הערות:
+- דורש את החבילה websockets (ב-requirements.txt) - בלעדיה הסטרים כבוי
+- HELIUS_WS_ENABLED=false מכבה את הסטרים, HELIUS_WS_URL דורס את הכתובת
+- הסריקה הרגילה (DexScreener / PumpFun) ממשיכה לרוץ כגיבוי
+"""
+
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Pattern, Set
+
+from core.config import settings
+from utils.http_pool import create_http_client
+from utils.logger import get_logger
+
+logger = get_logger("helius_stream")
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+
+# ============================================================================
+# Programs & creation markers
+# ============================================================================
+
+RAYDIUM_AMM_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+PUMPFUN_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+METEORA_DLMM = "LBUZKhRxPF3XUpBCjp4YzTKgLccjZhTSDM9YuVaPwxo"
+METEORA_DYNAMIC_AMM = "Eo7WjKq67rjJQSZxS6z3YkapzY3eMj6Xy8X5EQVn5UaB"
+
+# program -> (name, log line that marks a new pool / token)
+PROGRAM_MARKERS: Dict[str, tuple] = {
+    RAYDIUM_AMM_V4: ("raydium", re.compile(r"^Program log: initialize2\b")),
+    PUMPFUN_PROGRAM: ("pumpfun", re.compile(r"^Program log: Instruction: Create(V2)?$")),
+    METEORA_DLMM: ("meteora_dlmm", re.compile(r"^Program log: Instruction: InitializeLbPair")),
+    METEORA_DYNAMIC_AMM: ("meteora_amm", re.compile(r"^Program log: Instruction: InitializePermissionless")),
+}
+
+# Quote side of new pools - never the "new" token
+QUOTE_MINTS = {
+    "So11111111111111111111111111111111111111112",   # WSOL
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",  # USDT
+}
+
+# Tuning
+RESOLVER_WORKERS = 4
+BACKFILL_LIMIT = 100          # Signatures per program after a reconnect
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+SEEN_MAX = 20_000             # Remembered signatures / mints (dedup)
+
+
+def _matches(logs: List[str], marker: Pattern) -> bool:
+    return any(marker.search(line) for line in logs or [])
+
+
+def _signers(transaction: Dict) -> Set[str]:
+    """Signer accounts of a transaction (jsonParsed keys, or the fee payer of plain keys)"""
+    message = ((transaction or {}).get("transaction") or {}).get("message") or {}
+    signers = set()
+    for i, key in enumerate(message.get("accountKeys") or []):
+        if isinstance(key, dict):
+            if key.get("signer"):
+                signers.add(key.get("pubkey"))
+        elif i == 0:
+            signers.add(key)
+    return signers
+
+
+def extract_new_mints(transaction: Dict) -> List[str]:
+    """
+    New token mints in a pool / token creation transaction
+
+    Pool creation (Raydium initialize2, Meteora) also mints LP tokens to the
+    creator. An LP mint has no balance before the transaction and ends up
+    held only by the signers, while the pool's own mints sit in vaults /
+    bonding curves owned by the program - so mints like that are skipped.
+
+    Args:
+        transaction: getTransaction result (jsonParsed)
+
+    Returns:
+        Mints from postTokenBalances, without SOL / stablecoins / LP mints
+    """
+    meta = (transaction or {}).get("meta") or {}
+    signers = _signers(transaction)
+    existing = {b.get("mint") for b in meta.get("preTokenBalances") or []}
+
+    owners: Dict[str, Set[str]] = {}
+    for balance in meta.get("postTokenBalances") or []:
+        mint = balance.get("mint")
+        if mint and mint not in QUOTE_MINTS:
+            owners.setdefault(mint, set()).add(balance.get("owner"))
+
+    return [
+        mint for mint, holders in owners.items()
+        if mint in existing or not signers or not holders <= signers
+    ]
+
+
+class _BoundedSet:
+    """Insertion-ordered set that forgets the oldest items"""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, item: str) -> bool:
+        """Add item - False if it was already there"""
+        if item in self._items:
+            return False
+        self._items[item] = None
+        if len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return True
+
+
+class HeliusLogStream:
+    """
+    Streams newly created tokens from program logs over a websocket
+    """
+
+    def __init__(
+        self,
+        ws_url: Optional[str] = None,
+        rpc_url: Optional[str] = None,
+        programs: Optional[List[str]] = None,
+        queue_size: int = 1000,
+    ):
+        self.ws_url = ws_url or settings.helius_ws_url or (
+            f"wss://mainnet.helius-rpc.com/?api-key={settings.helius_api_key}"
+        )
+        self.rpc_url = rpc_url or settings.solana_rpc_url
+        self.programs = programs or list(PROGRAM_MARKERS.keys())
+        self.http_client = create_http_client("scanner", timeout=20.0)
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._signatures: asyncio.Queue = asyncio.Queue()
+
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+        self._last_signature: Dict[str, str] = {}  # program -> newest seen signature
+        self._seen_signatures = _BoundedSet(SEEN_MAX)
+        self._seen_mints = _BoundedSet(SEEN_MAX)
+
+        # Stats
+        self.connected = False
+        self.connections = 0
+        self.notifications = 0
+        self.matched = 0
+        self.backfilled = 0
+        self.mints_found = 0
+        self.dropped = 0
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    async def start(self) -> bool:
+        """Start listening (returns False if websockets is unavailable)"""
+        if not WEBSOCKETS_AVAILABLE:
+            logger.warning("⚠️ websockets package not installed - Helius stream disabled")
+            return False
+        if self._running:
+            return True
+
+        self._running = True
+        self._tasks = [asyncio.create_task(self._connection_loop())]
+        self._tasks += [asyncio.create_task(self._resolver()) for _ in range(RESOLVER_WORKERS)]
+        logger.info(f"📡 Helius stream started ({len(self.programs)} programs)")
+        return True
+
+    async def stop(self):
+        """Stop listening and release resources"""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.connected = False
+        await self.http_client.aclose()
+
+    # ========================================================================
+    # Websocket
+    # ========================================================================
+
+    async def _connection_loop(self):
+        """Connect, subscribe, read - reconnect with exponential backoff"""
+        delay = RECONNECT_MIN_SECONDS
+
+        while self._running:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=20) as ws:
+                    self.connections += 1
+                    subscriptions = await self._subscribe(ws)
+                    self.connected = True
+                    delay = RECONNECT_MIN_SECONDS
+                    logger.info(f"✅ Helius stream connected ({len(subscriptions)} subscriptions)")
+
+                    # Subscribed first - now fill the gap since the last connection
+                    backfill = asyncio.create_task(self._backfill(dict(self._last_signature)))
+                    try:
+                        async for raw in ws:
+                            self._handle_message(raw, subscriptions)
+                    finally:
+                        backfill.cancel()
+
+                logger.warning("⚠️ Helius stream closed by server")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Helius stream error: {e}")
+            finally:
+                self.connected = False
+
+            if self._running:
+                logger.info(f"🔄 Reconnecting Helius stream in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _subscribe(self, ws) -> Dict[int, str]:
+        """logsSubscribe per program - returns subscription id -> program"""
+        pending: Dict[int, str] = {}
+        for request_id, program in enumerate(self.programs, start=1):
+            pending[request_id] = program
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "logsSubscribe",
+                "params": [{"mentions": [program]}, {"commitment": "confirmed"}],
+            }))
+
+        subscriptions: Dict[int, str] = {}
+        while len(subscriptions) < len(pending):
+            message = json.loads(await asyncio.wait_for(ws.recv(), timeout=15))
+            request_id = message.get("id")
+            if request_id in pending and "result" in message:
+                subscriptions[message["result"]] = pending[request_id]
+            elif "error" in message:
+                raise RuntimeError(f"logsSubscribe failed: {message['error']}")
+        return subscriptions
+
+    def _handle_message(self, raw, subscriptions: Dict[int, str]):
+        """Filter a logsNotification and queue its signature if it creates a pool / token"""
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if message.get("method") != "logsNotification":
+            return
+
+        params = message.get("params") or {}
+        program = subscriptions.get(params.get("subscription"))
+        value = (params.get("result") or {}).get("value") or {}
+        signature = value.get("signature")
+        if not program or not signature:
+            return
+
+        self.notifications += 1
+        self._last_signature[program] = signature
+
+        if value.get("err") or not _matches(value.get("logs"), PROGRAM_MARKERS[program][1]):
+            return
+
+        if self._seen_signatures.add(signature):
+            self.matched += 1
+            self._signatures.put_nowait((signature, program, False))
+
+    async def _backfill(self, since: Dict[str, str]):
+        """
+        Queue signatures missed while disconnected (verified against tx logs later)
+
+        Args:
+            since: program -> newest signature seen before the disconnect
+        """
+        for program, until in since.items():
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getSignaturesForAddress",
+                "params": [program, {"until": until, "limit": BACKFILL_LIMIT, "commitment": "confirmed"}],
+            }
+            try:
+                resp = await self.http_client.post(self.rpc_url, json=payload)
+                if resp.status_code != 200:
+                    continue
+                signatures = resp.json().get("result") or []
+            except Exception as e:
+                logger.debug(f"Backfill failed for {program[:8]}: {e}")
+                continue
+
+            # Oldest first, like the live stream
+            for item in reversed(signatures):
+                signature = item.get("signature")
+                if signature and not item.get("err") and self._seen_signatures.add(signature):
+                    self.backfilled += 1
+                    self._signatures.put_nowait((signature, program, True))
+
+            if signatures:
+                logger.info(f"🔁 Backfill {PROGRAM_MARKERS[program][0]}: {len(signatures)} signatures")
+
+    # ========================================================================
+    # Transaction resolution
+    # ========================================================================
+
+    async def _resolver(self):
+        """Worker: signature -> transaction -> new mints -> queue"""
+        while True:
+            signature, program, needs_log_check = await self._signatures.get()
+            try:
+                transaction = await self._get_transaction(signature)
+                if not transaction:
+                    continue
+
+                if needs_log_check:
+                    logs = (transaction.get("meta") or {}).get("logMessages")
+                    if not _matches(logs, PROGRAM_MARKERS[program][1]):
+                        continue
+
+                for mint in extract_new_mints(transaction):
+                    if self._seen_mints.add(mint):
+                        self._publish(mint, program, signature, transaction)
+
+            except Exception as e:
+                logger.debug(f"Failed to resolve {signature[:16]}: {e}")
+
+    async def _get_transaction(self, signature: str) -> Optional[Dict]:
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getTransaction",
+            "params": [
+                signature,
+                {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0, "commitment": "confirmed"},
+            ],
+        }
+        resp = await self.http_client.post(self.rpc_url, json=payload)
+        if resp.status_code == 200:
+            return resp.json().get("result")
+        return None
+
+    def _publish(self, mint: str, program: str, signature: str, transaction: Dict):
+        block_time = transaction.get("blockTime")
+        token = {
+            "address": mint,
+            "symbol": "UNKNOWN",
+            "name": "Unknown Token",
+            "created_at": datetime.fromtimestamp(block_time) if block_time else datetime.now(),
+            "source": f"helius_{PROGRAM_MARKERS[program][0]}",
+            "signature": signature,
+        }
+        try:
+            self.queue.put_nowait(token)
+            self.mints_found += 1
+            logger.info(f"⚡ New token from {PROGRAM_MARKERS[program][0]}: {mint[:20]}...")
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def get_stats(self) -> Dict:
+        """Stream counters"""
+        return {
+            "connected": self.connected,
+            "connections": self.connections,
+            "notifications": self.notifications,
+            "matched": self.matched,
+            "backfilled": self.backfilled,
+            "mints_found": self.mints_found,
+            "queued": self.queue.qsize(),
+            "dropped": self.dropped,
+        }
@@ -7,13 +7,14 @@ Modern scanner with AI-powered filtering and multi-source discovery
 זה הקובץ שסורק ומזהה טוקנים חדשים ברשת Solana.
 
 הקובץ הזה:
-1. סורק טוקנים חדשים ממספר מקורות (DexScreener, Helius)
+1. סורק טוקנים חדשים ממספר מקורות (DexScreener, Helius, PumpFun)
 2. מסיר כפילויות (deduplication)
 3. מסנן טוקנים ישנים (רק טוקנים שנוצרו ב-24 שעות האחרונות)
 4. מציג את התוצאות בטבלה יפה
 
 🔧 פונקציות עיקריות:
 - discover_new_tokens(hours=24) - מוצא טוקנים חדשים
+- start_stream() / next_stream_batch() - גילוי בזמן אמת (Helius websocket)
 - display_tokens(tokens) - מציג טבלה יפה עם כל הטוקנים
 - close() - סגירה נקייה של החיבורים
 
@@ -28,19 +29,21 @@ Modern scanner with AI-powered filtering and multi-source discovery
 - משתמש ב-async/await לניהול I/O יעיל
 - תומך ב-multi-source discovery (אם מקור אחד נכשל, מנסה את השני)
 - מציג טבלה יפה עם Rich library
+- הסטרים (scanner/helius_stream.py) מזהה pools חדשים תוך שניות, הסריקה הרגילה נשארת כגיבוי
 """
 
 import asyncio
 import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-import httpx
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
 from core.config import settings
 from utils.logger import get_logger
+from utils.http_pool import create_http_client
+from scanner.helius_stream import HeliusLogStream
 
 logger = get_logger("scanner")
 console = Console()
@@ -64,11 +67,11 @@ class TokenScanner:
         self.last_scan_time: Optional[datetime] = None
         self.discovered_tokens: Dict[str, datetime] = {}  # address -> first_seen
         
-        # HTTP client with retry logic
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
-        )
+        # HTTP client on the shared connection pool
+        self.client = create_http_client("scanner", timeout=30.0)
+        
+        # Real-time discovery (started by start_stream)
+        self.stream: Optional[HeliusLogStream] = None
     
     async def discover_new_tokens(self, hours: int = 24) -> List[Dict]:
         """
@@ -231,13 +234,77 @@ class TokenScanner:
             return []
     
     async def _discover_from_helius(self, hours: int) -> List[Dict]:
-        """Discover tokens from Helius Enhanced APIs"""
-        # Helius Enhanced APIs for token discovery
-        # This is a placeholder - actual implementation depends on Helius API availability
+        """Tokens the Helius stream found that nobody consumed yet"""
+        if not self.stream:
+            return []
         
-        # For now, return empty list
-        # TODO: Implement when Helius Enhanced APIs are available
-        return []
+        tokens = []
+        while not self.stream.queue.empty():
+            tokens.append(self.stream.queue.get_nowait())
+        
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        return [t for t in tokens if t["created_at"] >= cutoff_time]
+    
+    async def start_stream(self) -> bool:
+        """
+        Start real-time discovery over Helius websockets
+        
+        Returns:
+            True if the stream is running
+        """
+        if not settings.helius_ws_enabled:
+            return False
+        if self.stream is None:
+            self.stream = HeliusLogStream(rpc_url=self.rpc_url)
+        return await self.stream.start()
+    
+    async def next_stream_batch(self, max_tokens: int = 50, max_wait: float = 2.0) -> List[Dict]:
+        """
+        Wait for new tokens from the stream and return them as a small batch
+        
+        Waits for the first token, then collects more for up to max_wait seconds
+        so the analysis still runs in batches.
+        
+        Args:
+            max_tokens: Max tokens per batch
+            max_wait: Seconds to keep collecting after the first token
+        
+        Returns:
+            List of new (not seen before) tokens with metadata
+        """
+        if not self.stream:
+            return []
+        
+        queue = self.stream.queue
+        tokens = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        
+        while len(tokens) < max_tokens:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                tokens.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        new_tokens = [
+            token for token in self._deduplicate_tokens(tokens)
+            if token["address"] not in self.discovered_tokens
+        ]
+        for token in new_tokens:
+            self.discovered_tokens[token["address"]] = datetime.now()
+        
+        # Names / symbols - the stream only knows the mint
+        metadata = await asyncio.gather(
+            *(self._get_token_metadata_from_helius(t["address"]) for t in new_tokens)
+        )
+        for token, meta in zip(new_tokens, metadata):
+            token["symbol"] = meta.get("symbol", "UNKNOWN")
+            token["name"] = meta.get("name", "Unknown Token")
+        
+        return new_tokens
     
     async def _get_token_metadata_from_helius(self, mint_address: str) -> Dict:
         """
@@ -397,6 +464,8 @@ class TokenScanner:
     
     async def close(self):
         """Cleanup resources"""
+        if self.stream:
+            await self.stream.stop()
         await self.client.aclose()
 
 
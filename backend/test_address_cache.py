@@ -0,0 +1,122 @@
+"""
+Test script for the Address Owner Cache append-only log
+
+Runs on a temporary data directory + a fake owner lookup - no network needed:
+1. Only unknown addresses reach the lookup; new ones are appended to address_owners.jsonl
+2. Torn last line cut on load, last line per address wins
+3. Compaction once the log outgrows the cache (evicted addresses dropped)
+4. Legacy address_owners.json → imported once into the log
+"""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from analyzer.address_cache import AddressOwnerCache
+
+LP_OWNER = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+
+
+def classify(address: str, owner: str):
+    return ("lp", "LP: Raydium") if owner == LP_OWNER else ("other", "")
+
+
+async def run_resolve_and_append_test():
+    print("\n📝 resolve + append:")
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache_file = str(Path(data_dir) / "address_owners.json")
+        cache = AddressOwnerCache(cache_file=cache_file)
+        looked_up = []
+
+        async def fetch(addresses):
+            looked_up.extend(addresses)
+            return {a: (LP_OWNER if a.startswith("pool") else "wallet-program") for a in addresses if a != "closed"}
+
+        owners = await cache.resolve(["pool1", "holder1", "closed"], fetch, classify)
+        assert owners == {"pool1": LP_OWNER, "holder1": "wallet-program"}, owners
+        await cache.flush(force=True)
+
+        owners = await cache.resolve(["pool1", "holder2"], fetch, classify)
+        assert looked_up == ["pool1", "holder1", "closed", "holder2"], looked_up  # pool1 was a hit
+        await cache.flush(force=True)
+
+        log_file = Path(data_dir) / "address_owners.jsonl"
+        lines = log_file.read_text().splitlines()
+        assert [json.loads(line)["address"] for line in lines] == ["pool1", "holder1", "holder2"], lines
+        assert not Path(cache_file).exists()
+
+        # Torn last line + a newer line for holder1
+        with open(log_file, "a") as f:
+            f.write(json.dumps({"address": "holder1", "owner": LP_OWNER, "kind": "lp", "label": "x"}) + "\n")
+            f.write('{"address": "torn", "ow')
+
+        reloaded = AddressOwnerCache(cache_file=cache_file)
+        assert reloaded.get("holder1")["owner"] == LP_OWNER
+        assert reloaded.get("pool1") == {"owner": LP_OWNER, "kind": "lp", "label": "LP: Raydium"}
+        assert reloaded.get("torn") is None
+        assert log_file.read_text().endswith("\n")
+        assert reloaded.get_stats()["log_lines"] == 4
+        print(f"  {len(lines)} lines appended, {reloaded.get_stats()['entries']} entries reloaded")
+
+
+async def run_compaction_test():
+    print("\n🗜️ Compaction:")
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache_file = str(Path(data_dir) / "address_owners.json")
+        cache = AddressOwnerCache(cache_file=cache_file, max_entries=100)
+
+        async def fetch(addresses):
+            return {a: "wallet-program" for a in addresses}
+
+        for batch in range(30):
+            await cache.resolve([f"acc{batch}-{i}" for i in range(50)], fetch, classify)
+            await cache.flush()
+
+        log_file = Path(data_dir) / "address_owners.jsonl"
+        lines = log_file.read_text().splitlines()
+        assert len(lines) <= 2 * 100 + 1000 + 50, len(lines)
+        assert cache.get_stats()["log_lines"] == len(lines)
+
+        reloaded = AddressOwnerCache(cache_file=cache_file, max_entries=100)
+        assert reloaded.get("acc29-49") is not None
+        assert reloaded.get("acc0-0") is None  # Evicted before compaction
+        print(f"  1500 addresses → {len(lines)} log lines")
+
+
+def test_legacy_import():
+    print("\n📦 Legacy JSON import:")
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache_file = Path(data_dir) / "address_owners.json"
+        cache_file.write_text(json.dumps({
+            "pool1": {"owner": LP_OWNER, "kind": "lp", "label": "LP: Raydium"},
+            "broken": "not-an-entry",
+        }))
+
+        cache = AddressOwnerCache(cache_file=str(cache_file))
+        assert cache.get("pool1")["owner"] == LP_OWNER
+        assert cache.get("broken") is None
+
+        log_file = Path(data_dir) / "address_owners.jsonl"
+        assert len(log_file.read_text().splitlines()) == 1
+
+        cache_file.write_text("{}")  # The log wins from now on
+        assert AddressOwnerCache(cache_file=str(cache_file)).get("pool1") is not None
+        print("  imported 1 entry")
+
+
+def test_address_cache():
+    """Test lookups, the append-only log, compaction and the legacy import"""
+    print("=" * 60)
+    print("Testing Address Owner Cache")
+    print("=" * 60)
+
+    asyncio.run(run_resolve_and_append_test())
+    asyncio.run(run_compaction_test())
+    test_legacy_import()
+
+    print("\n✅ Address cache test passed")
+
+
+if __name__ == "__main__":
+    test_address_cache()
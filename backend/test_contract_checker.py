@@ -0,0 +1,108 @@
+"""
+Test script for mint account decoding in the Contract Checker
+
+Runs on fixtures only - no network needed:
+1. Program IDs match the on-chain program keys
+2. SPL Token mint (82 bytes) → authorities / supply / decimals
+3. Token-2022 mint with extensions (padded to 165 + account type 1) → decoded
+4. Token-2022 token account (account type 2) / unknown owner → None
+"""
+
+import base64
+import struct
+
+import base58
+
+from analyzer.contract_checker import (
+    MINT_LAYOUT_SIZE,
+    TOKEN_2022_PROGRAM_ID,
+    TOKEN_PROGRAM_ID,
+    decode_mint_account,
+    parse_account_value,
+)
+
+
+def pubkey_bytes(seed: int) -> bytes:
+    return bytes([seed]) * 32
+
+
+def b58(raw: bytes) -> str:
+    return base58.b58encode(raw).decode()
+
+
+def mint_data(mint_authority, freeze_authority, supply: int, decimals: int) -> bytes:
+    """82-byte mint layout; authorities are 32-byte keys or None"""
+    data = struct.pack("<I", 1 if mint_authority else 0) + (mint_authority or bytes(32))
+    data += struct.pack("<QB?", supply, decimals, True)
+    data += struct.pack("<I", 1 if freeze_authority else 0) + (freeze_authority or bytes(32))
+    assert len(data) == MINT_LAYOUT_SIZE
+    return data
+
+
+def token_2022_data(base: bytes, account_type: int) -> bytes:
+    """Token-2022 account with extensions: base padded to 165 + account type + TLV"""
+    return base.ljust(165, b"\0") + bytes([account_type]) + bytes(8)
+
+
+def test_program_ids():
+    """Both program IDs decode to the real program keys"""
+    token = bytes.fromhex("06ddf6e1d765a193d9cbe146ceeb79ac1cb485ed5f5b37913a8cf5857eff00a9")
+    token_2022 = bytes.fromhex("06ddf6e1ee758fde18425dbce46ccddab61afc4d83b90d27febdf928d8a18bfc")
+    assert b58(token) == TOKEN_PROGRAM_ID
+    assert b58(token_2022) == TOKEN_2022_PROGRAM_ID
+
+
+def test_spl_mint():
+    """Renounced SPL mint with a freeze authority"""
+    data = mint_data(None, pubkey_bytes(7), supply=1_000_000_000_000, decimals=6)
+    info = decode_mint_account(data, TOKEN_PROGRAM_ID)
+    assert info is not None
+    assert info.mint_authority is None, info
+    assert info.freeze_authority == b58(pubkey_bytes(7)), info
+    assert info.supply == 1_000_000_000_000, info
+    assert info.decimals == 6, info
+    assert info.is_initialized, info
+    assert info.token_program == "spl-token", info
+
+    # Same account through an RPC response
+    value = {"data": [base64.b64encode(data).decode(), "base64"], "owner": TOKEN_PROGRAM_ID}
+    assert parse_account_value(value) == info
+    print(f"  SPL mint: {info}")
+
+
+def test_token_2022_mint():
+    """Token-2022 mint with extensions; non-mint accounts are rejected"""
+    base = mint_data(pubkey_bytes(3), None, supply=42, decimals=9)
+    info = decode_mint_account(token_2022_data(base, account_type=1), TOKEN_2022_PROGRAM_ID)
+    assert info is not None
+    assert info.mint_authority == b58(pubkey_bytes(3)), info
+    assert info.freeze_authority is None, info
+    assert info.supply == 42, info
+    assert info.decimals == 9, info
+    assert info.token_program == "token-2022", info
+    print(f"  Token-2022 mint: {info}")
+
+    # Plain 82-byte Token-2022 mint (no extensions)
+    assert decode_mint_account(base, TOKEN_2022_PROGRAM_ID) is not None
+
+    # Token-2022 token account, wrong owner, short data
+    assert decode_mint_account(token_2022_data(base, account_type=2), TOKEN_2022_PROGRAM_ID) is None
+    assert decode_mint_account(base, "11111111111111111111111111111111") is None
+    assert decode_mint_account(base[:40], TOKEN_PROGRAM_ID) is None
+
+
+def test_contract_checker():
+    """Test mint account decoding"""
+    print("=" * 60)
+    print("Testing Contract Checker mint decoding")
+    print("=" * 60)
+
+    test_program_ids()
+    test_spl_mint()
+    test_token_2022_mint()
+
+    print("\n✅ Contract checker test passed")
+
+
+if __name__ == "__main__":
+    test_contract_checker()
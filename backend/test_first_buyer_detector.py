@@ -0,0 +1,195 @@
+"""
+Test script for the First Buyer Detector
+
+Runs on jsonParsed fixtures + a mock RPC - no network needed:
+1. SOL buy by the fee payer (index 0) → fee excluded from the amount paid
+2. USDC buy by a signer that did not pay the fee
+3. Transfer / airdrop (no SOL / USDC paid) → not a buy
+4. _page_signatures → pages back until a short page, keeps the first window only
+"""
+
+import asyncio
+import json
+import tempfile
+
+import httpx
+
+from analyzer.first_buyer_detector import (
+    SIGNATURES_PAGE_SIZE,
+    WSOL_MINT,
+    FirstBuyerDetector,
+    _MintHistory,
+    decode_buys,
+)
+
+TOKEN = "Tok1111111111111111111111111111111111111111"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+BUYER = "Buyer111111111111111111111111111111111111111"
+RELAYER = "Re1ayer11111111111111111111111111111111111111"
+POOL = "Poo1111111111111111111111111111111111111111"
+
+FEE = 5000
+CREATED = 1_700_000_000
+
+
+def balance(owner: str, mint: str, amount: int, decimals: int) -> dict:
+    return {"owner": owner, "mint": mint, "uiTokenAmount": {"amount": str(amount), "decimals": decimals}}
+
+
+def transaction(keys, pre_lamports, post_lamports, pre_tokens, post_tokens, slot=100) -> dict:
+    """getTransaction result (jsonParsed); keys = [(pubkey, signer)]"""
+    return {
+        "slot": slot,
+        "blockTime": CREATED + 60,
+        "meta": {
+            "err": None,
+            "fee": FEE,
+            "preBalances": pre_lamports,
+            "postBalances": post_lamports,
+            "preTokenBalances": pre_tokens,
+            "postTokenBalances": post_tokens,
+        },
+        "transaction": {"message": {"accountKeys": [
+            {"pubkey": pubkey, "signer": signer} for pubkey, signer in keys
+        ]}},
+    }
+
+
+def test_sol_buy():
+    """1 SOL (+ fee) for 1,000 tokens - buyer pays the fee"""
+    tx = transaction(
+        keys=[(BUYER, True), (POOL, False)],
+        pre_lamports=[2_000_000_000 + FEE, 50_000_000_000],
+        post_lamports=[1_000_000_000, 51_000_000_000],
+        pre_tokens=[balance(POOL, TOKEN, 10_000_000_000, 6)],
+        post_tokens=[balance(POOL, TOKEN, 9_000_000_000, 6), balance(BUYER, TOKEN, 1_000_000_000, 6)],
+    )
+    buys = decode_buys(tx, TOKEN)
+    assert len(buys) == 1, buys
+    buy = buys[0]
+    assert buy["wallet"] == BUYER, buy
+    assert buy["quote_mint"] == WSOL_MINT, buy
+    assert abs(buy["quote_amount"] - 1.0) < 1e-9, buy
+    assert abs(buy["amount_tokens"] - 1000.0) < 1e-9, buy
+    assert abs(buy["price_quote"] - 0.001) < 1e-12, buy
+    assert buy["slot"] == 100, buy
+    print(f"  SOL buy: {buy}")
+
+
+def test_usdc_buy():
+    """50 USDC for 500 tokens - a relayer pays the fee"""
+    tx = transaction(
+        keys=[(RELAYER, True), (BUYER, True), (POOL, False)],
+        pre_lamports=[1_000_000_000, 10_000_000, 0],
+        post_lamports=[1_000_000_000 - FEE, 10_000_000, 0],
+        pre_tokens=[balance(BUYER, USDC, 100_000_000, 6), balance(POOL, TOKEN, 10_000_000_000, 6)],
+        post_tokens=[
+            balance(BUYER, USDC, 50_000_000, 6),
+            balance(POOL, TOKEN, 9_500_000_000, 6),
+            balance(BUYER, TOKEN, 500_000_000, 6),
+        ],
+    )
+    buys = decode_buys(tx, TOKEN)
+    assert len(buys) == 1, buys
+    buy = buys[0]
+    assert buy["wallet"] == BUYER, buy
+    assert buy["quote_mint"] == USDC, buy
+    assert abs(buy["quote_amount"] - 50.0) < 1e-9, buy
+    assert abs(buy["price_quote"] - 0.1) < 1e-12, buy
+    print(f"  USDC buy: {buy}")
+
+
+def test_transfer_rejected():
+    """Tokens received without paying (only the fee / not a signer) are not buys"""
+    # Signer receives tokens and pays only the fee
+    transfer = transaction(
+        keys=[(BUYER, True), (RELAYER, False)],
+        pre_lamports=[1_000_000_000, 0],
+        post_lamports=[1_000_000_000 - FEE, 0],
+        pre_tokens=[balance(RELAYER, TOKEN, 1_000_000_000, 6)],
+        post_tokens=[balance(RELAYER, TOKEN, 0, 6), balance(BUYER, TOKEN, 1_000_000_000, 6)],
+    )
+    assert decode_buys(transfer, TOKEN) == []
+
+    # Airdrop - the recipient did not sign
+    airdrop = transaction(
+        keys=[(RELAYER, True), (BUYER, False)],
+        pre_lamports=[1_000_000_000, 0],
+        post_lamports=[1_000_000_000 - FEE, 0],
+        pre_tokens=[balance(RELAYER, TOKEN, 1_000_000_000, 6)],
+        post_tokens=[balance(RELAYER, TOKEN, 0, 6), balance(BUYER, TOKEN, 1_000_000_000, 6)],
+    )
+    assert decode_buys(airdrop, TOKEN) == []
+
+    # Failed transaction
+    failed = dict(airdrop, meta=dict(airdrop["meta"], err={"InstructionError": [0, "Custom"]}))
+    assert decode_buys(failed, TOKEN) == []
+
+
+# Signatures newest first: a full page, then a short page that reaches creation.
+# One signature per 10 minutes → the first 24h are the oldest 145 signatures.
+TOTAL_SIGNATURES = SIGNATURES_PAGE_SIZE + 200
+SIGNATURES = [
+    {
+        "signature": f"sig{i}",
+        "blockTime": CREATED + (TOTAL_SIGNATURES - 1 - i) * 600,
+        "err": None if i % 50 else {"InstructionError": [0, "Custom"]},
+    }
+    for i in range(TOTAL_SIGNATURES)
+]
+
+
+async def run_page_signatures_test():
+    requests = []
+
+    def fake_rpc(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        assert body["method"] == "getSignaturesForAddress"
+        address, options = body["params"]
+        assert address == TOKEN
+        requests.append(options)
+        start = 0
+        if "before" in options:
+            start = next(i for i, s in enumerate(SIGNATURES) if s["signature"] == options["before"]) + 1
+        return httpx.Response(200, json={"result": SIGNATURES[start:start + options["limit"]]})
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        detector = FirstBuyerDetector(rpc_url="http://rpc.test", cache_dir=cache_dir, max_signature_pages=5)
+        detector.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_rpc))
+        try:
+            history = _MintHistory(token_address=TOKEN, source_address=TOKEN, window_hours=24)
+            await detector._page_signatures(history)
+        finally:
+            await detector.close()
+
+    assert len(requests) == 2, requests
+    assert requests[1]["before"] == f"sig{SIGNATURES_PAGE_SIZE - 1}", requests
+    assert history.complete
+    assert history.cursor == f"sig{TOTAL_SIGNATURES - 1}", history.cursor
+    assert history.oldest_block_time == CREATED, history.oldest_block_time
+
+    window = [
+        s for s in SIGNATURES
+        if s["blockTime"] <= CREATED + 24 * 3600 and s["err"] is None
+    ]
+    assert set(history.candidates) == {s["signature"] for s in window}, len(history.candidates)
+    assert detector.get_stats()["signature_pages"] == 2
+    print(f"  {len(history.candidates)} transactions in the first 24h (of {TOTAL_SIGNATURES})")
+
+
+def test_first_buyer_detector():
+    """Test swap decoding and signature paging"""
+    print("=" * 60)
+    print("Testing First Buyer Detector")
+    print("=" * 60)
+
+    test_sol_buy()
+    test_usdc_buy()
+    test_transfer_rejected()
+    asyncio.run(run_page_signatures_test())
+
+    print("\n✅ First buyer detector test passed")
+
+
+if __name__ == "__main__":
+    test_first_buyer_detector()
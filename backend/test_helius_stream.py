@@ -0,0 +1,161 @@
+"""
+Test script for Helius Log Stream (real-time discovery)
+
+Runs against a local fake websocket server + fake RPC - no network needed:
+1. New pool on the first connection → token in the queue
+2. Server drops the connection → stream reconnects
+3. Signature missed while disconnected → picked up by backfill
+4. Raydium pool creation also mints LP tokens to the creator → LP mint not published
+"""
+
+import asyncio
+import json
+
+import httpx
+import websockets
+
+from scanner.helius_stream import HeliusLogStream, PUMPFUN_PROGRAM, RAYDIUM_AMM_V4
+
+WSOL = "So11111111111111111111111111111111111111112"
+CREATOR = "Creator111111111111111111111111111111111111"
+RAYDIUM_AUTHORITY = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+BONDING_CURVE = "Curve11111111111111111111111111111111111111"
+LP_MINT = "MintLP11111111111111111111111111111111111111"
+
+# signature -> (program, new mint)
+TRANSACTIONS = {
+    "sig-live-pump": (PUMPFUN_PROGRAM, "MintPump111111111111111111111111111111111111"),
+    "sig-live-swap": (RAYDIUM_AMM_V4, "MintSwap111111111111111111111111111111111111"),
+    "sig-live-ray": (RAYDIUM_AMM_V4, "MintRay1111111111111111111111111111111111111"),
+    "sig-missed-ray": (RAYDIUM_AMM_V4, "MintMissed11111111111111111111111111111111111"),
+}
+
+LOGS = {
+    "sig-live-pump": ["Program log: Instruction: Create"],
+    "sig-live-swap": ["Program log: ray_log: AAAA", "Program log: Instruction: CreateIdempotent"],
+    "sig-live-ray": ["Program log: initialize2: InitializeInstruction2 { nonce: 254 }"],
+    "sig-missed-ray": ["Program log: initialize2: InitializeInstruction2 { nonce: 253 }"],
+}
+
+
+def fake_rpc(request: httpx.Request) -> httpx.Response:
+    """getTransaction / getSignaturesForAddress"""
+    body = json.loads(request.content)
+    method, params = body["method"], body["params"]
+
+    if method == "getTransaction":
+        program, mint = TRANSACTIONS[params[0]]
+        if program == PUMPFUN_PROGRAM:
+            # Mint created in this transaction; the creator buys right away
+            pre_balances = []
+            post_balances = [{"mint": mint, "owner": BONDING_CURVE}, {"mint": mint, "owner": CREATOR}]
+        else:
+            # Creator funds the pool and gets the (new) LP mint back
+            pre_balances = [{"mint": mint, "owner": CREATOR}, {"mint": WSOL, "owner": CREATOR}]
+            post_balances = [
+                {"mint": mint, "owner": RAYDIUM_AUTHORITY},
+                {"mint": WSOL, "owner": RAYDIUM_AUTHORITY},
+                {"mint": LP_MINT, "owner": CREATOR},
+            ]
+        return httpx.Response(200, json={"result": {
+            "blockTime": None,
+            "transaction": {"message": {"accountKeys": [
+                {"pubkey": CREATOR, "signer": True, "writable": True},
+                {"pubkey": program, "signer": False, "writable": False},
+            ]}},
+            "meta": {
+                "logMessages": LOGS[params[0]],
+                "preTokenBalances": pre_balances,
+                "postTokenBalances": post_balances,
+            },
+        }})
+
+    if method == "getSignaturesForAddress" and params[0] == RAYDIUM_AMM_V4:
+        # Newest first, like the real RPC
+        return httpx.Response(200, json={"result": [
+            {"signature": "sig-missed-ray", "err": None},
+        ]})
+
+    return httpx.Response(200, json={"result": []})
+
+
+def notification(subscription: int, signature: str) -> str:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "subscription": subscription,
+            "result": {"value": {"signature": signature, "err": None, "logs": LOGS[signature]}},
+        },
+    })
+
+
+async def run_stream_test():
+    connections = 0
+
+    async def handler(ws):
+        nonlocal connections
+        connections += 1
+
+        # Answer logsSubscribe: subscription id = 100 + request id
+        programs = {}
+        for _ in range(2):
+            request = json.loads(await ws.recv())
+            programs[request["params"][0]["mentions"][0]] = 100 + request["id"]
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": 100 + request["id"]}))
+
+        if connections == 1:
+            await ws.send(notification(programs[PUMPFUN_PROGRAM], "sig-live-pump"))
+            await ws.send(notification(programs[RAYDIUM_AMM_V4], "sig-live-swap"))  # Swap - ignored
+            await ws.send(notification(programs[RAYDIUM_AMM_V4], "sig-live-ray"))
+            await asyncio.sleep(0.2)
+            return  # Drop the connection
+
+        await asyncio.sleep(5)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        stream = HeliusLogStream(
+            ws_url=f"ws://127.0.0.1:{port}",
+            rpc_url="http://rpc.test",
+            programs=[PUMPFUN_PROGRAM, RAYDIUM_AMM_V4],
+        )
+        stream.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_rpc))
+
+        assert await stream.start()
+        try:
+            found = []
+            for _ in range(3):
+                token = await asyncio.wait_for(stream.queue.get(), timeout=10)
+                found.append(token["address"])
+                print(f"  ⚡ {token['source']}: {token['address']}")
+            await asyncio.sleep(0.2)
+            while not stream.queue.empty():
+                found.append(stream.queue.get_nowait()["address"])
+        finally:
+            stats = stream.get_stats()
+            await stream.stop()
+
+    assert found[:2] == [TRANSACTIONS["sig-live-pump"][1], TRANSACTIONS["sig-live-ray"][1]], found
+    assert found[2] == TRANSACTIONS["sig-missed-ray"][1], found
+    assert len(found) == 3 and LP_MINT not in found, found
+    assert TRANSACTIONS["sig-live-swap"][1] not in found
+    assert stats["connections"] >= 2, stats
+    assert stats["backfilled"] == 1, stats
+
+    print(f"\nStats: {stats}")
+
+
+def test_helius_stream():
+    """Test the Helius stream against a fake websocket server"""
+    print("=" * 60)
+    print("Testing Helius Log Stream")
+    print("=" * 60)
+
+    asyncio.run(run_stream_test())
+
+    print("\n✅ Helius stream test passed")
+
+
+if __name__ == "__main__":
+    test_helius_stream()
@@ -0,0 +1,160 @@
+"""
+Test script for the Liquidity Watcher (on-chain drain detection)
+
+Runs against a local fake websocket server + fake RPC - no network needed:
+1. Raydium AMM v4 pool account → base / quote vaults
+2. Normal swaps → no alert
+3. LP pulled (base + quote drop together) → drain callback fires once
+"""
+
+import asyncio
+import base64
+import json
+
+import base58
+import httpx
+import websockets
+
+from executor.liquidity_watcher import (
+    LiquidityWatcher,
+    PoolVaults,
+    RAYDIUM_V4_BASE_MINT_OFFSET,
+    RAYDIUM_V4_BASE_VAULT_OFFSET,
+    RAYDIUM_V4_POOL_SIZE,
+    RAYDIUM_V4_QUOTE_MINT_OFFSET,
+    RAYDIUM_V4_QUOTE_VAULT_OFFSET,
+    decode_raydium_v4_vaults,
+)
+
+WSOL = "So11111111111111111111111111111111111111112"
+POOL = "Poo1111111111111111111111111111111111111111"
+
+
+def pubkey_bytes(seed: int) -> bytes:
+    return bytes([seed]) * 32
+
+
+def b58(raw: bytes) -> str:
+    return base58.b58encode(raw).decode()
+
+
+def token_account(amount: int) -> str:
+    """Base64 SPL token account with the given amount"""
+    data = pubkey_bytes(1) + pubkey_bytes(2) + amount.to_bytes(8, "little") + bytes(93)
+    return base64.b64encode(data).decode()
+
+
+BASE_VAULT = b58(pubkey_bytes(10))
+QUOTE_VAULT = b58(pubkey_bytes(11))
+
+# (vault, amount) updates pushed by the fake server, in order
+UPDATES = [
+    (QUOTE_VAULT, 1_050_000_000),  # Buy
+    (BASE_VAULT, 950_000),
+    (QUOTE_VAULT, 980_000_000),    # Sell - small
+    (BASE_VAULT, 1_020_000),
+    (BASE_VAULT, 10_000),          # LP pulled
+    (QUOTE_VAULT, 9_000_000),
+    (QUOTE_VAULT, 1_000_000),      # Already fired - no second alert
+]
+
+
+def test_decode_vaults():
+    """SOL-as-base pools get their vaults swapped"""
+    data = bytearray(RAYDIUM_V4_POOL_SIZE)
+    data[RAYDIUM_V4_BASE_VAULT_OFFSET:RAYDIUM_V4_BASE_VAULT_OFFSET + 32] = pubkey_bytes(10)
+    data[RAYDIUM_V4_QUOTE_VAULT_OFFSET:RAYDIUM_V4_QUOTE_VAULT_OFFSET + 32] = pubkey_bytes(11)
+    data[RAYDIUM_V4_QUOTE_MINT_OFFSET:RAYDIUM_V4_QUOTE_MINT_OFFSET + 32] = pubkey_bytes(12)
+
+    wsol = bytes.fromhex("069b8857feab8184fb687f634618c035dac439dc1aeb3b5598a0f00000000001")
+    assert b58(wsol) == WSOL
+    data[RAYDIUM_V4_BASE_MINT_OFFSET:RAYDIUM_V4_BASE_MINT_OFFSET + 32] = wsol
+
+    vaults = decode_raydium_v4_vaults(POOL, bytes(data))
+    assert vaults == PoolVaults(POOL, base_vault=QUOTE_VAULT, quote_vault=BASE_VAULT), vaults
+    assert decode_raydium_v4_vaults(POOL, bytes(100)) is None
+
+
+def fake_rpc(request: httpx.Request) -> httpx.Response:
+    """getMultipleAccounts - starting balances"""
+    body = json.loads(request.content)
+    assert body["method"] == "getMultipleAccounts"
+    balances = {BASE_VAULT: 1_000_000, QUOTE_VAULT: 1_000_000_000}
+    return httpx.Response(200, json={"result": {"value": [
+        {"data": [token_account(balances[vault]), "base64"], "owner": "Tokenkeg"}
+        for vault in body["params"][0]
+    ]}})
+
+
+async def run_watcher_test():
+    async def handler(ws):
+        subscriptions = {}
+        for _ in range(2):
+            request = json.loads(await ws.recv())
+            assert request["method"] == "accountSubscribe"
+            subscriptions[request["params"][0]] = 500 + request["id"]
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": 500 + request["id"]}))
+
+        for vault, amount in UPDATES:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "accountNotification",
+                "params": {
+                    "subscription": subscriptions[vault],
+                    "result": {"value": {"data": [token_account(amount), "base64"]}},
+                },
+            }))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(5)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        watcher = LiquidityWatcher(
+            ws_url=f"ws://127.0.0.1:{port}",
+            rpc_url="http://rpc.test",
+            drain_threshold_pct=50.0,
+            window_seconds=60.0,
+        )
+        watcher.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_rpc))
+
+        drains = []
+        fired = asyncio.Event()
+
+        def on_drain(event):
+            drains.append(event)
+            fired.set()
+
+        vaults = PoolVaults(POOL, base_vault=BASE_VAULT, quote_vault=QUOTE_VAULT)
+        assert await watcher.watch("MintRug", on_drain, vaults=vaults)
+        try:
+            await asyncio.wait_for(fired.wait(), timeout=10)
+            await asyncio.sleep(0.2)  # Let the remaining updates arrive
+        finally:
+            stats = watcher.get_stats()
+            await watcher.close()
+
+    assert len(drains) == 1, drains
+    drain = drains[0]
+    print(f"  {drain.reason}")
+    assert drain.quote_before == 1_050_000_000, drain
+    assert drain.quote_after == 9_000_000, drain
+    assert drain.base_dropped, drain
+    assert stats["notifications"] == len(UPDATES), stats
+
+    print(f"\nStats: {stats}")
+
+
+def test_liquidity_watcher():
+    """Test the liquidity watcher against a fake websocket server"""
+    print("=" * 60)
+    print("Testing Liquidity Watcher")
+    print("=" * 60)
+
+    test_decode_vaults()
+    asyncio.run(run_watcher_test())
+
+    print("\n✅ Liquidity watcher test passed")
+
+
+if __name__ == "__main__":
+    test_liquidity_watcher()
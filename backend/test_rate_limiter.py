@@ -0,0 +1,144 @@
+"""
+Test script for the per-host Rate Limiter
+
+Runs on small buckets + a mock transport - no network needed:
+1. Trading requests jump the queue ahead of scanner / monitor waiters
+2. Fair classes are served round-robin
+3. A 429 (Retry-After) pauses the host's bucket
+4. RATE_LIMITS / Retry-After parsing
+"""
+
+import asyncio
+import time
+
+import httpx
+
+import utils.rate_limiter as rate_limiter_module
+from utils.rate_limiter import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    HostBucket,
+    RateLimiter,
+    _parse_retry_after,
+    parse_budgets,
+    rate_limit_hooks,
+)
+
+HOST = "api.example.com"
+
+
+async def grant_order(bucket: HostBucket, classes) -> list:
+    """Queue one waiter per class (in order) on an empty bucket, return the order they were served"""
+    await bucket.acquire("scanner")  # Drain the single burst token
+    order = []
+
+    async def waiter(name: str, cls: str):
+        await bucket.acquire(cls)
+        order.append(name)
+
+    tasks = []
+    for i, cls in enumerate(classes):
+        tasks.append(asyncio.create_task(waiter(f"{cls}{i}", cls)))
+        await asyncio.sleep(0)  # Enqueue in this exact order
+
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def run_trading_priority_test():
+    print("\n🚀 Trading priority:")
+    bucket = HostBucket(HOST, rate=50.0, burst=1)
+    order = await grant_order(bucket, ["scanner", "scanner", "monitor", "trading"])
+
+    assert order[0] == "trading3", order
+    assert bucket.granted["trading"] == 1
+    assert bucket.get_stats()["waiting"] == 0
+    print(f"  served: {order}")
+
+
+async def run_round_robin_test():
+    print("\n🔁 Round-robin between fair classes:")
+    bucket = HostBucket(HOST, rate=50.0, burst=1)
+    order = await grant_order(bucket, ["scanner"] * 3 + ["monitor"] * 3)
+
+    served = [name.rstrip("0123456789") for name in order]
+    assert served == ["monitor", "scanner"] * 3, order
+    print(f"  served: {served}")
+
+
+async def run_429_penalty_test():
+    print("\n⏳ 429 pauses the host:")
+    limiter = RateLimiter({HOST: (100.0, 10)})
+    previous = rate_limiter_module._rate_limiter
+    rate_limiter_module._rate_limiter = limiter
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.3"})
+        return httpx.Response(200, json={})
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            event_hooks=rate_limit_hooks("scanner"),
+        ) as client:
+            first = await client.get(f"https://{HOST}/a")
+            second = await client.get(f"https://{HOST}/b")
+    finally:
+        rate_limiter_module._rate_limiter = previous
+
+    assert first.status_code == 429
+    assert second.status_code == 200
+    delay = calls[1] - calls[0]
+    assert delay >= 0.25, delay  # Burst had 9 tokens left - only the penalty can explain the wait
+
+    stats = limiter.get_stats()[HOST]
+    assert stats["throttled_429"] == 1
+    assert stats["queued"] == 1
+    print(f"  second request waited {delay:.2f}s")
+
+
+def test_parse_budgets():
+    print("\n⚙️ RATE_LIMITS parsing:")
+    budgets = parse_budgets("api.dexscreener.com=5/10, API.Solscan.io=3, broken, x.io=abc, y.io=0,z.io=0.5")
+
+    assert budgets["api.dexscreener.com"] == (5.0, 10)
+    assert budgets["api.solscan.io"] == (3.0, 3)  # Burst defaults to the rate
+    assert budgets["z.io"] == (0.5, 1)  # ...but never below 1
+    assert "broken" not in budgets and "x.io" not in budgets and "y.io" not in budgets
+    assert parse_budgets("") == {} and parse_budgets(None) == {}
+
+    limiter = RateLimiter(budgets)
+    assert limiter.bucket("API.DEXSCREENER.COM").rate == 5.0
+    assert limiter.bucket("unknown.host").burst == rate_limiter_module.DEFAULT_BUDGET[1]
+    print(f"  {budgets}")
+
+
+def test_parse_retry_after():
+    print("\n⏱️ Retry-After parsing:")
+    assert _parse_retry_after(None) == DEFAULT_RETRY_AFTER_SECONDS
+    assert _parse_retry_after("1.5") == 1.5
+    assert _parse_retry_after("3600") == 60.0  # Capped
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == DEFAULT_RETRY_AFTER_SECONDS
+    print("  ok")
+
+
+def test_rate_limiter():
+    """Test priority, fairness, 429 handling and budget parsing"""
+    print("=" * 60)
+    print("Testing Rate Limiter")
+    print("=" * 60)
+
+    asyncio.run(run_trading_priority_test())
+    asyncio.run(run_round_robin_test())
+    asyncio.run(run_429_penalty_test())
+    test_parse_budgets()
+    test_parse_retry_after()
+
+    print("\n✅ Rate limiter test passed")
+
+
+if __name__ == "__main__":
+    test_rate_limiter()
@@ -0,0 +1,146 @@
+"""
+Test script for the Smart Wallet Index and the tracker's append-only log
+
+Runs on a temporary data directory - no network needed:
+1. holder_stats → one count per (token, wallet), trust sums / averages per token
+2. Bloom filter → rebuilt when full, no false negatives
+3. smart_wallets.jsonl → last line per address wins, torn last line cut, compaction
+4. Legacy smart_wallets.json → imported once into the log
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from analyzer.smart_money_tracker import SmartMoneyTracker
+from analyzer.smart_wallet_index import NEUTRAL_TRUST, SmartWalletIndex
+
+
+def close(a: float, b: float) -> bool:
+    return abs(a - b) < 1e-9
+
+
+def test_holder_stats():
+    """Duplicate holders count once per token; the same wallet counts in every token"""
+    index = SmartWalletIndex()
+    index.add("smart1", 80.0)
+    index.add("smart2", 40.0)
+    index.add("smart3")
+    index.add("smart2", 60.0)  # Trust update, same id
+    assert len(index) == 3
+
+    stats = index.holder_stats({
+        "tokenA": ["smart1", "x", "smart1", "smart2", "y"],
+        "tokenB": ["smart2", "smart2", "smart3"],
+        "tokenC": ["x", "y"],
+        "tokenD": [],
+    })
+    a, b, c, d = stats["tokenA"], stats["tokenB"], stats["tokenC"], stats["tokenD"]
+    assert a.count == 2 and sorted(a.wallets) == ["smart1", "smart2"], a
+    assert close(a.weighted_score, 1.4) and close(a.avg_trust, 70.0), a
+    assert b.count == 2 and sorted(b.wallets) == ["smart2", "smart3"], b
+    assert close(b.avg_trust, (60.0 + NEUTRAL_TRUST) / 2), b
+    assert c.count == 0 and c.wallets == [] and c.avg_trust == NEUTRAL_TRUST, c
+    assert d.count == 0, d
+    assert index.holder_stats({}) == {}
+    assert "smart1" in index and "x" not in index
+    print(f"  tokenA: {a}")
+
+
+def test_bloom_rebuild():
+    """Adding past the capacity rebuilds a bigger filter with every wallet in it"""
+    index = SmartWalletIndex(bloom_filter=True)
+    first_capacity = index._bloom.capacity
+    wallets = [f"wallet{i}" for i in range(3 * first_capacity)]
+    for wallet in wallets:
+        index.add(wallet, 70.0)
+
+    assert index._bloom.capacity > first_capacity, index._bloom.capacity
+    assert all(wallet in index for wallet in wallets)  # No false negatives
+
+    outsiders = [f"outsider{i}" for i in range(5000)]
+    assert not any(o in index for o in outsiders)
+    assert index.get_stats()["bloom_rejects"] > 4500, index.get_stats()  # ~1% false positives
+    stats = index.holder_stats({"token": wallets[:10] + outsiders[:10]})
+    assert stats["token"].count == 10, stats
+    print(f"  bloom: {index.get_stats()}")
+
+
+def test_tracker_log():
+    """Append-only log: replay, torn line, compaction"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        wallets_file = str(Path(data_dir) / "smart_wallets.json")
+        log_file = Path(data_dir) / "smart_wallets.jsonl"
+
+        tracker = SmartMoneyTracker(wallets_file=wallets_file, bloom_filter=False)
+        tracker.add_smart_wallet("w1", nickname="one")
+        tracker.add_smart_wallet("w2")
+        tracker.save_wallets()
+        tracker.get_wallet_info("w1").total_trades = 10
+        tracker.get_wallet_info("w1").success_rate = 90.0
+        tracker.save_wallets()  # Only w1 is appended
+        tracker.save_wallets()  # Nothing changed
+        assert len(log_file.read_text().splitlines()) == 3
+
+        # Crash mid-write: the torn line is cut, and the next append is not glued to it
+        with open(log_file, "a") as f:
+            f.write('{"address": "w3", "nick')
+        tracker = SmartMoneyTracker(wallets_file=wallets_file, bloom_filter=False)
+        assert tracker.get_smart_wallet_count() == 2
+        assert tracker.get_wallet_info("w1").success_rate == 90.0  # Last line wins
+        assert close(tracker.check_many({"t": ["w1"]})["t"].avg_trust, 90.0)
+        tracker.add_smart_wallet("w4")
+        tracker.save_wallets()
+
+        tracker = SmartMoneyTracker(wallets_file=wallets_file, bloom_filter=False)
+        assert set(tracker.smart_wallets) == {"w1", "w2", "w4"}, set(tracker.smart_wallets)
+
+        # Compaction once the log passes 2x the wallets (+1000 lines)
+        wallet = tracker.get_wallet_info("w2")
+        for i in range(1100):
+            wallet.total_trades = i + 1
+            tracker.save_wallets()
+        lines = log_file.read_text().splitlines()
+        assert len(lines) < 1000, len(lines)
+        tracker = SmartMoneyTracker(wallets_file=wallets_file, bloom_filter=False)
+        assert tracker.get_wallet_info("w2").total_trades == 1100
+        assert tracker.get_smart_wallet_count() == 3
+        print(f"  log: {len(lines)} lines after 1100 saves")
+
+
+def test_legacy_import():
+    """smart_wallets.json is imported into the log once"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        wallets_file = Path(data_dir) / "smart_wallets.json"
+        wallets_file.write_text(json.dumps([
+            {"address": "old1", "nickname": "Legacy", "total_trades": 4, "success_rate": 75.0},
+            {"address": "old2"},
+        ]))
+
+        tracker = SmartMoneyTracker(wallets_file=str(wallets_file), bloom_filter=False)
+        assert tracker.get_smart_wallet_count() == 2
+        log_file = wallets_file.with_suffix(".jsonl")
+        assert len(log_file.read_text().splitlines()) == 2
+
+        wallets_file.write_text("[]")  # The log wins from now on
+        tracker = SmartMoneyTracker(wallets_file=str(wallets_file), bloom_filter=False)
+        assert tracker.get_wallet_info("old1").nickname == "Legacy"
+        assert close(tracker.check_many({"t": ["old1", "old2"]})["t"].avg_trust, (75.0 + NEUTRAL_TRUST) / 2)
+
+
+def test_smart_wallet_index():
+    """Test the smart wallet index and its persistence"""
+    print("=" * 60)
+    print("Testing Smart Wallet Index")
+    print("=" * 60)
+
+    test_holder_stats()
+    test_bloom_rebuild()
+    test_tracker_log()
+    test_legacy_import()
+
+    print("\n✅ Smart wallet index test passed")
+
+
+if __name__ == "__main__":
+    test_smart_wallet_index()
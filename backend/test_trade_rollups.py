@@ -0,0 +1,103 @@
+"""
+Test script for Trade Rollups across processes
+
+The bot writes trades and the API (run_api.py, separate process) reads the
+summaries. Two TradeRollups instances share a fake trade_rollups table - no
+network needed:
+1. Reader loads what the writer saved
+2. Reader picks up new trades once its buckets are older than SUMMARY_RELOAD_SECONDS
+3. A failed reload keeps the buckets already loaded
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from database.trade_rollups import SUMMARY_RELOAD_SECONDS, TradeRollups
+
+
+class FakeSupabase:
+    """trade_rollups table shared by every client"""
+
+    enabled = True
+
+    def __init__(self, table: Dict):
+        self.table = table
+        self.fail_reads = False
+        self.reads = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def save_trade_rollups(self, rows: List[Dict]) -> bool:
+        for row in rows:
+            self.table[(row["user_id"], row["granularity"], row["bucket_start"])] = dict(row)
+        return True
+
+    async def get_trade_rollups(self, user_id: str, since_day: str) -> Optional[List[Dict]]:
+        self.reads += 1
+        if self.fail_reads:
+            return None
+        return [
+            row for (user, granularity, start), row in self.table.items()
+            if user == user_id and (granularity == "week" or start >= since_day)
+        ]
+
+
+def expire(rollups: TradeRollups, user_id: str = "default"):
+    """Pretend the last load happened SUMMARY_RELOAD_SECONDS ago"""
+    rollups._users[user_id].loaded_at -= SUMMARY_RELOAD_SECONDS + 1
+
+
+async def run_cross_process_test():
+    table: Dict = {}
+    writer = TradeRollups(FakeSupabase(table))
+    reader_db = FakeSupabase(table)
+    reader = TradeRollups(reader_db)
+
+    await writer.record_trade({"trade_type": "SELL", "realized_pnl_usd": 50, "value_usd": 150, "token_symbol": "AAA"})
+
+    summary = await reader.summary("7d")
+    assert summary.total_trades == 1 and summary.total_pnl_usd == 50, summary
+    print(f"  first load: {summary.total_trades} trades, ${summary.total_pnl_usd:.2f}")
+
+    await writer.record_trade({"trade_type": "SELL", "realized_pnl_usd": -20, "value_usd": 80, "token_symbol": "BBB"})
+    await writer.record_position_closed()
+
+    # Fresh buckets - served from memory
+    reads = reader_db.reads
+    assert (await reader.summary("7d")).total_trades == 1
+    assert reader_db.reads == reads
+
+    expire(reader)
+    for time_range in ("7d", "all"):
+        summary = await reader.summary(time_range)
+        assert summary.total_trades == 2, (time_range, summary)
+        assert summary.total_pnl_usd == 30, (time_range, summary)
+        assert summary.closed_positions == 1, (time_range, summary)
+        assert summary.worst_token_symbol == "BBB", (time_range, summary)
+    print(f"  after reload: {summary.total_trades} trades, ${summary.total_pnl_usd:.2f}")
+
+    # Table unreachable - keep serving what we have
+    reader_db.fail_reads = True
+    expire(reader)
+    summary = await reader.summary("30d")
+    assert summary.total_trades == 2, summary
+    print("  failed reload: kept the loaded buckets")
+
+
+def test_trade_rollups():
+    """Test that summaries follow trades written by another instance"""
+    print("=" * 60)
+    print("Testing Trade Rollups")
+    print("=" * 60)
+
+    asyncio.run(run_cross_process_test())
+
+    print("\n✅ Trade rollups test passed")
+
+
+if __name__ == "__main__":
+    test_trade_rollups()
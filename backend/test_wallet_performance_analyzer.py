@@ -0,0 +1,243 @@
+"""
+Test script for the Wallet Performance Analyzer
+
+Runs on a temporary WalletTradeStore + a mock RPC - no network needed:
+1. _calculate_stats → per-(wallet, token) reduceat groups, per-wallet totals
+2. No SOL price → SOL trades still counted, only their USD PnL is left out
+3. _calculate_consistency → full windows only, per wallet
+4. sync_wallet truncated at max_transactions → gap kept and closed on the next syncs
+5. getTransaction keeps failing for one signature → nothing written until it is skipped
+"""
+
+import asyncio
+import json
+import tempfile
+
+import httpx
+import numpy as np
+
+from analyzer.first_buyer_detector import WSOL_MINT
+from analyzer.wallet_performance_analyzer import MAX_TX_FETCH_ATTEMPTS, WalletPerformanceAnalyzer
+from analyzer.wallet_trade_store import RECORD_DTYPE, WalletTradeStore
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+WALLET_A = "WA11111111111111111111111111111111111111111"
+WALLET_B = "WB11111111111111111111111111111111111111111"
+WALLET_C = "WC11111111111111111111111111111111111111111"
+TOKEN_1 = "T1111111111111111111111111111111111111111111"
+TOKEN_2 = "T2222222222222222222222222222222222222222222"
+TOKEN_3 = "T3333333333333333333333333333333333333333333"
+
+
+def swap(sig, token, side, amount, quote_amount, block_time, quote_mint=WSOL_MINT) -> dict:
+    return {
+        "signature": sig, "token": token, "side": side, "amount_tokens": amount,
+        "quote_mint": quote_mint, "quote_amount": quote_amount, "block_time": block_time, "slot": block_time,
+    }
+
+
+def fill_store(store: WalletTradeStore):
+    """Swaps appended out of time order, wallets interleaved"""
+    store.append(WALLET_B, [
+        swap("b3", TOKEN_1, "sell", 50, 2.0, 260),
+        swap("b1", TOKEN_1, "buy", 100, 2.0, 150),
+    ])
+    store.append(WALLET_A, [
+        swap("a2", TOKEN_1, "sell", 100, 3.0, 200),       # T1: 1 SOL → 3 SOL (3x)
+        swap("a4", TOKEN_2, "sell", 10, 5.0, 400, USDC),  # T2: 10 USDC → 5 USDC (0.5x)
+        swap("a3", TOKEN_2, "buy", 10, 10.0, 300, USDC),
+        swap("a1", TOKEN_1, "buy", 100, 1.0, 100),
+        swap("a5", TOKEN_3, "buy", 10, 1.0, 500),         # T3: never sold - not a trade
+    ])
+    store.append(WALLET_B, [swap("b2", TOKEN_1, "sell", 50, 2.0, 250)])  # T1: 0.02 → 0.04 (2x)
+    store.append(WALLET_C, [
+        swap("c1", TOKEN_2, "buy", 10, 1.0, 100),         # Mixed: bought in SOL, sold for USDC
+        swap("c2", TOKEN_2, "sell", 10, 300.0, 200, USDC),
+    ])
+
+
+def close(a: float, b: float) -> bool:
+    return abs(a - b) < 1e-9
+
+
+def test_calculate_stats():
+    """Per-wallet stats with and without a SOL price"""
+    with tempfile.TemporaryDirectory() as base_dir:
+        store = WalletTradeStore(base_dir=base_dir, shards=4)
+        fill_store(store)
+        analyzer = WalletPerformanceAnalyzer(rpc_url="http://rpc.test", store=store)
+        records = store.load([WALLET_A, WALLET_B, WALLET_C])
+        assert len(records) == 10, len(records)
+
+        stats = analyzer._calculate_stats(records, sol_usd=100.0)
+        a, b, c = stats[WALLET_A], stats[WALLET_B], stats[WALLET_C]
+        print(f"  A: {a}")
+        assert (a.total_trades, a.profitable_trades, a.losing_trades) == (2, 1, 1), a
+        assert close(a.win_rate, 0.5) and close(a.avg_profit_multiplier, 3.0), a
+        assert close(a.biggest_win, 3.0) and close(a.biggest_loss, 0.5), a
+        assert close(a.total_profit_usd, 2.0 * 100 - 5.0), a
+        assert close(a.avg_hold_hours, 100 / 3600), a
+        assert (b.total_trades, b.profitable_trades) == (1, 1), b
+        assert close(b.avg_profit_multiplier, 2.0) and close(b.total_profit_usd, 200.0), b
+        assert close(b.avg_hold_hours, 100 / 3600), b
+        assert close(c.avg_profit_multiplier, 3.0), c  # 1 SOL ($100) → $300
+
+        # No SOL price: same trades and multipliers, SOL PnL left out, mixed trade dropped
+        for sol_usd in (None, 0.0):
+            no_price = analyzer._calculate_stats(records, sol_usd=sol_usd)
+            assert set(no_price) == {WALLET_A, WALLET_B}, no_price
+            a, b = no_price[WALLET_A], no_price[WALLET_B]
+            assert (a.total_trades, a.profitable_trades) == (2, 1), a
+            assert close(a.avg_profit_multiplier, 3.0) and close(a.total_profit_usd, -5.0), a
+            assert close(b.avg_profit_multiplier, 2.0) and close(b.total_profit_usd, 0.0), b
+
+        assert analyzer._calculate_stats(records[:0], sol_usd=100.0) == {}
+
+
+def test_calculate_consistency():
+    """Share of full 5-trade windows (by exit time) with at least half wins"""
+    analyzer = WalletPerformanceAnalyzer.__new__(WalletPerformanceAnalyzer)
+    trades = (
+        [(0, t, w) for t, w in enumerate([1, 1, 1, 0, 0, 0, 0, 0, 0, 1])]  # 1 of 2 windows good
+        + [(1, t, 1) for t in range(4)]                                     # No full window
+        + [(2, t, w) for t, w in enumerate([1, 0, 1, 0, 1, 0, 0])]          # 1 of 1 (partial ignored)
+    )
+    rng = np.random.default_rng(7)
+    order = rng.permutation(len(trades))
+    wallet = np.array([trades[i][0] for i in order], dtype=np.uint32)
+    exit_time = np.array([trades[i][1] for i in order], dtype=np.int64)
+    win = np.array([trades[i][2] for i in order], dtype=bool)
+
+    consistency = analyzer._calculate_consistency(wallet, exit_time, win)
+    assert np.allclose(consistency, [0.5, 0.0, 1.0]), consistency
+    print(f"  consistency: {consistency}")
+
+
+# Wallet history, newest first; SIG_NEW arrives after the first syncs
+SIGS = [f"s{i}" for i in range(7)]
+SIG_NEW = "s_new"
+
+
+def buy_tx(sig: str) -> dict:
+    """getTransaction result: WALLET_A pays 1 SOL for 100 TOKEN_1"""
+    return {
+        "slot": 1, "blockTime": 1_700_000_000,
+        "meta": {
+            "err": None, "fee": 0,
+            "preBalances": [2_000_000_000], "postBalances": [1_000_000_000],
+            "preTokenBalances": [],
+            "postTokenBalances": [{"owner": WALLET_A, "mint": TOKEN_1, "uiTokenAmount": {"amount": "100", "decimals": 0}}],
+        },
+        "transaction": {"message": {"accountKeys": [{"pubkey": WALLET_A, "signer": True}]}},
+    }
+
+
+async def run_sync_test():
+    history = list(SIGS)
+
+    def fake_rpc(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            assert all(item["method"] == "getTransaction" for item in body)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "result": buy_tx(item["params"][0])} for item in body
+            ])
+        assert body["method"] == "getSignaturesForAddress"
+        _, options = body["params"]
+        start = history.index(options["before"]) + 1 if "before" in options else 0
+        end = history.index(options["until"]) if "until" in options else len(history)
+        page = history[start:end][:options["limit"]]
+        return httpx.Response(200, json={"result": [{"signature": s, "err": None} for s in page]})
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        def new_analyzer() -> WalletPerformanceAnalyzer:
+            analyzer = WalletPerformanceAnalyzer(
+                rpc_url="http://rpc.test", store=WalletTradeStore(base_dir=base_dir, shards=4), max_transactions=3,
+            )
+            analyzer.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_rpc))
+            return analyzer
+
+        analyzer = new_analyzer()
+        assert await analyzer.sync_wallet(WALLET_A)
+        assert analyzer.store.cursor(WALLET_A) is None
+        assert analyzer.store.gap(WALLET_A) == ("s2", "s0"), analyzer.store.gap(WALLET_A)
+        await analyzer.close()
+
+        # Gap survives a restart (cursors.jsonl replay)
+        analyzer = new_analyzer()
+        assert analyzer.store.gap(WALLET_A) == ("s2", "s0")
+        assert await analyzer.sync_wallet(WALLET_A)
+        assert analyzer.store.gap(WALLET_A) == ("s5", "s0"), analyzer.store.gap(WALLET_A)
+
+        history.insert(0, SIG_NEW)  # Not picked up until the gap is closed
+        assert await analyzer.sync_wallet(WALLET_A)
+        assert analyzer.store.cursor(WALLET_A) == "s0", analyzer.store.cursor(WALLET_A)
+        assert analyzer.store.gap(WALLET_A) is None
+
+        assert await analyzer.sync_wallet(WALLET_A)
+        assert analyzer.store.cursor(WALLET_A) == SIG_NEW
+        await analyzer.close()
+
+        # Every signature ingested exactly once, also after a restart
+        analyzer = new_analyzer()
+        assert analyzer.store.cursor(WALLET_A) == SIG_NEW and analyzer.store.gap(WALLET_A) is None
+        records = analyzer.store.load([WALLET_A])
+        assert len(records) == len(history), len(records)
+        await analyzer.close()
+    print(f"  {len(records)} swaps ingested over 4 syncs of at most 3 transactions")
+
+
+async def run_failed_fetch_test():
+    history = ["ok0", "bad", "ok1"]
+
+    def fake_rpc(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32009, "message": "not available"}}
+                if item["params"][0] == "bad" else
+                {"jsonrpc": "2.0", "id": item["id"], "result": buy_tx(item["params"][0])}
+                for item in body
+            ])
+        _, options = body["params"]
+        end = history.index(options["until"]) if "until" in options else len(history)
+        return httpx.Response(200, json={"result": [{"signature": s, "err": None} for s in history[:end]]})
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        store = WalletTradeStore(base_dir=base_dir, shards=4)
+        analyzer = WalletPerformanceAnalyzer(rpc_url="http://rpc.test", store=store, max_transactions=10)
+        analyzer.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_rpc))
+
+        def records_on_disk() -> int:
+            path = store._shard_path(store.shard_of(WALLET_A))
+            return path.stat().st_size // RECORD_DTYPE.itemsize if path.exists() else 0
+
+        for _ in range(MAX_TX_FETCH_ATTEMPTS - 1):
+            assert not await analyzer.sync_wallet(WALLET_A)
+            assert store.cursor(WALLET_A) is None
+            assert records_on_disk() == 0  # The retried range is not appended twice
+
+        assert await analyzer.sync_wallet(WALLET_A)
+        assert store.cursor(WALLET_A) == "ok0", store.cursor(WALLET_A)
+        assert records_on_disk() == 2
+        assert analyzer.get_stats()["transactions_skipped"] == 1
+        await analyzer.close()
+    print(f"  failing transaction skipped after {MAX_TX_FETCH_ATTEMPTS} syncs")
+
+
+def test_wallet_performance_analyzer():
+    """Test vectorized wallet stats and incremental sync"""
+    print("=" * 60)
+    print("Testing Wallet Performance Analyzer")
+    print("=" * 60)
+
+    test_calculate_stats()
+    test_calculate_consistency()
+    asyncio.run(run_sync_test())
+    asyncio.run(run_failed_fetch_test())
+
+    print("\n✅ Wallet performance analyzer test passed")
+
+
+if __name__ == "__main__":
+    test_wallet_performance_analyzer()
@@ -0,0 +1,159 @@
+"""
+Test script for the Write-Behind Buffer
+
+Runs against a fake SupabaseClient whose bulk methods fail on demand - no network needed:
+1. Failed flush → rows requeued, a newer version that arrived meanwhile wins
+2. Row dropped after max_retries failed writes
+3. Flush cancelled mid-request (shutdown) → nothing is lost
+"""
+
+import asyncio
+from typing import Dict, List
+
+from database.write_buffer import WriteBehindBuffer
+
+
+class FakeSupabase:
+    """Bulk methods of SupabaseClient; each table fails the first N calls"""
+
+    enabled = True
+
+    def __init__(self, failures: Dict[str, int] = None):
+        self.failures = dict(failures or {})
+        self.calls: Dict[str, List[List[Dict]]] = {}
+        self.on_call = None  # Optional async hook (method, rows) run before answering
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def _bulk(self, method: str, rows: List[Dict]) -> bool:
+        self.calls.setdefault(method, []).append(rows)
+        if self.on_call:
+            await self.on_call(method, rows)
+        if self.failures.get(method, 0) > 0:
+            self.failures[method] -= 1
+            return False
+        return True
+
+    async def save_tokens(self, rows):
+        return await self._bulk("save_tokens", rows)
+
+    async def save_performance_rows(self, rows):
+        return await self._bulk("save_performance_rows", rows)
+
+    async def update_position_prices(self, rows):
+        return await self._bulk("update_position_prices", rows)
+
+
+def make_buffer(supabase: FakeSupabase, max_retries: int = 5) -> WriteBehindBuffer:
+    # Long max_age - the test drives flush() itself
+    return WriteBehindBuffer(supabase=supabase, max_rows=1000, max_age_seconds=60.0, max_retries=max_retries)
+
+
+async def stop(buffer: WriteBehindBuffer):
+    buffer._task.cancel()
+    await asyncio.gather(buffer._task, return_exceptions=True)
+
+
+async def run_requeue_test():
+    print("\n🔁 Requeue on failure, newer row wins:")
+    supabase = FakeSupabase({"save_tokens": 1})
+    buffer = make_buffer(supabase)
+
+    async def newer_version(method, rows):
+        if len(supabase.calls[method]) == 1:
+            buffer.add("scanned_tokens_history", {"address": "tokA", "score": 2})  # Arrives mid-flush
+
+    supabase.on_call = newer_version
+    buffer.add("scanned_tokens_history", {"address": "tokA", "score": 1})
+    buffer.add("scanned_tokens_history", {"address": "tokB", "score": 1})
+
+    assert not await buffer.flush()
+    assert buffer.pending() == 2
+    assert buffer._rows["scanned_tokens_history"]["tokA"]["score"] == 2
+    assert buffer._retry_delay > 0
+
+    assert await buffer.flush()
+    written = {row["address"]: row["score"] for row in supabase.calls["save_tokens"][-1]}
+    assert written == {"tokA": 2, "tokB": 1}, written
+    assert buffer.pending() == 0 and not buffer._attempts
+    assert buffer._retry_delay == 0.0
+
+    stats = buffer.get_stats()
+    assert stats["rows_written"] == 2 and stats["failed_flushes"] == 1, stats
+    await stop(buffer)
+    print(f"  {stats}")
+
+
+async def run_drop_test():
+    print("\n🗑️ Drop after max_retries:")
+    supabase = FakeSupabase({"update_position_prices": 99})
+    buffer = make_buffer(supabase, max_retries=3)
+
+    buffer.add("positions", {"token_address": "posA", "current_price": 1.0})
+    buffer.add("performance_tracking", {"address": "tokA", "roi": 10})
+
+    results = [await buffer.flush() for _ in range(3)]
+    assert results == [False, False, False], results
+    assert len(supabase.calls["update_position_prices"]) == 3
+    assert len(supabase.calls["save_performance_rows"]) == 1  # Written on the first flush
+    assert buffer.pending() == 0
+    assert not buffer._attempts
+
+    stats = buffer.get_stats()
+    assert stats["rows_dropped"] == 1 and stats["rows_written"] == 1, stats
+    await stop(buffer)
+    print(f"  {stats}")
+
+
+async def run_cancel_test():
+    print("\n⛔ Cancelled mid-flush:")
+    supabase = FakeSupabase()
+    buffer = make_buffer(supabase)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def hang(method, rows):
+        started.set()
+        await release.wait()
+
+    supabase.on_call = hang
+    buffer.add("scanned_tokens_history", {"address": "tokA", "score": 1})
+    buffer.add("performance_tracking", {"address": "tokA", "roi": 10})
+
+    flush = asyncio.create_task(buffer.flush())
+    await started.wait()
+    flush.cancel()
+    await asyncio.gather(flush, return_exceptions=True)
+
+    # Neither the in-flight table nor the one after it was lost
+    assert buffer.pending() == 2
+    assert "tokA" in buffer._rows["scanned_tokens_history"]
+    assert "tokA" in buffer._rows["performance_tracking"]
+    assert buffer._oldest is not None
+    assert "save_performance_rows" not in supabase.calls
+
+    supabase.on_call = None
+    await buffer.close()
+    assert buffer.pending() == 0
+    assert buffer.get_stats()["rows_written"] == 2
+    print(f"  {buffer.get_stats()}")
+
+
+def test_write_buffer():
+    """Test requeue, drop and cancellation of buffered writes"""
+    print("=" * 60)
+    print("Testing Write-Behind Buffer")
+    print("=" * 60)
+
+    asyncio.run(run_requeue_test())
+    asyncio.run(run_drop_test())
+    asyncio.run(run_cancel_test())
+
+    print("\n✅ Write buffer test passed")
+
+
+if __name__ == "__main__":
+    test_write_buffer()
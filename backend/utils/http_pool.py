@@ -0,0 +1,123 @@
+"""
+Shared HTTP Connection Pool
+One long-lived connection pool (HTTP/2 + keep-alive) for every HTTP client in the process
+
+📋 מה הקובץ הזה עושה:
+-------------------
+עד עכשיו כל מודול (ולפעמים כל בקשה!) יצר httpx.AsyncClient חדש - כלומר
+TLS handshake חדש ל-DexScreener / Supabase / Helius בכל פעם.
+
+הקובץ הזה:
+1. מחזיק transport אחד משותף (connection pool) לכל התהליך
+2. מפעיל HTTP/2 כשהחבילה h2 מותקנת (httpx[http2])
+3. שומר חיבורים פתוחים (keep-alive) בין בקשות
+4. נסגר פעם אחת ב-shutdown של FastAPI / הבוט
+
+🔧 פונקציות עיקריות:
+- create_http_client(request_class, **kwargs) - AsyncClient קליל שיושב על ה-pool המשותף
+- close_http_pool() - סגירת ה-pool (lifecycle hook)
+- get_pool_info() - מידע על ה-pool (לבדיקות / health)
+
+💡 איך זה עובד:
+1. כל client שנוצר עם create_http_client משתמש ב-SharedTransport
+2. SharedTransport מעביר כל בקשה ל-transport האמיתי (נוצר בעצלות)
+3. aclose() של client בודד לא סוגר את ה-pool - רק close_http_pool() סוגר
+4. אחרי close_http_pool() הבקשה הבאה פותחת pool חדש
+
+📝 הערות:
+- ה-rate limiter (utils/rate_limiter.py) מחובר אוטומטית לכל client
+- headers / base_url / timeout נשארים פר-client, רק החיבורים משותפים
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from utils.logger import get_logger
+from utils.rate_limiter import rate_limit_hooks
+
+logger = get_logger("http_pool")
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Pool tuning
+POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=40,
+    keepalive_expiry=60.0,  # Keep idle connections for a minute (scan interval bursts)
+)
+TRANSPORT_RETRIES = 1  # Retry once on connect errors (stale keep-alive sockets)
+
+_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+
+def _get_transport() -> httpx.AsyncHTTPTransport:
+    """Get (or lazily create) the process-wide transport"""
+    global _transport
+    if _transport is None:
+        _transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=POOL_LIMITS,
+            retries=TRANSPORT_RETRIES,
+        )
+        logger.debug(f"🔌 HTTP pool created (http2={HTTP2_AVAILABLE})")
+    return _transport
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that forwards to the shared pool
+
+    Closing a client that uses it does not close the pool.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await _get_transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # The pool is owned by close_http_pool()
+        pass
+
+
+def create_http_client(request_class: str = "api", **kwargs: Any) -> httpx.AsyncClient:
+    """
+    Create an AsyncClient backed by the shared connection pool
+
+    Args:
+        request_class: Rate limiter class (trading / monitor / api / scanner)
+        **kwargs: Regular httpx.AsyncClient arguments (timeout, headers, base_url...)
+
+    Returns:
+        httpx.AsyncClient - cheap to create, safe to aclose()
+    """
+    kwargs.pop("limits", None)  # Limits belong to the shared pool
+    kwargs.setdefault("event_hooks", rate_limit_hooks(request_class))
+    return httpx.AsyncClient(transport=SharedTransport(), **kwargs)
+
+
+async def close_http_pool():
+    """Close the shared pool (call on app / bot shutdown)"""
+    global _transport
+    if _transport is not None:
+        transport, _transport = _transport, None
+        try:
+            await transport.aclose()
+            logger.info("🔌 HTTP pool closed")
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing HTTP pool: {e}")
+
+
+def get_pool_info() -> Dict[str, Any]:
+    """Basic info about the shared pool"""
+    return {
+        "open": _transport is not None,
+        "http2": HTTP2_AVAILABLE,
+        "max_connections": POOL_LIMITS.max_connections,
+        "max_keepalive_connections": POOL_LIMITS.max_keepalive_connections,
+        "keepalive_expiry": POOL_LIMITS.keepalive_expiry,
+    }
@@ -0,0 +1,348 @@
+"""
+Per-Host Rate Limiter
+Process-wide token bucket per upstream host, shared by every HTTP client
+
+📋 מה הקובץ הזה עושה:
+-------------------
+זה הקובץ שמתאם את כל הבקשות החוצה (DexScreener, Helius, Solscan, Jupiter)
+כדי שלא נחטוף 429 ולא נצטרך לנחש עם sleep-ים.
+
+הקובץ הזה:
+1. מחזיק token bucket לכל host (קצב + burst)
+2. מחלק את התור בצורה הוגנת בין הסורק, מוניטור הפוזיציות וה-API
+3. נותן עדיפות מוחלטת לבקשות מסחר (trading) - קנייה/מכירה לא מחכות לסורק
+4. כשמתקבל 429 - עוצר את ה-host לפי Retry-After
+
+🔧 פונקציות עיקריות:
+- get_rate_limiter() - ה-limiter הגלובלי
+- rate_limit_hooks(default_class) - event hooks ל-httpx.AsyncClient
+- request_class(name) / set_request_class(name) - קביעת סוג הבקשה בהקשר הנוכחי
+
+💡 איך זה עובד:
+1. כל AsyncClient נבנה עם event_hooks=rate_limit_hooks("scanner") (או monitor/api/trading)
+2. לפני כל בקשה ה-hook מחכה לטוקן מה-bucket של ה-host
+3. אם אין טוקן - הבקשה נכנסת לתור של הסוג שלה
+4. כשטוקן מתפנה: קודם trading, ואז round-robin בין scanner/monitor/api
+
+📝 הערות:
+- אפשר לדרוס תקציבים ב-.env: RATE_LIMITS=api.dexscreener.com=5/10,api.solscan.io=3
+- הפורמט: host=בקשות_לשנייה/burst (ה-burst אופציונלי)
+- host שלא מוגדר מקבל DEFAULT_BUDGET
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional, Tuple
+
+import httpx
+
+from core.config import settings
+from utils.logger import get_logger
+
+logger = get_logger("rate_limiter")
+
+
+# ============================================================================
+# Request classes & budgets
+# ============================================================================
+
+# Trading calls always go first, the rest share the bucket round-robin
+PRIORITY_CLASS = "trading"
+FAIR_CLASSES = ("monitor", "api", "scanner")
+REQUEST_CLASSES = (PRIORITY_CLASS,) + FAIR_CLASSES
+
+# host -> (requests per second, burst)
+DEFAULT_HOST_BUDGETS: Dict[str, Tuple[float, int]] = {
+    "api.dexscreener.com": (5.0, 10),          # 300 req/min
+    "mainnet.helius-rpc.com": (10.0, 20),      # Helius free plan
+    "api.mainnet-beta.solana.com": (4.0, 8),   # Public RPC: 40 req / 10s per IP
+    "api.solscan.io": (3.0, 5),
+    "quote-api.jup.ag": (10.0, 10),
+    "frontend-api.pump.fun": (2.0, 4),
+}
+DEFAULT_BUDGET: Tuple[float, int] = (20.0, 40)
+
+# Fallback pause when a 429 has no Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 2.0
+
+_request_class: ContextVar[Optional[str]] = ContextVar("request_class", default=None)
+
+
+def parse_budgets(spec: Optional[str]) -> Dict[str, Tuple[float, int]]:
+    """
+    Parse RATE_LIMITS override string
+
+    Args:
+        spec: "host=rps/burst,host=rps"
+
+    Returns:
+        Dict host -> (rate, burst)
+    """
+    budgets: Dict[str, Tuple[float, int]] = {}
+    if not spec:
+        return budgets
+
+    for item in spec.split(","):
+        item = item.strip()
+        if not item or "=" not in item:
+            continue
+        host, value = item.split("=", 1)
+        try:
+            if "/" in value:
+                rate_str, burst_str = value.split("/", 1)
+                rate, burst = float(rate_str), int(burst_str)
+            else:
+                rate = float(value)
+                burst = max(1, int(rate))
+            if rate > 0:
+                budgets[host.strip().lower()] = (rate, max(1, burst))
+        except ValueError:
+            logger.warning(f"⚠️ Invalid RATE_LIMITS entry: {item}")
+
+    return budgets
+
+
+# ============================================================================
+# Token bucket per host
+# ============================================================================
+
+class HostBucket:
+    """
+    Token bucket for a single upstream host with class-aware waiting queues
+    """
+
+    def __init__(self, host: str, rate: float, burst: int):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        self.queues: Dict[str, Deque[asyncio.Future]] = {c: deque() for c in REQUEST_CLASSES}
+        self._rr = 0  # Round-robin pointer into FAIR_CLASSES
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Stats
+        self.granted: Dict[str, int] = {c: 0 for c in REQUEST_CLASSES}
+        self.queued = 0
+        self.wait_seconds = 0.0
+        self.throttled_429 = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _has_waiters(self) -> bool:
+        return any(self.queues.values())
+
+    async def acquire(self, request_class: str):
+        """Wait until a request to this host is allowed"""
+        if request_class not in self.queues:
+            request_class = "api"
+
+        now = time.monotonic()
+        self._refill(now)
+
+        # Fast path - token available and nobody is waiting ahead of us
+        if now >= self.blocked_until and self.tokens >= 1 and not self._has_waiters():
+            self.tokens -= 1
+            self.granted[request_class] += 1
+            return
+
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        self.queues[request_class].append(future)
+        self.queued += 1
+        self._pump()
+
+        try:
+            await future
+        finally:
+            self.wait_seconds += time.monotonic() - now
+
+        self.granted[request_class] += 1
+
+    def penalize(self, seconds: float):
+        """Stop sending to this host for N seconds (after a 429)"""
+        self.throttled_429 += 1
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        logger.warning(f"⏳ {self.host} rate limited us - pausing for {seconds:.1f}s")
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Trading first, then round-robin between the fair classes"""
+        queue = self.queues[PRIORITY_CLASS]
+        while queue:
+            future = queue.popleft()
+            if not future.done():
+                return future
+
+        for i in range(len(FAIR_CLASSES)):
+            idx = (self._rr + i) % len(FAIR_CLASSES)
+            queue = self.queues[FAIR_CLASSES[idx]]
+            while queue:
+                future = queue.popleft()
+                if not future.done():  # Skip cancelled waiters
+                    self._rr = (idx + 1) % len(FAIR_CLASSES)
+                    return future
+        return None
+
+    def _pump(self):
+        """Hand out available tokens to waiters and re-arm the timer if needed"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self._refill(now)
+
+        if now < self.blocked_until:
+            self._arm(self.blocked_until - now)
+            return
+
+        while self.tokens >= 1:
+            future = self._next_waiter()
+            if future is None:
+                return
+            self.tokens -= 1
+            future.set_result(None)
+
+        if self._has_waiters():
+            self._arm((1 - self.tokens) / self.rate)
+
+    def _arm(self, delay: float):
+        if self._loop and not self._loop.is_closed():
+            self._timer = self._loop.call_later(max(delay, 0.001), self._pump)
+
+    def get_stats(self) -> Dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "waiting": sum(len(q) for q in self.queues.values()),
+            "granted": dict(self.granted),
+            "queued": self.queued,
+            "avg_wait_ms": (self.wait_seconds / self.queued * 1000) if self.queued else 0.0,
+            "throttled_429": self.throttled_429,
+        }
+
+
+# ============================================================================
+# Process-wide limiter
+# ============================================================================
+
+class RateLimiter:
+    """
+    Process-wide rate limiter - one token bucket per upstream host
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.budgets: Dict[str, Tuple[float, int]] = dict(DEFAULT_HOST_BUDGETS)
+        self.budgets.update(budgets or {})
+        self._buckets: Dict[str, HostBucket] = {}
+
+    def bucket(self, host: str) -> HostBucket:
+        host = (host or "").lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.budgets.get(host, DEFAULT_BUDGET)
+            bucket = HostBucket(host, rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, host: str, request_class: str = "api"):
+        """Wait for permission to send one request to host"""
+        await self.bucket(host).acquire(request_class)
+
+    def penalize(self, host: str, seconds: float = DEFAULT_RETRY_AFTER_SECONDS):
+        """Pause a host after it returned 429"""
+        self.bucket(host).penalize(seconds)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-host usage statistics"""
+        return {host: bucket.get_stats() for host, bucket in self._buckets.items()}
+
+
+# ============================================================================
+# Request class context
+# ============================================================================
+
+def get_request_class() -> Optional[str]:
+    """Request class set for the current task (if any)"""
+    return _request_class.get()
+
+
+def set_request_class(name: str):
+    """Set request class for the rest of the current task (e.g. a monitor loop)"""
+    _request_class.set(name)
+
+
+@contextmanager
+def request_class(name: str):
+    """
+    Run a block with a given request class
+
+    Example:
+        with request_class("trading"):
+            price = await price_fetcher.get_token_price(mint)
+    """
+    token = _request_class.set(name)
+    try:
+        yield
+    finally:
+        _request_class.reset(token)
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    if not value:
+        return DEFAULT_RETRY_AFTER_SECONDS
+    try:
+        return max(0.0, min(float(value), 60.0))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+def rate_limit_hooks(default_class: str = "api") -> Dict[str, list]:
+    """
+    httpx event hooks that route every request through the shared limiter
+
+    Trading clients always stay trading; other clients use the class set in
+    the current context (set_request_class / request_class) or their default.
+
+    Args:
+        default_class: trading / monitor / api / scanner
+
+    Returns:
+        Dict for httpx.AsyncClient(event_hooks=...)
+    """
+    async def on_request(request: httpx.Request):
+        if default_class == PRIORITY_CLASS:
+            cls = PRIORITY_CLASS
+        else:
+            cls = _request_class.get() or default_class
+        await get_rate_limiter().acquire(request.url.host, cls)
+
+    async def on_response(response: httpx.Response):
+        if response.status_code == 429:
+            get_rate_limiter().penalize(
+                response.request.url.host,
+                _parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+# Global instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get global rate limiter instance"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(parse_budgets(settings.rate_limits))
+    return _rate_limiter
@@ -0,0 +1,267 @@
+"""
+Response Cache - Stale-While-Revalidate for Dashboard API Routes
+מטמון תשובות ל-routes של הדשבורד (TTL + stale-while-revalidate + single-flight)
+
+📋 מה הקובץ הזה עושה:
+-------------------
+הדשבורד (Next.js) עושה polling ל-analytics, ל-portfolio/stats ול-dexscreener/trending.
+כל בקשה הגיעה ל-Supabase / DexScreener מאפס - ה-analytics מושכים עד 1000 שורות
+trade_history ומחשבים ב-Python בכל פעם, וכל טאב פתוח מכפיל את העומס.
+
+הקובץ הזה:
+1. שומר את התשובה של כל route לפי מפתח = שם ה-route + query params (time_range וכו')
+2. TTL לכל route - בזמן הזה התשובה מוחזרת מהמטמון
+3. אחרי ה-TTL ועד stale_ttl - מחזיר את התשובה הישנה מיד ומרענן ברקע
+4. מאחד בקשות במקביל לאותו מפתח לחישוב אחד (single-flight)
+5. מוחק תשובות לפי tag כשנכתב trade / פוזיציה (invalidate)
+
+🔧 פונקציות עיקריות:
+- cached_response(ttl, stale_ttl, tags) - decorator ל-route
+- get_response_cache() - המטמון הגלובלי
+- invalidate(tag) - מחיקת כל התשובות עם ה-tag
+- get_stats() - מונים
+
+💡 איך זה עובד:
+1. fresh (גיל < ttl) → מהמטמון
+2. stale (ttl ≤ גיל < ttl + stale_ttl) → מהמטמון + רענון אחד ברקע
+3. חסר / ישן מדי → חישוב; בקשות נוספות לאותו מפתח מחכות לאותו חישוב
+4. invalidate(tag) מעלה גרסה ל-tag - חישוב שהתחיל לפני כן לא נשמר במטמון
+
+📝 הערות:
+- שגיאה (HTTPException וכו') לא נשמרת - מגיעה לכל מי שחיכה לאותו חישוב
+- החישוב רץ כ-task נפרד - לקוח שהתנתק לא מבטל אותו למחכים האחרים
+- tags בשימוש: "trades" (trade_history), "positions" (positions)
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger("response_cache")
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass
+class _Entry:
+    """תשובה אחת במטמון"""
+    value: Any
+    fresh_until: float  # time.monotonic()
+    stale_until: float  # time.monotonic()
+    tags: Tuple[str, ...]
+
+
+class ResponseCache:
+    """
+    In-process cache of API responses per route + query params
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._inflight_tags: Dict[str, Tuple[str, ...]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+
+        # Stats
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+        tags: Tuple[str, ...] = (),
+    ) -> Any:
+        """
+        Get a response from the cache or compute it
+
+        Args:
+            key: מפתח (route + query params)
+            compute: פונקציה שמחשבת את התשובה
+            ttl: שניות שהתשובה נחשבת טרייה
+            stale_ttl: שניות נוספות שבהן מחזירים תשובה ישנה ומרעננים ברקע
+            tags: tags ל-invalidate
+
+        Returns:
+            The response
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry and now < entry.fresh_until:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+        if entry and now < entry.stale_until:
+            self.stale_hits += 1
+            self._entries.move_to_end(key)
+            if key not in self._inflight:
+                self.refreshes += 1
+                self._refreshing.add(self._start(key, compute, ttl, stale_ttl, tags))
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start(key, compute, ttl, stale_ttl, tags)
+
+        # shield - a cancelled waiter (client disconnect) must not cancel the shared computation
+        return await asyncio.shield(task)
+
+    def invalidate(self, tag: str):
+        """
+        Drop every response with this tag
+
+        Computations that started before the call still answer their waiters,
+        but their result is not stored.
+        """
+        self.invalidations += 1
+        self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+        for key in [k for k, e in self._entries.items() if tag in e.tags]:
+            del self._entries[key]
+        for key in [k for k, t in self._inflight_tags.items() if tag in t]:
+            # New requests start a fresh computation instead of joining the outdated one
+            self._inflight.pop(key, None)
+            self._inflight_tags.pop(key, None)
+
+    def clear(self):
+        """Drop everything"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Cache counters"""
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": ((lookups - self.misses) / lookups) if lookups else 0.0,
+        }
+
+    def _start(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        tags: Tuple[str, ...],
+    ) -> asyncio.Task:
+        """Run compute() as a shared task and register it as in-flight for key"""
+        task = asyncio.create_task(self._compute(key, compute, ttl, stale_ttl, tags))
+        self._inflight[key] = task
+        self._inflight_tags[key] = tags
+        task.add_done_callback(functools.partial(self._done, key))
+        return task
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        tags: Tuple[str, ...],
+    ) -> Any:
+        versions = [self._tag_versions.get(tag, 0) for tag in tags]
+        value = await compute()
+
+        # Invalidated while computing - answer the waiters but don't keep it
+        if versions == [self._tag_versions.get(tag, 0) for tag in tags]:
+            now = time.monotonic()
+            self._entries[key] = _Entry(
+                value=value,
+                fresh_until=now + ttl,
+                stale_until=now + ttl + stale_ttl,
+                tags=tags,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._inflight_tags.pop(key, None)
+
+        # Retrieve the exception even if every waiter went away (no "never retrieved" warning)
+        error = None if task.cancelled() else task.exception()
+
+        if task in self._refreshing:
+            # Background refresh - nobody awaits it, log the failure here
+            self._refreshing.discard(task)
+            if error is not None:
+                self.refresh_errors += 1
+                logger.warning(f"⚠️ Background refresh of {key} failed: {error}")
+
+
+# Global instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get global response cache instance"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def cached_response(ttl: float, stale_ttl: float = 0.0, tags: Tuple[str, ...] = ()):
+    """
+    Decorator for async FastAPI routes - cache the response per query params
+
+    Goes under @router.get(...) - FastAPI still sees the original signature.
+
+    Args:
+        ttl: שניות שהתשובה נחשבת טרייה
+        stale_ttl: שניות נוספות של stale-while-revalidate
+        tags: tags ל-invalidate ("trades", "positions")
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        route = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            params = [repr(a) for a in args]
+            params += [f"{name}={kwargs[name]!r}" for name in sorted(kwargs)]
+            key = f"{route}?{'&'.join(params)}"
+            return await get_response_cache().get_or_compute(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                tags=tuple(tags),
+            )
+
+        return wrapper
+
+    return decorator
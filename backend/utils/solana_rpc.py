@@ -0,0 +1,88 @@
+"""
+Solana JSON-RPC Helpers
+קריאות JSON-RPC משותפות לכל מי שקורא היסטוריית טרנזקציות מה-chain
+
+📋 מה הקובץ הזה עושה:
+-------------------
+FirstBuyerDetector ו-WalletPerformanceAnalyzer שולפים שניהם חתימות וטרנזקציות
+(getSignaturesForAddress + getTransaction jsonParsed) - הקוד יושב כאן פעם אחת.
+
+🔧 פונקציות עיקריות:
+- rpc_call(client, url, method, params) - קריאת JSON-RPC אחת (None בכשלון)
+- get_transactions(client, url, signatures) - getTransaction לכמה חתימות ב-batch אחד
+
+📝 הערות:
+- ה-client מגיע מהקורא (create_http_client) - כך ה-rate limiter וה-pool משותפים
+"""
+
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from utils.logger import get_logger
+
+logger = get_logger("solana_rpc")
+
+
+async def rpc_call(http_client: httpx.AsyncClient, rpc_url: str, method: str, params: List) -> Optional[Any]:
+    """קריאת JSON-RPC אחת (None בכשלון)"""
+    try:
+        response = await http_client.post(
+            rpc_url,
+            json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+        )
+        if response.status_code != 200:
+            logger.warning(f"⚠️ {method} returned {response.status_code}")
+            return None
+        data = response.json()
+        if "error" in data:
+            logger.warning(f"⚠️ {method} error: {data['error']}")
+            return None
+        return data.get("result")
+    except Exception as e:
+        logger.error(f"Error in {method}: {e}")
+        return None
+
+
+async def get_transactions(
+    http_client: httpx.AsyncClient,
+    rpc_url: str,
+    signatures: List[str],
+) -> Dict[str, Optional[Dict]]:
+    """
+    getTransaction לכמה חתימות ב-batch אחד (encoding=jsonParsed)
+
+    Returns:
+        signature -> transaction (None = לא נמצאה). חתימות של batch שנכשל חסרות.
+    """
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "id": idx,
+            "method": "getTransaction",
+            "params": [
+                sig,
+                {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0, "commitment": "confirmed"},
+            ],
+        }
+        for idx, sig in enumerate(signatures)
+    ]
+    try:
+        response = await http_client.post(rpc_url, json=payload)
+        data = response.json() if response.status_code == 200 else None
+        if not isinstance(data, list):
+            logger.warning(f"⚠️ getTransaction batch of {len(signatures)} failed ({response.status_code})")
+            return {}
+    except Exception as e:
+        logger.error(f"Error fetching transactions: {e}")
+        return {}
+
+    # Batch responses may come back in any order - match by id
+    transactions: Dict[str, Optional[Dict]] = {}
+    for item in data:
+        if not isinstance(item, dict) or "error" in item:
+            continue
+        idx = item.get("id")
+        if isinstance(idx, int) and 0 <= idx < len(signatures):
+            transactions[signatures[idx]] = item.get("result")
+    return transactions
@@ -0,0 +1,43 @@
+-- ============================================================================
+-- Migration 006: Address Owners Cache
+-- ============================================================================
+-- 
+-- 📋 מה הקובץ הזה עושה:
+-- --------------------
+-- יוצר טבלה משותפת של address -> owner program + סיווג (lp / burn / exempt):
+-- 1. HolderAnalyzer בודק כאן לפני קריאת getMultipleAccounts
+-- 2. כמה מופעים של הבוט חולקים את אותו מטמון
+-- 3. מופעל רק עם ADDRESS_CACHE_SUPABASE=true
+-- 
+-- תאריך: 2026-10-17
+-- ============================================================================
+
+-- ============================================================================
+-- 1. יצירת טבלת address_owners
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS address_owners (
+    address TEXT PRIMARY KEY,
+    owner TEXT,
+    kind TEXT NOT NULL DEFAULT 'other',  -- 'lp', 'burn', 'exempt', 'program', 'other'
+    label TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- ============================================================================
+-- 2. יצירת Indexes
+-- ============================================================================
+
+-- Index לסינון לפי סיווג (כמה LP vaults מוכרים וכו')
+CREATE INDEX IF NOT EXISTS idx_address_owners_kind 
+ON address_owners(kind);
+
+-- ============================================================================
+-- ✅ סיום
+-- ============================================================================
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 006 completed successfully!';
+    RAISE NOTICE '   Created table: address_owners';
+END $$;
@@ -0,0 +1,55 @@
+-- ============================================================================
+-- Migration 007: Token Lookup Indexes
+-- ============================================================================
+--
+-- 📋 מה הקובץ הזה עושה:
+-- --------------------
+-- מוסיף indexes ל-scanned_tokens_history כדי שה-API לא יצטרך למשוך 1000 שורות:
+-- 1. GET /api/tokens/{address} → address=eq.X (שורה אחת דרך index)
+-- 2. GET /api/tokens/search?q= → symbol / name ilike '%q%' (trigram index)
+--
+-- תאריך: 2026-10-17
+-- ============================================================================
+
+-- ============================================================================
+-- 1. Index על address
+-- ============================================================================
+
+-- address הוא PRIMARY KEY בטבלה שנוצרת ב-002, אבל טבלאות שנוצרו לפני כן
+-- (CREATE TABLE IF NOT EXISTS) עלולות להיות בלי - יוצרים index רק אם חסר
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'scanned_tokens_history'::regclass
+          AND i.indnatts = 1
+          AND a.attname = 'address'
+    ) THEN
+        CREATE UNIQUE INDEX idx_scanned_tokens_address
+        ON scanned_tokens_history(address);
+    END IF;
+END $$;
+
+-- ============================================================================
+-- 2. Trigram indexes לחיפוש (ilike '%q%')
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_scanned_tokens_symbol_trgm
+ON scanned_tokens_history USING gin (symbol gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_scanned_tokens_name_trgm
+ON scanned_tokens_history USING gin (name gin_trgm_ops);
+
+-- ============================================================================
+-- ✅ סיום
+-- ============================================================================
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 007 completed successfully!';
+    RAISE NOTICE '   Indexes: address (if missing), symbol / name trigram';
+END $$;
@@ -0,0 +1,155 @@
+-- ============================================================================
+-- Migration 008: Trade Rollups
+-- ============================================================================
+--
+-- 📋 מה הקובץ הזה עושה:
+-- --------------------
+-- יוצר טבלת סיכומים מצטברים של trades לפי יום ולפי שבוע (trade_rollups).
+-- ה-backend (database/trade_rollups.py) מעדכן את ה-bucket של היום ושל השבוע
+-- בכל save_trade / close_position, ו-/api/analytics סוכם כמה buckets במקום
+-- להוריד את כל trade_history.
+--
+-- 1. טבלת trade_rollups
+-- 2. מילוי ראשוני מ-trade_history הקיים
+--
+-- תאריך: 2026-10-17
+-- ============================================================================
+
+-- ============================================================================
+-- 1. טבלת trade_rollups
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS trade_rollups (
+    user_id TEXT NOT NULL DEFAULT 'default',
+    granularity TEXT NOT NULL CHECK (granularity IN ('day', 'week')),
+    bucket_start DATE NOT NULL, -- UTC; שבוע מתחיל ביום שני
+
+    -- מונים
+    total_trades INTEGER NOT NULL DEFAULT 0,
+    buy_trades INTEGER NOT NULL DEFAULT 0,
+    sell_trades INTEGER NOT NULL DEFAULT 0,
+    winning_trades INTEGER NOT NULL DEFAULT 0,
+    losing_trades INTEGER NOT NULL DEFAULT 0,
+    closed_positions INTEGER NOT NULL DEFAULT 0,
+
+    -- סכומים
+    total_pnl_usd DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    win_pnl_usd DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    loss_pnl_usd DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    volume_usd DECIMAL(20, 2) NOT NULL DEFAULT 0,
+
+    -- best / worst trade ב-bucket
+    best_pnl_usd DECIMAL(20, 2),
+    best_token_symbol TEXT,
+    best_trade_at TIMESTAMP WITH TIME ZONE,
+    worst_pnl_usd DECIMAL(20, 2),
+    worst_token_symbol TEXT,
+    worst_trade_at TIMESTAMP WITH TIME ZONE,
+
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, granularity, bucket_start)
+);
+
+COMMENT ON TABLE trade_rollups IS 'סיכומי trades מצטברים לפי יום / שבוע - מקור הנתונים של /api/analytics';
+
+-- ============================================================================
+-- 2. מילוי ראשוני מ-trade_history
+-- ============================================================================
+
+-- buckets שכבר קיימים (הרצה חוזרת) לא נדרסים
+WITH bucketed AS (
+    SELECT
+        t.user_id,
+        g.granularity,
+        CASE g.granularity
+            WHEN 'day' THEN (t.created_at AT TIME ZONE 'UTC')::date
+            ELSE date_trunc('week', t.created_at AT TIME ZONE 'UTC')::date
+        END AS bucket_start,
+        t.trade_type,
+        COALESCE(t.realized_pnl_usd, 0) AS pnl,
+        COALESCE(t.value_usd, 0) AS value_usd,
+        t.token_symbol,
+        t.created_at
+    FROM trade_history t
+    CROSS JOIN (VALUES ('day'), ('week')) AS g(granularity)
+    WHERE t.created_at IS NOT NULL
+),
+totals AS (
+    SELECT
+        user_id,
+        granularity,
+        bucket_start,
+        COUNT(*) AS total_trades,
+        COUNT(*) FILTER (WHERE trade_type = 'BUY') AS buy_trades,
+        COUNT(*) FILTER (WHERE trade_type = 'SELL') AS sell_trades,
+        COUNT(*) FILTER (WHERE pnl > 0) AS winning_trades,
+        COUNT(*) FILTER (WHERE pnl < 0) AS losing_trades,
+        SUM(pnl) AS total_pnl_usd,
+        COALESCE(SUM(pnl) FILTER (WHERE pnl > 0), 0) AS win_pnl_usd,
+        COALESCE(SUM(pnl) FILTER (WHERE pnl < 0), 0) AS loss_pnl_usd,
+        SUM(value_usd) AS volume_usd
+    FROM bucketed
+    GROUP BY user_id, granularity, bucket_start
+),
+best AS (
+    SELECT DISTINCT ON (user_id, granularity, bucket_start)
+        user_id, granularity, bucket_start, pnl, token_symbol, created_at
+    FROM bucketed
+    ORDER BY user_id, granularity, bucket_start, pnl DESC, created_at DESC
+),
+worst AS (
+    SELECT DISTINCT ON (user_id, granularity, bucket_start)
+        user_id, granularity, bucket_start, pnl, token_symbol, created_at
+    FROM bucketed
+    ORDER BY user_id, granularity, bucket_start, pnl ASC, created_at DESC
+)
+INSERT INTO trade_rollups (
+    user_id, granularity, bucket_start,
+    total_trades, buy_trades, sell_trades, winning_trades, losing_trades,
+    total_pnl_usd, win_pnl_usd, loss_pnl_usd, volume_usd,
+    best_pnl_usd, best_token_symbol, best_trade_at,
+    worst_pnl_usd, worst_token_symbol, worst_trade_at
+)
+SELECT
+    t.user_id, t.granularity, t.bucket_start,
+    t.total_trades, t.buy_trades, t.sell_trades, t.winning_trades, t.losing_trades,
+    t.total_pnl_usd, t.win_pnl_usd, t.loss_pnl_usd, t.volume_usd,
+    b.pnl, b.token_symbol, b.created_at,
+    w.pnl, w.token_symbol, w.created_at
+FROM totals t
+JOIN best b USING (user_id, granularity, bucket_start)
+JOIN worst w USING (user_id, granularity, bucket_start)
+ON CONFLICT (user_id, granularity, bucket_start) DO NOTHING;
+
+-- closed_positions מפוזיציות שכבר נסגרו
+WITH closed AS (
+    SELECT
+        p.user_id,
+        g.granularity,
+        CASE g.granularity
+            WHEN 'day' THEN (p.closed_at AT TIME ZONE 'UTC')::date
+            ELSE date_trunc('week', p.closed_at AT TIME ZONE 'UTC')::date
+        END AS bucket_start,
+        COUNT(*) AS closed_positions
+    FROM positions p
+    CROSS JOIN (VALUES ('day'), ('week')) AS g(granularity)
+    WHERE p.closed_at IS NOT NULL
+    GROUP BY 1, 2, 3
+)
+INSERT INTO trade_rollups (user_id, granularity, bucket_start, closed_positions)
+SELECT user_id, granularity, bucket_start, closed_positions
+FROM closed
+ON CONFLICT (user_id, granularity, bucket_start)
+DO UPDATE SET closed_positions = EXCLUDED.closed_positions
+WHERE trade_rollups.closed_positions = 0;
+
+-- ============================================================================
+-- ✅ סיום
+-- ============================================================================
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 008 completed successfully!';
+    RAISE NOTICE '   Table: trade_rollups (day / week buckets, backfilled from trade_history)';
+END $$;
@@ -0,0 +1,45 @@
+-- ============================================================================
+-- Migration 009: Portfolio Snapshots
+-- ============================================================================
+--
+-- 📋 מה הקובץ הזה עושה:
+-- --------------------
+-- יוצר טבלת time-series לצילומי מצב של התיק (portfolio_snapshots).
+-- ה-backend (executor/portfolio_snapshots.py) כותב כל 5 דקות נקודה אחת לכל רזולוציה:
+-- - 5m → נשמר יומיים
+-- - 1h → נשמר 90 יום
+-- - 1d → נשמר לתמיד
+-- נקודות ישנות נמחקות פעם בשעה, ו-/api/portfolio/performance/history קורא טווח
+-- מרזולוציה אחת דרך ה-PRIMARY KEY.
+--
+-- תאריך: 2026-10-17
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    user_id TEXT NOT NULL DEFAULT 'default',
+    resolution TEXT NOT NULL CHECK (resolution IN ('5m', '1h', '1d')),
+    bucket_at TIMESTAMP WITH TIME ZONE NOT NULL, -- תחילת ה-bucket (UTC)
+    taken_at TIMESTAMP WITH TIME ZONE NOT NULL, -- מתי צולם הערך (האחרון ב-bucket)
+
+    value_usd DECIMAL(20, 2) NOT NULL DEFAULT 0, -- שווי הפוזיציות הפתוחות
+    cost_usd DECIMAL(20, 2) NOT NULL DEFAULT 0, -- עלות הפוזיציות הפתוחות
+    unrealized_pnl_usd DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    realized_pnl_usd DECIMAL(20, 2) NOT NULL DEFAULT 0, -- מצטבר (trade_rollups)
+    equity_usd DECIMAL(20, 2) NOT NULL DEFAULT 0, -- value + realized
+    open_positions INTEGER NOT NULL DEFAULT 0,
+    positions JSONB NOT NULL DEFAULT '{}'::jsonb, -- token_address -> value_usd
+
+    PRIMARY KEY (user_id, resolution, bucket_at)
+);
+
+COMMENT ON TABLE portfolio_snapshots IS 'צילומי מצב של התיק לגרפים - 5m / 1h / 1d עם זמני שמירה שונים';
+
+-- ============================================================================
+-- ✅ סיום
+-- ============================================================================
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 009 completed successfully!';
+    RAISE NOTICE '   Table: portfolio_snapshots (5m for 2 days, 1h for 90 days, 1d forever)';
+END $$;